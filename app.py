@@ -16,6 +16,7 @@ from src.agents.pacing_brain import PacingBrain
 from src.api.mock_platform_api import MockPlatformAPI
 from src.api.internal_tracker import MockInternalTracker
 from src.models.spend import Platform
+from src.models.metadata import MetadataVocabulary
 from src.utils.audit_logger import AuditLogger
 from src.utils.results_tracker import ResultsTracker
 from src.analyzers.pacing_analyzer import PacingAnalyzer
@@ -152,9 +153,15 @@ def create_confidence_chart(alerts):
 def run_agent(platform, num_campaigns, seed, confidence_threshold, healthy_threshold, warning_threshold):
     """Run the pacing agent with given configuration."""
     with st.spinner("Initializing agent..."):
+        # Pin one reference time for the whole run
+        as_of = datetime.utcnow()
+
         # Create components
-        platform_api = MockPlatformAPI(platform, num_campaigns=num_campaigns, seed=seed)
-        internal_tracker = MockInternalTracker()
+        vocabulary = MetadataVocabulary(ConfidenceScorer.REQUIRED_FIELDS)
+        platform_api = MockPlatformAPI(
+            platform, num_campaigns=num_campaigns, seed=seed, as_of=as_of, vocabulary=vocabulary
+        )
+        internal_tracker = MockInternalTracker(vocabulary=vocabulary, as_of=as_of)
         internal_tracker.sync_from_platform(platform_api, dirty_ratio=0.15, seed=seed)
         audit_logger = AuditLogger(log_file="streamlit_audit.jsonl")
 
@@ -181,14 +188,16 @@ def run_agent(platform, num_campaigns, seed, confidence_threshold, healthy_thres
         actual = platform_api.get_campaign_spend(campaign_id)
         target = internal_tracker.get_target_spend(campaign_id)
 
-        # Calculate confidence
-        confidence_scores = scorer.calculate_confidence(
+        # Calculate confidence (explanation is built from the same pass)
+        confidence_result = scorer.score_with_explanation(
             tracker_name=target.campaign_name,
             api_name=actual.campaign_name,
             tracker_metadata=target.metadata,
             api_metadata=actual.metadata,
-            actual_timestamp=actual.timestamp
+            actual_timestamp=actual.timestamp,
+            as_of=as_of
         )
+        confidence_scores = confidence_result.scores
 
         # Create reconciled spend
         from src.models.spend import ReconciledSpend
@@ -202,7 +211,8 @@ def run_agent(platform, num_campaigns, seed, confidence_threshold, healthy_thres
             actual_timestamp=actual.timestamp,
             metadata_match_score=confidence_scores["metadata_match_score"],
             name_similarity=confidence_scores["name_similarity"],
-            data_freshness_score=confidence_scores["data_freshness_score"]
+            data_freshness_score=confidence_scores["data_freshness_score"],
+            confidence_weights=scorer.confidence_weights
         )
 
         # Calculate variance
@@ -222,14 +232,7 @@ def run_agent(platform, num_campaigns, seed, confidence_threshold, healthy_thres
             action_taken = "autonomous_halt_executed"
 
         # Generate score explanations
-        score_explanations = scorer.explain_confidence(
-            tracker_name=target.campaign_name,
-            api_name=actual.campaign_name,
-            tracker_metadata=target.metadata,
-            api_metadata=actual.metadata,
-            actual_timestamp=actual.timestamp,
-            scores=confidence_scores
-        )
+        score_explanations = confidence_result.explanation
 
         # Create alert
         from src.models.spend import PacingAlert
@@ -0,0 +1,51 @@
+"""
+Benchmark for parallel chunked audit log analytics.
+
+Writes the synthetic multi-GB JSONL log of bench_audit_index (default
+2 GB; set AUDIT_BENCH_GB) and times AuditLogger.aggregate(group_by=
+"platform") with 1, 2, 4, ... worker processes up to the CPU count,
+reporting the speedup over a single worker.
+
+Usage:
+    AUDIT_BENCH_GB=2 python -m benchmarks.bench_audit_analytics
+"""
+
+import os
+import tempfile
+import time
+
+from benchmarks.bench_audit_index import TARGET_BYTES, write_log
+from src.utils.audit_logger import AuditLogger
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    print("\n" + "=" * 70)
+    print(f" Audit analytics benchmark ({TARGET_BYTES / 2**30:.1f} GB log, {cpus} CPUs)")
+    print("=" * 70 + "\n")
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        log_file = os.path.join(log_dir, "audit_log.jsonl")
+        count = write_log(log_file)
+        print(f"Wrote {count:,} events ({os.path.getsize(log_file) / 2**30:.2f} GB)\n")
+
+        logger = AuditLogger(log_file=log_file)
+        workers = 1
+        baseline = expected = None
+        print(f"{'workers':<10}{'time':>10}{'events/s':>14}{'speedup':>10}")
+        while True:
+            start = time.perf_counter()
+            result = logger.aggregate(group_by="platform", workers=workers)
+            elapsed = time.perf_counter() - start
+            baseline = baseline or elapsed
+            expected = expected or result
+            assert result == expected
+            print(f"{workers:<10}{elapsed:>9.2f}s{count / elapsed:>14,.0f}{baseline / elapsed:>9.1f}x")
+            if workers >= cpus:
+                break
+            workers = min(workers * 2, cpus)
+    print()
+
+
+if __name__ == "__main__":
+    main()
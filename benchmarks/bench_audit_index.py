@@ -0,0 +1,122 @@
+"""
+Benchmark for the AuditLogger sidecar index on a multi-GB log.
+
+Writes a synthetic JSONL audit log (default 2 GB; set AUDIT_BENCH_GB),
+then compares a campaign drill-down and an event-type query answered by a
+full scan with the same queries answered through the sidecar index,
+including the one-off index rebuild and sidecar reload costs.
+
+Usage:
+    AUDIT_BENCH_GB=2 python -m benchmarks.bench_audit_index
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from src.utils.audit_logger import AuditLogger
+from src.utils.codecs import JsonCodec
+
+
+TARGET_BYTES = int(float(os.getenv("AUDIT_BENCH_GB", "2")) * 2**30)
+NUM_CAMPAIGNS = 100_000
+CHUNK_EVENTS = 50_000
+
+
+def write_log(path):
+    """Append synthetic events until the log reaches TARGET_BYTES."""
+    codec = JsonCodec()
+    rng = random.Random(42)
+    written = 0
+    count = 0
+    with open(path, "wb") as f:
+        while written < TARGET_BYTES:
+            chunk = []
+            for _ in range(CHUNK_EVENTS):
+                campaign_id = f"google_{rng.randrange(NUM_CAMPAIGNS):06d}"
+                kind = rng.random()
+                if kind < 0.45:
+                    event = {
+                        "event_type": "reconciliation", "campaign_id": campaign_id,
+                        "target_spend": 10000.0, "actual_spend": rng.uniform(0, 20000),
+                        "variance_pct": rng.uniform(0, 100), "confidence_score": rng.random(),
+                        "metadata_match_score": 1.0, "name_similarity": rng.random(),
+                        "data_freshness_score": rng.random(),
+                        "timestamp": "2026-01-15T12:00:00.000000",
+                        "as_of": "2026-01-15T12:00:00",
+                    }
+                elif kind < 0.9:
+                    event = {
+                        "event_type": "pacing_alert", "alert_id": f"alert_{count}",
+                        "campaign_id": campaign_id, "severity": "healthy",
+                        "variance_pct": rng.uniform(0, 10), "confidence_score": rng.random(),
+                        "action_taken": "logged_healthy", "recommendation": "No action",
+                        "requires_human": False, "root_cause_analysis": None,
+                        "mitigation_plan": None, "timestamp": "2026-01-15T12:00:00",
+                        "metadata": {"market": "EU", "product": "LEGO_City"},
+                    }
+                else:
+                    event = {
+                        "event_type": "agent_action", "campaign_id": campaign_id,
+                        "action_type": "send_alert", "success": True, "details": {},
+                        "timestamp": "2026-01-15T12:00:00",
+                    }
+                chunk.append(codec.encode(event))
+                count += 1
+            data = b"".join(chunk)
+            f.write(data)
+            written += len(data)
+    return count
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    print("\n" + "=" * 70)
+    print(f" Audit log index benchmark ({TARGET_BYTES / 2**30:.1f} GB log)")
+    print("=" * 70 + "\n")
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        log_file = os.path.join(log_dir, "audit_log.jsonl")
+        count, write_time = timed(lambda: write_log(log_file))
+        print(f"Wrote {count:,} events ({os.path.getsize(log_file) / 2**30:.2f} GB) "
+              f"in {write_time:.1f}s\n")
+
+        campaign_id = "google_004242"
+        plain = AuditLogger(log_file=log_file)
+        scan_events, scan_campaign = timed(lambda: plain.get_events(campaign_id=campaign_id))
+        _, scan_type = timed(lambda: plain.get_events(event_type="agent_action", limit=None))
+
+        indexed = AuditLogger(log_file=log_file, indexed=True)
+        stats, rebuild_time = timed(indexed.rebuild_index)
+        indexed.close()
+        sidecar_size = (
+            os.path.getsize(indexed.index.path) + os.path.getsize(indexed.index.keys_path)
+        )
+
+        reopened = AuditLogger(log_file=log_file, indexed=True)
+        _, load_time = timed(reopened.index.sync)
+        index_events, index_campaign = timed(
+            lambda: reopened.get_events(campaign_id=campaign_id)
+        )
+        _, index_type = timed(lambda: reopened.get_events(event_type="agent_action"))
+        assert index_events == scan_events
+
+        print(f"Index rebuild:              {rebuild_time:8.2f}s "
+              f"({stats['indexed_records']:,} records, sidecar {sidecar_size / 2**20:.0f} MB)")
+        print(f"Sidecar reload:             {load_time:8.2f}s\n")
+        print(f"{'query':<34}{'full scan':>10}{'indexed':>12}{'speedup':>10}")
+        print(f"{'campaign drill-down':<34}{scan_campaign:>9.2f}s{index_campaign * 1000:>10.1f}ms"
+              f"{scan_campaign / index_campaign:>9.0f}x  ({len(index_events)} events)")
+        print(f"{'event_type=agent_action':<34}{scan_type:>9.2f}s{index_type:>11.2f}s"
+              f"{scan_type / index_type:>9.1f}x")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark for memory-mapped, prefiltered audit log scans.
+
+Writes a synthetic JSONL audit log (default 10M events; set
+AUDIT_BENCH_EVENTS), then compares decoding every line and filtering (the
+old get_events path) with the prefiltered mmap scan for a campaign
+drill-down and an event-type query, and "latest 10 events for a campaign"
+from a full scan with the reverse tail reader.
+
+Usage:
+    AUDIT_BENCH_EVENTS=10000000 python -m benchmarks.bench_audit_scan
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from src.utils.audit_logger import AuditLogger
+from src.utils.codecs import JsonCodec
+
+
+NUM_EVENTS = int(os.getenv("AUDIT_BENCH_EVENTS", "10000000"))
+NUM_CAMPAIGNS = 100_000
+CHUNK_EVENTS = 50_000
+
+
+def write_log(path):
+    """Write NUM_EVENTS synthetic reconciliations, alerts and actions."""
+    codec = JsonCodec()
+    rng = random.Random(42)
+    with open(path, "wb") as f:
+        for chunk_start in range(0, NUM_EVENTS, CHUNK_EVENTS):
+            chunk = []
+            for i in range(chunk_start, min(chunk_start + CHUNK_EVENTS, NUM_EVENTS)):
+                campaign_id = f"google_{rng.randrange(NUM_CAMPAIGNS):06d}"
+                kind = rng.random()
+                if kind < 0.45:
+                    event = {
+                        "event_type": "reconciliation", "campaign_id": campaign_id,
+                        "target_spend": 10000.0, "actual_spend": rng.uniform(0, 20000),
+                        "confidence_score": rng.random(),
+                        "timestamp": "2026-01-15T12:00:00.000000",
+                    }
+                elif kind < 0.9:
+                    event = {
+                        "event_type": "pacing_alert", "alert_id": f"alert_{i}",
+                        "campaign_id": campaign_id, "severity": "healthy",
+                        "variance_pct": rng.uniform(0, 10), "action_taken": "logged_healthy",
+                        "timestamp": "2026-01-15T12:00:00",
+                        "metadata": {"market": "EU", "product": "LEGO_City"},
+                    }
+                else:
+                    event = {
+                        "event_type": "agent_action", "campaign_id": campaign_id,
+                        "action_type": "send_alert", "success": True, "details": {},
+                        "timestamp": "2026-01-15T12:00:00",
+                    }
+                chunk.append(codec.encode(event))
+            f.write(b"".join(chunk))
+
+
+def decode_all(logger, event_type=None, campaign_id=None):
+    """The old get_events path: decode every line, then filter."""
+    with open(logger.log_path, "rb") as f:
+        return [
+            event for event in logger.codec.iter_decode(f)
+            if (not event_type or event.get("event_type") == event_type)
+            and (not campaign_id or event.get("campaign_id") == campaign_id)
+        ]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    print("\n" + "=" * 70)
+    print(f" Audit log scan benchmark ({NUM_EVENTS:,} events)")
+    print("=" * 70 + "\n")
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        log_file = os.path.join(log_dir, "audit_log.jsonl")
+        _, write_time = timed(lambda: write_log(log_file))
+        print(f"Wrote {os.path.getsize(log_file) / 2**30:.2f} GB in {write_time:.1f}s\n")
+
+        logger = AuditLogger(log_file=log_file)
+        campaign_id = "google_004242"
+        queries = [
+            ("campaign drill-down", dict(campaign_id=campaign_id)),
+            ("event_type=agent_action", dict(event_type="agent_action")),
+        ]
+
+        print(f"{'query':<30}{'decode all':>12}{'mmap scan':>12}{'speedup':>10}")
+        for label, query in queries:
+            expected, full_time = timed(lambda: decode_all(logger, **query))
+            events, scan_time = timed(lambda: logger.get_events(**query))
+            assert events == expected
+            print(f"{label:<30}{full_time:>11.2f}s{scan_time:>11.2f}s"
+                  f"{full_time / scan_time:>9.1f}x  ({len(events):,} events)")
+
+        expected, full_time = timed(lambda: decode_all(logger, campaign_id=campaign_id)[-10:])
+        latest, tail_time = timed(lambda: logger.tail_events(10, campaign_id=campaign_id))
+        assert latest == expected
+        print(f"{'latest 10 for campaign':<30}{full_time:>11.2f}s{tail_time * 1000:>10.1f}ms"
+              f"{full_time / tail_time:>9.0f}x")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark for rotating, compressed audit log segments.
+
+Logs a day of synthetic events (timestamps spread over 24 hours) into a
+single log and into a log rotated every ROTATE_MB and compressed, then
+compares disk usage, logging throughput, a full get_events scan and a
+one-hour time-range query that only reads overlapping segments.
+
+Usage:
+    python -m benchmarks.bench_audit_segments
+"""
+
+import os
+import tempfile
+import time
+
+from src.utils.audit_logger import AuditLogger
+
+
+NUM_EVENTS = 500_000
+ROTATE_MB = 8
+
+CONFIGS = [
+    ("single log", dict()),
+    ("rotated, gzip", dict(rotate_bytes=ROTATE_MB * 2**20, compression="gzip")),
+    ("rotated, zstd", dict(rotate_bytes=ROTATE_MB * 2**20, compression="zstd")),
+]
+
+
+def log_day(logger):
+    """Log NUM_EVENTS decisions in timestamp order over one day."""
+    for i in range(NUM_EVENTS):
+        seconds = i * 86400 // NUM_EVENTS
+        logger.log_event({
+            "event_type": "agent_decision",
+            "campaign_id": f"google_{i % 5000:05d}",
+            "variance_pct": 12.5,
+            "confidence_score": 0.91,
+            "severity": "warning",
+            "decision": "alert",
+            "reasoning": "Spend is pacing above target",
+            "timestamp": f"2026-01-15T{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}",
+        })
+    logger.close()
+
+
+def disk_usage(log_dir):
+    return sum(entry.stat().st_size for entry in os.scandir(log_dir))
+
+
+def main():
+    print("\n" + "=" * 70)
+    print(f" Audit segment benchmark ({NUM_EVENTS:,} events, rotate every {ROTATE_MB} MB)")
+    print("=" * 70 + "\n")
+    print(f"{'':<16}{'disk MB':>9}{'events/s':>11}{'full scan':>11}{'1h range':>10}{'segments':>10}")
+
+    for label, options in CONFIGS:
+        if options.get("compression") == "zstd":
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                print(f"{label:<16}  (zstandard not installed)")
+                continue
+        with tempfile.TemporaryDirectory() as log_dir:
+            logger = AuditLogger(log_dir=log_dir, **options)
+            start = time.perf_counter()
+            log_day(logger)
+            write_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            assert len(logger.get_events()) == NUM_EVENTS
+            scan_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            hour = logger.get_events(start_time="2026-01-15T12:00:00", end_time="2026-01-15T13:00:00")
+            range_time = time.perf_counter() - start
+            assert abs(len(hour) - NUM_EVENTS / 24) < 2
+
+            print(
+                f"{label:<16}{disk_usage(log_dir) / 2**20:>9.1f}{NUM_EVENTS / write_time:>11,.0f}"
+                f"{scan_time:>10.2f}s{range_time:>9.2f}s{len(logger.segments.entries()):>10}"
+            )
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark for the SQLite audit backend against JSONL log files.
+
+Logs the same events through each backend, then times a campaign
+drill-down, an event-type query with a time range, and get_summary_stats.
+Also times migrating the JSONL log into a fresh database.
+
+Usage:
+    python -m benchmarks.bench_audit_sqlite
+"""
+
+import tempfile
+import time
+from pathlib import Path
+
+from src.utils.audit_logger import AuditLogger
+from src.utils.audit_sqlite import migrate_log
+
+
+NUM_EVENTS = 200_000
+NUM_CAMPAIGNS = 5_000
+
+
+def backends(log_dir):
+    db_url = f"sqlite:///{Path(log_dir) / 'audit_logs.db'}"
+    return [
+        ("jsonl direct", dict(log_dir=log_dir, log_file="direct.jsonl")),
+        ("jsonl buffered", dict(log_dir=log_dir, log_file="buffered.jsonl", buffered=True)),
+        ("jsonl indexed", dict(log_dir=log_dir, log_file="indexed.jsonl", buffered=True, indexed=True)),
+        ("sqlite per-event", dict(database_url=db_url.replace(".db", "_direct.db"))),
+        ("sqlite batched", dict(database_url=db_url, buffered=True)),
+    ]
+
+
+def log_events(logger):
+    for i in range(NUM_EVENTS):
+        seconds = i * 86400 // NUM_EVENTS
+        logger.log_event({
+            "event_type": ("agent_decision", "pacing_alert", "reconciliation")[i % 3],
+            "campaign_id": f"google_{i % NUM_CAMPAIGNS:05d}",
+            "severity": "warning",
+            "decision": "alert",
+            "variance_pct": 12.5,
+            "confidence_score": 0.91,
+            "timestamp": f"2026-01-15T{seconds // 3600:02d}:{seconds // 60 % 60:02d}:{seconds % 60:02d}",
+        })
+    logger.close()
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    print("\n" + "=" * 70)
+    print(f" SQLite vs JSONL audit backend ({NUM_EVENTS:,} events)")
+    print("=" * 70 + "\n")
+    print(f"{'':<18}{'events/s':>10}{'campaign':>11}{'type+1h':>11}{'summary':>11}")
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        for label, options in backends(log_dir):
+            logger = AuditLogger(**options)
+            _, write_time = timed(lambda: log_events(logger))
+            campaign, campaign_time = timed(lambda: logger.get_events(campaign_id="google_01234"))
+            hour, hour_time = timed(lambda: logger.get_events(
+                event_type="pacing_alert",
+                start_time="2026-01-15T12:00:00", end_time="2026-01-15T13:00:00"
+            ))
+            # Fresh logger: nothing cached from the writes
+            stats, stats_time = timed(AuditLogger(**options).get_summary_stats)
+            assert len(campaign) == NUM_EVENTS // NUM_CAMPAIGNS
+            assert stats["total_events"] == NUM_EVENTS
+            print(
+                f"{label:<18}{NUM_EVENTS / write_time:>10,.0f}{campaign_time * 1000:>9.1f}ms"
+                f"{hour_time * 1000:>9.1f}ms{stats_time * 1000:>9.1f}ms"
+            )
+
+        target = f"sqlite:///{Path(log_dir) / 'migrated.db'}"
+        count, migrate_time = timed(lambda: migrate_log(str(Path(log_dir) / "direct.jsonl"), target))
+        print(f"\nmigrate jsonl -> sqlite: {count:,} events in {migrate_time:.2f}s "
+              f"({count / migrate_time:,.0f} events/s)")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark for AuditLogger.get_summary_stats on a growing audit log.
+
+Appends a short "run" of events to logs holding increasing history and
+times the end-of-run get_summary_stats call: a full recount of the log
+(reconcile_summary_stats, what every call used to cost) against the
+incremental counters, from the same process and from a fresh logger
+resuming the summary checkpoint.
+
+Usage:
+    python -m benchmarks.bench_audit_summary
+"""
+
+import os
+import tempfile
+import time
+
+from src.utils.audit_logger import AuditLogger
+
+
+HISTORY_SIZES = [10_000, 100_000, 1_000_000]
+RUN_EVENTS = 1_000
+
+
+def log_run(logger, start, count):
+    """Log one run's worth of decisions and alerts."""
+    for i in range(start, start + count):
+        if i % 2:
+            logger.log_decision(f"google_{i % 5000:05d}", 12.5, 0.9, "warning", "alert", "Over pace")
+        else:
+            logger.log_event({
+                "event_type": "pacing_alert", "campaign_id": f"google_{i % 5000:05d}",
+                "severity": "warning", "variance_pct": 12.5,
+            })
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    print("\n" + "=" * 70)
+    print(f" Audit summary stats benchmark ({RUN_EVENTS:,}-event run)")
+    print("=" * 70 + "\n")
+    print(f"{'history':>10}{'log MB':>9}{'recount':>11}{'counters':>11}{'resumed':>11}")
+
+    for history in HISTORY_SIZES:
+        with tempfile.TemporaryDirectory() as log_dir:
+            with AuditLogger(log_dir=log_dir, buffered=True) as logger:
+                log_run(logger, 0, history)
+                log_run(logger, history, RUN_EVENTS)
+                stats, counters = timed(logger.get_summary_stats)
+                recounted, recount = timed(logger.reconcile_summary_stats)
+                assert recounted["drift"] == {}
+
+            resumed_logger = AuditLogger(log_dir=log_dir)
+            resumed_stats, resumed = timed(resumed_logger.get_summary_stats)
+            assert resumed_stats["total_events"] == stats["total_events"] == history + RUN_EVENTS
+            size_mb = os.path.getsize(logger.log_path) / 2**20
+
+        print(
+            f"{history:>10,}{size_mb:>9.1f}{recount * 1000:>9.1f}ms"
+            f"{counters * 1000:>9.2f}ms{resumed * 1000:>9.2f}ms"
+        )
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark for per-campaign vs batch spend fetching.
+
+Simulates a fixed round-trip latency on the mock platform API and internal
+tracker, then compares one-request-per-campaign fetching against the batch
+endpoints used by PacingBrain.prefetch.
+
+Usage:
+    python -m benchmarks.bench_batch_fetch
+"""
+
+import time
+
+from src.api.mock_platform_api import MockPlatformAPI
+from src.api.internal_tracker import MockInternalTracker
+from src.models.spend import Platform
+
+
+NUM_CAMPAIGNS = 2000
+LATENCY_MS = 2.0
+
+
+def main():
+    print("\n" + "=" * 70)
+    print(f" Spend fetch benchmark ({NUM_CAMPAIGNS:,} campaigns, {LATENCY_MS} ms/request)")
+    print("=" * 70 + "\n")
+
+    api = MockPlatformAPI(
+        Platform.GOOGLE, num_campaigns=NUM_CAMPAIGNS, seed=42, request_latency_ms=LATENCY_MS
+    )
+    tracker = MockInternalTracker(request_latency_ms=LATENCY_MS)
+    tracker.sync_from_platform(api, seed=42)
+    campaign_ids = api.list_campaign_ids()
+
+    # Per-campaign fetching
+    start = time.perf_counter()
+    for campaign_id in campaign_ids:
+        api.get_campaign_spend(campaign_id)
+        tracker.get_target_spend(campaign_id)
+    single_time = time.perf_counter() - start
+    single_requests = api.request_count + tracker.request_count
+
+    # Batch fetching
+    api.request_count = tracker.request_count = 0
+    start = time.perf_counter()
+    api.get_campaign_spend_batch(campaign_ids)
+    tracker.get_target_spend_batch(campaign_ids)
+    batch_time = time.perf_counter() - start
+    batch_requests = api.request_count + tracker.request_count
+
+    print(f"{'mode':<14}  {'round trips':>11}  {'wall time (s)':>13}")
+    print(f"{'per-campaign':<14}  {single_requests:>11,}  {single_time:>13.3f}")
+    print(f"{'batch':<14}  {batch_requests:>11,}  {batch_time:>13.3f}")
+    print(f"\nSpeedup: {single_time / batch_time:.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
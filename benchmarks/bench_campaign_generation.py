@@ -0,0 +1,94 @@
+"""
+Benchmark for synthetic campaign catalog generation.
+
+Compares the original per-campaign Python loop (reproduced here as a
+reference) against MockPlatformAPI.generate_campaign_columns, which draws
+the whole catalog as NumPy arrays.
+
+Usage:
+    python -m benchmarks.bench_campaign_generation
+"""
+
+import random
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from src.api.mock_platform_api import MockPlatformAPI
+from src.models.spend import Platform
+
+
+SIZES = [10_000, 100_000, 1_000_000]
+
+
+def generate_with_loop(api: MockPlatformAPI, num_campaigns: int) -> list:
+    """Reference implementation: one Python iteration per campaign."""
+    campaigns = []
+    for i in range(num_campaigns):
+        scenario = random.choice(api.SCENARIO_DISTRIBUTION)
+        variance_factor = random.choice(api.VARIANCE_SCENARIOS[scenario])
+        target = random.uniform(1000, 15000)
+        actual = target * variance_factor
+        market = random.choice(api.MARKETS)
+        product = random.choice(api.PRODUCTS)
+        start_date = datetime.utcnow() - timedelta(days=random.randint(7, 30))
+        end_date = start_date + timedelta(days=random.randint(14, 60))
+        last_updated = datetime.utcnow() - timedelta(hours=random.randint(1, 8))
+        name_product = product.replace("_", " ") if random.random() < 0.2 else product
+        name = (
+            f"LEGO_{market}_{name_product}_Q{random.randint(1, 4)}_2026_"
+            f"{random.choice(api.CHANNELS)}_{i:03d}"
+        )
+        campaigns.append({
+            "campaign_id": f"{api.platform.value}_{i:03d}",
+            "campaign_name": name,
+            "spend": actual,
+            "target": target,
+            "status": "active" if actual > 0 else "paused",
+            "last_updated": last_updated,
+            "metadata": {
+                "market": market,
+                "product": product,
+                "start_date": start_date.strftime("%Y-%m-%d"),
+                "end_date": end_date.strftime("%Y-%m-%d"),
+            },
+            "scenario": scenario,
+        })
+    return campaigns
+
+
+def main():
+    print("\n" + "=" * 70)
+    print(" Campaign catalog generation benchmark")
+    print("=" * 70 + "\n")
+    print(f"{'campaigns':>10}  {'loop (s)':>9}  {'columns (s)':>11}  {'speedup':>8}  {'full init (s)':>13}")
+
+    api = MockPlatformAPI(Platform.GOOGLE, num_campaigns=1, seed=42)
+
+    for size in SIZES:
+        start = time.perf_counter()
+        generate_with_loop(api, size)
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        api.generate_campaign_columns(size, np.random.default_rng(42))
+        column_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        MockPlatformAPI(Platform.GOOGLE, num_campaigns=size, seed=42)
+        init_time = time.perf_counter() - start
+
+        print(
+            f"{size:>10,}  {loop_time:>9.2f}  {column_time:>11.2f}  "
+            f"{loop_time / column_time:>7.1f}x  {init_time:>13.2f}"
+        )
+
+    print(
+        "\n'full init' includes materializing the per-campaign dictionaries "
+        "used by the accessors.\n"
+    )
+
+
+if __name__ == "__main__":
+    main()
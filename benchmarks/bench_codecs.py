@@ -0,0 +1,127 @@
+"""
+Benchmark for audit event and model serialization codecs.
+
+For each available codec, measures events/sec for encoding a mix of
+audit events and models, decoding them back from a stream, and the full
+AuditLogger.log_reconciliation + get_events path on disk.
+
+Usage:
+    python -m benchmarks.bench_codecs
+"""
+
+import io
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from src.models.spend import PacingAlert, Platform, ReconciledSpend
+from src.utils.audit_logger import AuditLogger
+from src.utils.codecs import CODECS, get_codec
+
+
+NUM_EVENTS = 100_000
+NUM_LOGGED = 20_000
+
+
+def build_records(n):
+    """Mix of reconciliation events, alert events and ReconciledSpend models."""
+    as_of = datetime(2026, 1, 15, 12, 0)
+    records = []
+    for i in range(n):
+        campaign_id = f"google_{i:06d}"
+        kind = i % 3
+        if kind == 0:
+            records.append({
+                "event_type": "reconciliation",
+                "campaign_id": campaign_id,
+                "target_spend": 10000.0 + i,
+                "actual_spend": 9500.0 + i,
+                "variance_pct": 5.0,
+                "confidence_score": 0.91,
+                "metadata_match_score": 1.0,
+                "name_similarity": 0.82,
+                "data_freshness_score": 0.9,
+                "timestamp": as_of.isoformat(),
+                "as_of": as_of.isoformat(),
+            })
+        elif kind == 1:
+            records.append(PacingAlert(
+                alert_id=f"alert_{campaign_id}", campaign_id=campaign_id, severity="healthy",
+                variance_pct=5.0, confidence_score=0.91, action_taken="logged_healthy",
+                recommendation="No action", requires_human=False, timestamp=as_of,
+                metadata={"market": "EU", "target_spend": 10000.0, "actual_spend": 9500.0},
+            ).to_dict())
+        else:
+            records.append(ReconciledSpend(
+                campaign_id=campaign_id, campaign_name=f"LEGO_EU_City_Q1_2026_Search_{i}",
+                platform=Platform.GOOGLE, target_spend=10000.0, actual_spend=9500.0,
+                target_timestamp=as_of, actual_timestamp=as_of - timedelta(hours=2),
+                metadata_match_score=1.0, name_similarity=0.82, data_freshness_score=0.9,
+            ))
+    return records
+
+
+def bench_codec(codec, records):
+    """Encode/decode throughput and encoded size for one codec."""
+    start = time.perf_counter()
+    data = b"".join([codec.encode(record) for record in records])
+    encode_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    decoded = list(codec.iter_decode(io.BytesIO(data)))
+    decode_time = time.perf_counter() - start
+    assert len(decoded) == len(records)
+
+    return encode_time, decode_time, len(data)
+
+
+def bench_logger(codec_name, log_dir):
+    """AuditLogger log_reconciliation and get_events throughput."""
+    logger = AuditLogger(log_dir=log_dir, codec=codec_name)
+    as_of = datetime(2026, 1, 15, 12, 0)
+
+    start = time.perf_counter()
+    for i in range(NUM_LOGGED):
+        logger.log_reconciliation(
+            campaign_id=f"google_{i:06d}", target_spend=10000.0, actual_spend=9500.0,
+            confidence_score=0.91, metadata_match_score=1.0, name_similarity=0.82,
+            data_freshness_score=0.9, as_of=as_of
+        )
+    log_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    events = logger.get_events()
+    read_time = time.perf_counter() - start
+    assert len(events) == NUM_LOGGED
+
+    return log_time, read_time
+
+
+def main():
+    print("\n" + "=" * 70)
+    print(f" Codec benchmark ({NUM_EVENTS:,} records, {NUM_LOGGED:,} logged events)")
+    print("=" * 70 + "\n")
+
+    records = build_records(NUM_EVENTS)
+
+    print(f"{'codec':<10}{'encode ev/s':>14}{'decode ev/s':>14}{'bytes/ev':>10}"
+          f"{'log ev/s':>12}{'read ev/s':>12}")
+    for name in CODECS:
+        try:
+            codec = get_codec(name)
+        except ImportError as e:
+            print(f"{name:<10}skipped ({e})")
+            continue
+        encode_time, decode_time, size = bench_codec(codec, records)
+        with tempfile.TemporaryDirectory() as log_dir:
+            log_time, read_time = bench_logger(name, log_dir)
+        print(
+            f"{name:<10}{NUM_EVENTS / encode_time:>14,.0f}{NUM_EVENTS / decode_time:>14,.0f}"
+            f"{size / NUM_EVENTS:>10.0f}{NUM_LOGGED / log_time:>12,.0f}"
+            f"{NUM_LOGGED / read_time:>12,.0f}"
+        )
+    print()
+
+
+if __name__ == "__main__":
+    main()
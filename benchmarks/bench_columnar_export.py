@@ -0,0 +1,91 @@
+"""
+Benchmark for columnar audit log exports.
+
+Logs synthetic reconciliations and decisions (default 1M events; set
+AUDIT_BENCH_EVENTS), exports them with export_to_json and
+export_to_parquet, and compares export time, file size and the cost of
+reading two columns back (json.load of the whole export vs a Parquet
+column projection).
+
+Usage:
+    AUDIT_BENCH_EVENTS=1000000 python -m benchmarks.bench_columnar_export
+"""
+
+import json
+import os
+import tempfile
+import time
+
+import pyarrow.parquet as pq
+
+from src.utils.audit_logger import AuditLogger
+from src.utils.codecs import JsonCodec
+
+
+NUM_EVENTS = int(os.getenv("AUDIT_BENCH_EVENTS", "1000000"))
+
+
+def write_log(path):
+    """Write NUM_EVENTS reconciliations, each followed by a decision."""
+    codec = JsonCodec()
+    with open(path, "wb") as f:
+        for i in range(0, NUM_EVENTS, 2):
+            campaign_id = f"google_{i % 10_000:06d}"
+            timestamp = f"2026-01-15T{i % 24:02d}:00:00.000000"
+            f.write(codec.encode({
+                "event_type": "reconciliation", "campaign_id": campaign_id,
+                "target_spend": 10000.0, "actual_spend": 9000.0 + i % 2000,
+                "variance_pct": (i % 2000) / 20, "confidence_score": 0.9,
+                "metadata_match_score": 1.0, "name_similarity": 0.8,
+                "data_freshness_score": 0.9, "timestamp": timestamp,
+            }))
+            f.write(codec.encode({
+                "event_type": "agent_decision", "campaign_id": campaign_id,
+                "variance_pct": (i % 2000) / 20, "confidence_score": 0.9,
+                "severity": "warning", "decision": "send_alert",
+                "reasoning": "Variance above warning threshold", "timestamp": timestamp,
+            }))
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    print("\n" + "=" * 70)
+    print(f" Columnar export benchmark ({NUM_EVENTS:,} events)")
+    print("=" * 70 + "\n")
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        log_file = os.path.join(log_dir, "audit_log.jsonl")
+        write_log(log_file)
+        logger = AuditLogger(log_file=log_file)
+        json_file = os.path.join(log_dir, "export.json")
+        parquet_file = os.path.join(log_dir, "export.parquet")
+        columns = ["campaign_id", "variance_pct"]
+
+        _, json_export = timed(lambda: logger.export_to_json(json_file))
+        _, parquet_export = timed(lambda: logger.export_to_parquet(parquet_file))
+
+        def read_json():
+            with open(json_file) as f:
+                return [[event.get(column) for column in columns] for event in json.load(f)]
+
+        rows, json_read = timed(read_json)
+        table, parquet_read = timed(lambda: pq.read_table(parquet_file, columns=columns))
+        assert table.num_rows == len(rows) == NUM_EVENTS
+
+        print(f"\n{'':<22}{'export':>10}{'size':>12}{'read 2 columns':>18}")
+        for label, export_time, path, read_time in (
+            ("JSON", json_export, json_file, json_read),
+            ("Parquet", parquet_export, parquet_file, parquet_read),
+        ):
+            print(f"{label:<22}{export_time:>9.2f}s{os.path.getsize(path) / 2**20:>9.0f} MB"
+                  f"{read_time:>17.3f}s")
+    print()
+
+
+if __name__ == "__main__":
+    main()
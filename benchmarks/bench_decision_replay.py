@@ -0,0 +1,141 @@
+"""
+Benchmark for replaying logged decisions under alternative thresholds.
+
+Writes a synthetic month of hourly PacingBrain runs (default 1,000
+campaigns; set REPLAY_BENCH_CAMPAIGNS) as a JSONL audit log, then times
+loading it into a DecisionReplay, a replay under the logged thresholds
+(which must change nothing) and a few alternative threshold sets. A
+scalar replay (one ReconciledSpend and calculate_variance call per row)
+is timed on a sample for comparison.
+
+Usage:
+    REPLAY_BENCH_CAMPAIGNS=1000 python -m benchmarks.bench_decision_replay
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from src.analyzers.decision_replay import DecisionReplay
+from src.analyzers.pacing_analyzer import PacingAnalyzer
+from src.utils.codecs import JsonCodec
+
+
+NUM_CAMPAIGNS = int(os.getenv("REPLAY_BENCH_CAMPAIGNS", "1000"))
+NUM_HOURS = 30 * 24
+SCALAR_SAMPLE = 100_000
+
+SCENARIOS = [
+    ("logged thresholds", {}),
+    ("warning at 45%", dict(warning_threshold=45.0)),
+    ("confidence >= 0.6", dict(confidence_threshold=0.6)),
+    ("reweighted confidence", dict(confidence_weights=(0.4, 0.4, 0.2))),
+]
+
+
+def route(variance, confidence):
+    """PacingBrain's routing under the default thresholds."""
+    if confidence < 0.7:
+        return "escalate_to_human"
+    if variance < 10:
+        return "log_healthy"
+    return "send_alert" if variance < 25 else "autonomous_halt"
+
+
+def write_log(path):
+    """Write one run per campaign per hour: reconciliation, decision, alert, action."""
+    codec = JsonCodec()
+    rng = random.Random(42)
+    with open(path, "wb") as f:
+        for hour in range(NUM_HOURS):
+            timestamp = f"2026-01-{1 + hour // 24:02d}T{hour % 24:02d}:00:00"
+            chunk = []
+            for campaign in range(NUM_CAMPAIGNS):
+                campaign_id = f"google_{campaign:05d}"
+                target = 10000.0
+                actual = target * rng.choice([0.0, 0.7, 0.85, 0.95, 1.0, 1.05, 1.2, 1.4])
+                scores = [rng.choice([0.5, 0.75, 1.0]), rng.uniform(0.5, 1.0),
+                          rng.choice([0.5, 0.8, 1.0])]
+                confidence = scores[0] * 0.5 + scores[1] * 0.3 + scores[2] * 0.2
+                variance = 100.0 if actual == 0 else abs(actual - target) / target * 100
+                chunk.append(codec.encode({
+                    "event_type": "reconciliation", "campaign_id": campaign_id,
+                    "target_spend": target, "actual_spend": actual, "variance_pct": variance,
+                    "confidence_score": confidence, "metadata_match_score": scores[0],
+                    "name_similarity": scores[1], "data_freshness_score": scores[2],
+                    "timestamp": timestamp,
+                }))
+                decision = route(variance, confidence)
+                if decision == "log_healthy":
+                    chunk.append(codec.encode({
+                        "type": "healthy_pacing", "campaign_id": campaign_id,
+                        "variance": variance, "confidence": confidence, "timestamp": timestamp,
+                    }))
+                    continue
+                if decision == "autonomous_halt":
+                    chunk.append(codec.encode({
+                        "event_type": "agent_action", "campaign_id": campaign_id,
+                        "action_type": "pause_campaign", "success": True, "details": {},
+                        "timestamp": timestamp,
+                    }))
+                chunk.append(codec.encode({
+                    "event_type": "agent_decision", "campaign_id": campaign_id,
+                    "variance_pct": variance, "confidence_score": confidence,
+                    "decision": decision, "reasoning": "", "timestamp": timestamp,
+                }))
+                if decision != "escalate_to_human":
+                    chunk.append(codec.encode({
+                        "event_type": "pacing_alert", "campaign_id": campaign_id,
+                        "variance_pct": variance, "action_taken": decision,
+                        "timestamp": timestamp, "metadata": {"target_spend": target},
+                    }))
+            f.write(b"".join(chunk))
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    num_runs = NUM_CAMPAIGNS * NUM_HOURS
+    print("\n" + "=" * 70)
+    print(f" Decision replay benchmark ({num_runs:,} runs, 30 days)")
+    print("=" * 70 + "\n")
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        log_file = os.path.join(log_dir, "audit_log.jsonl")
+        _, write_time = timed(lambda: write_log(log_file))
+        print(f"Wrote {os.path.getsize(log_file) / 2**20:.0f} MB in {write_time:.1f}s")
+
+        # Read the file directly, so no summary checkpoint is built first
+        def load():
+            with open(log_file, "rb") as f:
+                return DecisionReplay.from_events(JsonCodec().iter_decode(f))
+
+        replay, load_time = timed(load)
+        print(f"Loaded {len(replay):,} reconciliations in {load_time:.1f}s\n")
+
+        print(f"{'scenario':<26}{'replay':>10}{'changed':>12}")
+        for label, thresholds in SCENARIOS:
+            result, replay_time = timed(lambda: replay.compare(**thresholds))
+            if not thresholds:
+                assert result["changed"] == 0 and result["not_logged"] == 0
+            print(f"{label:<26}{replay_time * 1000:>8.0f}ms{result['changed']:>12,}")
+
+        analyzer = PacingAnalyzer()
+        sample = min(SCALAR_SAMPLE, len(replay))
+        _, scalar_time = timed(lambda: [
+            analyzer.calculate_variance(replay.frame.row(i)) for i in range(sample)
+        ])
+        scalar_time *= len(replay) / sample
+        _, batch_time = timed(lambda: replay.replay())
+        print(f"\nScalar re-routing (extrapolated): {scalar_time:.1f}s, "
+              f"vectorized: {batch_time * 1000:.0f}ms ({scalar_time / batch_time:.0f}x)")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark for integer-coded metadata matching.
+
+Builds a synced 200k-campaign catalog twice, with plain metadata dicts and
+with metadata encoded at ingestion by a shared MetadataVocabulary, then
+compares per-pair cost of ConfidenceScorer.calculate_metadata_match and of
+the batch path (string columns vs code matrices).
+
+Usage:
+    python -m benchmarks.bench_metadata_encoding
+"""
+
+import time
+
+from src.agents.confidence_scorer import ConfidenceScorer
+from src.api.internal_tracker import MockInternalTracker
+from src.api.mock_platform_api import MockPlatformAPI
+from src.models.metadata import MetadataVocabulary
+from src.models.spend import Platform
+
+
+NUM_CAMPAIGNS = 200_000
+
+
+def load_metadata(vocabulary=None):
+    """Fetch aligned (tracker, api) metadata dicts from a synced catalog."""
+    api = MockPlatformAPI(
+        Platform.GOOGLE, num_campaigns=NUM_CAMPAIGNS, seed=42, vocabulary=vocabulary
+    )
+    tracker = MockInternalTracker(vocabulary=vocabulary)
+    tracker.sync_from_platform(api, seed=42)
+    campaign_ids = api.list_campaign_ids()
+    return (
+        [r.metadata for r in tracker.get_target_spend_batch(campaign_ids)],
+        [r.metadata for r in api.get_campaign_spend_batch(campaign_ids)],
+    )
+
+
+def main():
+    print("\n" + "=" * 70)
+    print(f" Metadata encoding benchmark ({NUM_CAMPAIGNS:,} pairs)")
+    print("=" * 70 + "\n")
+
+    scorer = ConfidenceScorer()
+
+    vocabulary = MetadataVocabulary(ConfidenceScorer.REQUIRED_FIELDS)
+    start = time.perf_counter()
+    coded_tracker, coded_api = load_metadata(vocabulary)
+    coded_load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    plain_tracker, plain_api = load_metadata()
+    plain_load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    plain = [scorer.calculate_metadata_match(t, a) for t, a in zip(plain_tracker, plain_api)]
+    plain_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    coded = [scorer.calculate_metadata_match(t, a) for t, a in zip(coded_tracker, coded_api)]
+    coded_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scorer.calculate_metadata_match_batch(
+        scorer.metadata_columns(plain_tracker), scorer.metadata_columns(plain_api)
+    )
+    plain_batch_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    tracker_codes = scorer.metadata_codes(coded_tracker)
+    api_codes = scorer.metadata_codes(coded_api)
+    stack_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    coded_batch = scorer.calculate_metadata_match_batch(tracker_codes, api_codes)
+    coded_batch_time = time.perf_counter() - start
+
+    assert plain == coded == coded_batch.tolist()
+
+    per_pair = 1e9 / NUM_CAMPAIGNS
+    print(f"ingestion, plain dicts:        {plain_load_time:.2f} s")
+    print(f"ingestion, encoded:            {coded_load_time:.2f} s")
+    print(f"scalar match, strings:         {plain_time * per_pair:.0f} ns/pair")
+    print(f"scalar match, integer codes:   {coded_time * per_pair:.0f} ns/pair")
+    print(f"batch match, string columns:   {plain_batch_time * per_pair:.0f} ns/pair")
+    print(f"stack code matrices:           {stack_time * per_pair:.0f} ns/pair")
+    print(f"batch match, code matrices:    {coded_batch_time * per_pair:.0f} ns/pair")
+    print(f"Vocabulary sizes: {vocabulary.stats()}\n")
+
+
+if __name__ == "__main__":
+    main()
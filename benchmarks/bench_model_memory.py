@@ -0,0 +1,126 @@
+"""
+Memory benchmark for slotted models and interned metadata.
+
+Measures with tracemalloc the memory allocated for one pacing cycle's
+model objects (two SpendRecords, a ReconciledSpend and a PacingAlert per
+campaign) and for per-campaign metadata, at 100k and 1M campaigns. The
+"before" case uses plain __dict__-backed dataclasses with the same fields
+and a metadata dict per record; "after" uses the slotted models and
+metadata interned by a MetadataVocabulary.
+
+Usage:
+    python -m benchmarks.bench_model_memory
+"""
+
+import dataclasses
+import gc
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+from src.api.mock_platform_api import MockPlatformAPI
+from src.models.metadata import MetadataVocabulary
+from src.models.spend import DataSource, PacingAlert, Platform, ReconciledSpend, SpendRecord
+
+
+SIZES = (100_000, 1_000_000)
+
+
+def unslotted(cls):
+    """Plain dataclass with the same fields as cls (the pre-slots layout)."""
+    return dataclasses.make_dataclass(cls.__name__, [
+        (f.name, f.type, dataclasses.field(default=f.default, default_factory=f.default_factory))
+        for f in dataclasses.fields(cls)
+    ])
+
+
+def load_inputs(size):
+    """Column inputs shared by both cases, allocated before measuring."""
+    as_of = datetime(2026, 1, 15)
+    api = MockPlatformAPI(Platform.GOOGLE, num_campaigns=1, seed=42, as_of=as_of)
+    columns = api.generate_campaign_columns(size, np.random.default_rng(42), as_of)
+    return {
+        "campaign_id": columns["campaign_id"].tolist(),
+        "campaign_name": columns["campaign_name"].tolist(),
+        "spend": columns["spend"].tolist(),
+        "target": columns["target"].tolist(),
+        "timestamp": columns["last_updated"].astype("datetime64[us]").tolist(),
+        "metadata": list(zip(
+            columns["market"].tolist(),
+            columns["product"].tolist(),
+            columns["start_date"].tolist(),
+            columns["end_date"].tolist(),
+        )),
+    }
+
+
+def build_cycle(inputs, spend_record, reconciled_spend, pacing_alert, make_metadata):
+    """Build catalog metadata and one cycle of model objects."""
+    catalog = [
+        make_metadata({
+            "market": market,
+            "product": product,
+            "start_date": start_date,
+            "end_date": end_date,
+            "platform": "google",
+        })
+        for market, product, start_date, end_date in inputs["metadata"]
+    ]
+    objects = []
+    for i, campaign_id in enumerate(inputs["campaign_id"]):
+        name = inputs["campaign_name"][i]
+        timestamp = inputs["timestamp"][i]
+        actual = spend_record(
+            campaign_id, name, Platform.GOOGLE, DataSource.PLATFORM_API,
+            inputs["spend"][i], timestamp, 4, catalog[i]
+        )
+        target = spend_record(
+            campaign_id, name, Platform.GOOGLE, DataSource.INTERNAL_TRACKER,
+            inputs["target"][i], timestamp, 24, make_metadata(catalog[i])
+        )
+        reconciled = reconciled_spend(
+            campaign_id, name, Platform.GOOGLE, target.amount_usd, actual.amount_usd,
+            timestamp, timestamp, 1.0, 1.0, 1.0
+        )
+        alert = pacing_alert(
+            campaign_id, campaign_id, "healthy", 0.0, 1.0, "logged_healthy", "", False, timestamp
+        )
+        objects.append((actual, target, reconciled, alert))
+    return catalog, objects
+
+
+def measure(inputs, *args):
+    """Bytes allocated and still alive after building one cycle."""
+    gc.collect()
+    tracemalloc.start()
+    result = build_cycle(inputs, *args)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    gc.collect()
+    return allocated
+
+
+def main():
+    print("\n" + "=" * 70)
+    print(" Model memory benchmark (tracemalloc)")
+    print("=" * 70 + "\n")
+
+    before_classes = (unslotted(SpendRecord), unslotted(ReconciledSpend), unslotted(PacingAlert))
+    after_classes = (SpendRecord, ReconciledSpend, PacingAlert)
+
+    for size in SIZES:
+        inputs = load_inputs(size)
+        before = measure(inputs, *before_classes, dict)
+        after = measure(inputs, *after_classes, MetadataVocabulary().intern)
+        del inputs
+
+        print(f"{size:>9,} campaigns:")
+        print(f"  before: {before / 2**20:8.1f} MiB  ({before / size:6.0f} B/campaign)")
+        print(f"  after:  {after / 2**20:8.1f} MiB  ({after / size:6.0f} B/campaign)")
+        print(f"  saved:  {1 - after / before:.0%}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""
+Benchmark for MockPlatformAPI campaign lookups.
+
+Times get_all_campaigns() and per-campaign get_campaign_spend() at
+increasing catalog sizes to show that cost grows linearly with the
+number of campaigns.
+
+Usage:
+    python -m benchmarks.bench_platform_api
+"""
+
+import time
+
+from src.api.mock_platform_api import MockPlatformAPI
+from src.models.spend import Platform
+
+
+SIZES = [10_000, 25_000, 50_000, 100_000]
+
+
+def time_call(fn, *args) -> float:
+    """Return wall-clock seconds for a single call."""
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    print("\n" + "=" * 70)
+    print(" MockPlatformAPI lookup benchmark")
+    print("=" * 70 + "\n")
+    print(f"{'campaigns':>10}  {'get_all (s)':>12}  {'per campaign (us)':>18}  {'lookup loop (s)':>16}")
+
+    for size in SIZES:
+        api = MockPlatformAPI(Platform.GOOGLE, num_campaigns=size, seed=42)
+        campaign_ids = api.list_campaign_ids()
+
+        get_all = time_call(api.get_all_campaigns)
+
+        start = time.perf_counter()
+        for campaign_id in campaign_ids:
+            api.get_campaign_spend(campaign_id)
+        lookup_loop = time.perf_counter() - start
+
+        print(
+            f"{size:>10,}  {get_all:>12.3f}  "
+            f"{get_all / size * 1e6:>18.2f}  {lookup_loop:>16.3f}"
+        )
+
+    print("\nPer-campaign cost should stay roughly flat as the catalog grows.\n")
+
+
+if __name__ == "__main__":
+    main()
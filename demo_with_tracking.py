@@ -56,7 +56,8 @@ def run_agent_with_config(config):
             actual_timestamp=actual.timestamp,
             metadata_match_score=confidence_scores["metadata_match_score"],
             name_similarity=confidence_scores["name_similarity"],
-            data_freshness_score=confidence_scores["data_freshness_score"]
+            data_freshness_score=confidence_scores["data_freshness_score"],
+            confidence_weights=scorer.confidence_weights
         )
 
         # Calculate variance
@@ -1,10 +1,19 @@
 """Agent components for decision-making and confidence scoring."""
 
 from src.agents.pacing_brain import PacingBrain, AgentState
-from src.agents.confidence_scorer import ConfidenceScorer
+from src.agents.campaign_matcher import CampaignMatch, CampaignMatcher
+from src.agents.confidence_scorer import (
+    ConfidenceResult,
+    ConfidenceScorer,
+    NameDistanceCache,
+)
 
 __all__ = [
     "PacingBrain",
     "AgentState",
     "ConfidenceScorer",
+    "ConfidenceResult",
+    "NameDistanceCache",
+    "CampaignMatcher",
+    "CampaignMatch",
 ]
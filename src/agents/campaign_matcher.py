@@ -0,0 +1,202 @@
+"""
+Fuzzy campaign matcher for reconciliation without shared campaign IDs.
+
+Tracker rows and platform campaigns don't always share a campaign_id, so
+they have to be paired by name and metadata. Comparing every tracker row
+with every platform campaign is O(n x m) Levenshtein calls; instead this
+module:
+- Blocks platform campaigns by market/product, so only campaigns that
+  could match a row's metadata are considered
+- Indexes each block with a character n-gram inverted index over
+  normalized names
+- Collects candidates from the rarest n-grams of each tracker name and
+  scores only the best few with ConfidenceScorer
+"""
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from src.agents.confidence_scorer import ConfidenceScorer
+from src.models.spend import SpendRecord
+
+
+@dataclass
+class CampaignMatch:
+    """Candidate platform campaign for a tracker row, with confidence scores."""
+    tracker_campaign_id: str
+    campaign_id: str
+    campaign_name: str
+    scores: Dict[str, float]
+
+    @property
+    def confidence_score(self) -> float:
+        """Overall confidence of this pairing."""
+        return self.scores["confidence_score"]
+
+
+class CampaignMatcher:
+    """
+    Candidate index over platform campaigns for ID-less reconciliation.
+
+    Per-query work is bounded by the postings of a few rare n-grams and a
+    fixed candidate pool instead of the catalog size, so matching n tracker
+    rows against m campaigns scales sub-quadratically.
+    """
+
+    # Character n-gram length for the inverted index
+    NGRAM_SIZE = 3
+
+    # Metadata fields a candidate must share with the tracker row
+    BLOCK_FIELDS = ("market", "product")
+
+    # Rarest query n-grams used to collect candidates
+    MAX_QUERY_GRAMS = 12
+
+    # Query n-grams found in more than this share of a block are skipped
+    # ("lego", "_q1_"); they would pull in the whole block
+    MAX_GRAM_SHARE = 0.05
+
+    # Candidates (by shared n-grams) scored with ConfidenceScorer per row
+    CANDIDATE_POOL = 10
+
+    # Name separators folded together for indexing, so "LEGO EU City"
+    # and "LEGO_EU_City" share n-grams
+    SEPARATORS = str.maketrans({" ": "_", "-": "_"})
+
+    def __init__(
+        self,
+        campaigns: Sequence[SpendRecord],
+        confidence_scorer: Optional[ConfidenceScorer] = None,
+        ngram_size: int = NGRAM_SIZE,
+        block_fields: Sequence[str] = BLOCK_FIELDS,
+        max_query_grams: int = MAX_QUERY_GRAMS,
+        max_gram_share: float = MAX_GRAM_SHARE,
+        candidate_pool: int = CANDIDATE_POOL
+    ):
+        """
+        Build the candidate index.
+
+        Args:
+            campaigns: Platform API spend records to match against
+            confidence_scorer: Scorer for candidate pairs (default: new scorer)
+            ngram_size: Character n-gram length
+            block_fields: Metadata fields used for blocking (empty: one block)
+            max_query_grams: Rarest query n-grams used to collect candidates
+            max_gram_share: Skip query n-grams found in more than this share
+                            of the block (the rarest one is always kept)
+            candidate_pool: Candidates per row scored with the scorer
+        """
+        self.campaigns = list(campaigns)
+        self.confidence_scorer = confidence_scorer or ConfidenceScorer()
+        self.ngram_size = ngram_size
+        self.block_fields = tuple(block_fields)
+        self.max_query_grams = max_query_grams
+        self.max_gram_share = max_gram_share
+        self.candidate_pool = candidate_pool
+
+        # block key -> n-gram -> positions in self.campaigns
+        self._index: Dict[Tuple, Dict[str, List[int]]] = defaultdict(lambda: defaultdict(list))
+        self._block_sizes: Counter = Counter()
+        for position, record in enumerate(self.campaigns):
+            block_key = self._block_key(record.metadata)
+            self._block_sizes[block_key] += 1
+            postings = self._index[block_key]
+            for gram in self._ngrams(record.campaign_name):
+                postings[gram].append(position)
+
+    def __len__(self) -> int:
+        return len(self.campaigns)
+
+    def match(
+        self,
+        record: SpendRecord,
+        k: int = 5,
+        as_of: Optional[datetime] = None
+    ) -> List[CampaignMatch]:
+        """
+        Find the top-k platform campaigns for one tracker row.
+
+        Args:
+            record: Tracker spend record (name and metadata are used)
+            k: Maximum number of candidates to return
+            as_of: Reference time for freshness (default: current UTC time)
+
+        Returns:
+            Up to k CampaignMatches, highest confidence first. Empty if no
+            indexed campaign shares the row's block fields.
+        """
+        block_key = self._block_key(record.metadata)
+        postings = self._index.get(block_key)
+        if not postings:
+            return []
+
+        # Rare n-grams discriminate between near-identical names
+        gram_postings = sorted(
+            (postings[gram] for gram in self._ngrams(record.campaign_name) if gram in postings),
+            key=len
+        )[:self.max_query_grams]
+        max_postings = max(self.candidate_pool, self.max_gram_share * self._block_sizes[block_key])
+        gram_postings = [p for p in gram_postings if len(p) <= max_postings] or gram_postings[:1]
+
+        shared = Counter()
+        for positions in gram_postings:
+            shared.update(positions)
+
+        as_of = as_of or datetime.utcnow()
+        matches = []
+        for position, _ in shared.most_common(max(k, self.candidate_pool)):
+            candidate = self.campaigns[position]
+            scores = self.confidence_scorer.calculate_confidence(
+                tracker_name=record.campaign_name,
+                api_name=candidate.campaign_name,
+                tracker_metadata=record.metadata,
+                api_metadata=candidate.metadata,
+                actual_timestamp=candidate.timestamp,
+                as_of=as_of
+            )
+            matches.append(CampaignMatch(
+                tracker_campaign_id=record.campaign_id,
+                campaign_id=candidate.campaign_id,
+                campaign_name=candidate.campaign_name,
+                scores=scores
+            ))
+
+        matches.sort(key=lambda m: m.confidence_score, reverse=True)
+        return matches[:k]
+
+    def match_all(
+        self,
+        records: Sequence[SpendRecord],
+        k: int = 5,
+        as_of: Optional[datetime] = None
+    ) -> List[List[CampaignMatch]]:
+        """
+        Find the top-k platform campaigns for many tracker rows.
+
+        Args:
+            records: Tracker spend records
+            k: Maximum number of candidates per row
+            as_of: Reference time for freshness, shared by all rows
+                   (default: current UTC time)
+
+        Returns:
+            One list of CampaignMatches per record, aligned with records
+        """
+        as_of = as_of or datetime.utcnow()
+        return [self.match(record, k, as_of) for record in records]
+
+    def _block_key(self, metadata: Dict[str, str]) -> Tuple:
+        """Normalized block-field values, compared like metadata matching."""
+        return tuple(
+            str(value).lower() if value is not None else None
+            for value in (metadata.get(field) for field in self.block_fields)
+        )
+
+    def _ngrams(self, name: str) -> set:
+        """Distinct character n-grams of a normalized name."""
+        text = (name or "").lower().strip().translate(self.SEPARATORS)
+        if len(text) <= self.ngram_size:
+            return {text} if text else set()
+        return {text[i:i + self.ngram_size] for i in range(len(text) - self.ngram_size + 1)}
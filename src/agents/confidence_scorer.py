@@ -7,10 +7,175 @@ This module calculates confidence scores for spend reconciliation based on:
 - Data freshness (time since last update)
 """
 
+import json
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 from Levenshtein import distance as levenshtein_distance
 
+try:
+    # rapidfuzz ships with python-Levenshtein and computes element-wise
+    # distances for whole arrays in native code
+    from rapidfuzz.distance import Levenshtein as _RapidfuzzLevenshtein
+    from rapidfuzz.process import cpdist
+except ImportError:  # pragma: no cover - older rapidfuzz without cpdist
+    cpdist = None
+
+
+class NameDistanceCache:
+    """
+    Bounded LRU cache of Levenshtein distances between normalized names.
+
+    Campaign names rarely change between API refreshes, so the same
+    tracker/API pairs recur every cycle. Entries are keyed by the normalized
+    (tracker, api) pair; the least recently used entry is evicted once
+    max_size is reached. The cache can be saved to and loaded from a JSON
+    file so a restarted process starts warm.
+    """
+
+    def __init__(self, max_size: int = 100_000, path: Optional[str] = None):
+        """
+        Initialize the cache, loading persisted entries if path exists.
+
+        Args:
+            max_size: Maximum number of cached pairs
+            path: Optional JSON file used by load() and save()
+        """
+        self.max_size = max_size
+        self.path = Path(path) if path else None
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[str, str], int]" = OrderedDict()
+
+        if self.path and self.path.exists():
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def distance(self, tracker_normalized: str, api_normalized: str) -> int:
+        """
+        Return the edit distance for a normalized pair, computing it on a miss.
+
+        Args:
+            tracker_normalized: Normalized tracker campaign name
+            api_normalized: Normalized API campaign name
+
+        Returns:
+            Levenshtein distance between the two names
+        """
+        key = (tracker_normalized, api_normalized)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return cached
+
+        self.misses += 1
+        edit_distance = levenshtein_distance(tracker_normalized, api_normalized)
+        self._entries[key] = edit_distance
+        if len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return edit_distance
+
+    def stats(self) -> Dict[str, float]:
+        """Get hit/miss counters and current size."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+        }
+
+    def clear(self):
+        """Drop all entries and reset counters."""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def save(self, path: Optional[str] = None):
+        """
+        Persist entries (least to most recently used) to a JSON file.
+
+        Args:
+            path: Output file (default: the path given at construction)
+        """
+        target = Path(path) if path else self.path
+        if target is None:
+            raise ValueError("No path configured for name distance cache")
+
+        tmp_path = target.with_suffix(target.suffix + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump([[a, b, d] for (a, b), d in self._entries.items()], f)
+        tmp_path.replace(target)
+
+    def load(self, path: Optional[str] = None):
+        """
+        Load entries from a JSON file written by save().
+
+        Args:
+            path: Input file (default: the path given at construction)
+        """
+        source = Path(path) if path else self.path
+        with open(source, "r") as f:
+            for tracker_normalized, api_normalized, edit_distance in json.load(f):
+                self._entries[(tracker_normalized, api_normalized)] = edit_distance
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+
+class ConfidenceResult:
+    """
+    Confidence scores from a single scoring pass, with a lazy explanation.
+
+    The explanation structure (same shape as explain_confidence) is only
+    built the first time it is read, from intermediates captured while
+    scoring, so consumers that never look at it pay nothing for it.
+    Indexing a result returns a score, like the dict from
+    calculate_confidence.
+    """
+
+    def __init__(
+        self,
+        scores: Dict[str, float],
+        explain: Callable[[], Dict[str, dict]],
+        short_circuited: bool = False,
+        name_similarity_max: Optional[float] = None,
+        confidence_score_max: Optional[float] = None
+    ):
+        """
+        Initialize result.
+
+        Args:
+            scores: Component scores, as returned by calculate_confidence()
+            explain: Callable building the explanation on first access
+            short_circuited: True if the name distance was skipped because
+                             the threshold decision was already settled
+                             (see ConfidenceScorer.score_for_threshold)
+            name_similarity_max: Upper bound on the skipped name similarity
+            confidence_score_max: Upper bound on the confidence the full
+                                  computation would have given
+        """
+        self.scores = scores
+        self._explain = explain
+        self.short_circuited = short_circuited
+        self.name_similarity_max = name_similarity_max
+        self.confidence_score_max = confidence_score_max
+
+    def __getitem__(self, key: str) -> float:
+        return self.scores[key]
+
+    @cached_property
+    def explanation(self) -> Dict[str, dict]:
+        """Per-component explanation, built on first access."""
+        return self._explain()
+
 
 class ConfidenceScorer:
     """
@@ -32,12 +197,17 @@ class ConfidenceScorer:
     # Required metadata fields for matching
     REQUIRED_FIELDS = ["market", "product", "start_date", "end_date"]
 
+    # Default number of cached name-pair distances
+    NAME_CACHE_SIZE = 100_000
+
     def __init__(
         self,
         required_fields: list = None,
         metadata_weight: float = METADATA_WEIGHT,
         name_similarity_weight: float = NAME_SIMILARITY_WEIGHT,
-        freshness_weight: float = FRESHNESS_WEIGHT
+        freshness_weight: float = FRESHNESS_WEIGHT,
+        name_cache_size: int = NAME_CACHE_SIZE,
+        name_cache_path: Optional[str] = None
     ):
         """
         Initialize confidence scorer with configurable weights.
@@ -47,11 +217,21 @@ class ConfidenceScorer:
             metadata_weight: Weight for metadata matching (default 0.5)
             name_similarity_weight: Weight for name similarity (default 0.3)
             freshness_weight: Weight for data freshness (default 0.2)
+            name_cache_size: Maximum cached name pairs (0 disables caching)
+            name_cache_path: Optional JSON file to load/save the name cache
         """
         self.required_fields = required_fields or self.REQUIRED_FIELDS
+        self._required_fields_key = tuple(self.required_fields)
         self.metadata_weight = metadata_weight
         self.name_similarity_weight = name_similarity_weight
         self.freshness_weight = freshness_weight
+        self.name_cache = (
+            NameDistanceCache(name_cache_size, name_cache_path) if name_cache_size > 0 else None
+        )
+
+        # Counters for score_for_threshold()
+        self.gated_pairs = 0
+        self.short_circuited_pairs = 0
 
         # Validate weights sum to 1.0
         total_weight = metadata_weight + name_similarity_weight + freshness_weight
@@ -63,13 +243,19 @@ class ConfidenceScorer:
                 f"and freshness_weight ({freshness_weight})."
             )
 
+    @property
+    def confidence_weights(self) -> Tuple[float, float, float]:
+        """Weights as (metadata, name similarity, freshness), for ReconciledSpend."""
+        return (self.metadata_weight, self.name_similarity_weight, self.freshness_weight)
+
     def calculate_confidence(
         self,
         tracker_name: str,
         api_name: str,
         tracker_metadata: Dict[str, str],
         api_metadata: Dict[str, str],
-        actual_timestamp: datetime
+        actual_timestamp: datetime,
+        as_of: Optional[datetime] = None
     ) -> Dict[str, float]:
         """
         Calculate overall confidence score and component scores.
@@ -80,6 +266,7 @@ class ConfidenceScorer:
             tracker_metadata: Metadata dict from tracker
             api_metadata: Metadata dict from API
             actual_timestamp: Timestamp of actual spend data
+            as_of: Reference time for freshness (default: current UTC time)
 
         Returns:
             Dictionary with:
@@ -92,7 +279,237 @@ class ConfidenceScorer:
             tracker_metadata, api_metadata
         )
         name_score = self.calculate_name_similarity(tracker_name, api_name)
-        freshness_score = self.calculate_freshness(actual_timestamp)
+        freshness_score = self.calculate_freshness(actual_timestamp, as_of)
+
+        confidence = (
+            metadata_score * self.metadata_weight +
+            name_score * self.name_similarity_weight +
+            freshness_score * self.freshness_weight
+        )
+
+        return {
+            "confidence_score": confidence,
+            "metadata_match_score": metadata_score,
+            "name_similarity": name_score,
+            "data_freshness_score": freshness_score
+        }
+
+    def score_with_explanation(
+        self,
+        tracker_name: str,
+        api_name: str,
+        tracker_metadata: Dict[str, str],
+        api_metadata: Dict[str, str],
+        actual_timestamp: datetime,
+        as_of: Optional[datetime] = None
+    ) -> ConfidenceResult:
+        """
+        Calculate confidence scores and a lazily built explanation in one pass.
+
+        The name distance is computed at most once and data age is measured
+        once; the explanation reuses those values instead of recomputing them
+        as explain_confidence() would. The per-field metadata breakdown is
+        only built with the explanation.
+
+        Args:
+            tracker_name: Campaign name from internal tracker
+            api_name: Campaign name from platform API
+            tracker_metadata: Metadata dict from tracker
+            api_metadata: Metadata dict from API
+            actual_timestamp: Timestamp of actual spend data
+            as_of: Reference time for freshness (default: current UTC time)
+
+        Returns:
+            ConfidenceResult with the calculate_confidence() scores and an
+            explanation equal to explain_confidence() for the same inputs
+        """
+        metadata_score = self.calculate_metadata_match(tracker_metadata, api_metadata)
+
+        tracker_norm = (tracker_name or "").lower().strip()
+        api_norm = (api_name or "").lower().strip()
+        if tracker_norm and api_norm and tracker_norm != api_norm:
+            edit_dist = self._edit_distance(tracker_norm, api_norm)
+        else:
+            edit_dist = 0
+
+        if not tracker_name or not api_name:
+            name_score = 0.0
+        elif tracker_norm == api_norm:
+            name_score = 1.0
+        else:
+            # A name that normalizes to empty is max_len edits from the other
+            max_len = max(len(tracker_norm), len(api_norm))
+            distance = edit_dist if tracker_norm and api_norm else max_len
+            name_score = max(0.0, 1.0 - (distance / max_len))
+
+        hours_old = ((as_of or datetime.utcnow()) - actual_timestamp).total_seconds() / 3600
+        freshness_score = self._freshness_from_hours(hours_old)
+
+        confidence = (
+            metadata_score * self.metadata_weight +
+            name_score * self.name_similarity_weight +
+            freshness_score * self.freshness_weight
+        )
+
+        scores = {
+            "confidence_score": confidence,
+            "metadata_match_score": metadata_score,
+            "name_similarity": name_score,
+            "data_freshness_score": freshness_score
+        }
+
+        return ConfidenceResult(
+            scores,
+            lambda: self._build_explanation(
+                scores, *self._metadata_breakdown(tracker_metadata, api_metadata),
+                tracker_norm, api_norm, edit_dist, hours_old, actual_timestamp
+            )
+        )
+
+    def score_for_threshold(
+        self,
+        tracker_name: str,
+        api_name: str,
+        tracker_metadata: Dict[str, str],
+        api_metadata: Dict[str, str],
+        actual_timestamp: datetime,
+        threshold: float,
+        as_of: Optional[datetime] = None
+    ) -> ConfidenceResult:
+        """
+        Score a pair only as far as needed to decide confidence >= threshold.
+
+        Components are computed cheapest first: metadata and freshness, then
+        the name checks that need no edit distance (empty or identical
+        names). If the confidence is on the same side of the threshold for
+        every name score the pair could still get, the Levenshtein distance
+        is skipped and the name similarity is reported as unknown (None).
+        The confidence_score then only counts the measured components
+        (metadata and freshness): it is a lower bound on the full
+        confidence, and on the same side of the threshold as it, since
+        the decision was settled for every possible name score. The result's
+        name_similarity_max and confidence_score_max give the upper bounds.
+
+        Args:
+            tracker_name: Campaign name from internal tracker
+            api_name: Campaign name from platform API
+            tracker_metadata: Metadata dict from tracker
+            api_metadata: Metadata dict from API
+            actual_timestamp: Timestamp of actual spend data
+            threshold: Confidence threshold being gated on
+            as_of: Reference time for freshness (default: current UTC time)
+
+        Returns:
+            ConfidenceResult; short_circuited is True if the distance was skipped
+            (name_similarity is then None)
+        """
+        self.gated_pairs += 1
+        as_of = as_of or datetime.utcnow()
+
+        metadata_score = self.calculate_metadata_match(tracker_metadata, api_metadata)
+        freshness_score = self.calculate_freshness(actual_timestamp, as_of)
+
+        tracker_norm = (tracker_name or "").lower().strip()
+        api_norm = (api_name or "").lower().strip()
+        short_circuited = False
+        best_name_score = None
+
+        if not tracker_name or not api_name:
+            name_score = 0.0
+        elif tracker_norm == api_norm:
+            name_score = 1.0
+        else:
+            # Names differ, so at least one edit (and at least the length
+            # difference) is needed: similarity is bounded above by that
+            max_len = max(len(tracker_norm), len(api_norm))
+            min_edits = max(1, abs(len(tracker_norm) - len(api_norm)))
+            best_name_score = max(0.0, 1.0 - (min_edits / max_len))
+
+            if (
+                self._combine(metadata_score, 0.0, freshness_score) >= threshold or
+                self._combine(metadata_score, best_name_score, freshness_score) < threshold
+            ):
+                name_score = None
+                short_circuited = True
+            else:
+                edit_distance = self._edit_distance(tracker_norm, api_norm)
+                name_score = max(0.0, 1.0 - (edit_distance / max_len))
+
+        if short_circuited:
+            self.short_circuited_pairs += 1
+
+        scores = {
+            "confidence_score": self._combine(metadata_score, name_score or 0.0, freshness_score),
+            "metadata_match_score": metadata_score,
+            "name_similarity": name_score,
+            "data_freshness_score": freshness_score
+        }
+
+        return ConfidenceResult(
+            scores,
+            lambda: self.explain_confidence(
+                tracker_name, api_name, tracker_metadata, api_metadata,
+                actual_timestamp, scores, as_of
+            ),
+            short_circuited=short_circuited,
+            name_similarity_max=best_name_score if short_circuited else None,
+            confidence_score_max=(
+                self._combine(metadata_score, best_name_score, freshness_score)
+                if short_circuited else None
+            )
+        )
+
+    def _combine(self, metadata_score: float, name_score: float, freshness_score: float) -> float:
+        """Weighted confidence, summed in the same order as calculate_confidence()."""
+        return (
+            metadata_score * self.metadata_weight +
+            name_score * self.name_similarity_weight +
+            freshness_score * self.freshness_weight
+        )
+
+    def gating_stats(self) -> Dict[str, float]:
+        """Get how many score_for_threshold() pairs skipped the name distance."""
+        return {
+            "gated": self.gated_pairs,
+            "short_circuited": self.short_circuited_pairs,
+            "short_circuit_rate": (
+                self.short_circuited_pairs / self.gated_pairs if self.gated_pairs else 0.0
+            ),
+        }
+
+    def calculate_confidence_batch(
+        self,
+        tracker_names: Sequence[str],
+        api_names: Sequence[str],
+        tracker_metadata: Dict[str, Sequence],
+        api_metadata: Dict[str, Sequence],
+        actual_timestamps: Sequence,
+        as_of: Optional[datetime] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Calculate confidence scores for many tracker/API pairs at once.
+
+        Vectorized equivalent of calculate_confidence: every returned array
+        matches the scalar scores for the same row.
+
+        Args:
+            tracker_names: Campaign names from internal tracker
+            api_names: Campaign names from platform API (aligned)
+            tracker_metadata: Tracker metadata columns, field -> values
+                              (see metadata_columns), or a code matrix
+                              (see metadata_codes)
+            api_metadata: API metadata columns or code matrix, like
+                          tracker_metadata
+            actual_timestamps: Timestamps of actual spend data (datetimes or
+                               datetime64 values)
+            as_of: Reference time for freshness (default: current UTC time)
+
+        Returns:
+            Dictionary of arrays with the same keys as calculate_confidence
+        """
+        metadata_score = self.calculate_metadata_match_batch(tracker_metadata, api_metadata)
+        name_score = self.calculate_name_similarity_batch(tracker_names, api_names)
+        freshness_score = self.calculate_freshness_batch(actual_timestamps, as_of)
 
         confidence = (
             metadata_score * self.metadata_weight +
@@ -107,6 +524,199 @@ class ConfidenceScorer:
             "data_freshness_score": freshness_score
         }
 
+    def metadata_columns(self, metadata_rows: List[Dict[str, str]]) -> Dict[str, list]:
+        """
+        Pivot per-record metadata dicts into columns of required fields.
+
+        Args:
+            metadata_rows: One metadata dict per record
+
+        Returns:
+            Dictionary mapping each required field to its values (None if missing)
+        """
+        return {
+            field: [row.get(field) for row in metadata_rows]
+            for field in self.required_fields
+        }
+
+    def metadata_codes(self, metadata_rows: List[Dict[str, str]]) -> Optional[np.ndarray]:
+        """
+        Stack the integer codes of pre-encoded metadata rows.
+
+        Args:
+            metadata_rows: One metadata dict per record
+
+        Returns:
+            (n, required fields) code matrix if every row is EncodedMetadata
+            from one vocabulary over the required fields, else None (use
+            metadata_columns instead)
+        """
+        if not metadata_rows:
+            return None
+        vocabulary = getattr(metadata_rows[0], "vocabulary", None)
+        if vocabulary is None or vocabulary.fields != self._required_fields_key:
+            return None
+        return vocabulary.codes_of(metadata_rows)
+
+    def calculate_metadata_match_batch(
+        self,
+        tracker_metadata: Union[Dict[str, Sequence], np.ndarray],
+        api_metadata: Union[Dict[str, Sequence], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Compare metadata columns between tracker and API for many pairs.
+
+        Each column is dictionary-encoded: the distinct values (a handful of
+        markets, products and dates) are normalized once and every row is
+        mapped to an integer code, so matching is an integer comparison.
+        Code matrices from metadata_codes() (which must come from the same
+        vocabulary) skip the encoding step entirely.
+
+        Args:
+            tracker_metadata: Tracker metadata columns, field -> values, or
+                              code matrix
+            api_metadata: API metadata columns, field -> values, or code matrix
+
+        Returns:
+            Array of scores from 0.0 (no matches) to 1.0 (all fields match)
+        """
+        if isinstance(tracker_metadata, np.ndarray):
+            if not self.required_fields:
+                return np.ones(len(tracker_metadata))
+            matched = ((tracker_metadata >= 0) & (tracker_metadata == api_metadata)).sum(axis=1)
+            return matched / len(self.required_fields)
+
+        size = len(next(iter(tracker_metadata.values()), []))
+        if not self.required_fields:
+            return np.ones(size)
+
+        matched = np.zeros(size, dtype=np.int64)
+        for field in self.required_fields:
+            codes: Dict[str, int] = {}
+            tracker_codes = self._encode_column(tracker_metadata.get(field, [None] * size), codes)
+            api_codes = self._encode_column(api_metadata.get(field, [None] * size), codes)
+            matched += (tracker_codes >= 0) & (tracker_codes == api_codes)
+
+        return matched / len(self.required_fields)
+
+    @staticmethod
+    def _encode_column(values: Sequence, codes: Dict[str, int]) -> np.ndarray:
+        """
+        Map values to integer codes of their normalized (lowercased) form.
+
+        Each value is normalized on its own: raw values never serve as dict
+        keys, where True, 1 and 1.0 would collide although they normalize
+        to "true", "1" and "1.0".
+
+        Args:
+            values: Column values; None marks a missing field
+            codes: Normalized value -> code mapping shared by compared columns
+
+        Returns:
+            Integer code per value, -1 for missing values
+        """
+        return np.fromiter(
+            (-1 if value is None else codes.setdefault(str(value).lower(), len(codes))
+             for value in values),
+            dtype=np.int64,
+            count=len(values)
+        )
+
+    def calculate_name_similarity_batch(
+        self,
+        tracker_names: Sequence[str],
+        api_names: Sequence[str]
+    ) -> np.ndarray:
+        """
+        Calculate Levenshtein-based name similarity for many pairs.
+
+        Args:
+            tracker_names: Campaign names from tracker
+            api_names: Campaign names from API (aligned)
+
+        Returns:
+            Array of similarity scores from 0.0 to 1.0
+        """
+        size = len(tracker_names)
+        tracker_normalized = self._normalize_names(tracker_names)
+        api_normalized = self._normalize_names(api_names)
+
+        max_len = np.maximum(
+            np.fromiter(map(len, tracker_normalized), dtype=np.int64, count=size),
+            np.fromiter(map(len, api_normalized), dtype=np.int64, count=size)
+        )
+
+        if cpdist is not None and size:
+            edit_distance = cpdist(
+                tracker_normalized,
+                api_normalized,
+                scorer=_RapidfuzzLevenshtein.distance,
+                workers=-1
+            )
+        else:
+            edit_distance = np.fromiter(
+                map(levenshtein_distance, tracker_normalized, api_normalized),
+                dtype=np.int64,
+                count=size
+            )
+
+        similarity = np.ones(size)
+        differs = max_len > 0
+        similarity[differs] = 1.0 - (edit_distance[differs] / max_len[differs])
+        similarity = np.maximum(0.0, similarity)
+
+        # Missing or empty names never match
+        has_names = (
+            np.fromiter(map(bool, tracker_names), dtype=bool, count=size) &
+            np.fromiter(map(bool, api_names), dtype=bool, count=size)
+        )
+        similarity[~has_names] = 0.0
+        return similarity
+
+    @staticmethod
+    def _normalize_names(names: Sequence[str]) -> List[str]:
+        """Lowercase and strip names, treating None as empty."""
+        names = list(names)
+        if None in names:
+            names = [name or "" for name in names]
+        return list(map(str.strip, map(str.lower, names)))
+
+    def calculate_freshness_batch(
+        self,
+        timestamps: Sequence,
+        as_of: Optional[datetime] = None
+    ) -> np.ndarray:
+        """
+        Calculate freshness scores for many timestamps in one pass.
+
+        Uses the same tiers as calculate_freshness, measured against a single
+        reference time for the whole batch.
+
+        Args:
+            timestamps: Data timestamps (datetimes or a datetime64 array)
+            as_of: Reference time (default: current UTC time)
+
+        Returns:
+            Array of freshness scores from 0.2 (very stale) to 1.0 (fresh)
+        """
+        now = as_of or datetime.utcnow()
+
+        if isinstance(timestamps, np.ndarray) and np.issubdtype(timestamps.dtype, np.datetime64):
+            age_us = (np.datetime64(now, "us") - timestamps.astype("datetime64[us]")).astype(np.int64)
+            hours_old = age_us / 10**6 / 3600
+        else:
+            hours_old = np.fromiter(
+                ((now - ts).total_seconds() for ts in timestamps),
+                dtype=np.float64,
+                count=len(timestamps)
+            ) / 3600
+
+        return np.select(
+            [hours_old < 4, hours_old < 12, hours_old < 24],
+            [1.0, 0.8, 0.5],
+            default=0.2
+        )
+
     def calculate_metadata_match(
         self,
         tracker_metadata: Dict[str, str],
@@ -131,6 +741,21 @@ class ConfidenceScorer:
         if not self.required_fields:
             return 1.0  # No fields to check, perfect match
 
+        # Both sides pre-encoded by one run vocabulary: compare integer codes
+        tracker_codes = getattr(tracker_metadata, "codes", None)
+        if tracker_codes is not None:
+            api_codes = getattr(api_metadata, "codes", None)
+            if (
+                api_codes is not None and
+                tracker_metadata.vocabulary is api_metadata.vocabulary and
+                tracker_metadata.vocabulary.fields == self._required_fields_key
+            ):
+                matched = 0
+                for tracker_code, api_code in zip(tracker_codes, api_codes):
+                    if tracker_code == api_code and tracker_code >= 0:
+                        matched += 1
+                return matched / len(tracker_codes)
+
         matched = 0
         total = len(self.required_fields)
 
@@ -182,7 +807,7 @@ class ConfidenceScorer:
         if max_len == 0:
             return 1.0
 
-        edit_distance = levenshtein_distance(tracker_normalized, api_normalized)
+        edit_distance = self._edit_distance(tracker_normalized, api_normalized)
 
         # Convert distance to similarity score
         # Similarity = 1 - (edit_distance / max_length)
@@ -190,7 +815,13 @@ class ConfidenceScorer:
 
         return max(0.0, similarity)  # Ensure non-negative
 
-    def calculate_freshness(self, timestamp: datetime) -> float:
+    def _edit_distance(self, tracker_normalized: str, api_normalized: str) -> int:
+        """Levenshtein distance between normalized names, via the cache if enabled."""
+        if self.name_cache is None:
+            return levenshtein_distance(tracker_normalized, api_normalized)
+        return self.name_cache.distance(tracker_normalized, api_normalized)
+
+    def calculate_freshness(self, timestamp: datetime, as_of: Optional[datetime] = None) -> float:
         """
         Calculate freshness score based on data age.
 
@@ -202,12 +833,17 @@ class ConfidenceScorer:
 
         Args:
             timestamp: Timestamp of the data
+            as_of: Reference time (default: current UTC time)
 
         Returns:
             Freshness score from 0.2 (very stale) to 1.0 (fresh)
         """
-        hours_old = (datetime.utcnow() - timestamp).total_seconds() / 3600
+        hours_old = ((as_of or datetime.utcnow()) - timestamp).total_seconds() / 3600
+        return self._freshness_from_hours(hours_old)
 
+    @staticmethod
+    def _freshness_from_hours(hours_old: float) -> float:
+        """Map data age in hours to its freshness tier score."""
         if hours_old < 4:
             return 1.0
         elif hours_old < 12:
@@ -241,7 +877,8 @@ class ConfidenceScorer:
         tracker_metadata: Dict[str, str],
         api_metadata: Dict[str, str],
         actual_timestamp: datetime,
-        scores: Dict[str, float]
+        scores: Dict[str, float],
+        as_of: Optional[datetime] = None
     ) -> Dict[str, dict]:
         """
         Generate human-readable explanations for each confidence component.
@@ -253,6 +890,7 @@ class ConfidenceScorer:
             api_metadata: Metadata dict from API
             actual_timestamp: Timestamp of actual spend data
             scores: Dictionary with component scores from calculate_confidence()
+            as_of: Reference time for data age (default: current UTC time)
 
         Returns:
             Dictionary with explanation details for each component:
@@ -260,7 +898,30 @@ class ConfidenceScorer:
             - name_similarity: edit distance and character counts
             - data_freshness: data age, tier label, and timestamp
         """
-        # --- Metadata explanation ---
+        matched_fields, mismatched_fields = self._metadata_breakdown(
+            tracker_metadata, api_metadata
+        )
+
+        tracker_norm = (tracker_name or "").lower().strip()
+        api_norm = (api_name or "").lower().strip()
+        if tracker_norm and api_norm:
+            edit_dist = self._edit_distance(tracker_norm, api_norm)
+        else:
+            edit_dist = 0
+
+        hours_old = ((as_of or datetime.utcnow()) - actual_timestamp).total_seconds() / 3600
+
+        return self._build_explanation(
+            scores, matched_fields, mismatched_fields,
+            tracker_norm, api_norm, edit_dist, hours_old, actual_timestamp
+        )
+
+    def _metadata_breakdown(
+        self,
+        tracker_metadata: Dict[str, str],
+        api_metadata: Dict[str, str]
+    ) -> Tuple[List[str], List[Dict[str, str]]]:
+        """Split required fields into matched names and mismatch details."""
         matched_fields = []
         mismatched_fields = []
         for field in self.required_fields:
@@ -278,7 +939,21 @@ class ConfidenceScorer:
                     "tracker_value": str(tracker_val) if tracker_val is not None else "missing",
                     "api_value": str(api_val) if api_val is not None else "missing",
                 })
+        return matched_fields, mismatched_fields
 
+    def _build_explanation(
+        self,
+        scores: Dict[str, float],
+        matched_fields: List[str],
+        mismatched_fields: List[Dict[str, str]],
+        tracker_norm: str,
+        api_norm: str,
+        edit_dist: int,
+        hours_old: float,
+        actual_timestamp: datetime
+    ) -> Dict[str, dict]:
+        """Assemble the explain_confidence structure from scoring intermediates."""
+        # --- Metadata explanation ---
         metadata_explanation = {
             "score": scores["metadata_match_score"],
             "matched_count": len(matched_fields),
@@ -293,30 +968,25 @@ class ConfidenceScorer:
         }
 
         # --- Name similarity explanation ---
-        tracker_norm = (tracker_name or "").lower().strip()
-        api_norm = (api_name or "").lower().strip()
-        if tracker_norm and api_norm:
-            edit_dist = levenshtein_distance(tracker_norm, api_norm)
-            max_len = max(len(tracker_norm), len(api_norm))
-        else:
-            edit_dist = 0
-            max_len = 0
+        max_len = max(len(tracker_norm), len(api_norm)) if tracker_norm and api_norm else 0
+
+        name_summary = (
+            "Identical names"
+            if edit_dist == 0 and max_len > 0
+            else f"Edit distance: {edit_dist} character(s) across {max_len}-char names"
+        )
+        if scores["name_similarity"] is None:
+            name_summary += " (not scored: the threshold was settled without it)"
 
         name_explanation = {
             "score": scores["name_similarity"],
             "edit_distance": edit_dist,
             "tracker_length": len(tracker_norm),
             "api_length": len(api_norm),
-            "summary": (
-                "Identical names"
-                if edit_dist == 0 and max_len > 0
-                else f"Edit distance: {edit_dist} character(s) across {max_len}-char names"
-            ),
+            "summary": name_summary,
         }
 
         # --- Data freshness explanation ---
-        hours_old = (datetime.utcnow() - actual_timestamp).total_seconds() / 3600
-
         if hours_old < 4:
             tier_label = "Fresh"
             tier_range = "< 4 hours"
@@ -375,8 +1045,14 @@ class ConfidenceScorer:
                 f"Verify campaign fields: {', '.join(self.required_fields)}"
             )
 
-        # Check name similarity
-        if scores["name_similarity"] < 0.8:
+        # Check name similarity (None: skipped by threshold gating, because
+        # even the closest possible names couldn't lift the score)
+        if scores["name_similarity"] is None:
+            issues.append(
+                "- Name similarity not scored: metadata and freshness keep confidence "
+                "below the threshold whatever the names."
+            )
+        elif scores["name_similarity"] < 0.8:
             issues.append(
                 f"- Low name similarity ({scores['name_similarity']:.1%}). "
                 f"Campaign names differ significantly between tracker and API. "
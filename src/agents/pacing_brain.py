@@ -6,13 +6,13 @@ The agent uses a state machine to route decisions based on variance thresholds
 and data quality confidence scores.
 """
 
-from typing import TypedDict, Optional, Dict, Any, Literal
+from typing import TypedDict, Optional, Dict, Any, Literal, List, Tuple
 from datetime import datetime
 from langgraph.graph import StateGraph, END
 
-from src.models.spend import ReconciledSpend, PacingAlert, Platform
+from src.models.spend import ReconciledSpend, PacingAlert, Platform, SpendRecord
 from src.analyzers.pacing_analyzer import PacingAnalyzer
-from src.agents.confidence_scorer import ConfidenceScorer
+from src.agents.confidence_scorer import ConfidenceResult, ConfidenceScorer
 from src.utils.slack_notifier import SlackNotifier
 from src.utils.audit_logger import AuditLogger
 
@@ -34,6 +34,8 @@ class AgentState(TypedDict):
     root_cause_analysis: Optional[str]
     mitigation_plan: Optional[str]
     alert: Optional[PacingAlert]
+    as_of: datetime
+    confidence_result: Optional[ConfidenceResult]
 
 
 class PacingBrain:
@@ -58,7 +60,10 @@ class PacingBrain:
         internal_tracker,
         slack_webhook: Optional[str] = None,
         audit_logger: Optional[AuditLogger] = None,
-        confidence_threshold: float = CONFIDENCE_THRESHOLD
+        confidence_threshold: float = CONFIDENCE_THRESHOLD,
+        as_of: Optional[datetime] = None,
+        confidence_scorer: Optional[ConfidenceScorer] = None,
+        short_circuit_gating: bool = False
     ):
         """
         Initialize PacingBrain agent.
@@ -69,19 +74,33 @@ class PacingBrain:
             slack_webhook: Optional Slack webhook URL for alerts
             audit_logger: Optional AuditLogger instance
             confidence_threshold: Minimum confidence for autonomous action
+            as_of: Fixed reference time for freshness scoring. If None, each
+                   run()/run_batch() call pins the current UTC time once.
+            confidence_scorer: Optional ConfidenceScorer to share (e.g. with a
+                               warm name-similarity cache across agents)
+            short_circuit_gating: Score only as far as needed to decide the
+                                  confidence threshold, skipping the name
+                                  distance when metadata and freshness settle
+                                  it (routing is unchanged; see
+                                  ConfidenceScorer.score_for_threshold)
         """
         self.platform_api = platform_api
         self.internal_tracker = internal_tracker
         self.confidence_threshold = confidence_threshold
+        self.as_of = as_of
+        self.short_circuit_gating = short_circuit_gating
 
         # Initialize components
         self.analyzer = PacingAnalyzer()
-        self.confidence_scorer = ConfidenceScorer()
+        self.confidence_scorer = confidence_scorer or ConfidenceScorer()
 
         # Initialize utilities
         self.slack_notifier = SlackNotifier(slack_webhook) if slack_webhook else None
         self.audit_logger = audit_logger or AuditLogger()
 
+        # (actual, target) spend records fetched in bulk ahead of run()
+        self._prefetched: Dict[str, Tuple[SpendRecord, SpendRecord]] = {}
+
         # Build the state graph
         self.graph = self._build_graph()
 
@@ -166,20 +185,34 @@ class PacingBrain:
         campaign_id = state["campaign_id"]
 
         try:
-            # Fetch actual spend from platform API
-            actual_spend_record = self.platform_api.get_campaign_spend(campaign_id)
-
-            # Fetch target spend from internal tracker
-            target_spend_record = self.internal_tracker.get_target_spend(campaign_id)
-
-            # Calculate confidence scores
-            confidence_scores = self.confidence_scorer.calculate_confidence(
+            prefetched = self._prefetched.pop(campaign_id, None)
+            if prefetched:
+                actual_spend_record, target_spend_record = prefetched
+            else:
+                # Fetch actual spend from platform API
+                actual_spend_record = self.platform_api.get_campaign_spend(campaign_id)
+
+                # Fetch target spend from internal tracker
+                target_spend_record = self.internal_tracker.get_target_spend(campaign_id)
+
+            # Calculate confidence scores (explanation is deferred until
+            # the escalation path asks for it)
+            scoring_inputs = dict(
                 tracker_name=target_spend_record.campaign_name,
                 api_name=actual_spend_record.campaign_name,
                 tracker_metadata=target_spend_record.metadata,
                 api_metadata=actual_spend_record.metadata,
-                actual_timestamp=actual_spend_record.timestamp
+                actual_timestamp=actual_spend_record.timestamp,
+                as_of=state["as_of"]
             )
+            if self.short_circuit_gating:
+                confidence_result = self.confidence_scorer.score_for_threshold(
+                    threshold=self.confidence_threshold, **scoring_inputs
+                )
+            else:
+                confidence_result = self.confidence_scorer.score_with_explanation(
+                    **scoring_inputs
+                )
 
             # Create reconciled spend object
             reconciled = ReconciledSpend(
@@ -190,12 +223,14 @@ class PacingBrain:
                 actual_spend=actual_spend_record.amount_usd,
                 target_timestamp=target_spend_record.timestamp,
                 actual_timestamp=actual_spend_record.timestamp,
-                metadata_match_score=confidence_scores["metadata_match_score"],
-                name_similarity=confidence_scores["name_similarity"],
-                data_freshness_score=confidence_scores["data_freshness_score"]
+                metadata_match_score=confidence_result["metadata_match_score"],
+                name_similarity=confidence_result["name_similarity"],
+                data_freshness_score=confidence_result["data_freshness_score"],
+                confidence_weights=self.confidence_scorer.confidence_weights
             )
 
             state["reconciled_spend"] = reconciled
+            state["confidence_result"] = confidence_result
 
             # Log reconciliation
             self.audit_logger.log_reconciliation(
@@ -205,7 +240,10 @@ class PacingBrain:
                 confidence_score=reconciled.confidence_score,
                 metadata_match_score=reconciled.metadata_match_score,
                 name_similarity=reconciled.name_similarity,
-                data_freshness_score=reconciled.data_freshness_score
+                data_freshness_score=reconciled.data_freshness_score,
+                as_of=state["as_of"],
+                name_similarity_max=confidence_result.name_similarity_max,
+                confidence_score_max=confidence_result.confidence_score_max
             )
 
         except Exception as e:
@@ -296,6 +334,15 @@ class PacingBrain:
                 self.confidence_threshold
             )
 
+            # Only escalations read the explanation, so only they build it
+            confidence_result = state.get("confidence_result")
+            if confidence_result is not None:
+                details = "\n".join(
+                    f"- {component}: {explanation['summary']}"
+                    for component, explanation in confidence_result.explanation.items()
+                )
+                diagnosis = f"{diagnosis}\n\nScore details:\n{details}"
+
             state["recommendation"] = (
                 f"⚠️ Data quality confidence too low for autonomous action "
                 f"({confidence:.1%}).\n\n"
@@ -565,12 +612,46 @@ class PacingBrain:
     # Public Interface
     # ===================
 
-    def run(self, campaign_id: str) -> PacingAlert:
+    def prefetch(self, campaign_ids: List[str]) -> int:
+        """
+        Fetch actual and target spend for many campaigns in bulk.
+
+        Uses the batch endpoints of the platform API and internal tracker so
+        a whole platform costs a handful of round trips instead of two per
+        campaign. Subsequent run() calls consume the prefetched records;
+        campaigns missing from either batch fall back to per-campaign fetches
+        (and their usual error handling).
+
+        Args:
+            campaign_ids: Campaign identifiers to prefetch
+
+        Returns:
+            Number of campaigns prefetched
+        """
+        if not (
+            hasattr(self.platform_api, "get_campaign_spend_batch") and
+            hasattr(self.internal_tracker, "get_target_spend_batch")
+        ):
+            return 0
+
+        actual_records = self.platform_api.get_campaign_spend_batch(campaign_ids)
+        target_records = self.internal_tracker.get_target_spend_batch(campaign_ids)
+
+        count = 0
+        for campaign_id, actual, target in zip(campaign_ids, actual_records, target_records):
+            if actual is not None and target is not None:
+                self._prefetched[campaign_id] = (actual, target)
+                count += 1
+        return count
+
+    def run(self, campaign_id: str, as_of: Optional[datetime] = None) -> PacingAlert:
         """
         Execute the full pacing workflow for a campaign.
 
         Args:
             campaign_id: Campaign identifier
+            as_of: Reference time for this run (default: the agent's as_of,
+                   else the current UTC time)
 
         Returns:
             PacingAlert with final decision and recommendations
@@ -585,7 +666,9 @@ class PacingBrain:
             requires_human=False,
             root_cause_analysis=None,
             mitigation_plan=None,
-            alert=None
+            alert=None,
+            as_of=as_of or self.as_of or datetime.utcnow(),
+            confidence_result=None
         )
 
         # Run the graph
@@ -593,14 +676,21 @@ class PacingBrain:
 
         return final_state["alert"]
 
-    def run_batch(self, campaign_ids: list) -> list:
+    def run_batch(self, campaign_ids: list, as_of: Optional[datetime] = None) -> list:
         """
         Execute pacing workflow for multiple campaigns.
 
+        All campaigns are scored against one reference time, so freshness
+        tiers can't drift mid-batch.
+
         Args:
             campaign_ids: List of campaign identifiers
+            as_of: Reference time for the batch (default: the agent's as_of,
+                   else the current UTC time)
 
         Returns:
             List of PacingAlert objects
         """
-        return [self.run(campaign_id) for campaign_id in campaign_ids]
+        as_of = as_of or self.as_of or datetime.utcnow()
+        self.prefetch(campaign_ids)
+        return [self.run(campaign_id, as_of=as_of) for campaign_id in campaign_ids]
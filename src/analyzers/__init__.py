@@ -1,7 +1,9 @@
 """Analyzers for variance calculation and anomaly detection."""
 
 from src.analyzers.pacing_analyzer import PacingAnalyzer
+from src.analyzers.decision_replay import DecisionReplay
 
 __all__ = [
     "PacingAnalyzer",
+    "DecisionReplay",
 ]
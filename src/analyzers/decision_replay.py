@@ -0,0 +1,332 @@
+"""
+Replay of logged pacing decisions under alternative thresholds.
+
+Every PacingBrain run logs a reconciliation (target, actual and component
+scores) followed by its decision for the same campaign. DecisionReplay
+rebuilds the reconciliations of an audit log as one ReconciledSpendFrame
+and re-evaluates the routing for the whole history in a vectorized pass:
+- Confidence gate: below confidence_threshold -> "escalate_to_human"
+- Otherwise by severity (PacingAnalyzer.calculate_variance_batch):
+  healthy -> "log_healthy", warning -> "send_alert",
+  critical -> "autonomous_halt"
+
+Logs written with short_circuit_gating skip the name distance whenever
+the other scores settle the confidence gate, logging the name similarity
+as unknown with an upper bound instead. For those rows the confidence is
+only known to lie between the logged lower and upper bounds: a replayed
+gate that falls between them can't be decided from the log, and the row
+is reported as "undecidable" rather than guessed.
+
+Replays have no side effects (no Slack alerts, no pauses, nothing is
+logged), so the log can be loaded once and replayed under as many
+threshold sets as needed, each reported as a diff against the logged
+decisions (see compare()).
+"""
+
+import math
+from array import array
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from src.analyzers.pacing_analyzer import PacingAnalyzer
+from src.models.spend import DEFAULT_CONFIDENCE_WEIGHTS, Platform, ReconciledSpendFrame
+from src.utils.audit_logger import AuditLogger
+
+
+# Decision labels indexed by decision code; codes 0-2 match the severity
+# codes of PacingAnalyzer.SEVERITY_LEVELS
+DECISIONS = np.array([
+    "log_healthy", "send_alert", "autonomous_halt", "escalate_to_human", "not_logged",
+    "undecidable",
+])
+ESCALATE = 3
+NOT_LOGGED = 4  # No recognizable decision followed the reconciliation
+UNDECIDABLE = 5  # Replayed confidence gate falls within a skipped name score's bounds
+
+# Logged decision labels -> decision code (healthy runs log a
+# "healthy_pacing" event instead of an agent_decision)
+DECISION_CODES = {
+    "send_alert": 1,
+    "autonomous_halt": 2,
+    "escalate_to_human": ESCALATE,
+}
+
+# Confidence threshold PacingBrain routes with by default
+CONFIDENCE_THRESHOLD = 0.7
+
+# Reconciliation fields replayed from the log
+SCORE_FIELDS = (
+    "target_spend",
+    "actual_spend",
+    "metadata_match_score",
+    "name_similarity",
+    "data_freshness_score",
+    "confidence_score",
+)
+
+# Upper bounds logged for short-circuited (skipped) name scores
+BOUND_FIELDS = ("name_similarity_max", "confidence_score_max")
+
+
+def _number(value: Any) -> float:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return math.nan
+
+
+@dataclass
+class DecisionReplay:
+    """
+    Logged reconciliations and decisions, ready to replay.
+
+    Campaign names and spend timestamps aren't logged: the frame uses the
+    campaign ID as name and NaT timestamps, which routing doesn't read.
+    Skipped name similarities are NaN in the frame.
+    """
+    frame: ReconciledSpendFrame
+    timestamp: np.ndarray  # object array of logged ISO timestamps
+    confidence_score: np.ndarray  # float64, as logged (NaN if missing)
+    logged_decision: np.ndarray  # int8 decision codes
+    short_circuited: np.ndarray  # bool, True where the name score was skipped
+    name_similarity_max: np.ndarray  # float64 bounds (NaN unless short-circuited)
+    confidence_score_max: np.ndarray  # float64 bounds (NaN unless short-circuited)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    @classmethod
+    def from_audit_log(
+        cls,
+        audit_logger: AuditLogger,
+        start_time: Union[str, datetime, None] = None,
+        end_time: Union[str, datetime, None] = None
+    ) -> "DecisionReplay":
+        """
+        Load the reconciliations of an audit log (and its segments).
+
+        Args:
+            audit_logger: Logger to read from
+            start_time: Only events at or after this time
+            end_time: Only events before this time
+
+        Returns:
+            DecisionReplay with one row per reconciliation, in log order
+        """
+        return cls.from_events(audit_logger.iter_events(start_time=start_time, end_time=end_time))
+
+    @classmethod
+    def from_events(cls, events: Iterable[Dict[str, Any]]) -> "DecisionReplay":
+        """
+        Build a replay from a stream of audit events.
+
+        Each reconciliation is paired with the next agent_decision or
+        healthy_pacing event for the same campaign; reconciliations
+        without target or actual spend are skipped. Short-circuited
+        reconciliations keep their logged bounds.
+
+        Args:
+            events: Audit events, in log order
+
+        Returns:
+            DecisionReplay with one row per reconciliation
+        """
+        columns = {field: array("d") for field in SCORE_FIELDS + BOUND_FIELDS}
+        campaign_ids, timestamps = [], []
+        logged, short_circuited = bytearray(), bytearray()
+        no_bounds = [math.nan] * len(BOUND_FIELDS)
+        pending: Dict[Any, int] = {}  # campaign_id -> row awaiting its decision
+
+        for event in events:
+            event_type = event.get("event_type")
+            campaign_id = event.get("campaign_id")
+            if event_type == "reconciliation":
+                values = [_number(event.get(field)) for field in SCORE_FIELDS]
+                if math.isnan(values[0]) or math.isnan(values[1]):
+                    continue
+                skipped = bool(event.get("short_circuited"))
+                values += [_number(event.get(field)) for field in BOUND_FIELDS] if skipped else no_bounds
+                pending[campaign_id] = len(logged)
+                for column, value in zip(columns.values(), values):
+                    column.append(value)
+                campaign_ids.append(campaign_id)
+                timestamps.append(event.get("timestamp"))
+                logged.append(NOT_LOGGED)
+                short_circuited.append(skipped)
+            elif event_type == "agent_decision":
+                row = pending.pop(campaign_id, None)
+                if row is not None:
+                    logged[row] = DECISION_CODES.get(event.get("decision"), NOT_LOGGED)
+            elif event_type is None and event.get("type") == "healthy_pacing":
+                row = pending.pop(campaign_id, None)
+                if row is not None:
+                    logged[row] = 0
+
+        arrays = {field: np.frombuffer(column, dtype=np.float64) for field, column in columns.items()}
+        campaign_id = np.array(campaign_ids, dtype=object)
+        platforms = {platform.value: platform for platform in Platform}
+        no_time = np.full(len(campaign_ids), np.datetime64("NaT"), dtype="datetime64[us]")
+        frame = ReconciledSpendFrame(
+            campaign_id=campaign_id,
+            campaign_name=campaign_id,
+            platform=np.array(
+                [platforms.get(str(cid).split("_", 1)[0]) for cid in campaign_ids], dtype=object
+            ),
+            target_spend=arrays["target_spend"],
+            actual_spend=arrays["actual_spend"],
+            target_timestamp=no_time,
+            actual_timestamp=no_time,
+            metadata_match_score=arrays["metadata_match_score"],
+            name_similarity=arrays["name_similarity"],
+            data_freshness_score=arrays["data_freshness_score"],
+        )
+        return cls(
+            frame=frame,
+            timestamp=np.array(timestamps, dtype=object),
+            confidence_score=arrays["confidence_score"],
+            logged_decision=np.frombuffer(bytes(logged), dtype=np.int8),
+            short_circuited=np.frombuffer(bytes(short_circuited), dtype=np.bool_),
+            name_similarity_max=arrays["name_similarity_max"],
+            confidence_score_max=arrays["confidence_score_max"],
+        )
+
+    def replay(
+        self,
+        healthy_threshold: float = PacingAnalyzer.HEALTHY_THRESHOLD,
+        warning_threshold: float = PacingAnalyzer.WARNING_THRESHOLD,
+        confidence_threshold: float = CONFIDENCE_THRESHOLD,
+        confidence_weights: Optional[Tuple[float, float, float]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Re-evaluate the routing of every reconciliation.
+
+        Args:
+            healthy_threshold: Maximum variance % for healthy classification
+            warning_threshold: Maximum variance % for warning classification
+            confidence_threshold: Minimum confidence for autonomous action
+            confidence_weights: Recompute confidence from the component
+                                scores with these weights (None: use the
+                                logged confidence_score)
+
+        Returns:
+            Dictionary of arrays aligned with the rows:
+            - variance_pct: Percentage variance from target
+            - severity: "healthy" | "warning" | "critical"
+            - confidence: Confidence routed on (a lower bound for
+                          short-circuited rows)
+            - confidence_max: Upper bound on the confidence (inf where a
+                              short-circuited row lacks its bound)
+            - decision: Decision codes (index into DECISIONS); UNDECIDABLE
+                        where the confidence threshold lies between the
+                        bounds of a short-circuited row
+        """
+        analyzer = PacingAnalyzer(healthy_threshold, warning_threshold)
+        frame = replace(self.frame, confidence_weights=confidence_weights or DEFAULT_CONFIDENCE_WEIGHTS)
+        result = analyzer.calculate_variance_batch(frame)
+
+        # Rows missing the preferred confidence fall back to the other one;
+        # rows missing both escalate
+        recomputed = result["confidence"]
+        skipped = self.short_circuited
+        if confidence_weights is None:
+            confidence = np.where(np.isnan(self.confidence_score), recomputed, self.confidence_score)
+            bound = self.confidence_score_max
+            upper = np.where(skipped, bound, confidence)
+        else:
+            confidence = np.where(np.isnan(recomputed), self.confidence_score, recomputed)
+            # Skipped names count as 0.0 in the frame; their bound gives the upper end
+            bound = self.name_similarity_max
+            best = replace(frame, name_similarity=np.where(skipped, bound, 0.0))
+            upper = np.where(skipped, best.confidence_score, confidence)
+        upper[skipped & np.isnan(bound)] = np.inf
+
+        severity = result["severity"]
+        decision = np.zeros(len(self), dtype=np.int8)
+        decision[severity == "warning"] = 1
+        decision[severity == "critical"] = 2
+        passes = confidence >= confidence_threshold
+        decision[~passes & skipped & (upper >= confidence_threshold)] = UNDECIDABLE
+        decision[~passes & ~(upper >= confidence_threshold)] = ESCALATE
+        return {
+            "variance_pct": result["variance_pct"],
+            "severity": severity,
+            "confidence": confidence,
+            "confidence_max": upper,
+            "decision": decision,
+        }
+
+    def compare(
+        self,
+        healthy_threshold: float = PacingAnalyzer.HEALTHY_THRESHOLD,
+        warning_threshold: float = PacingAnalyzer.WARNING_THRESHOLD,
+        confidence_threshold: float = CONFIDENCE_THRESHOLD,
+        confidence_weights: Optional[Tuple[float, float, float]] = None,
+        max_diffs: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Replay under the given thresholds and diff against the logged decisions.
+
+        Args:
+            healthy_threshold: Maximum variance % for healthy classification
+            warning_threshold: Maximum variance % for warning classification
+            confidence_threshold: Minimum confidence for autonomous action
+            confidence_weights: See replay()
+            max_diffs: Maximum changed rows to list in "diffs"
+
+        Returns:
+            Dictionary with the thresholds, "reconciliations", decision
+            counts ("logged", "replayed"), "changed" (rows whose logged
+            decision differs from the replayed one), "not_logged",
+            "undecidable" (short-circuited rows the replay can't route,
+            never counted as changed), "transitions" ("logged -> replayed": count, changed rows only)
+            and "diffs" (the first max_diffs changed rows, in log order)
+        """
+        result = self.replay(
+            healthy_threshold, warning_threshold, confidence_threshold, confidence_weights
+        )
+        decision = result["decision"]
+        logged = self.logged_decision
+        changed = (logged != NOT_LOGGED) & (decision != UNDECIDABLE) & (decision != logged)
+        num_decisions = len(DECISIONS)
+
+        def counts(codes: np.ndarray) -> Dict[str, int]:
+            totals = np.bincount(codes, minlength=num_decisions)
+            return {str(label): int(count) for label, count in zip(DECISIONS, totals) if count}
+
+        transitions = np.bincount(
+            logged[changed].astype(np.intp) * num_decisions + decision[changed],
+            minlength=num_decisions * num_decisions
+        )
+        diffs = [
+            {
+                "campaign_id": self.frame.campaign_id[row],
+                "timestamp": self.timestamp[row],
+                "variance_pct": float(result["variance_pct"][row]),
+                "confidence_score": float(result["confidence"][row]),
+                "severity": str(result["severity"][row]),
+                "logged": str(DECISIONS[logged[row]]),
+                "replayed": str(DECISIONS[decision[row]]),
+            }
+            for row in np.flatnonzero(changed)[:max_diffs]
+        ]
+        return {
+            "thresholds": {
+                "healthy_threshold": healthy_threshold,
+                "warning_threshold": warning_threshold,
+                "confidence_threshold": confidence_threshold,
+                "confidence_weights": list(confidence_weights) if confidence_weights else None,
+            },
+            "reconciliations": len(self),
+            "logged": counts(logged),
+            "replayed": counts(decision),
+            "changed": int(changed.sum()),
+            "not_logged": int((logged == NOT_LOGGED).sum()),
+            "undecidable": int((decision == UNDECIDABLE).sum()),
+            "transitions": {
+                f"{DECISIONS[code // num_decisions]} -> {DECISIONS[code % num_decisions]}": int(count)
+                for code, count in enumerate(transitions) if count
+            },
+            "diffs": diffs,
+        }
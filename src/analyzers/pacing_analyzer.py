@@ -6,7 +6,10 @@ campaign pacing variance into severity levels and generates recommendations.
 """
 
 from typing import Dict, Any
-from src.models.spend import ReconciledSpend
+
+import numpy as np
+
+from src.models.spend import ReconciledSpend, ReconciledSpendFrame
 
 
 class PacingAnalyzer:
@@ -19,6 +22,9 @@ class PacingAnalyzer:
     - Critical: > 25% variance or zero delivery
     """
 
+    # Severity labels indexed by severity code
+    SEVERITY_LEVELS = np.array(["healthy", "warning", "critical"])
+
     # Variance thresholds (percentage)
     HEALTHY_THRESHOLD = 10.0  # < 10% variance
     WARNING_THRESHOLD = 25.0  # 10-25% variance
@@ -94,6 +100,45 @@ class PacingAnalyzer:
             "reason": reason
         }
 
+    def calculate_variance_batch(self, frame: ReconciledSpendFrame) -> Dict[str, np.ndarray]:
+        """
+        Calculate pacing variance and classify severity for a whole frame.
+
+        Vectorized equivalent of calculate_variance: every output column
+        matches the scalar result for the same row.
+
+        Args:
+            frame: Columnar batch of reconciled spend
+
+        Returns:
+            Dictionary of arrays aligned with the frame rows:
+            - variance_pct: Percentage variance from target
+            - variance_amount: Dollar amount of variance
+            - severity: "healthy" | "warning" | "critical"
+            - is_zero_delivery: Boolean flags
+            - confidence: Confidence score from reconciliation
+            - spend_direction: "overspending" | "underspending" | "zero_delivery" | "on_target"
+        """
+        variance = frame.pacing_variance
+        is_zero_delivery = frame.is_zero_delivery
+
+        # Zero delivery is always critical and reported as 100% variance
+        variance[is_zero_delivery] = 100.0
+
+        severity_code = np.full(len(frame), 2, dtype=np.int8)
+        severity_code[variance < self.warning_threshold] = 1
+        severity_code[variance < self.healthy_threshold] = 0
+        severity_code[is_zero_delivery] = 2
+
+        return {
+            "variance_pct": variance,
+            "variance_amount": frame.variance_amount,
+            "severity": self.SEVERITY_LEVELS[severity_code],
+            "is_zero_delivery": is_zero_delivery,
+            "confidence": frame.confidence_score,
+            "spend_direction": frame.spend_direction,
+        }
+
     def generate_recommendation(
         self,
         variance_result: Dict[str, Any],
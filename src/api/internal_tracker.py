@@ -6,9 +6,16 @@ for campaigns. In production, this would query a database or data warehouse.
 """
 
 import random
+import time
+import zlib
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.models.metadata import MetadataVocabulary
 from src.models.spend import Platform, DataSource, SpendRecord
+from src.api.mock_platform_api import platform_seed_sequence
 
 
 class MockInternalTracker:
@@ -19,15 +26,62 @@ class MockInternalTracker:
     Simulates daily refresh cycle (24 hours) typical of internal systems.
     """
 
-    def __init__(self, target_data: Optional[Dict[str, Dict]] = None):
+    # Spawn key separating the dirty-selection stream from catalog shards
+    SYNC_STREAM_KEY = zlib.crc32(b"tracker_sync")
+
+    # Maximum campaigns returned by one batch query
+    MAX_BATCH_SIZE = 1000
+
+    def __init__(
+        self,
+        target_data: Optional[Dict[str, Dict]] = None,
+        request_latency_ms: float = 0.0,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        vocabulary: Optional[MetadataVocabulary] = None,
+        as_of: Optional[datetime] = None
+    ):
         """
         Initialize internal tracker with optional target data.
 
         Args:
             target_data: Optional dictionary mapping campaign_id to target info.
                         If None, generates targets dynamically based on campaign_id.
+            request_latency_ms: Simulated round-trip latency per tracker query
+            max_batch_size: Maximum campaigns per batch query
+            vocabulary: Optional run-scoped metadata vocabulary (shared with
+                        the platform APIs); target metadata is encoded with
+                        it at ingestion
+            as_of: Reference time that record timestamps and campaign dates
+                   are generated relative to (default: the current UTC time
+                   at each fetch), so a run pinned to an as_of reproduces
+                   the same freshness scores
         """
         self.target_data = target_data or {}
+        self.as_of = as_of
+        self.request_latency_ms = request_latency_ms
+        self.max_batch_size = max_batch_size
+        self.request_count = 0
+        self.vocabulary = None
+
+        if vocabulary is not None:
+            self.encode_metadata(vocabulary)
+
+    def encode_metadata(self, vocabulary: MetadataVocabulary):
+        """
+        Encode stored and future target metadata with a run-scoped vocabulary.
+
+        Args:
+            vocabulary: Vocabulary shared with the platform APIs
+        """
+        self.vocabulary = vocabulary
+        for data in self.target_data.values():
+            data["metadata"] = self._encode_metadata(data.get("metadata", {}))
+
+    def _encode_metadata(self, metadata: Dict) -> Dict:
+        """Encode and intern metadata with the vocabulary, if one is set."""
+        if self.vocabulary is None:
+            return metadata
+        return self.vocabulary.intern(metadata)
 
     def get_target_spend(self, campaign_id: str) -> SpendRecord:
         """
@@ -42,6 +96,41 @@ class MockInternalTracker:
         Raises:
             ValueError: If campaign not found and can't be inferred
         """
+        self._simulate_request()
+        return self._lookup_target(campaign_id)
+
+    def get_target_spend_batch(self, campaign_ids: List[str]) -> List[Optional[SpendRecord]]:
+        """
+        Fetch target spend for many campaigns in bulk.
+
+        Issues one query per max_batch_size campaigns instead of one per
+        campaign.
+
+        Args:
+            campaign_ids: Campaign identifiers to fetch
+
+        Returns:
+            List of SpendRecords aligned with campaign_ids, with None for
+            campaigns that are unknown and can't be inferred
+        """
+        records = []
+        for start in range(0, len(campaign_ids), self.max_batch_size):
+            self._simulate_request()
+            for campaign_id in campaign_ids[start:start + self.max_batch_size]:
+                try:
+                    records.append(self._lookup_target(campaign_id))
+                except ValueError:
+                    records.append(None)
+        return records
+
+    def _simulate_request(self):
+        """Count one tracker round trip and wait out the simulated latency."""
+        self.request_count += 1
+        if self.request_latency_ms > 0:
+            time.sleep(self.request_latency_ms / 1000)
+
+    def _lookup_target(self, campaign_id: str) -> SpendRecord:
+        """Resolve target spend from explicit data or the campaign ID."""
         # If we have explicit target data, use it
         if campaign_id in self.target_data:
             data = self.target_data[campaign_id]
@@ -50,6 +139,10 @@ class MockInternalTracker:
         # Otherwise, generate target dynamically based on campaign_id
         return self._generate_target_from_id(campaign_id)
 
+    def _now(self) -> datetime:
+        """Reference time for generated timestamps."""
+        return self.as_of or datetime.utcnow()
+
     def _create_spend_record(
         self,
         campaign_id: str,
@@ -67,7 +160,7 @@ class MockInternalTracker:
         """
         # Tracker updates daily (24-hour refresh cycle)
         # Simulate data that's 6-18 hours old
-        timestamp = datetime.utcnow() - timedelta(hours=data.get("hours_old", 12))
+        timestamp = self._now() - timedelta(hours=data.get("hours_old", 12))
 
         return SpendRecord(
             campaign_id=campaign_id,
@@ -111,15 +204,16 @@ class MockInternalTracker:
         target = base_target + (index * 500)  # Vary by index
 
         # Generate metadata (simplified version)
-        metadata = {
+        now = self._now()
+        metadata = self._encode_metadata({
             "market": "EU",
             "product": "LEGO_City",
-            "start_date": (datetime.utcnow() - timedelta(days=14)).strftime("%Y-%m-%d"),
-            "end_date": (datetime.utcnow() + timedelta(days=30)).strftime("%Y-%m-%d"),
-        }
+            "start_date": (now - timedelta(days=14)).strftime("%Y-%m-%d"),
+            "end_date": (now + timedelta(days=30)).strftime("%Y-%m-%d"),
+        })
 
         # Tracker data is typically 12 hours old (daily refresh, queried mid-day)
-        timestamp = datetime.utcnow() - timedelta(hours=12)
+        timestamp = now - timedelta(hours=12)
 
         return SpendRecord(
             campaign_id=campaign_id,
@@ -171,7 +265,7 @@ class MockInternalTracker:
         """
         self.target_data[campaign_id] = {
             "target_spend": target_spend,
-            "metadata": metadata or {},
+            "metadata": self._encode_metadata(metadata or {}),
             "platform": platform.value if platform else self._infer_platform(campaign_id),
             "hours_old": 12,  # Default to 12 hours old
         }
@@ -195,15 +289,25 @@ class MockInternalTracker:
         mismatches (wrong name or metadata) for a subset of campaigns, causing
         low confidence scores and human escalation — demonstrating safety guardrails.
 
+        Dirty selection uses a generator local to this call, split per platform,
+        so syncing several platforms (in any order or concurrently) gives the
+        same result as syncing each one alone.
+
         Args:
             platform_api: MockPlatformAPI instance to sync from
             dirty_ratio: Fraction of campaigns with intentional mismatches (default 0.15)
-            seed: Optional random seed for reproducibility of dirty selection
+            seed: Optional random seed for reproducibility of dirty selection.
+                  If None, derived from the platform API's own seed sequence.
         """
         if seed is not None:
-            rng = random.Random(seed)
+            seed_sequence = platform_seed_sequence(seed, platform_api.platform)
         else:
-            rng = random.Random()
+            seed_sequence = platform_api.seed_sequence
+
+        rng = random.Random(int(np.random.SeedSequence(
+            entropy=seed_sequence.entropy,
+            spawn_key=seed_sequence.spawn_key + (self.SYNC_STREAM_KEY,)
+        ).generate_state(1, np.uint64)[0]))
 
         for campaign in platform_api.campaigns:
             campaign_id = campaign["campaign_id"]
@@ -225,7 +329,7 @@ class MockInternalTracker:
                 self.target_data[campaign_id] = {
                     "target_spend": campaign["target"],
                     "campaign_name": dirty_name,
-                    "metadata": dirty_metadata,
+                    "metadata": self._encode_metadata(dirty_metadata),
                     "platform": campaign["metadata"]["platform"],
                     "hours_old": 12,
                 }
@@ -239,7 +343,7 @@ class MockInternalTracker:
                 self.target_data[campaign_id] = {
                     "target_spend": campaign["target"],
                     "campaign_name": name,
-                    "metadata": dict(campaign["metadata"]),
+                    "metadata": self._encode_metadata(dict(campaign["metadata"])),
                     "platform": campaign["metadata"]["platform"],
                     "hours_old": rng.uniform(6, 18),
                 }
@@ -5,12 +5,38 @@ Simulates realistic platform API responses with various variance scenarios
 for testing the pacing agent without requiring real API credentials.
 """
 
-import random
-from datetime import datetime, timedelta
+import time
+import zlib
+from datetime import datetime
 from typing import List, Dict, Optional
+
+import numpy as np
+
+from src.models.metadata import MetadataVocabulary
 from src.models.spend import Platform, DataSource, SpendRecord
 
 
+def platform_seed_sequence(seed: Optional[int], platform: Platform) -> np.random.SeedSequence:
+    """
+    Derive an independent seed sequence for one platform.
+
+    The platform is mixed in through a stable hash of its value, so the
+    result does not depend on construction order or on which process
+    builds the platform.
+
+    Args:
+        seed: Base random seed (None draws fresh OS entropy)
+        platform: Platform the sequence belongs to
+
+    Returns:
+        SeedSequence whose children can be spawned per shard
+    """
+    return np.random.SeedSequence(
+        entropy=seed,
+        spawn_key=(zlib.crc32(platform.value.encode()),)
+    )
+
+
 class MockPlatformAPI:
     """
     Simulated platform API with realistic behavior.
@@ -32,7 +58,38 @@ class MockPlatformAPI:
         "zero_delivery": [0.0],  # Zero spend
     }
 
-    def __init__(self, platform: Platform, num_campaigns: int = 10, seed: Optional[int] = None):
+    # Distribution of scenarios (adjust for testing needs)
+    SCENARIO_DISTRIBUTION = (
+        ["healthy"] * 4 +  # 40% healthy
+        ["warning_under", "warning_over"] * 2 +  # 40% warning
+        ["critical_under", "critical_over"] +  # 20% critical
+        ["zero_delivery"]  # 10% zero delivery
+    )
+
+    MARKETS = ["EU", "NA", "APAC"]
+    PRODUCTS = [
+        "LEGO_City", "LEGO_Friends", "LEGO_Technic",
+        "LEGO_StarWars", "LEGO_Harry_Potter"
+    ]
+    CHANNELS = ["Search", "Display", "Video", "Social"]
+
+    # Campaigns per generation shard. Each shard draws from its own child
+    # seed, so a catalog is identical however its shards are scheduled.
+    SHARD_SIZE = 100_000
+
+    # Maximum campaigns returned by one batch request (simulated page size)
+    MAX_BATCH_SIZE = 1000
+
+    def __init__(
+        self,
+        platform: Platform,
+        num_campaigns: int = 10,
+        seed: Optional[int] = None,
+        as_of: Optional[datetime] = None,
+        request_latency_ms: float = 0.0,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        vocabulary: Optional[MetadataVocabulary] = None
+    ):
         """
         Initialize mock API for a specific platform.
 
@@ -40,101 +97,251 @@ class MockPlatformAPI:
             platform: Platform enum (GOOGLE, META, etc.)
             num_campaigns: Number of mock campaigns to generate
             seed: Random seed for reproducibility
+            as_of: Reference time for generated dates (default: current UTC time)
+            request_latency_ms: Simulated round-trip latency per API request
+            max_batch_size: Maximum campaigns per batch request
+            vocabulary: Optional run-scoped metadata vocabulary; campaign
+                        metadata is encoded with it at ingestion
         """
         self.platform = platform
         self.num_campaigns = num_campaigns
+        self.seed = seed
+        self.as_of = as_of or datetime.utcnow()
+        self.request_latency_ms = request_latency_ms
+        self.max_batch_size = max_batch_size
+        self.request_count = 0
 
-        if seed is not None:
-            random.seed(seed)
+        # Instance-scoped seed, split per platform so that platforms built
+        # with the same seed (in any order, thread or process) are
+        # independent of each other and of the global random state
+        self.seed_sequence = platform_seed_sequence(seed, platform)
 
         self.campaigns = self._generate_mock_campaigns()
 
-    def _generate_mock_campaigns(self) -> List[Dict]:
-        """
-        Generate realistic campaign data with various spend patterns.
+        # Index campaigns by ID for O(1) lookup and mutation. Entries share
+        # the same dict objects as self.campaigns, so status updates made
+        # through either view stay consistent.
+        self._campaigns_by_id: Dict[str, Dict] = {
+            c["campaign_id"]: c for c in self.campaigns
+        }
 
-        Returns:
-            List of campaign dictionaries with spend, metadata, and status
+        if vocabulary is not None:
+            self.encode_metadata(vocabulary)
+
+    def encode_metadata(self, vocabulary: MetadataVocabulary):
         """
-        campaigns = []
-
-        # Distribution of scenarios (adjust for testing needs)
-        scenario_distribution = (
-            ["healthy"] * 4 +  # 40% healthy
-            ["warning_under", "warning_over"] * 2 +  # 40% warning
-            ["critical_under", "critical_over"] +  # 20% critical
-            ["zero_delivery"]  # 10% zero delivery
-        )
+        Encode every campaign's metadata with a run-scoped vocabulary.
 
-        for i in range(self.num_campaigns):
-            # Select variance scenario
-            scenario = random.choice(scenario_distribution)
-            variance_factor = random.choice(self.VARIANCE_SCENARIOS[scenario])
+        Spend records returned afterwards carry EncodedMetadata, so
+        confidence scoring compares integer codes, and campaigns with
+        identical metadata share one interned instance. Call this in the
+        process that owns the vocabulary (e.g. after a catalog is built in
+        a worker).
 
-            # Generate target and actual spend
-            target = random.uniform(1000, 15000)
-            actual = target * variance_factor
+        Args:
+            vocabulary: Vocabulary shared with the internal tracker
+        """
+        for campaign in self.campaigns:
+            campaign["metadata"] = vocabulary.intern(campaign["metadata"])
 
-            # Generate realistic metadata
-            market = random.choice(["EU", "NA", "APAC"])
-            product = random.choice([
-                "LEGO_City", "LEGO_Friends", "LEGO_Technic",
-                "LEGO_StarWars", "LEGO_Harry_Potter"
-            ])
+    def _generate_mock_campaigns(self) -> List[Dict]:
+        """
+        Generate realistic campaign data with various spend patterns.
 
-            # Campaign start/end dates
-            start_date = datetime.utcnow() - timedelta(days=random.randint(7, 30))
-            end_date = start_date + timedelta(days=random.randint(14, 60))
+        Draws all campaign attributes as arrays in one pass (see
+        generate_campaign_columns) and then materializes the per-campaign
+        dictionaries used by the accessors.
 
-            # Determine status
-            status = "active" if actual > 0 else "paused"
+        Returns:
+            List of campaign dictionaries with spend, metadata, and status
+        """
+        columns = self.generate_shard_columns(self.num_campaigns)
 
-            # Last updated (simulate API refresh cycle of 4 hours)
-            last_updated = datetime.utcnow() - timedelta(
-                hours=random.randint(1, 8)
-            )
+        platform = self.platform.value
+        last_updated = columns["last_updated"].astype("datetime64[us]").tolist()
 
-            campaigns.append({
-                "campaign_id": f"{self.platform.value}_{i:03d}",
-                "campaign_name": self._generate_campaign_name(market, product, i),
-                "spend": actual,
+        return [
+            {
+                "campaign_id": campaign_id,
+                "campaign_name": name,
+                "spend": spend,
                 "target": target,
                 "status": status,
-                "last_updated": last_updated,
+                "last_updated": updated,
                 "metadata": {
                     "market": market,
                     "product": product,
-                    "start_date": start_date.strftime("%Y-%m-%d"),
-                    "end_date": end_date.strftime("%Y-%m-%d"),
-                    "platform": self.platform.value,
+                    "start_date": start_date,
+                    "end_date": end_date,
+                    "platform": platform,
                 },
                 "scenario": scenario,  # For testing/debugging
-            })
+            }
+            for (
+                campaign_id, name, spend, target, status, updated,
+                market, product, start_date, end_date, scenario
+            ) in zip(
+                columns["campaign_id"].tolist(),
+                columns["campaign_name"].tolist(),
+                columns["spend"].tolist(),
+                columns["target"].tolist(),
+                columns["status"].tolist(),
+                last_updated,
+                columns["market"].tolist(),
+                columns["product"].tolist(),
+                columns["start_date"].tolist(),
+                columns["end_date"].tolist(),
+                columns["scenario"].tolist(),
+            )
+        ]
+
+    def generate_shard_columns(
+        self,
+        num_campaigns: int,
+        shards: Optional[List[int]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Generate catalog columns shard by shard from per-shard child seeds.
 
-        return campaigns
+        Shard i covers campaign indices [i * SHARD_SIZE, (i + 1) * SHARD_SIZE)
+        and draws from its own generator, so any subset of shards can be
+        generated independently (e.g. in separate processes) and concatenated
+        into the same columns a single serial call would produce.
 
-    def _generate_campaign_name(self, market: str, product: str, index: int) -> str:
+        Args:
+            num_campaigns: Total number of campaigns in the catalog
+            shards: Shard indices to generate (default: all shards)
+
+        Returns:
+            Dictionary of column arrays covering the requested shards
         """
-        Generate realistic campaign name with LEGO naming conventions.
+        num_shards = -(-num_campaigns // self.SHARD_SIZE)
+        if shards is None:
+            shards = range(num_shards)
+
+        parts = []
+        for shard in shards:
+            start = shard * self.SHARD_SIZE
+            size = min(self.SHARD_SIZE, num_campaigns - start)
+            rng = np.random.default_rng(np.random.SeedSequence(
+                entropy=self.seed_sequence.entropy,
+                spawn_key=self.seed_sequence.spawn_key + (shard,)
+            ))
+            parts.append(
+                self.generate_campaign_columns(size, rng, self.as_of, start_index=start)
+            )
+
+        if not parts:
+            return self.generate_campaign_columns(0, np.random.default_rng(0), self.as_of)
+        if len(parts) == 1:
+            return parts[0]
+        return {key: np.concatenate([p[key] for p in parts]) for key in parts[0]}
+
+    def generate_campaign_columns(
+        self,
+        num_campaigns: int,
+        rng: np.random.Generator,
+        now: Optional[datetime] = None,
+        start_index: int = 0
+    ) -> Dict[str, np.ndarray]:
+        """
+        Generate a synthetic campaign catalog as NumPy column arrays.
+
+        Scenarios, variance factors, targets, markets, products, dates and
+        names are drawn as whole arrays, so large load-test catalogs can be
+        built without a per-campaign Python loop. The scenario distribution
+        matches SCENARIO_DISTRIBUTION and output is reproducible for a given
+        generator state.
 
         Args:
-            market: Market identifier (EU, NA, APAC)
-            product: Product line
-            index: Campaign index
+            num_campaigns: Number of campaigns to generate
+            rng: NumPy random generator driving all draws
+            now: Reference time for dates (default: current UTC time)
+            start_index: Index of the first campaign (for IDs and names)
 
         Returns:
-            Campaign name string
+            Dictionary of equal-length arrays keyed by campaign field
         """
-        quarter = f"Q{random.randint(1, 4)}"
-        year = "2026"
-        channel = random.choice(["Search", "Display", "Video", "Social"])
+        n = num_campaigns
+        now = now or datetime.utcnow()
+
+        # Scenario and variance factor: flatten the per-scenario factor lists
+        # into one table and index it by scenario offset + factor position
+        scenario_names = list(self.VARIANCE_SCENARIOS)
+        factor_table = np.array(
+            [f for name in scenario_names for f in self.VARIANCE_SCENARIOS[name]]
+        )
+        factor_counts = np.array([len(self.VARIANCE_SCENARIOS[name]) for name in scenario_names])
+        factor_offsets = np.concatenate(([0], np.cumsum(factor_counts)[:-1]))
 
-        # Sometimes add variation for testing name similarity
-        if random.random() < 0.2:
-            # Add typo or variation
-            product = product.replace("_", " ")  # "LEGO City" vs "LEGO_City"
+        distribution = np.array(
+            [scenario_names.index(name) for name in self.SCENARIO_DISTRIBUTION]
+        )
+        scenario_codes = distribution[rng.integers(0, len(distribution), size=n)]
+        factor_positions = (
+            rng.random(n) * factor_counts[scenario_codes]
+        ).astype(np.int64)
+        variance_factor = factor_table[factor_offsets[scenario_codes] + factor_positions]
+
+        # Target and actual spend
+        target = rng.uniform(1000, 15000, size=n)
+        actual = target * variance_factor
+
+        # Metadata
+        market_codes = rng.integers(0, len(self.MARKETS), size=n)
+        product_codes = rng.integers(0, len(self.PRODUCTS), size=n)
+
+        # Campaign start/end dates, as day offsets from today rendered via a
+        # small lookup table of date strings
+        start_offset = -rng.integers(7, 31, size=n)
+        end_offset = start_offset + rng.integers(14, 61, size=n)
+        today = np.datetime64(now.date(), "D")
+        date_table = (today + np.arange(-30, 61).astype("timedelta64[D]")).astype(str)
+
+        # Last updated (simulate API refresh cycle of 4 hours)
+        last_updated = np.datetime64(now, "us") - rng.integers(1, 9, size=n).astype(
+            "timedelta64[h]"
+        )
+
+        # Campaign names with LEGO naming conventions; 20% of names use a
+        # spaced product variant for testing name similarity. Every name
+        # prefix combination is rendered once and indexed by a combined code.
+        quarter_codes = rng.integers(0, 4, size=n)
+        channel_codes = rng.integers(0, len(self.CHANNELS), size=n)
+        spaced_product = (rng.random(n) < 0.2).astype(np.int64)
+
+        name_table = np.array([
+            f"LEGO_{market}_{product.replace('_', ' ') if spaced else product}"
+            f"_Q{quarter + 1}_2026_{channel}_"
+            for market in self.MARKETS
+            for product in self.PRODUCTS
+            for spaced in (0, 1)
+            for quarter in range(4)
+            for channel in self.CHANNELS
+        ])
+        name_codes = (
+            (((market_codes * len(self.PRODUCTS) + product_codes) * 2
+              + spaced_product) * 4 + quarter_codes) * len(self.CHANNELS)
+            + channel_codes
+        )
+        index = np.char.zfill(np.arange(start_index, start_index + n).astype(str), 3)
 
-        return f"LEGO_{market}_{product}_{quarter}_{year}_{channel}_{index:03d}"
+        markets = np.array(self.MARKETS)
+        products = np.array(self.PRODUCTS)
+
+        return {
+            "campaign_id": np.char.add(f"{self.platform.value}_", index),
+            "campaign_name": np.char.add(name_table[name_codes], index),
+            "scenario": np.array(scenario_names)[scenario_codes],
+            "spend": actual,
+            "target": target,
+            "status": np.where(actual > 0, "active", "paused"),
+            "last_updated": last_updated,
+            "market": markets[market_codes],
+            "product": products[product_codes],
+            "start_date": date_table[start_offset + 30],
+            "end_date": date_table[end_offset + 30],
+        }
 
     def get_campaign_spend(self, campaign_id: str) -> SpendRecord:
         """
@@ -149,16 +356,26 @@ class MockPlatformAPI:
         Raises:
             ValueError: If campaign not found
         """
-        campaign = next(
-            (c for c in self.campaigns if c["campaign_id"] == campaign_id),
-            None
-        )
+        self._simulate_request()
+        campaign = self._campaigns_by_id.get(campaign_id)
 
         if not campaign:
             raise ValueError(
                 f"Campaign {campaign_id} not found in {self.platform.value} platform"
             )
 
+        return self._to_spend_record(campaign)
+
+    def _to_spend_record(self, campaign: Dict) -> SpendRecord:
+        """
+        Build a SpendRecord from a stored campaign dictionary.
+
+        Args:
+            campaign: Campaign dictionary from the campaign store
+
+        Returns:
+            SpendRecord with actual spend data
+        """
         return SpendRecord(
             campaign_id=campaign["campaign_id"],
             campaign_name=campaign["campaign_name"],
@@ -170,6 +387,28 @@ class MockPlatformAPI:
             metadata=campaign["metadata"]
         )
 
+    def get_campaign_spend_batch(self, campaign_ids: List[str]) -> List[Optional[SpendRecord]]:
+        """
+        Fetch spend for many campaigns in bulk.
+
+        Issues one request per max_batch_size campaigns instead of one per
+        campaign.
+
+        Args:
+            campaign_ids: Campaign identifiers to fetch
+
+        Returns:
+            List of SpendRecords aligned with campaign_ids, with None for
+            campaigns not found on this platform
+        """
+        records = []
+        for start in range(0, len(campaign_ids), self.max_batch_size):
+            self._simulate_request()
+            for campaign_id in campaign_ids[start:start + self.max_batch_size]:
+                campaign = self._campaigns_by_id.get(campaign_id)
+                records.append(self._to_spend_record(campaign) if campaign else None)
+        return records
+
     def get_all_campaigns(self) -> List[SpendRecord]:
         """
         Fetch spend for all campaigns.
@@ -177,10 +416,15 @@ class MockPlatformAPI:
         Returns:
             List of SpendRecord objects
         """
-        return [
-            self.get_campaign_spend(c["campaign_id"])
-            for c in self.campaigns
-        ]
+        for _ in range(0, len(self.campaigns), self.max_batch_size):
+            self._simulate_request()
+        return [self._to_spend_record(c) for c in self.campaigns]
+
+    def _simulate_request(self):
+        """Count one API round trip and wait out the simulated latency."""
+        self.request_count += 1
+        if self.request_latency_ms > 0:
+            time.sleep(self.request_latency_ms / 1000)
 
     def pause_campaign(self, campaign_id: str) -> bool:
         """
@@ -195,10 +439,7 @@ class MockPlatformAPI:
         Returns:
             True if successfully paused, False if not found
         """
-        campaign = next(
-            (c for c in self.campaigns if c["campaign_id"] == campaign_id),
-            None
-        )
+        campaign = self._campaigns_by_id.get(campaign_id)
 
         if campaign:
             campaign["status"] = "paused"
@@ -220,10 +461,7 @@ class MockPlatformAPI:
         Returns:
             True if successfully resumed, False if not found
         """
-        campaign = next(
-            (c for c in self.campaigns if c["campaign_id"] == campaign_id),
-            None
-        )
+        campaign = self._campaigns_by_id.get(campaign_id)
 
         if campaign:
             campaign["status"] = "active"
@@ -245,10 +483,7 @@ class MockPlatformAPI:
         Returns:
             Status string ("active" or "paused") or None if not found
         """
-        campaign = next(
-            (c for c in self.campaigns if c["campaign_id"] == campaign_id),
-            None
-        )
+        campaign = self._campaigns_by_id.get(campaign_id)
         return campaign["status"] if campaign else None
 
     def list_campaign_ids(self) -> List[str]:
@@ -5,13 +5,18 @@ from src.models.spend import (
     DataSource,
     SpendRecord,
     ReconciledSpend,
+    ReconciledSpendFrame,
     PacingAlert,
 )
+from src.models.metadata import EncodedMetadata, MetadataVocabulary
 
 __all__ = [
     "Platform",
     "DataSource",
     "SpendRecord",
     "ReconciledSpend",
+    "ReconciledSpendFrame",
     "PacingAlert",
+    "EncodedMetadata",
+    "MetadataVocabulary",
 ]
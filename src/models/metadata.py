@@ -0,0 +1,251 @@
+"""
+Dictionary encoding for campaign metadata.
+
+Market, product and date values come from tiny vocabularies, yet metadata
+matching compares them as lowercased strings for every field of every
+pair. A MetadataVocabulary shared by one run interns each normalized value
+into a small integer code once, when records are ingested, so matching
+becomes integer comparison (and vectorizes across a batch). Whole metadata
+dicts can be interned too, so records with identical metadata share one
+read-only instance.
+"""
+
+from itertools import chain
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Fields encoded by default (the fields ConfidenceScorer matches on)
+DEFAULT_FIELDS = ("market", "product", "start_date", "end_date")
+
+
+def _typed_key(value: Any) -> Any:
+    """
+    Hashable key that tells equal values of different types apart.
+
+    True, 1 and 1.0 are equal dict keys but normalize to "true", "1" and
+    "1.0", so raw-value caches key them as (type, value) instead; strings
+    key as themselves.
+    """
+    if value.__class__ is str:
+        return value
+    if isinstance(value, tuple):
+        return (tuple, tuple(_typed_key(item) for item in value))
+    if isinstance(value, frozenset):
+        return (frozenset, frozenset(_typed_key(item) for item in value))
+    return (value.__class__, value)
+
+
+class EncodedMetadata(dict):
+    """
+    Metadata dict carrying the integer codes of its vocabulary fields.
+
+    Behaves exactly like the plain metadata dict it was built from. Codes
+    reflect the contents at encoding time; re-encode after mutating.
+    """
+
+    __slots__ = ("codes", "vocabulary")
+
+    def __init__(
+        self,
+        metadata: Dict[str, Any],
+        codes: Tuple[int, ...],
+        vocabulary: "MetadataVocabulary"
+    ):
+        super().__init__(metadata)
+        self.codes = codes
+        self.vocabulary = vocabulary
+
+    def __reduce__(self):
+        return (EncodedMetadata, (dict(self), self.codes, self.vocabulary))
+
+
+class InternedMetadata(EncodedMetadata):
+    """
+    Shared, read-only EncodedMetadata returned by MetadataVocabulary.intern.
+
+    One instance stands in for every record with identical metadata, so it
+    rejects mutation; copy it with dict() to get an editable dict.
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Interned metadata is shared and read-only; copy it with dict() first")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (InternedMetadata, (dict(self), self.codes, self.vocabulary))
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
+
+class MetadataVocabulary:
+    """
+    Run-scoped interning of normalized metadata values into integer codes.
+
+    Values are normalized like metadata matching does (str(value).lower()),
+    so two values share a code exactly when they would match. Missing values
+    (None) get MISSING, which never matches anything.
+    """
+
+    # Code for a missing field value
+    MISSING = -1
+
+    def __init__(self, fields: Sequence[str] = DEFAULT_FIELDS):
+        """
+        Initialize an empty vocabulary.
+
+        Args:
+            fields: Metadata fields to encode, in code-tuple order
+        """
+        self.fields = tuple(fields)
+        # Per field: normalized value -> code, and typed raw value (see
+        # _typed_key) -> code so repeated raw values skip normalization
+        self._codes: Dict[str, Dict[str, int]] = {f: {} for f in self.fields}
+        self._raw_codes: Dict[str, Dict[Any, int]] = {f: {} for f in self.fields}
+        # Distinct typed metadata contents -> shared InternedMetadata
+        self._interned: Dict[Tuple, InternedMetadata] = {}
+
+    def __len__(self) -> int:
+        return sum(len(codes) for codes in self._codes.values())
+
+    def code(self, field: str, value: Any) -> int:
+        """
+        Get the code for one field value, interning it if new.
+
+        Args:
+            field: Metadata field name
+            value: Raw field value
+
+        Returns:
+            Integer code (MISSING for None)
+        """
+        if value is None:
+            return self.MISSING
+        raw_codes = self._raw_codes[field]
+        key = value if value.__class__ is str else _typed_key(value)
+        code = raw_codes.get(key)
+        if code is None:
+            codes = self._codes[field]
+            code = codes.setdefault(str(value).lower(), len(codes))
+            raw_codes[key] = code
+        return code
+
+    def encode(self, metadata: Dict[str, Any]) -> EncodedMetadata:
+        """
+        Encode a metadata dict.
+
+        Args:
+            metadata: Metadata dict (plain or previously encoded)
+
+        Returns:
+            EncodedMetadata with the same contents and this vocabulary's codes
+        """
+        if isinstance(metadata, EncodedMetadata) and metadata.vocabulary is self:
+            return metadata
+        return EncodedMetadata(
+            metadata,
+            tuple(self.code(field, metadata.get(field)) for field in self.fields),
+            self
+        )
+
+    def intern(self, metadata: Dict[str, Any]) -> EncodedMetadata:
+        """
+        Encode a metadata dict, sharing one instance per distinct contents.
+
+        Catalog metadata repeats heavily (a few markets, products and date
+        ranges), so records with identical metadata can share one read-only
+        object instead of a dict each.
+
+        Args:
+            metadata: Metadata dict (plain or previously encoded)
+
+        Returns:
+            Shared InternedMetadata, or a private EncodedMetadata if the
+            metadata holds unhashable values
+        """
+        if isinstance(metadata, InternedMetadata) and metadata.vocabulary is self:
+            return metadata
+        try:
+            # Typed, so {"market": 1} and {"market": True} stay distinct
+            key = tuple((_typed_key(k), _typed_key(v)) for k, v in metadata.items())
+            interned = self._interned.get(key)
+        except TypeError:
+            return self.encode(metadata)
+        if interned is None:
+            interned = InternedMetadata(
+                metadata,
+                tuple(self.code(field, metadata.get(field)) for field in self.fields),
+                self
+            )
+            self._interned[key] = interned
+        return interned
+
+    def encode_column(self, field: str, values: Iterable[Any]) -> np.ndarray:
+        """
+        Encode a column of raw values for one field.
+
+        Args:
+            field: Metadata field name
+            values: Raw values
+
+        Returns:
+            int64 array of codes
+        """
+        return np.fromiter((self.code(field, v) for v in values), dtype=np.int64)
+
+    def codes_of(self, rows: Sequence[Dict[str, Any]]) -> Optional[np.ndarray]:
+        """
+        Stack the codes of encoded metadata rows into an (n, fields) array.
+
+        Args:
+            rows: Metadata dicts
+
+        Returns:
+            int64 code matrix, or None unless every row is EncodedMetadata
+            from this vocabulary
+        """
+        if not all(
+            isinstance(row, EncodedMetadata) and row.vocabulary is self for row in rows
+        ):
+            return None
+        codes = np.fromiter(
+            chain.from_iterable(row.codes for row in rows),
+            dtype=np.int64,
+            count=len(rows) * len(self.fields)
+        )
+        return codes.reshape(len(rows), len(self.fields))
+
+    def decode(self, field: str, code: int) -> Optional[str]:
+        """
+        Get the normalized value behind a code.
+
+        Args:
+            field: Metadata field name
+            code: Code from this vocabulary
+
+        Returns:
+            Normalized value, or None for MISSING
+        """
+        if code == self.MISSING:
+            return None
+        for value, value_code in self._codes[field].items():
+            if value_code == code:
+                return value
+        raise KeyError(f"Unknown code {code} for field {field}")
+
+    def stats(self) -> Dict[str, int]:
+        """Get the number of distinct values interned per field."""
+        return {field: len(codes) for field, codes in self._codes.items()}
+
+    def interned_count(self) -> int:
+        """Get the number of distinct shared metadata instances."""
+        return len(self._interned)
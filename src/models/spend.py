@@ -5,13 +5,16 @@ This module defines the core data structures used throughout the AI Pacing Agent
 - Platform and DataSource enums for type safety
 - SpendRecord for individual spend data points
 - ReconciledSpend for matched target vs actual spend with confidence scoring
+- ReconciledSpendFrame for columnar (struct-of-arrays) batches of reconciliations
 - PacingAlert for agent actions and recommendations
 """
 
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
+
+import numpy as np
 
 
 class Platform(Enum):
@@ -29,13 +32,15 @@ class DataSource(Enum):
     PLATFORM_API = "platform_api"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SpendRecord:
     """
     Single spend data point from any source.
 
     Represents either target spend (from internal tracker) or actual spend
-    (from platform API) for a specific campaign.
+    (from platform API) for a specific campaign. Immutable and slotted: a
+    cycle holds two per campaign, and metadata is usually shared with the
+    source catalog (see MetadataVocabulary.intern).
     """
     campaign_id: str
     campaign_name: str
@@ -49,21 +54,51 @@ class SpendRecord:
     @property
     def hours_since_update(self) -> float:
         """Calculate hours since last data update."""
-        return (datetime.utcnow() - self.timestamp).total_seconds() / 3600
+        return self.hours_since_update_at()
 
     @property
     def is_stale(self) -> bool:
         """Check if data is stale (older than refresh cycle)."""
-        return self.hours_since_update > self.refresh_cycle_hours
+        return self.is_stale_at()
+
+    def hours_since_update_at(self, as_of: Optional[datetime] = None) -> float:
+        """
+        Calculate hours between the last data update and a reference time.
 
+        Args:
+            as_of: Reference time (default: current UTC time)
 
-@dataclass
+        Returns:
+            Age of the data in hours
+        """
+        return ((as_of or datetime.utcnow()) - self.timestamp).total_seconds() / 3600
+
+    def is_stale_at(self, as_of: Optional[datetime] = None) -> bool:
+        """
+        Check if data is stale (older than refresh cycle) at a reference time.
+
+        Args:
+            as_of: Reference time (default: current UTC time)
+
+        Returns:
+            True if the data is older than its refresh cycle
+        """
+        return self.hours_since_update_at(as_of) > self.refresh_cycle_hours
+
+
+# Default confidence weights: (metadata match, name similarity, data freshness)
+DEFAULT_CONFIDENCE_WEIGHTS = (0.5, 0.3, 0.2)
+
+
+@dataclass(frozen=True, slots=True)
 class ReconciledSpend:
     """
     Matched target vs actual spend with confidence score.
 
     Represents a successfully reconciled pair of target (from internal tracker)
     and actual (from platform API) spend data, including data quality metrics.
+    Immutable and slotted; derived values (confidence_score, pacing_variance,
+    variance_amount, spend_direction) are computed once at construction.
     """
     campaign_id: str
     campaign_name: str
@@ -73,45 +108,52 @@ class ReconciledSpend:
     target_timestamp: datetime
     actual_timestamp: datetime
 
-    # Data quality metrics (0.0 to 1.0)
+    # Data quality metrics (0.0 to 1.0). name_similarity is None when
+    # threshold gating skipped it (see ConfidenceScorer.score_for_threshold);
+    # confidence_score then only counts the measured components
     metadata_match_score: float
-    name_similarity: float
+    name_similarity: Optional[float]
     data_freshness_score: float
 
-    @property
-    def confidence_score(self) -> float:
-        """
-        Overall confidence in this reconciliation.
-
-        Weighted average:
-        - Metadata match: 50%
-        - Name similarity: 30%
-        - Data freshness: 20%
-        """
-        return (
-            self.metadata_match_score * 0.5 +
-            self.name_similarity * 0.3 +
-            self.data_freshness_score * 0.2
-        )
-
-    @property
-    def pacing_variance(self) -> float:
-        """
-        Percentage variance from target spend.
-
-        Returns:
-            Absolute percentage variance (always positive).
-            100.0 if target is zero but actual > 0.
-            0.0 if both target and actual are zero.
-        """
+    # Weights of the scorer that produced the metrics (see
+    # ConfidenceScorer.confidence_weights)
+    confidence_weights: Tuple[float, float, float] = DEFAULT_CONFIDENCE_WEIGHTS
+
+    # Derived values, cached at construction
+    confidence_score: float = field(init=False, repr=False, compare=False)
+    pacing_variance: float = field(init=False, repr=False, compare=False)
+    variance_amount: float = field(init=False, repr=False, compare=False)
+    spend_direction: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        metadata_weight, name_similarity_weight, freshness_weight = self.confidence_weights
+        # Overall confidence in this reconciliation: weighted average of
+        # metadata match, name similarity and data freshness
+        object.__setattr__(self, "confidence_score", (
+            self.metadata_match_score * metadata_weight +
+            (self.name_similarity or 0.0) * name_similarity_weight +
+            self.data_freshness_score * freshness_weight
+        ))
+        # Absolute dollar amount of variance
+        variance_amount = abs(self.actual_spend - self.target_spend)
+        object.__setattr__(self, "variance_amount", variance_amount)
+        # Absolute percentage variance from target: 100.0 if target is zero
+        # but actual > 0, 0.0 if both are zero
         if self.target_spend == 0:
-            return 100.0 if self.actual_spend > 0 else 0.0
-        return abs(self.actual_spend - self.target_spend) / self.target_spend * 100
-
-    @property
-    def variance_amount(self) -> float:
-        """Absolute dollar amount of variance."""
-        return abs(self.actual_spend - self.target_spend)
+            pacing_variance = 100.0 if self.actual_spend > 0 else 0.0
+        else:
+            pacing_variance = variance_amount / self.target_spend * 100
+        object.__setattr__(self, "pacing_variance", pacing_variance)
+        # Spending direction as human-readable string
+        if self.is_zero_delivery:
+            spend_direction = "zero_delivery"
+        elif self.is_overspending:
+            spend_direction = "overspending"
+        elif self.is_underspending:
+            spend_direction = "underspending"
+        else:
+            spend_direction = "on_target"
+        object.__setattr__(self, "spend_direction", spend_direction)
 
     @property
     def is_overspending(self) -> bool:
@@ -132,18 +174,6 @@ class ReconciledSpend:
         """
         return self.actual_spend == 0 and self.target_spend > 0
 
-    @property
-    def spend_direction(self) -> str:
-        """Get spending direction as human-readable string."""
-        if self.is_zero_delivery:
-            return "zero_delivery"
-        elif self.is_overspending:
-            return "overspending"
-        elif self.is_underspending:
-            return "underspending"
-        else:
-            return "on_target"
-
     def to_dict(self) -> Dict:
         """Convert to dictionary for serialization."""
         return {
@@ -164,12 +194,175 @@ class ReconciledSpend:
 
 
 @dataclass
+class ReconciledSpendFrame:
+    """
+    Columnar batch of reconciled spend.
+
+    Struct-of-arrays counterpart of ReconciledSpend: each field is a NumPy
+    column, and the derived properties are computed for every row in one
+    vectorized pass. Values match the scalar ReconciledSpend properties
+    exactly (same operations in the same order).
+    """
+    campaign_id: np.ndarray  # object array of str
+    campaign_name: np.ndarray  # object array of str
+    platform: np.ndarray  # object array of Platform
+    target_spend: np.ndarray  # float64
+    actual_spend: np.ndarray  # float64
+    target_timestamp: np.ndarray  # datetime64[us]
+    actual_timestamp: np.ndarray  # datetime64[us]
+
+    # Data quality metrics (0.0 to 1.0), float64; name_similarity is NaN
+    # where threshold gating skipped it
+    metadata_match_score: np.ndarray
+    name_similarity: np.ndarray
+    data_freshness_score: np.ndarray
+
+    # Confidence weights shared by every row
+    confidence_weights: Tuple[float, float, float] = DEFAULT_CONFIDENCE_WEIGHTS
+
+    SPEND_DIRECTIONS = np.array(["on_target", "overspending", "underspending", "zero_delivery"])
+
+    def __len__(self) -> int:
+        return len(self.campaign_id)
+
+    @classmethod
+    def from_records(cls, records: List[ReconciledSpend]) -> "ReconciledSpendFrame":
+        """
+        Build a frame from ReconciledSpend objects.
+
+        Args:
+            records: Reconciled spend objects, one per row
+
+        Returns:
+            ReconciledSpendFrame with one row per record
+
+        Raises:
+            ValueError: If the records were scored with different weights
+        """
+        weights = {r.confidence_weights for r in records} or {DEFAULT_CONFIDENCE_WEIGHTS}
+        if len(weights) > 1:
+            raise ValueError(f"Records mix confidence weights: {sorted(weights)}")
+        return cls(
+            campaign_id=np.array([r.campaign_id for r in records], dtype=object),
+            campaign_name=np.array([r.campaign_name for r in records], dtype=object),
+            platform=np.array([r.platform for r in records], dtype=object),
+            target_spend=np.array([r.target_spend for r in records], dtype=np.float64),
+            actual_spend=np.array([r.actual_spend for r in records], dtype=np.float64),
+            target_timestamp=np.array(
+                [r.target_timestamp for r in records], dtype="datetime64[us]"
+            ),
+            actual_timestamp=np.array(
+                [r.actual_timestamp for r in records], dtype="datetime64[us]"
+            ),
+            metadata_match_score=np.array(
+                [r.metadata_match_score for r in records], dtype=np.float64
+            ),
+            name_similarity=np.array([r.name_similarity for r in records], dtype=np.float64),
+            data_freshness_score=np.array(
+                [r.data_freshness_score for r in records], dtype=np.float64
+            ),
+            confidence_weights=weights.pop(),
+        )
+
+    @property
+    def confidence_score(self) -> np.ndarray:
+        """
+        Weighted confidence per row (same weights as ReconciledSpend).
+
+        Skipped (NaN) name similarities count as 0.0, like None in
+        ReconciledSpend.
+        """
+        metadata_weight, name_similarity_weight, freshness_weight = self.confidence_weights
+        return (
+            self.metadata_match_score * metadata_weight +
+            np.nan_to_num(self.name_similarity) * name_similarity_weight +
+            self.data_freshness_score * freshness_weight
+        )
+
+    @property
+    def pacing_variance(self) -> np.ndarray:
+        """
+        Absolute percentage variance from target per row.
+
+        100.0 where target is zero but actual > 0, 0.0 where both are zero.
+        """
+        zero_target = self.target_spend == 0
+        variance = np.abs(self.actual_spend - self.target_spend)
+        np.divide(variance, self.target_spend, out=variance, where=~zero_target)
+        variance *= 100
+        variance[zero_target] = np.where(self.actual_spend[zero_target] > 0, 100.0, 0.0)
+        return variance
+
+    @property
+    def variance_amount(self) -> np.ndarray:
+        """Absolute dollar amount of variance per row."""
+        return np.abs(self.actual_spend - self.target_spend)
+
+    @property
+    def is_overspending(self) -> np.ndarray:
+        """Rows spending more than target."""
+        return self.actual_spend > self.target_spend
+
+    @property
+    def is_underspending(self) -> np.ndarray:
+        """Rows spending less than target (but more than zero)."""
+        return (self.actual_spend < self.target_spend) & (self.actual_spend > 0)
+
+    @property
+    def is_zero_delivery(self) -> np.ndarray:
+        """Rows with zero spend despite positive target."""
+        return (self.actual_spend == 0) & (self.target_spend > 0)
+
+    @property
+    def spend_direction_code(self) -> np.ndarray:
+        """Spend direction per row as an index into SPEND_DIRECTIONS."""
+        codes = np.zeros(len(self), dtype=np.int8)
+        codes[self.is_underspending] = 2
+        codes[self.is_overspending] = 1
+        codes[self.is_zero_delivery] = 3
+        return codes
+
+    @property
+    def spend_direction(self) -> np.ndarray:
+        """Spend direction per row as human-readable strings."""
+        return self.SPEND_DIRECTIONS[self.spend_direction_code]
+
+    def row(self, index: int) -> ReconciledSpend:
+        """
+        Materialize a single row as a ReconciledSpend.
+
+        Args:
+            index: Row index
+
+        Returns:
+            ReconciledSpend for that row
+        """
+        return ReconciledSpend(
+            campaign_id=self.campaign_id[index],
+            campaign_name=self.campaign_name[index],
+            platform=self.platform[index],
+            target_spend=float(self.target_spend[index]),
+            actual_spend=float(self.actual_spend[index]),
+            target_timestamp=self.target_timestamp[index].astype(datetime),
+            actual_timestamp=self.actual_timestamp[index].astype(datetime),
+            metadata_match_score=float(self.metadata_match_score[index]),
+            name_similarity=(
+                None if np.isnan(self.name_similarity[index])
+                else float(self.name_similarity[index])
+            ),
+            data_freshness_score=float(self.data_freshness_score[index]),
+            confidence_weights=self.confidence_weights,
+        )
+
+
+@dataclass(slots=True)
 class PacingAlert:
     """
     Alert/action generated by the agent.
 
     Represents the final output of the PacingBrain agent's decision-making process,
-    including the action taken, recommendations, and analysis.
+    including the action taken, recommendations, and analysis. Slotted (no
+    per-instance __dict__).
     """
     alert_id: str
     campaign_id: str
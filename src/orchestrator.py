@@ -6,14 +6,27 @@ across platforms and executing the pacing workflow.
 """
 
 import os
+from concurrent.futures import ProcessPoolExecutor
 from typing import List, Dict, Optional
 from datetime import datetime
 
 from src.agents.pacing_brain import PacingBrain
+from src.agents.confidence_scorer import ConfidenceScorer
 from src.api.mock_platform_api import MockPlatformAPI
 from src.api.internal_tracker import MockInternalTracker
 from src.utils.audit_logger import AuditLogger
 from src.models.spend import Platform, PacingAlert
+from src.models.metadata import MetadataVocabulary
+
+
+def _build_platform_api(
+    platform: Platform,
+    num_campaigns: int,
+    seed: Optional[int],
+    as_of: datetime
+) -> MockPlatformAPI:
+    """Build one platform catalog (module-level so worker processes can run it)."""
+    return MockPlatformAPI(platform, num_campaigns=num_campaigns, seed=seed, as_of=as_of)
 
 
 class PacingOrchestrator:
@@ -32,7 +45,15 @@ class PacingOrchestrator:
         platforms: List[Platform] = None,
         slack_webhook: Optional[str] = None,
         audit_log_file: str = "audit_log.jsonl",
-        confidence_threshold: float = 0.7
+        confidence_threshold: float = 0.7,
+        num_campaigns: int = 10,
+        seed: Optional[int] = 42,
+        max_workers: Optional[int] = None,
+        as_of: Optional[datetime] = None,
+        name_cache_path: Optional[str] = None,
+        short_circuit_gating: bool = False,
+        buffered_audit_log: bool = False,
+        audit_database_url: Optional[str] = None
     ):
         """
         Initialize orchestrator.
@@ -42,22 +63,53 @@ class PacingOrchestrator:
             slack_webhook: Slack webhook URL for alerts
             audit_log_file: Path to audit log file
             confidence_threshold: Confidence threshold for autonomous action
+            num_campaigns: Number of mock campaigns per platform
+            seed: Random seed for mock catalogs
+            max_workers: Worker processes for building platform catalogs
+                        (None or 1 builds serially)
+            as_of: Fixed reference time for every run (default: the current
+                   UTC time, taken afresh at the start of each run)
+            name_cache_path: Optional file persisting the name-similarity cache
+                            between runs, so a restarted orchestrator starts warm
+            short_circuit_gating: Skip name distances once metadata and
+                                  freshness settle the confidence threshold
+            buffered_audit_log: Write audit events through a background
+                                writer instead of reopening the file per event
+            audit_database_url: Store audit events in SQLite (e.g.
+                                "sqlite:///audit_logs.db") instead of
+                                audit_log_file
         """
         self.platforms = platforms or [Platform.GOOGLE, Platform.META]
         self.slack_webhook = slack_webhook or os.getenv("SLACK_WEBHOOK_URL")
         self.confidence_threshold = confidence_threshold
+        self.as_of = as_of
 
         # Initialize audit logger
-        self.audit_logger = AuditLogger(log_file=audit_log_file)
+        self.audit_logger = AuditLogger(
+            log_file=audit_log_file,
+            buffered=buffered_audit_log,
+            database_url=audit_database_url
+        )
 
         # Initialize API clients (using mocks for MVP)
-        self.platform_apis = {
-            platform: MockPlatformAPI(platform, num_campaigns=10, seed=42)
-            for platform in self.platforms
-        }
+        self.platform_apis = self._build_platform_apis(
+            num_campaigns, seed, max_workers, as_of or datetime.utcnow()
+        )
+
+        # One metadata vocabulary per run, so tracker and platform metadata
+        # share integer codes. Catalogs may come from worker processes, so
+        # they are encoded here rather than at build time.
+        self.metadata_vocabulary = MetadataVocabulary(ConfidenceScorer.REQUIRED_FIELDS)
+        for api in self.platform_apis.values():
+            api.encode_metadata(self.metadata_vocabulary)
 
         # Initialize internal tracker
-        self.internal_tracker = MockInternalTracker()
+        self.internal_tracker = MockInternalTracker(
+            vocabulary=self.metadata_vocabulary, as_of=as_of
+        )
+
+        # One scorer shared by all agents, so they share the name cache
+        self.confidence_scorer = ConfidenceScorer(name_cache_path=name_cache_path)
 
         # Initialize PacingBrain agents for each platform
         self.agents = {
@@ -66,21 +118,65 @@ class PacingOrchestrator:
                 internal_tracker=self.internal_tracker,
                 slack_webhook=self.slack_webhook,
                 audit_logger=self.audit_logger,
-                confidence_threshold=self.confidence_threshold
+                confidence_threshold=self.confidence_threshold,
+                as_of=self.as_of,
+                confidence_scorer=self.confidence_scorer,
+                short_circuit_gating=short_circuit_gating
             )
             for platform, api in self.platform_apis.items()
         }
 
+    def _build_platform_apis(
+        self,
+        num_campaigns: int,
+        seed: Optional[int],
+        max_workers: Optional[int],
+        as_of: datetime
+    ) -> Dict[Platform, MockPlatformAPI]:
+        """
+        Build mock platform catalogs, optionally in parallel worker processes.
+
+        Every platform draws from its own seed sequence and all catalogs share
+        one as_of time, so parallel and serial builds are identical.
+
+        Args:
+            num_campaigns: Number of mock campaigns per platform
+            seed: Random seed for mock catalogs
+            max_workers: Worker processes (None or 1 builds serially)
+            as_of: Reference time for generated dates
+
+        Returns:
+            Dictionary mapping Platform to its MockPlatformAPI
+        """
+        if not max_workers or max_workers <= 1 or len(self.platforms) <= 1:
+            return {
+                platform: _build_platform_api(platform, num_campaigns, seed, as_of)
+                for platform in self.platforms
+            }
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                platform: executor.submit(
+                    _build_platform_api, platform, num_campaigns, seed, as_of
+                )
+                for platform in self.platforms
+            }
+            return {platform: future.result() for platform, future in futures.items()}
+
     def run_all_campaigns(self) -> Dict[Platform, List[PacingAlert]]:
         """
         Run pacing workflow for all campaigns across all platforms.
 
+        Every campaign of the run is scored against one reference time.
+
         Returns:
             Dictionary mapping Platform to list of PacingAlerts
         """
+        as_of = self.as_of or datetime.utcnow()
+
         print(f"\n{'=' * 70}")
         print(f"AI Pacing Agent - Monitoring Started")
-        print(f"Timestamp: {datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S UTC')}")
+        print(f"Timestamp: {as_of.strftime('%Y-%m-%d %H:%M:%S UTC')}")
         print(f"{'=' * 70}\n")
 
         results = {}
@@ -92,12 +188,15 @@ class PacingOrchestrator:
             campaign_ids = self.platform_apis[platform].list_campaign_ids()
             print(f"   Found {len(campaign_ids)} campaigns\n")
 
+            # Fetch actual and target spend for the platform in bulk
+            agent.prefetch(campaign_ids)
+
             # Run pacing workflow for each campaign
             alerts = []
             for campaign_id in campaign_ids:
                 try:
                     print(f"   📊 Analyzing {campaign_id}...", end=" ")
-                    alert = agent.run(campaign_id)
+                    alert = agent.run(campaign_id, as_of=as_of)
                     alerts.append(alert)
 
                     # Print result
@@ -115,6 +214,13 @@ class PacingOrchestrator:
 
             results[platform] = alerts
 
+        # Persist the name-similarity cache for the next run
+        if self.confidence_scorer.name_cache and self.confidence_scorer.name_cache.path:
+            self.confidence_scorer.name_cache.save()
+
+        # Write out buffered audit events before reporting
+        self.audit_logger.flush()
+
         # Print summary
         self._print_summary(results)
 
@@ -124,6 +230,8 @@ class PacingOrchestrator:
         """
         Run pacing workflow for a single platform.
 
+        Every campaign of the run is scored against one reference time.
+
         Args:
             platform: Platform to monitor
 
@@ -133,13 +241,15 @@ class PacingOrchestrator:
         if platform not in self.agents:
             raise ValueError(f"Platform {platform.value} not configured")
 
+        as_of = self.as_of or datetime.utcnow()
         agent = self.agents[platform]
         campaign_ids = self.platform_apis[platform].list_campaign_ids()
+        agent.prefetch(campaign_ids)
 
         alerts = []
         for campaign_id in campaign_ids:
             try:
-                alert = agent.run(campaign_id)
+                alert = agent.run(campaign_id, as_of=as_of)
                 alerts.append(alert)
             except Exception as e:
                 self.audit_logger.log_error(
@@ -214,6 +324,13 @@ class PacingOrchestrator:
         print(f"\n🤖 Autonomous actions:      {actions_taken}")
         print(f"👤 Human escalations:       {escalations}")
 
+        gating_stats = self.confidence_scorer.gating_stats()
+        if gating_stats["gated"]:
+            print(
+                f"⚡ Short-circuited scores:  {gating_stats['short_circuited']} "
+                f"({gating_stats['short_circuit_rate']*100:.1f}%)"
+            )
+
         # Audit log stats
         audit_stats = self.audit_logger.get_summary_stats()
         print(f"\n📝 Audit log entries:       {audit_stats['total_events']}")
@@ -235,6 +352,9 @@ def main():
 
     Usage:
         python -m src.orchestrator
+
+    Audit events go to audit_log.jsonl unless AUDIT_DATABASE_URL is set
+    (e.g. sqlite:///audit_logs.db), which switches them to SQLite.
     """
     # Load configuration from environment
     slack_webhook = os.getenv("SLACK_WEBHOOK_URL")
@@ -244,7 +364,8 @@ def main():
     orchestrator = PacingOrchestrator(
         platforms=[Platform.GOOGLE, Platform.META],
         slack_webhook=slack_webhook,
-        confidence_threshold=confidence_threshold
+        confidence_threshold=confidence_threshold,
+        audit_database_url=os.getenv("AUDIT_DATABASE_URL")
     )
 
     # Run monitoring for all campaigns
@@ -0,0 +1,269 @@
+"""
+Parallel chunked analytics over the audit log.
+
+AuditLogger.aggregate() answers questions the incremental summary counters
+don't cover (escalation rates per platform, variance histograms, counts
+per day...) without a single-threaded pass over the whole history:
+- The log file is split into byte ranges aligned to record boundaries
+  (newlines for JSONL, frame headers for MessagePack); each rotated
+  segment is one more part, as compressed files can't be split
+- Every part is aggregated into partial counters in a process pool
+- Partials are merged in log order, so the result is identical to a
+  serial pass (including the first-seen order of counter keys)
+
+Aggregates are plain dicts like the summary counters (see
+empty_aggregate()), so they pickle cheaply between processes.
+"""
+
+import mmap
+import os
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from src.utils.audit_segments import open_compressed
+from src.utils.audit_summary import AuditSummary, count_event, empty_counts, merge_counts
+from src.utils.codecs import Codec, MsgpackCodec, get_codec
+
+
+# Histogram bin edges per reconciliation field; bin i counts values in
+# [edges[i - 1], edges[i]), with open-ended first and last bins
+HISTOGRAMS = {
+    "variance_pct": (0, 5, 10, 15, 20, 30, 50, 100),
+    "confidence_score": (0.5, 0.6, 0.7, 0.8, 0.9, 0.95),
+}
+
+# Group keys for aggregate(group_by=...)
+GROUP_BY = ("platform", "campaign_id", "event_type", "day", "hour")
+
+# Counters per group. "decisions" counts every routed run: agent_decision
+# events plus the healthy_pacing events healthy runs log instead
+GROUP_FIELDS = ("events", "reconciliations", "alerts", "decisions", "escalations", "halts")
+
+# Parts per worker, so uneven parts still keep every worker busy
+PARTS_PER_WORKER = 4
+
+
+def empty_aggregate() -> Dict[str, Any]:
+    """
+    Aggregate of no events.
+
+    The summary counters (see empty_counts), plus "groups" (group key ->
+    GROUP_FIELDS counters) and "histograms" (field -> bin counts).
+    """
+    aggregate = empty_counts()
+    aggregate["groups"] = {}
+    aggregate["histograms"] = {field: [0] * (len(edges) + 1) for field, edges in HISTOGRAMS.items()}
+    return aggregate
+
+
+def group_key(event: Dict[str, Any], group_by: str) -> Any:
+    """
+    Group of an event.
+
+    Args:
+        event: Decoded event
+        group_by: One of GROUP_BY; "platform" is the campaign_id prefix
+                  (e.g. "google" for "google_007"), "day"/"hour" are
+                  prefixes of the ISO timestamp
+
+    Returns:
+        Group key ("unknown" when the event lacks the field)
+    """
+    if group_by == "event_type":
+        # Healthy runs log {"type": "healthy_pacing"} without an event_type
+        value = event.get("event_type", event.get("type"))
+        return "unknown" if value is None else value
+    if group_by in ("platform", "campaign_id"):
+        value = event.get("campaign_id")
+        if value is None:
+            return "unknown"
+        return str(value).split("_", 1)[0] if group_by == "platform" else value
+    timestamp = event.get("timestamp")
+    if not isinstance(timestamp, str):
+        return "unknown"
+    return timestamp[:10] if group_by == "day" else timestamp[:13]
+
+
+def add_event(
+    aggregate: Dict[str, Any],
+    event: Dict[str, Any],
+    group_by: Optional[str] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None
+):
+    """
+    Aggregate one event, in place.
+
+    Args:
+        aggregate: Aggregate from empty_aggregate()
+        event: Decoded event
+        group_by: Group key (one of GROUP_BY), or None for no groups
+        start: Skip events before this ISO timestamp
+        end: Skip events at or after this ISO timestamp
+    """
+    keys = AuditSummary.keys(event)
+    event_type, label, timestamp = keys
+    if start is not None or end is not None:
+        if timestamp is None:
+            return
+        if (start is not None and timestamp < start) or (end is not None and timestamp >= end):
+            return
+    count_event(aggregate, keys)
+
+    if event_type == "reconciliation":
+        for field, edges in HISTOGRAMS.items():
+            value = event.get(field)
+            if isinstance(value, (int, float)):
+                aggregate["histograms"][field][bisect_right(edges, value)] += 1
+
+    if group_by is None:
+        return
+    key = group_key(event, group_by)
+    group = aggregate["groups"].get(key)
+    if group is None:
+        group = aggregate["groups"][key] = dict.fromkeys(GROUP_FIELDS, 0)
+    group["events"] += 1
+    if event_type == "reconciliation":
+        group["reconciliations"] += 1
+    elif event_type == "pacing_alert":
+        group["alerts"] += 1
+    elif event_type == "agent_decision":
+        group["decisions"] += 1
+        if label == "escalate_to_human":
+            group["escalations"] += 1
+        elif label == "autonomous_halt":
+            group["halts"] += 1
+    elif event_type == "unknown" and event.get("type") == "healthy_pacing":
+        group["decisions"] += 1
+
+
+def merge_aggregates(total: Dict[str, Any], aggregate: Dict[str, Any]):
+    """Add an aggregate (e.g. of a later part of the log) into total, in place."""
+    merge_counts(total, aggregate)
+    for key, group in aggregate["groups"].items():
+        merged = total["groups"].get(key)
+        if merged is None:
+            total["groups"][key] = dict(group)
+        else:
+            for field in GROUP_FIELDS:
+                merged[field] += group[field]
+    for field, counts in aggregate["histograms"].items():
+        total["histograms"][field] = [a + b for a, b in zip(total["histograms"][field], counts)]
+
+
+def finish_aggregate(aggregate: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Add derived values to a merged aggregate.
+
+    Each group gets "escalation_rate" (escalations per decision, healthy
+    runs included; 0.0 with no decisions), and each histogram is reported
+    with its bin edges.
+
+    Returns:
+        The aggregate, modified in place
+    """
+    for group in aggregate["groups"].values():
+        group["escalation_rate"] = group["escalations"] / group["decisions"] if group["decisions"] else 0.0
+    aggregate["histograms"] = {
+        field: {"edges": list(HISTOGRAMS[field]), "counts": counts}
+        for field, counts in aggregate["histograms"].items()
+    }
+    return aggregate
+
+
+def split_log(log_path: Path, codec: Codec, parts: int) -> List[Tuple[int, int]]:
+    """
+    Split a log file into byte ranges starting at record boundaries.
+
+    Args:
+        log_path: Audit log file
+        codec: Codec the log is written with
+        parts: Number of ranges wanted (fewer for small logs)
+
+    Returns:
+        (start, end) byte ranges covering the file, in order
+    """
+    size = log_path.stat().st_size if log_path.exists() else 0
+    if size == 0:
+        return []
+    parts = max(1, parts)
+    targets = [size * i // parts for i in range(1, parts)]
+    bounds = [0]
+    with open(log_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if isinstance(codec, MsgpackCodec):
+            # Cut at the first valid frame at or after each target
+            for target in targets:
+                bounds.append(codec.next_frame(mm, max(target, bounds[-1])))
+        else:
+            for target in targets:
+                newline = mm.find(b"\n", max(target, bounds[-1], 1) - 1)
+                bounds.append(size if newline < 0 else newline + 1)
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def aggregate_part(
+    path: str,
+    codec_name: str,
+    start: int,
+    end: Optional[int],
+    compression: Optional[str] = None,
+    group_by: Optional[str] = None,
+    time_range: Tuple[Optional[str], Optional[str]] = (None, None)
+) -> Dict[str, Any]:
+    """
+    Aggregate the records of one part of the log (runs in worker processes).
+
+    Args:
+        path: Log file or rotated segment
+        codec_name: Codec name (codec instances aren't always picklable)
+        start: Byte offset of the part's first record
+        end: Byte offset the part ends at (None: end of file)
+        compression: Segment compression, if any
+        group_by: Group key (one of GROUP_BY), or None
+        time_range: (start, end) ISO timestamps to restrict events to
+
+    Returns:
+        Aggregate of the part
+    """
+    codec = get_codec(codec_name)
+    aggregate = empty_aggregate()
+    with open_compressed(Path(path), compression) as f:
+        if start:
+            f.seek(start)
+        for offset, _, event in codec.iter_records(f):
+            if end is not None and offset >= end:
+                break
+            add_event(aggregate, event, group_by, *time_range)
+    return aggregate
+
+
+def aggregate_parts(
+    tasks: Iterable[Tuple],
+    workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Aggregate parts of a log and merge the results in order.
+
+    Args:
+        tasks: aggregate_part() argument tuples, in log order
+        workers: Worker processes (None: one per CPU; 1 runs in-process)
+
+    Returns:
+        Merged (finished) aggregate
+    """
+    tasks = list(tasks)
+    workers = workers or os.cpu_count() or 1
+    total = empty_aggregate()
+    if workers <= 1 or len(tasks) <= 1:
+        partials = (aggregate_part(*task) for task in tasks)
+        for partial in partials:
+            merge_aggregates(total, partial)
+        return finish_aggregate(total)
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as executor:
+        for partial in executor.map(aggregate_part, *zip(*tasks)):
+            merge_aggregates(total, partial)
+    return finish_aggregate(total)
@@ -0,0 +1,184 @@
+"""
+Command-line maintenance for audit logs.
+
+Usage:
+    python -m src.utils.audit_cli reconcile audit_log.jsonl
+    python -m src.utils.audit_cli migrate audit_log.jsonl sqlite:///audit_logs.db
+    python -m src.utils.audit_cli aggregate audit_log.jsonl --group-by platform
+    python -m src.utils.audit_cli replay audit_log.jsonl --warning-threshold 30
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import List, Optional
+
+from src.analyzers.decision_replay import CONFIDENCE_THRESHOLD, DecisionReplay
+from src.analyzers.pacing_analyzer import PacingAnalyzer
+from src.utils.audit_analytics import GROUP_BY
+from src.utils.audit_logger import AuditLogger
+from src.utils.audit_sqlite import migrate_log
+from src.utils.codecs import CODECS, codec_for_path
+
+
+def reconcile(args: argparse.Namespace) -> int:
+    """Recount the summary counters of a log and report any drift."""
+    codec = args.codec or codec_for_path(args.log_file)
+    logger = AuditLogger(log_file=args.log_file, codec=codec)
+    stats = logger.reconcile_summary_stats()
+    drift = stats.pop("drift")
+
+    print(json.dumps(stats, indent=2))
+    if drift:
+        print(f"⚠️  Checkpoint drift corrected: {json.dumps(drift)}")
+    else:
+        print("✅ Summary checkpoint matches the log")
+    return 0
+
+
+def migrate(args: argparse.Namespace) -> int:
+    """Copy a log file into a SQLite database."""
+    database_url = args.database_url or os.getenv("AUDIT_DATABASE_URL")
+    if not database_url:
+        print("❌ No database URL given and AUDIT_DATABASE_URL is not set", file=sys.stderr)
+        return 2
+
+    start = time.perf_counter()
+    count = migrate_log(args.log_file, database_url, codec=args.codec)
+    elapsed = time.perf_counter() - start
+    print(f"✅ Migrated {count} events to {database_url} in {elapsed:.1f}s")
+    return 0
+
+
+def aggregate(args: argparse.Namespace) -> int:
+    """Aggregate a log in parallel and print the result as JSON."""
+    codec = args.codec or codec_for_path(args.log_file)
+    logger = AuditLogger(log_file=args.log_file, codec=codec)
+
+    start = time.perf_counter()
+    result = logger.aggregate(
+        group_by=None if args.group_by == "none" else args.group_by,
+        start_time=args.start, end_time=args.end, workers=args.workers
+    )
+    elapsed = time.perf_counter() - start
+    print(json.dumps(result, indent=2))
+    print(f"✅ Aggregated {result['total_events']} events in {elapsed:.1f}s", file=sys.stderr)
+    return 0
+
+
+def replay(args: argparse.Namespace) -> int:
+    """Replay the logged decisions under other thresholds and print the diff as JSON."""
+    codec = args.codec or codec_for_path(args.log_file)
+    logger = AuditLogger(log_file=args.log_file, codec=codec)
+
+    start = time.perf_counter()
+    decisions = DecisionReplay.from_audit_log(logger, start_time=args.start, end_time=args.end)
+    result = decisions.compare(
+        healthy_threshold=args.healthy_threshold,
+        warning_threshold=args.warning_threshold,
+        confidence_threshold=args.confidence_threshold,
+        confidence_weights=tuple(args.weights) if args.weights else None,
+        max_diffs=args.max_diffs
+    )
+    elapsed = time.perf_counter() - start
+    print(json.dumps(result, indent=2))
+    print(
+        f"✅ Replayed {result['reconciliations']} reconciliations in {elapsed:.1f}s "
+        f"({result['changed']} decisions changed, {result['undecidable']} undecidable)",
+        file=sys.stderr
+    )
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Main entry point for audit log maintenance commands.
+
+    Args:
+        argv: Command-line arguments (default: sys.argv[1:])
+
+    Returns:
+        Process exit code
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src.utils.audit_cli", description="Audit log maintenance"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    reconcile_parser = commands.add_parser(
+        "reconcile", help="Recompute summary counters from the log and rewrite the checkpoint"
+    )
+    reconcile_parser.add_argument("log_file", help="Audit log file")
+    reconcile_parser.add_argument(
+        "--codec", choices=sorted(CODECS), help="Log codec (default: from the file extension)"
+    )
+    reconcile_parser.set_defaults(handler=reconcile)
+
+    migrate_parser = commands.add_parser(
+        "migrate", help="Copy a log file (and its rotated segments) into a SQLite database"
+    )
+    migrate_parser.add_argument("log_file", help="Audit log file")
+    migrate_parser.add_argument(
+        "database_url", nargs="?", help="Target sqlite:/// URL (default: $AUDIT_DATABASE_URL)"
+    )
+    migrate_parser.add_argument(
+        "--codec", choices=sorted(CODECS), help="Log codec (default: from the file extension)"
+    )
+    migrate_parser.set_defaults(handler=migrate)
+
+    aggregate_parser = commands.add_parser(
+        "aggregate", help="Count events, escalation rates and histograms in parallel"
+    )
+    aggregate_parser.add_argument("log_file", help="Audit log file")
+    aggregate_parser.add_argument(
+        "--group-by", choices=GROUP_BY + ("none",), default="platform",
+        help="Per-group counters (default: platform)"
+    )
+    aggregate_parser.add_argument("--start", help="Only events at or after this ISO time")
+    aggregate_parser.add_argument("--end", help="Only events before this ISO time")
+    aggregate_parser.add_argument(
+        "--workers", type=int, help="Worker processes (default: one per CPU)"
+    )
+    aggregate_parser.add_argument(
+        "--codec", choices=sorted(CODECS), help="Log codec (default: from the file extension)"
+    )
+    aggregate_parser.set_defaults(handler=aggregate)
+
+    replay_parser = commands.add_parser(
+        "replay", help="Re-route logged reconciliations under other thresholds and diff the decisions"
+    )
+    replay_parser.add_argument("log_file", help="Audit log file")
+    replay_parser.add_argument(
+        "--healthy-threshold", type=float, default=PacingAnalyzer.HEALTHY_THRESHOLD,
+        help="Maximum variance %% for healthy (default: %(default)s)"
+    )
+    replay_parser.add_argument(
+        "--warning-threshold", type=float, default=PacingAnalyzer.WARNING_THRESHOLD,
+        help="Maximum variance %% for warning (default: %(default)s)"
+    )
+    replay_parser.add_argument(
+        "--confidence-threshold", type=float, default=CONFIDENCE_THRESHOLD,
+        help="Minimum confidence for autonomous action (default: %(default)s)"
+    )
+    replay_parser.add_argument(
+        "--weights", type=float, nargs=3, metavar=("METADATA", "NAME", "FRESHNESS"),
+        help="Recompute confidence with these weights (default: the logged confidence)"
+    )
+    replay_parser.add_argument("--start", help="Only events at or after this ISO time")
+    replay_parser.add_argument("--end", help="Only events before this ISO time")
+    replay_parser.add_argument(
+        "--max-diffs", type=int, default=100, help="Changed decisions to list (default: 100)"
+    )
+    replay_parser.add_argument(
+        "--codec", choices=sorted(CODECS), help="Log codec (default: from the file extension)"
+    )
+    replay_parser.set_defaults(handler=replay)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,436 @@
+"""
+Sidecar byte-offset index for the audit log.
+
+AuditLogger.get_events used to decode every record of the log to answer a
+filtered query. AuditLogIndex keeps, per campaign_id and per event_type,
+the byte offsets and lengths of matching records, so a filtered query seeks
+straight to them:
+- Appends are indexed as they are written, and appended to two sidecar
+  files: "<log>.idx" (one fixed-size binary entry per record) and
+  "<log>.idx.keys" (one line per distinct campaign_id/event_type)
+- "<log>.idx.head" fingerprints the head of the indexed log, like the
+  summary checkpoint does: a sidecar whose log was deleted or replaced
+  behind the index's back (rm, external rotation) is discarded on load
+  and the log re-indexed, even if the new log has grown past the old one
+- On first use the sidecar is loaded with NumPy and grouped by key, and any
+  log tail it doesn't cover yet (e.g. after a crash) is scanned, so the
+  index is always complete
+- rebuild() re-creates the index from the log alone
+
+The index only narrows candidates; callers re-check filters on the decoded
+records, so a stale or damaged entry can never return a wrong event.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import threading
+from array import array
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.utils.codecs import Codec
+
+
+# One sidecar entry: record offset, record length, event_type key id,
+# campaign_id key id
+ENTRY = struct.Struct("<QIII")
+ENTRY_DTYPE = np.dtype([
+    ("offset", "<u8"), ("length", "<u4"), ("event_type", "<u4"), ("campaign_id", "<u4")
+])
+
+# Key id of an absent event_type/campaign_id
+NO_KEY = 0xFFFFFFFF
+
+# Positions of the two indexed keys in entries and key tuples
+EVENT_TYPE, CAMPAIGN_ID = 0, 1
+
+
+def _escape(key: str) -> str:
+    """Make a key safe for a line of the keys file."""
+    if "\\" in key or "\n" in key:
+        return key.replace("\\", "\\\\").replace("\n", "\\n")
+    return key
+
+
+def _unescape(key: str) -> str:
+    """Inverse of _escape."""
+    if "\\" not in key:
+        return key
+    chars = []
+    escaped = False
+    for char in key:
+        if escaped:
+            chars.append("\n" if char == "n" else char)
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        else:
+            chars.append(char)
+    return "".join(chars)
+
+
+class _LoadedPostings:
+    """Entries loaded from the sidecar, sorted by key id (then log order)."""
+
+    def __init__(self, key_ids: np.ndarray, offsets: np.ndarray, lengths: np.ndarray):
+        order = np.argsort(key_ids, kind="stable")
+        self.key_ids = key_ids[order]
+        self.offsets = offsets[order]
+        self.lengths = lengths[order]
+
+    def get(self, key_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        start = np.searchsorted(self.key_ids, key_id, side="left")
+        end = np.searchsorted(self.key_ids, key_id, side="right")
+        return self.offsets[start:end], self.lengths[start:end]
+
+
+class _Postings:
+    """Offsets and lengths of records appended since loading, in log order."""
+
+    __slots__ = ("offsets", "lengths")
+
+    def __init__(self):
+        self.offsets = array("Q")
+        self.lengths = array("I")
+
+
+class AuditLogIndex:
+    """
+    Byte-offset index of an audit log by campaign_id and event_type.
+
+    Thread-safe; a record appended while a reader catches up with the log
+    is indexed once, by whichever of the scan and add() gets to it first.
+    """
+
+    # Sidecar file suffixes, appended to the log file name
+    SUFFIX = ".idx"
+    KEYS_SUFFIX = ".idx.keys"
+    HEAD_SUFFIX = ".idx.head"
+
+    # Leading log bytes fingerprinted to detect a replaced log
+    HEAD_BYTES = 4096
+
+    # Entries buffered per sidecar write while scanning the log
+    SCAN_CHUNK = 10_000
+
+    def __init__(self, log_path: Path, codec: Codec):
+        """
+        Initialize index (loaded lazily on first use).
+
+        Args:
+            log_path: Audit log file
+            codec: Codec the log is written with
+        """
+        self.log_path = Path(log_path)
+        self.path = self.log_path.with_name(self.log_path.name + self.SUFFIX)
+        self.keys_path = self.log_path.with_name(self.log_path.name + self.KEYS_SUFFIX)
+        self.head_path = self.log_path.with_name(self.log_path.name + self.HEAD_SUFFIX)
+        self.codec = codec
+        self.lock = threading.RLock()
+        self._loaded = False
+        self._sidecar: Optional[BinaryIO] = None
+        self._keys_file: Optional[BinaryIO] = None
+        self._reset()
+
+    def add(self, offset: int, length: int, keys: Tuple[str, str]):
+        """
+        Index a record just appended to the log.
+
+        Args:
+            offset: Byte offset of the record's frame
+            length: Frame length in bytes
+            keys: (event_type, campaign_id) from keys()
+        """
+        with self.lock:
+            self._ensure_loaded()
+            if offset > self.indexed_bytes:
+                # Someone else appended since; index their records first
+                self._scan_log(self.indexed_bytes)
+            if offset < self.indexed_bytes:
+                # Already picked up by a catch-up scan
+                return
+            key_ids = (self._key_id(keys[EVENT_TYPE]), self._key_id(keys[CAMPAIGN_ID]))
+            self._insert(offset, length, key_ids)
+            self._sidecar_file().write(ENTRY.pack(offset, length, *key_ids))
+
+    def lookup(
+        self,
+        event_type: Optional[str] = None,
+        campaign_id: Optional[str] = None
+    ) -> List[Tuple[int, int]]:
+        """
+        Find candidate records for a filtered query.
+
+        Args:
+            event_type: Event type filter (falsy: any)
+            campaign_id: Campaign ID filter (falsy: any)
+
+        Returns:
+            (offset, length) of candidate records in log order
+
+        Raises:
+            ValueError: If neither filter is given
+        """
+        with self.lock:
+            self.sync()
+            filters = [
+                (position, str(key))
+                for position, key in ((CAMPAIGN_ID, campaign_id), (EVENT_TYPE, event_type))
+                if key
+            ]
+            if not filters:
+                raise ValueError("lookup() needs an event_type or campaign_id filter")
+
+            postings = [self._postings(position, key) for position, key in filters]
+            postings.sort(key=lambda p: len(p[0]))
+            offsets, lengths = postings[0]
+            for other_offsets, _ in postings[1:]:
+                _, keep, _ = np.intersect1d(
+                    offsets, other_offsets, assume_unique=True, return_indices=True
+                )
+                offsets, lengths = offsets[keep], lengths[keep]
+            return list(zip(offsets.tolist(), lengths.tolist()))
+
+    def sync(self):
+        """Index records appended to the log by anyone since the last sync."""
+        with self.lock:
+            self._ensure_loaded()
+            if self.log_path.exists() and self.log_path.stat().st_size > self.indexed_bytes:
+                self._scan_log(self.indexed_bytes)
+
+    def flush(self):
+        """Write buffered sidecar data to the OS."""
+        with self.lock:
+            # Keys first, so entries never refer to keys that aren't on disk
+            for handle in (self._keys_file, self._sidecar):
+                if handle is not None:
+                    handle.flush()
+            if (
+                self._loaded
+                and min(self.indexed_bytes, self.HEAD_BYTES) > self._head_bytes
+                and self.log_path.exists()
+            ):
+                self._save_head()
+
+    def close(self):
+        """Flush and close the sidecar files (the index stays usable)."""
+        with self.lock:
+            self.flush()
+            for handle in (self._keys_file, self._sidecar):
+                if handle is not None:
+                    handle.close()
+            self._keys_file = self._sidecar = None
+
+    def rebuild(self):
+        """Discard the sidecar and re-index the whole log."""
+        with self.lock:
+            self._discard_sidecar()
+            self._loaded = True
+            if self.log_path.exists():
+                self._scan_log(0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get index coverage and key counts."""
+        with self.lock:
+            self._ensure_loaded()
+            distinct = []
+            for position in (CAMPAIGN_ID, EVENT_TYPE):
+                key_ids = set(self._appended[position])
+                if self._loaded_postings[position] is not None:
+                    key_ids.update(np.unique(self._loaded_postings[position].key_ids).tolist())
+                distinct.append(len(key_ids))
+            return {
+                "indexed_records": self.indexed_records,
+                "indexed_bytes": self.indexed_bytes,
+                "campaigns": distinct[0],
+                "event_types": distinct[1],
+                "index_file": str(self.path),
+            }
+
+    @staticmethod
+    def keys(event: Dict[str, Any]) -> Tuple[str, str]:
+        """Index keys (event_type, campaign_id) of an event ("" when absent)."""
+        event_type = event.get("event_type")
+        campaign_id = event.get("campaign_id")
+        return (
+            str(event_type) if event_type is not None else "",
+            str(campaign_id) if campaign_id is not None else "",
+        )
+
+    def _reset(self):
+        self._key_ids: Dict[str, int] = {}
+        self._loaded_postings: List[Optional[_LoadedPostings]] = [None, None]
+        self._appended: List[Dict[int, _Postings]] = [{}, {}]
+        # End of the last indexed record; log bytes past it are unindexed
+        self.indexed_bytes = 0
+        self.indexed_records = 0
+        # Log bytes the head file fingerprints
+        self._head_bytes = 0
+
+    def _discard_sidecar(self):
+        """Close and delete the sidecar files and forget their entries."""
+        self._reset()
+        self.close()
+        for path in (self.path, self.keys_path, self.head_path):
+            if path.exists():
+                path.unlink()
+
+    def _ensure_loaded(self):
+        """Load the sidecar and catch up with the log, once."""
+        if self._loaded:
+            return
+        self._loaded = True
+        self._reset()
+        log_size = self.log_path.stat().st_size if self.log_path.exists() else 0
+
+        if self.path.exists() or self.keys_path.exists():
+            head_bytes = self._read_head(log_size)
+            if head_bytes is None:
+                # The sidecar describes another log (or predates head files)
+                self._discard_sidecar()
+            else:
+                self._head_bytes = head_bytes
+
+        if self.keys_path.exists():
+            data = self.keys_path.read_bytes()
+            complete = data[:data.rfind(b"\n") + 1]
+            for line in complete.decode("utf-8", "replace").split("\n")[:-1]:
+                self._key_ids.setdefault(_unescape(line), len(self._key_ids))
+            if len(complete) < len(data):
+                self._truncate(self.keys_path, len(complete))
+
+        if self.path.exists():
+            with open(self.path, "rb") as f:
+                entries = np.fromfile(
+                    f, dtype=ENTRY_DTYPE, count=self.path.stat().st_size // ENTRY.size
+                )
+            valid = self._valid_prefix(entries, log_size)
+            if valid * ENTRY.size < self.path.stat().st_size:
+                # Drop entries that no longer describe this log
+                self._truncate(self.path, valid * ENTRY.size)
+            entries = entries[:valid]
+            if len(entries):
+                for position, column in ((EVENT_TYPE, "event_type"), (CAMPAIGN_ID, "campaign_id")):
+                    present = entries[column] != NO_KEY
+                    self._loaded_postings[position] = _LoadedPostings(
+                        entries[column][present],
+                        entries["offset"][present],
+                        entries["length"][present],
+                    )
+                self.indexed_bytes = int(entries["offset"][-1]) + int(entries["length"][-1])
+                self.indexed_records = len(entries)
+
+        if log_size > self.indexed_bytes:
+            self._scan_log(self.indexed_bytes)
+
+    def _read_head(self, log_size: int) -> Optional[int]:
+        """Log bytes the head file fingerprints, or None if they don't match the log."""
+        try:
+            with open(self.head_path) as f:
+                head = json.load(f)
+            head_bytes = int(head["head_bytes"])
+            head_sha1 = head["head_sha1"]
+        except (OSError, ValueError, TypeError, KeyError):
+            return None
+        if not self.log_path.exists() or head_bytes > log_size or head_sha1 != self._head_digest(head_bytes):
+            return None
+        return head_bytes
+
+    def _save_head(self):
+        """Fingerprint the head of the indexed log (replaced atomically)."""
+        head_bytes = min(self.indexed_bytes, self.HEAD_BYTES)
+        head = {"head_bytes": head_bytes, "head_sha1": self._head_digest(head_bytes)}
+        tmp_path = self.head_path.with_name(f"{self.head_path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(head, f)
+        os.replace(tmp_path, self.head_path)
+        self._head_bytes = head_bytes
+
+    def _head_digest(self, size: int) -> str:
+        """Fingerprint of the first size bytes of the log."""
+        with open(self.log_path, "rb") as f:
+            return hashlib.sha1(f.read(size)).hexdigest()
+
+    def _valid_prefix(self, entries: np.ndarray, log_size: int) -> int:
+        """Number of leading entries consistent with the log and keys file."""
+        if not len(entries):
+            return 0
+        ends = entries["offset"] + entries["length"]
+        num_keys = len(self._key_ids)
+        ok = ends <= log_size
+        ok[1:] &= entries["offset"][1:] >= ends[:-1]
+        for column in ("event_type", "campaign_id"):
+            ok &= (entries[column] < num_keys) | (entries[column] == NO_KEY)
+        return len(entries) if ok.all() else int(np.argmin(ok))
+
+    def _scan_log(self, start: int):
+        """Index complete records from a byte offset to the end of the log."""
+        sidecar = self._sidecar_file()
+        chunk = []
+        with open(self.log_path, "rb") as f:
+            f.seek(start)
+            for offset, length, event in self.codec.iter_records(f):
+                keys = self.keys(event)
+                key_ids = (self._key_id(keys[EVENT_TYPE]), self._key_id(keys[CAMPAIGN_ID]))
+                self._insert(offset, length, key_ids)
+                chunk.append(ENTRY.pack(offset, length, *key_ids))
+                if len(chunk) >= self.SCAN_CHUNK:
+                    sidecar.write(b"".join(chunk))
+                    chunk = []
+        sidecar.write(b"".join(chunk))
+        self.flush()
+
+    def _insert(self, offset: int, length: int, key_ids: Tuple[int, int]):
+        for position, key_id in enumerate(key_ids):
+            if key_id == NO_KEY:
+                continue
+            appended = self._appended[position]
+            postings = appended.get(key_id)
+            if postings is None:
+                postings = appended[key_id] = _Postings()
+            postings.offsets.append(offset)
+            postings.lengths.append(length)
+        self.indexed_bytes = offset + length
+        self.indexed_records += 1
+
+    def _postings(self, position: int, key: str) -> Tuple[np.ndarray, np.ndarray]:
+        """All (offsets, lengths) for one key, in log order."""
+        key_id = self._key_ids.get(key)
+        offsets = [np.empty(0, dtype=np.uint64)]
+        lengths = [np.empty(0, dtype=np.uint32)]
+        if key_id is not None:
+            if self._loaded_postings[position] is not None:
+                loaded_offsets, loaded_lengths = self._loaded_postings[position].get(key_id)
+                offsets.append(loaded_offsets)
+                lengths.append(loaded_lengths)
+            appended = self._appended[position].get(key_id)
+            if appended is not None:
+                offsets.append(np.frombuffer(appended.offsets, dtype=np.uint64))
+                lengths.append(np.frombuffer(appended.lengths, dtype=np.uint32))
+        return np.concatenate(offsets), np.concatenate(lengths)
+
+    def _key_id(self, key: str) -> int:
+        """Id of a key, registering new keys in the keys file."""
+        if not key:
+            return NO_KEY
+        key_id = self._key_ids.get(key)
+        if key_id is None:
+            key_id = self._key_ids[key] = len(self._key_ids)
+            if self._keys_file is None:
+                self._keys_file = open(self.keys_path, "ab")
+            self._keys_file.write((_escape(key) + "\n").encode("utf-8"))
+        return key_id
+
+    def _sidecar_file(self) -> BinaryIO:
+        if self._sidecar is None:
+            self._sidecar = open(self.path, "ab")
+        return self._sidecar
+
+    @staticmethod
+    def _truncate(path: Path, size: int):
+        with open(path, "r+b") as f:
+            f.truncate(size)
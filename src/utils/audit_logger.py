@@ -2,15 +2,287 @@
 Audit logging utility.
 
 Logs all agent decisions, actions, and events for compliance and analysis.
-Supports JSON file logging and optional SQLite database storage.
+Supports JSON file logging and optional SQLite database storage. Events are
+serialized by a pluggable codec (JSON lines by default, or MessagePack), and
+can be written directly or through a buffered background writer.
 """
 
+import atexit
 import json
 import os
+import queue
+import textwrap
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, List, Optional
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
 from pathlib import Path
 
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, multiprocess=True is unavailable
+    fcntl = None
+
+from src.utils.audit_analytics import (
+    GROUP_BY, PARTS_PER_WORKER, add_event, aggregate_parts, empty_aggregate, finish_aggregate,
+    split_log,
+)
+from src.utils.audit_index import AuditLogIndex
+from src.utils.audit_scan import scan_events, scan_events_reverse
+from src.utils.audit_segments import AuditLogSegments
+from src.utils.audit_sqlite import SqliteAuditStore, sqlite_path
+from src.utils.audit_summary import AuditSummary, GROUPS, counts_drift, empty_counts, merge_counts
+from src.utils.codecs import Codec, get_codec
+from src.utils.columnar import AUDIT_COLUMNS, ROW_GROUP_SIZE, ColumnarWriter
+
+
+# Counters reported by get_summary_stats
+SUMMARY_KEYS = ("total_events",) + GROUPS
+
+
+def _iso(value: Union[str, datetime, None]) -> Optional[str]:
+    """Time range bound as an ISO string."""
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _matcher(
+    event_type: Optional[str],
+    campaign_id: Optional[str],
+    start: Optional[str],
+    end: Optional[str]
+) -> Callable[[Dict], bool]:
+    """Predicate for the get_events filters (falsy filters match anything)."""
+    def matches(event: Dict) -> bool:
+        if event_type and event.get("event_type") != event_type:
+            return False
+        if campaign_id and event.get("campaign_id") != campaign_id:
+            return False
+        if start is not None or end is not None:
+            timestamp = event.get("timestamp")
+            if timestamp is None:
+                return False
+            if start is not None and timestamp < start:
+                return False
+            if end is not None and timestamp >= end:
+                return False
+        return True
+    return matches
+
+
+def _open_append(path: Path) -> int:
+    """Open a log file for appending (O_APPEND), returning the descriptor."""
+    return os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o666)
+
+
+def _append(fd: int, data: bytes, file_lock: bool = False) -> int:
+    """
+    Append data to a log file with a single write.
+
+    On an O_APPEND descriptor the kernel moves to the end of the file and
+    writes in one step, so concurrent appenders (threads or processes)
+    never interleave within one write; with file_lock, an exclusive
+    flock() also covers the rare short write (e.g. a nearly full disk)
+    and filesystems that don't make appends atomic.
+
+    Args:
+        fd: Descriptor from _open_append
+        data: Complete encoded records
+        file_lock: Hold an exclusive advisory lock on the file while writing
+
+    Returns:
+        Byte offset the data was written at
+    """
+    if file_lock:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        written = os.write(fd, data)
+        while written < len(data):
+            written += os.write(fd, data[written:])
+        # O_APPEND leaves the position at the end of what we just wrote
+        end = os.lseek(fd, 0, os.SEEK_CUR)
+    finally:
+        if file_lock:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    return end - len(data)
+
+
+class _BufferedWriter:
+    """
+    Background thread appending encoded events to one open log file.
+
+    Producers put encoded records on a bounded queue (blocking when it is
+    full); the thread drains it in batches, so the hot path costs a queue
+    put instead of an open/append/close per event. Pending records are
+    written with one append per flush, so a record is never split across
+    writes (see _append).
+    """
+
+    # Records written per drained batch at most
+    BATCH_SIZE = 1024
+
+    # Pending bytes that trigger a write before the next flush
+    WRITE_BYTES = 1 << 20
+
+    # Queue control message to stop the thread; flush requests are queued
+    # as (threading.Event, fsync) tuples and records as (bytes, sidecar keys)
+    _CLOSE = object()
+
+    def __init__(
+        self,
+        path: Path,
+        queue_size: int,
+        flush_every: Optional[int],
+        fsync_interval: Optional[float],
+        sidecars: Sequence[Any] = (),
+        lock: Optional[threading.RLock] = None,
+        rotation_due: Optional[Callable[[int], bool]] = None,
+        rotate: Optional[Callable[[], None]] = None,
+        file_lock: bool = False
+    ):
+        self.path = path
+        self.flush_every = flush_every
+        self.fsync_interval = fsync_interval
+        # Index/summary updated with each record's offset, under lock
+        self.sidecars = tuple(sidecars)
+        self.lock = lock or threading.RLock()
+        # Log rotation: checked after each record, run with the file closed
+        self.rotation_due = rotation_due
+        self.rotate = rotate
+        # Hold an exclusive flock() around each write (multi-process logs)
+        self.file_lock = file_lock
+        self.error: Optional[BaseException] = None
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._pending: List[bytes] = []
+        self._pending_keys: List[tuple] = []
+        self._pending_bytes = 0
+        self._fd = _open_append(path)
+        # Log size after our last write (for rotation, which has one writer)
+        self._size = os.fstat(self._fd).st_size
+        self._thread = threading.Thread(
+            target=self._run, name=f"audit-writer:{path.name}", daemon=True
+        )
+        self._thread.start()
+
+    def put(self, record: bytes, keys: tuple = ()):
+        """Queue one encoded record (blocks while the queue is full)."""
+        self._queue.put((record, keys))
+
+    def flush(self, fsync: bool = False):
+        """Block until every record queued so far is written to the OS."""
+        done = threading.Event()
+        self._queue.put((done, fsync))
+        done.wait()
+
+    def close(self):
+        """Write all queued records, sync the file and stop the thread."""
+        self._queue.put(self._CLOSE)
+        self._thread.join()
+
+    def _run(self):
+        unflushed = 0
+        unsynced = False
+        last_fsync = time.monotonic()
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.fsync_interval)]
+            except queue.Empty:
+                batch = []
+            while batch and len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for item in batch:
+                if item is self._CLOSE:
+                    self._finish(sync=unsynced)
+                    return
+                if isinstance(item[0], threading.Event):
+                    done, fsync = item
+                    self._write(flush=True, fsync=fsync)
+                    unflushed = 0
+                    unsynced = unsynced and not fsync
+                    done.set()
+                    continue
+                self._write(*item)
+                unflushed += 1
+                unsynced = True
+                if self.flush_every and unflushed >= self.flush_every:
+                    self._write(flush=True)
+                    unflushed = 0
+
+            # Without flush_every, flush whenever the queue runs dry
+            if not self.flush_every and unflushed:
+                self._write(flush=True)
+                unflushed = 0
+
+            if (
+                self.fsync_interval is not None and unsynced
+                and time.monotonic() - last_fsync >= self.fsync_interval
+            ):
+                self._write(flush=True, fsync=True)
+                unflushed = 0
+                unsynced = False
+                last_fsync = time.monotonic()
+
+    def _write(
+        self,
+        record: Optional[bytes] = None,
+        keys: tuple = (),
+        flush: bool = False,
+        fsync: bool = False
+    ):
+        """Buffer/flush/fsync, remembering the first I/O error instead of raising."""
+        if self.error is not None:
+            return
+        try:
+            if record is not None:
+                self._pending.append(record)
+                self._pending_keys.append(keys)
+                self._pending_bytes += len(record)
+                if self._pending_bytes >= self.WRITE_BYTES or (
+                    self.rotation_due is not None
+                    and self.rotation_due(self._size + self._pending_bytes)
+                ):
+                    self._write_pending()
+            if flush or fsync:
+                self._write_pending()
+                for sidecar in self.sidecars:
+                    sidecar.flush()
+            if fsync:
+                os.fsync(self._fd)
+        except OSError as e:
+            self.error = e
+
+    def _write_pending(self):
+        """Append pending records in one write, then tell the sidecars their offsets."""
+        if not self._pending:
+            return
+        records, keys = self._pending, self._pending_keys
+        self._pending, self._pending_keys, self._pending_bytes = [], [], 0
+        with self.lock:
+            offset = _append(self._fd, b"".join(records), self.file_lock)
+            for record, record_keys in zip(records, keys):
+                for sidecar, sidecar_keys in zip(self.sidecars, record_keys):
+                    sidecar.add(offset, len(record), sidecar_keys)
+                offset += len(record)
+            self._size = offset
+            if self.rotation_due is not None and self.rotation_due(offset):
+                os.close(self._fd)
+                self.rotate()
+                self._fd = _open_append(self.path)
+                self._size = os.fstat(self._fd).st_size
+
+    def _finish(self, sync: bool):
+        """Final flush (and fsync if durability was requested), then close."""
+        self._write(flush=True, fsync=sync and self.fsync_interval is not None)
+        try:
+            os.close(self._fd)
+        except OSError as e:
+            self.error = self.error or e
+
 
 class AuditLogger:
     """
@@ -24,18 +296,109 @@ class AuditLogger:
     - Root cause analysis and recommendations
     """
 
+    # Default bound on queued events in buffered mode
+    QUEUE_SIZE = 10_000
+
+    # Default events per insert transaction for a buffered SQLite logger
+    DB_BATCH_SIZE = 1000
+
     def __init__(
         self,
-        log_file: str = "audit_log.jsonl",
-        log_dir: Optional[str] = None
+        log_file: Optional[str] = None,
+        log_dir: Optional[str] = None,
+        codec: Union[str, Codec, None] = None,
+        buffered: bool = False,
+        queue_size: int = QUEUE_SIZE,
+        flush_every: Optional[int] = None,
+        fsync_interval: Optional[float] = None,
+        indexed: bool = False,
+        summary_checkpoint: bool = True,
+        rotate_bytes: Optional[int] = None,
+        rotate_interval: Optional[float] = None,
+        compression: Optional[str] = "gzip",
+        keep_segments: Optional[int] = None,
+        database_url: Optional[str] = None,
+        multiprocess: bool = False
     ):
         """
         Initialize audit logger.
 
         Args:
-            log_file: Name of log file (JSONL format)
+            log_file: Name of log file (default: audit_log.jsonl, or
+                      audit_log.msgpack for the msgpack codec)
             log_dir: Directory for log files (default: current directory)
+            codec: Event codec name or instance (default: "json")
+            buffered: Write through a background thread holding one open
+                      file handle; call flush()/close() (or use the logger
+                      as a context manager) to make events visible
+            queue_size: Maximum queued events in buffered mode; log calls
+                        block while the queue is full
+            flush_every: In buffered mode, flush to the OS every N events
+                         (default: whenever the queue runs dry)
+            fsync_interval: In buffered mode, fsync at most this many
+                            seconds after an event is written (default: never)
+            indexed: Maintain a sidecar index ("<log>.idx") of byte offsets
+                     per campaign_id and event_type, so filtered get_events
+                     calls read only matching records
+            summary_checkpoint: Persist the summary counters behind
+                                get_summary_stats in "<log>.summary.json",
+                                so a new logger resumes them instead of
+                                re-reading the log
+            rotate_bytes: Rotate the log into a numbered segment once it
+                          reaches this many bytes (default: never)
+            rotate_interval: Rotate the log once it is this many seconds
+                             old (default: never)
+            compression: Compression of rotated segments: "gzip", "zstd"
+                         (needs zstandard) or None
+            keep_segments: Delete the oldest rotated segments beyond this
+                           many (default: keep all)
+            database_url: Store events in SQLite instead of a log file,
+                          e.g. "sqlite:///audit_logs.db". Buffered loggers
+                          insert in transactions of flush_every events
+                          (default: DB_BATCH_SIZE); unbuffered ones commit
+                          every event. Sidecar index, summary checkpoint
+                          and rotation options don't apply.
+            multiprocess: Several processes append to this log file (e.g.
+                          sharded workers): every append holds an exclusive
+                          flock() on the log, and summary counters catch up
+                          with the log on read instead of on append. Can't
+                          be combined with indexed=True or rotation.
+
+        Raises:
+            ValueError: If database_url is combined with indexed=True or
+                        rotation, or isn't a sqlite:/// URL; or if
+                        multiprocess is combined with indexed=True or
+                        rotation, or unsupported on this platform
         """
+        self.codec = get_codec(codec)
+        self.buffered = buffered
+        self.queue_size = queue_size
+        self.flush_every = flush_every
+        self.fsync_interval = fsync_interval
+        self.multiprocess = multiprocess
+        self._writer: Optional[_BufferedWriter] = None
+
+        self.store: Optional[SqliteAuditStore] = None
+        if database_url:
+            if indexed or rotate_bytes is not None or rotate_interval is not None:
+                raise ValueError("indexed and rotation options need a log file, not database_url")
+            batch_size = (flush_every or self.DB_BATCH_SIZE) if buffered else 1
+            self.store = SqliteAuditStore(sqlite_path(database_url), self.codec, batch_size)
+            self.log_path = Path(self.store.path)
+            self.index = self.summary = self.segments = None
+            if buffered:
+                atexit.register(self.close)
+            return
+
+        if multiprocess:
+            if indexed or rotate_bytes is not None or rotate_interval is not None:
+                # Each process would write its own sidecar entries and rotate
+                # the file out from under the others
+                raise ValueError("indexed and rotation options need a single writer process")
+            if fcntl is None:
+                raise ValueError("multiprocess=True needs fcntl (POSIX)")
+
+        log_file = log_file or f"audit_log{self.codec.stream_extension}"
         if log_dir:
             self.log_dir = Path(log_dir)
             self.log_dir.mkdir(parents=True, exist_ok=True)
@@ -43,6 +406,107 @@ class AuditLogger:
         else:
             self.log_path = Path(log_file)
 
+        self.index = AuditLogIndex(self.log_path, self.codec) if indexed else None
+        self.summary = AuditSummary(self.log_path, self.codec, checkpoint=summary_checkpoint)
+        # Sidecars told the offset of every appended record, under _append_lock.
+        # With other processes appending in between, every add() would rescan
+        # their records, so multi-process summaries only catch up on read.
+        self._sidecars = () if multiprocess else (self.summary,) + ((self.index,) if indexed else ())
+        self.segments = AuditLogSegments(
+            self.log_path, self.codec, rotate_bytes, rotate_interval, compression, keep_segments
+        )
+        self._append_lock = threading.RLock()
+        if buffered:
+            self._start_writer()
+
+    def __enter__(self) -> "AuditLogger":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _start_writer(self):
+        """Start the background writer (buffered mode)."""
+        rotating = self.segments.rotating
+        self._writer = _BufferedWriter(
+            self.log_path, self.queue_size, self.flush_every, self.fsync_interval,
+            self._sidecars, self._append_lock,
+            self.segments.due if rotating else None, self._rotate if rotating else None,
+            file_lock=self.multiprocess
+        )
+        atexit.register(self.close)
+
+    def _check_writer(self):
+        """Re-raise an I/O error hit by the background writer."""
+        if self._writer is not None and self._writer.error is not None:
+            error, self._writer.error = self._writer.error, None
+            raise error
+
+    def flush(self, fsync: bool = False):
+        """
+        Wait until every event logged so far has been written.
+
+        Unbuffered loggers write each event immediately; only the sidecar
+        index (if any) is flushed. Either way the summary checkpoint is
+        brought up to date. SQLite loggers commit pending inserts.
+
+        Args:
+            fsync: Also fsync the log file to stable storage
+
+        Raises:
+            OSError: If the background writer failed to write
+        """
+        if self.store is not None:
+            self.store.flush()
+            return
+        if self._writer is not None:
+            self._writer.flush(fsync)
+            self._check_writer()
+        elif self.index is not None:
+            self.index.flush()
+        self.summary.save()
+
+    def close(self):
+        """
+        Write all pending events and stop the background writer.
+
+        Also closes the sidecar index file, writes the summary checkpoint
+        and waits for segment compression. Safe to call more than once;
+        later events are written unbuffered.
+
+        Raises:
+            OSError: If the background writer failed to write
+        """
+        if self.store is not None:
+            # Commit, but keep the connection for later events
+            self.store.flush()
+            if self.buffered:
+                atexit.unregister(self.close)
+            return
+        if self._writer is not None:
+            self._writer.close()
+            atexit.unregister(self.close)
+            try:
+                self._check_writer()
+            finally:
+                self._writer = None
+        if self.index is not None:
+            self.index.close()
+        self.summary.save()
+        self.segments.wait()
+
+    def _rotate(self):
+        """
+        Close the active log as a segment and start a fresh one.
+
+        Called with _append_lock held and the log file closed.
+        """
+        self.segments.rotate(self.summary.counts())
+        if self.index is not None:
+            self.index.rebuild()
+        self.summary.rebuild()
+        self.summary.save()
+
     def log_event(self, event: Dict[str, Any]):
         """
         Log a generic event.
@@ -54,9 +518,29 @@ class AuditLogger:
         if "timestamp" not in event:
             event["timestamp"] = datetime.utcnow().isoformat()
 
-        # Append to JSONL file
-        with open(self.log_path, "a") as f:
-            f.write(json.dumps(event) + "\n")
+        record = self.codec.encode(event)
+        if self.store is not None:
+            self.store.append(event, record)
+            return
+
+        keys = tuple(sidecar.keys(event) for sidecar in self._sidecars)
+        if self._writer is not None:
+            self._check_writer()
+            self._writer.put(record, keys)
+            return
+
+        # Append one encoded record to the log file
+        with self._append_lock:
+            fd = _open_append(self.log_path)
+            try:
+                offset = _append(fd, record, self.multiprocess)
+            finally:
+                os.close(fd)
+            for sidecar, sidecar_keys in zip(self._sidecars, keys):
+                sidecar.add(offset, len(record), sidecar_keys)
+            if self.segments.rotating and self.segments.due(offset + len(record)):
+                self._rotate()
+        self.summary.flush()
 
     def log_alert(self, alert):
         """
@@ -147,8 +631,11 @@ class AuditLogger:
         actual_spend: float,
         confidence_score: float,
         metadata_match_score: float,
-        name_similarity: float,
-        data_freshness_score: float
+        name_similarity: Optional[float],
+        data_freshness_score: float,
+        as_of: Optional[datetime] = None,
+        name_similarity_max: Optional[float] = None,
+        confidence_score_max: Optional[float] = None
     ):
         """
         Log a spend reconciliation.
@@ -159,8 +646,15 @@ class AuditLogger:
             actual_spend: Actual spend from API
             confidence_score: Overall confidence
             metadata_match_score: Metadata matching score
-            name_similarity: Name similarity score
+            name_similarity: Name similarity score (None: skipped by
+                             threshold gating, in which case the event is
+                             marked "short_circuited" and confidence_score
+                             is a lower bound)
             data_freshness_score: Freshness score
+            as_of: Reference time the scores were computed against
+            name_similarity_max: Upper bound on a skipped name similarity
+            confidence_score_max: Upper bound on the confidence when the
+                                  name similarity was skipped
         """
         event = {
             "event_type": "reconciliation",
@@ -174,6 +668,12 @@ class AuditLogger:
             "data_freshness_score": data_freshness_score,
             "timestamp": datetime.utcnow().isoformat()
         }
+        if as_of is not None:
+            event["as_of"] = as_of.isoformat()
+        if name_similarity is None:
+            event["short_circuited"] = True
+            event["name_similarity_max"] = name_similarity_max
+            event["confidence_score_max"] = confidence_score_max
         self.log_event(event)
 
     def log_error(
@@ -206,7 +706,9 @@ class AuditLogger:
         self,
         event_type: Optional[str] = None,
         campaign_id: Optional[str] = None,
-        limit: Optional[int] = None
+        limit: Optional[int] = None,
+        start_time: Union[str, datetime, None] = None,
+        end_time: Union[str, datetime, None] = None
     ) -> List[Dict]:
         """
         Retrieve events from log file.
@@ -215,97 +717,347 @@ class AuditLogger:
             event_type: Filter by event type
             campaign_id: Filter by campaign ID
             limit: Maximum number of events to return
+            start_time: Only events at or after this time (ISO string or datetime)
+            end_time: Only events before this time (ISO string or datetime)
 
         Returns:
             List of event dictionaries
         """
-        if not self.log_path.exists():
-            return []
+        if self.store is not None:
+            # Let SQL apply the limit
+            self.flush()
+            return list(self.store.iter_events(
+                event_type, campaign_id, _iso(start_time), _iso(end_time), limit
+            ))
 
         events = []
-        with open(self.log_path, "r") as f:
-            for line in f:
-                try:
-                    event = json.loads(line.strip())
+        for event in self.iter_events(event_type, campaign_id, start_time, end_time):
+            events.append(event)
+
+            # Apply limit
+            if limit and len(events) >= limit:
+                break
+
+        return events
+
+    def iter_events(
+        self,
+        event_type: Optional[str] = None,
+        campaign_id: Optional[str] = None,
+        start_time: Union[str, datetime, None] = None,
+        end_time: Union[str, datetime, None] = None
+    ) -> Iterator[Dict]:
+        """
+        Stream events from rotated segments (oldest first), then the log file.
 
-                    # Apply filters
-                    if event_type and event.get("event_type") != event_type:
-                        continue
-                    if campaign_id and event.get("campaign_id") != campaign_id:
-                        continue
+        Only segments whose time range overlaps [start_time, end_time) are
+        read. Takes the same filters as get_events(); event_type and
+        campaign_id filters are answered by the sidecar index if there is
+        one, else by a memory-mapped scan that only decodes records
+        containing the filter values.
 
-                    events.append(event)
+        Yields:
+            Event dictionaries, in log order
+        """
+        self.flush()
+        start, end = _iso(start_time), _iso(end_time)
+        if self.store is not None:
+            yield from self.store.iter_events(event_type, campaign_id, start, end)
+            return
 
-                    # Apply limit
-                    if limit and len(events) >= limit:
-                        break
+        matches = _matcher(event_type, campaign_id, start, end)
+        for entry in self.segments.overlapping(start, end):
+            for event in self.segments.iter_events(entry):
+                if matches(event):
+                    yield event
 
-                except json.JSONDecodeError:
+        if not self.log_path.exists():
+            return
+        if (start or end) and not self.segments.overlaps(self.summary.counts(), start, end):
+            return
+        if self.index is not None and (event_type or campaign_id):
+            yield from filter(matches, self._iter_indexed_events(event_type, campaign_id))
+            return
+        yield from filter(matches, scan_events(self.log_path, self.codec, event_type, campaign_id))
+
+    def tail_events(
+        self,
+        limit: int,
+        event_type: Optional[str] = None,
+        campaign_id: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        Retrieve the latest events, e.g. the last 10 for a campaign.
+
+        Reads the log file backwards from its end (then older segments,
+        newest first), stopping once limit events matched.
+
+        Args:
+            limit: Maximum number of events to return
+            event_type: Filter by event type
+            campaign_id: Filter by campaign ID
+
+        Returns:
+            The last limit matching events, in log order
+        """
+        if limit <= 0:
+            return []
+        self.flush()
+        if self.store is not None:
+            return list(self.store.iter_events(
+                event_type, campaign_id, limit=limit, newest_first=True
+            ))[::-1]
+
+        matches = _matcher(event_type, campaign_id, None, None)
+        events = list(islice(
+            filter(matches, scan_events_reverse(self.log_path, self.codec, event_type, campaign_id)),
+            limit
+        ))
+        for entry in reversed(self.segments.entries()):
+            if len(events) >= limit:
+                break
+            # Segments are compressed, so read forward keeping only the tail
+            tail = deque(
+                filter(matches, self.segments.iter_events(entry)), maxlen=limit - len(events)
+            )
+            events.extend(reversed(tail))
+        return events[::-1]
+
+    def _iter_indexed_events(
+        self,
+        event_type: Optional[str],
+        campaign_id: Optional[str]
+    ) -> Iterator[Dict]:
+        """Events of the log file at the offsets the index has for the filters."""
+        with open(self.log_path, "rb") as f:
+            for offset, length in self.index.lookup(event_type, campaign_id):
+                f.seek(offset)
+                try:
+                    # The index only narrows candidates; callers re-check filters
+                    yield self.codec.decode(f.read(length))
+                except ValueError:
                     continue
 
-        return events
+    def rebuild_index(self) -> Dict[str, Any]:
+        """
+        Rebuild the sidecar index from the log.
+
+        Returns:
+            Index statistics after the rebuild
+
+        Raises:
+            ValueError: If the logger was created without indexed=True
+        """
+        if self.index is None:
+            raise ValueError("AuditLogger was created without indexed=True")
+        self.flush()
+        self.index.rebuild()
+        return self.index.stats()
 
     def get_summary_stats(self) -> Dict[str, Any]:
         """
         Get summary statistics from audit log.
 
+        Counters are maintained as events are logged (and resumed from the
+        summary checkpoint and the segment manifest), so this only counts
+        events other writers appended since; see reconcile_summary_stats()
+        to recount.
+
         Returns:
             Dictionary with aggregated statistics
         """
-        if not self.log_path.exists():
-            return {
-                "total_events": 0,
-                "event_types": {},
-                "alerts_by_severity": {},
-                "decisions_by_type": {},
-            }
-
-        events = self.get_events()
-
-        # Count by event type
-        event_types = {}
-        alerts_by_severity = {}
-        decisions_by_type = {}
-
-        for event in events:
-            event_type = event.get("event_type", "unknown")
-            event_types[event_type] = event_types.get(event_type, 0) + 1
-
-            if event_type == "pacing_alert":
-                severity = event.get("severity", "unknown")
-                alerts_by_severity[severity] = alerts_by_severity.get(severity, 0) + 1
-
-            if event_type == "agent_decision":
-                decision = event.get("decision", "unknown")
-                decisions_by_type[decision] = decisions_by_type.get(decision, 0) + 1
-
-        return {
-            "total_events": len(events),
-            "event_types": event_types,
-            "alerts_by_severity": alerts_by_severity,
-            "decisions_by_type": decisions_by_type,
-            "log_file": str(self.log_path),
-            "log_size_bytes": self.log_path.stat().st_size if self.log_path.exists() else 0
-        }
+        self.flush()
+        if self.store is not None:
+            stats = self.store.counts()
+            stats["log_file"] = str(self.log_path)
+            stats["log_size_bytes"] = self.store.size_bytes()
+            return stats
+
+        segments = self.segments.entries()
+        if not self.log_path.exists() and not segments:
+            return {key: value for key, value in empty_counts().items() if key in SUMMARY_KEYS}
+
+        counts = self.summary.counts() if self.log_path.exists() else empty_counts()
+        if segments:
+            total = self.segments.counts()
+            merge_counts(total, counts)
+            counts = total
+        stats = {key: counts[key] for key in SUMMARY_KEYS}
+        stats["log_file"] = str(self.log_path)
+        stats["log_size_bytes"] = (
+            self.log_path.stat().st_size if self.log_path.exists() else 0
+        ) + self.segments.stored_bytes()
+        if segments:
+            stats["segments"] = len(segments)
+        return stats
+
+    def aggregate(
+        self,
+        group_by: Optional[str] = "platform",
+        start_time: Union[str, datetime, None] = None,
+        end_time: Union[str, datetime, None] = None,
+        workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Aggregate the full log (and its segments) in parallel.
+
+        The log file is split at record boundaries and every part (and
+        every rotated segment in the time range) is aggregated in a worker
+        process; see audit_analytics. SQLite loggers aggregate serially.
+
+        Args:
+            group_by: Per-group counters by "platform", "campaign_id",
+                      "event_type", "day" or "hour" (None: no groups)
+            start_time: Only events at or after this time
+            end_time: Only events before this time
+            workers: Worker processes (default: one per CPU; 1 aggregates
+                     in this process)
+
+        Returns:
+            Dictionary with the get_summary_stats counters, first/last
+            timestamps, "groups" (events, reconciliations, alerts,
+            decisions, escalations, halts and escalation_rate per group),
+            "histograms" (bin edges and counts of variance_pct and
+            confidence_score over reconciliations) and "group_by"
+
+        Raises:
+            ValueError: If group_by is unknown
+        """
+        if group_by is not None and group_by not in GROUP_BY:
+            raise ValueError(f"Unknown group_by '{group_by}'. Available: {', '.join(GROUP_BY)}")
+        self.flush()
+        start, end = _iso(start_time), _iso(end_time)
+
+        if self.store is not None:
+            result = empty_aggregate()
+            for event in self.store.iter_events(start=start, end=end):
+                add_event(result, event, group_by)
+            result = finish_aggregate(result)
+        else:
+            workers = workers or os.cpu_count() or 1
+            # Compressed segments are final, so workers can open them by name
+            self.segments.wait()
+            tasks = [
+                (str(self.log_path.with_name(entry["file"])), self.codec.name, 0, None,
+                 entry["compression"], group_by, (start, end))
+                for entry in self.segments.overlapping(start, end)
+            ]
+            if self.log_path.exists() and (
+                not (start or end) or self.segments.overlaps(self.summary.counts(), start, end)
+            ):
+                parts = workers * PARTS_PER_WORKER if workers > 1 else 1
+                tasks.extend(
+                    (str(self.log_path), self.codec.name, part_start, part_end,
+                     None, group_by, (start, end))
+                    for part_start, part_end in split_log(self.log_path, self.codec, parts)
+                )
+            result = aggregate_parts(tasks, workers)
+        result["group_by"] = group_by
+        return result
+
+    def reconcile_summary_stats(self) -> Dict[str, Any]:
+        """
+        Recompute the summary counters from the full log.
+
+        Rewrites the summary checkpoint (and the counters of rotated
+        segments in the manifest). Use it to audit the incremental
+        counters, or after editing the log by hand.
+
+        Returns:
+            get_summary_stats() result after recounting, plus "drift":
+            recounted minus previous counts per key that differed (empty
+            when the counters were correct; always for SQLite, which
+            counts in SQL)
+        """
+        if self.store is not None:
+            stats = self.get_summary_stats()
+            stats["drift"] = {}
+            return stats
+
+        self.flush()
+        self.segments.wait()
+        before = self.segments.recount()
+        merge_counts(before, self.summary.rebuild())
+        self.summary.save()
+        stats = self.get_summary_stats()
+        stats["drift"] = counts_drift(before, stats)
+        return stats
 
     def clear_log(self):
         """
-        Clear the audit log file.
+        Clear the audit log file and its rotated segments.
 
         WARNING: This will delete all audit records.
         """
+        if self.store is not None:
+            self.store.clear()
+            print(f"✅ Cleared audit database: {self.log_path}")
+            return
+
+        buffered = self._writer is not None
+        self.close()
         if self.log_path.exists():
             self.log_path.unlink()
+        self.segments.clear()
+        if self.index is not None:
+            self.index.rebuild()
+        self.summary.rebuild()
+        self.summary.save()
+        if buffered:
+            self._start_writer()
         print(f"✅ Cleared audit log: {self.log_path}")
 
-    def export_to_json(self, output_file: str):
+    def export_to_json(
+        self,
+        output_file: str,
+        start_time: Union[str, datetime, None] = None,
+        end_time: Union[str, datetime, None] = None
+    ):
         """
         Export audit log to formatted JSON file.
 
+        Events are streamed from every segment and the log file, so memory
+        use doesn't grow with the log.
+
         Args:
             output_file: Output JSON file path
+            start_time: Only events at or after this time
+            end_time: Only events before this time
         """
-        events = self.get_events()
+        count = 0
         with open(output_file, "w") as f:
-            json.dump(events, f, indent=2)
-        print(f"✅ Exported {len(events)} events to {output_file}")
+            # Same layout as json.dump(events, f, indent=2)
+            for event in self.iter_events(start_time=start_time, end_time=end_time):
+                f.write(",\n" if count else "[\n")
+                f.write(textwrap.indent(json.dumps(event, indent=2), "  "))
+                count += 1
+            f.write("\n]" if count else "[]")
+        print(f"✅ Exported {count} events to {output_file}")
+
+    def export_to_parquet(
+        self,
+        output_file: str,
+        start_time: Union[str, datetime, None] = None,
+        end_time: Union[str, datetime, None] = None,
+        batch_size: int = ROW_GROUP_SIZE
+    ):
+        """
+        Export audit events to a columnar Parquet (or Arrow IPC) file.
+
+        Events are streamed from every segment and the log file into typed
+        columns (see columnar.AUDIT_COLUMNS; other fields go to a JSON
+        "extra" column), one row group per batch_size events. Needs pyarrow.
+
+        Args:
+            output_file: Output path (".arrow"/".feather" for Arrow IPC)
+            start_time: Only events at or after this time
+            end_time: Only events before this time
+            batch_size: Events per row group
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        with ColumnarWriter(output_file, AUDIT_COLUMNS, batch_size) as writer:
+            for event in self.iter_events(start_time=start_time, end_time=end_time):
+                writer.write(event)
+        print(f"✅ Exported {writer.rows} events to {output_file}")
@@ -0,0 +1,182 @@
+"""
+Memory-mapped, prefiltered scans of an audit log file.
+
+A filtered AuditLogger.get_events used to decode every record of the log
+and then discard most of them. scan_events() maps the log and first looks
+for the filters' encoded bytes (e.g. b'"google_007"' in a JSONL log,
+whatever separators it was written with; see Codec.field_needle), decoding only records that contain
+them:
+- JSONL logs jump from match to match with mmap.find, so non-matching
+  lines are never copied out of the map
+- MessagePack logs walk the frame headers and search each payload in place
+
+scan_events_reverse() yields the newest records first, reading a JSONL log
+backwards from its end, so "latest N events for campaign X" only touches
+the log's tail.
+
+The prefilter only skips records that can't match; it may let through a
+record that merely contains the needle (e.g. in a nested dict), so callers
+re-check their filters on the decoded events.
+"""
+
+import mmap
+import os
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.utils.codecs import Codec, JsonCodec, MsgpackCodec
+
+
+def _needles(codec: Codec, event_type: Optional[str], campaign_id: Optional[str]) -> List[bytes]:
+    """Prefilter needles for the filters, the (usually) most selective first."""
+    needles = []
+    for key, value in (("campaign_id", campaign_id), ("event_type", event_type)):
+        if value:
+            needle = codec.field_needle(key, value)
+            if needle is not None:
+                needles.append(needle)
+    return needles
+
+
+@contextmanager
+def _mapped(path: Path) -> Iterator[Optional[mmap.mmap]]:
+    """The file mapped read-only; None if it is missing or empty."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        yield None
+        return
+    with f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield None
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
+def _decode(codec: Codec, frame: bytes) -> Optional[Dict[str, Any]]:
+    """Decode one frame, or None if it is corrupt (skipped like iter_decode does)."""
+    try:
+        return codec.decode(frame)
+    except ValueError:
+        return None
+
+
+def _line_at(mm: mmap.mmap, hit: int, start: int, end: int) -> Tuple[int, int]:
+    """Span of the line containing position hit, within [start, end)."""
+    line_start = mm.rfind(b"\n", start, hit) + 1 or start
+    line_end = mm.find(b"\n", hit, end)
+    return line_start, end if line_end < 0 else line_end + 1
+
+
+def scan_events(
+    log_path: Path,
+    codec: Codec,
+    event_type: Optional[str] = None,
+    campaign_id: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the records of a log that may match the filters, in log order.
+
+    Args:
+        log_path: Audit log file
+        codec: Codec the log is written with
+        event_type: Event type filter (falsy: any)
+        campaign_id: Campaign ID filter (falsy: any)
+
+    Yields:
+        Decoded candidate events (callers re-check the filters)
+    """
+    needles = _needles(codec, event_type, campaign_id)
+    if not needles or not isinstance(codec, (JsonCodec, MsgpackCodec)):
+        if Path(log_path).exists():
+            with open(log_path, "rb") as f:
+                yield from codec.iter_decode(f)
+        return
+
+    with _mapped(log_path) as mm:
+        if mm is None:
+            return
+        if isinstance(codec, MsgpackCodec):
+            for offset, payload, end in codec.frames(mm):
+                if all(mm.find(needle, payload, end) >= 0 for needle in needles):
+                    event = _decode(codec, mm[offset:end])
+                    if event is not None:
+                        yield event
+            return
+
+        first, rest = needles[0], needles[1:]
+        size = len(mm)
+        position = 0
+        while True:
+            hit = mm.find(first, position)
+            if hit < 0:
+                return
+            start, end = _line_at(mm, hit, position, size)
+            line = mm[start:end]
+            if all(needle in line for needle in rest):
+                event = _decode(codec, line)
+                if event is not None:
+                    yield event
+            position = end
+
+
+def scan_events_reverse(
+    log_path: Path,
+    codec: Codec,
+    event_type: Optional[str] = None,
+    campaign_id: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream the records of a log that may match the filters, newest first.
+
+    JSONL logs are read backwards from the end of the file, so stopping
+    after a few events reads only the log's tail. MessagePack frames can't
+    be walked backwards; their candidate frames are located with a forward
+    scan (without decoding) and then decoded newest first.
+
+    Args:
+        log_path: Audit log file
+        codec: Codec the log is written with
+        event_type: Event type filter (falsy: any)
+        campaign_id: Campaign ID filter (falsy: any)
+
+    Yields:
+        Decoded candidate events, newest first (callers re-check the filters)
+    """
+    needles = _needles(codec, event_type, campaign_id)
+    if not isinstance(codec, (JsonCodec, MsgpackCodec)):
+        yield from reversed(list(scan_events(log_path, codec, event_type, campaign_id)))
+        return
+
+    with _mapped(log_path) as mm:
+        if mm is None:
+            return
+        if isinstance(codec, MsgpackCodec):
+            candidates = [
+                (offset, end) for offset, payload, end in codec.frames(mm)
+                if all(mm.find(needle, payload, end) >= 0 for needle in needles)
+            ]
+            for offset, end in reversed(candidates):
+                event = _decode(codec, mm[offset:end])
+                if event is not None:
+                    yield event
+            return
+
+        # Like iter_decode, a last line without a newline still counts
+        end = len(mm)
+        while end > 0:
+            if needles:
+                hit = mm.rfind(needles[0], 0, end)
+                if hit < 0:
+                    return
+                start, line_end = _line_at(mm, hit, 0, end)
+            else:
+                start, line_end = mm.rfind(b"\n", 0, end - 1) + 1, end
+            line = mm[start:line_end]
+            if all(needle in line for needle in needles[1:]):
+                event = _decode(codec, line)
+                if event is not None:
+                    yield event
+            end = start
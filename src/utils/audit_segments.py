@@ -0,0 +1,397 @@
+"""
+Rotating, compressed segments of the audit log.
+
+A 24/7 deployment can't let one audit log grow without bound. With
+rotation enabled, the active log ("audit_log.jsonl") is closed once it
+reaches a size or age limit and renamed to a numbered segment
+("audit_log.000001.jsonl"), which a background thread then compresses
+("audit_log.000001.jsonl.gz", or ".zst" with zstandard installed). A
+manifest ("audit_log.jsonl.manifest.json") records each segment's file,
+sizes, event counters and time range, so:
+- queries for a time range read only the segments overlapping it
+- summary counters of closed segments never need recounting
+- retention (keep_segments) deletes the oldest segments
+
+Segments are append-complete: once rotated they never change, apart from
+being compressed or deleted.
+"""
+
+import gzip
+import io
+import json
+import os
+import shutil
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional
+
+from src.utils.audit_summary import empty_counts, merge_counts, tally
+from src.utils.codecs import Codec
+
+try:
+    import zstandard as _zstandard
+except ImportError:  # pragma: no cover - depends on installed extras
+    _zstandard = None
+
+
+# Compression name -> file suffix
+COMPRESSIONS = {
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+
+def _compress(source: Path, target: Path, compression: str):
+    """Compress one file into another."""
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        if compression == "gzip":
+            with gzip.GzipFile(fileobj=dst, mode="wb", compresslevel=6, mtime=0) as gz:
+                shutil.copyfileobj(src, gz, 1 << 20)
+        else:
+            _zstandard.ZstdCompressor(level=3).copy_stream(src, dst)
+
+
+def open_compressed(path: Path, compression: Optional[str]) -> BinaryIO:
+    """Open a (possibly compressed) segment for streaming reads."""
+    if compression == "gzip":
+        return gzip.open(path, "rb")
+    if compression == "zstd":
+        if _zstandard is None:
+            raise ImportError("Reading .zst audit segments needs zstandard: pip install zstandard")
+        reader = _zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return io.BufferedReader(reader, 1 << 20)
+    return open(path, "rb")
+
+
+class AuditLogSegments:
+    """
+    Closed segments of an audit log and the manifest describing them.
+
+    Thread-safe. The manifest is re-read whenever another logger changed
+    it on disk, so readers see segments rotated by other loggers.
+    """
+
+    # Manifest file suffix, appended to the log file name
+    SUFFIX = ".manifest.json"
+
+    # Manifest format version
+    VERSION = 1
+
+    def __init__(
+        self,
+        log_path: Path,
+        codec: Codec,
+        rotate_bytes: Optional[int] = None,
+        rotate_interval: Optional[float] = None,
+        compression: Optional[str] = "gzip",
+        keep_segments: Optional[int] = None
+    ):
+        """
+        Initialize segments (manifest loaded lazily on first use).
+
+        Args:
+            log_path: Active audit log file
+            codec: Codec the log is written with
+            rotate_bytes: Rotate once the active log reaches this size
+            rotate_interval: Rotate once the active log is this many seconds old
+            compression: "gzip", "zstd" or None to keep segments uncompressed
+            keep_segments: Delete the oldest segments beyond this many
+
+        Raises:
+            ValueError: If the compression is unknown
+            ImportError: If zstd compression is requested without zstandard
+        """
+        if compression is not None and compression not in COMPRESSIONS:
+            raise ValueError(
+                f"Unknown compression '{compression}'. Available: {', '.join(COMPRESSIONS)}"
+            )
+        if compression == "zstd" and _zstandard is None:
+            raise ImportError("zstd compression needs zstandard: pip install zstandard")
+        self.log_path = Path(log_path)
+        self.path = self.log_path.with_name(self.log_path.name + self.SUFFIX)
+        self.codec = codec
+        self.rotate_bytes = rotate_bytes
+        self.rotate_interval = rotate_interval
+        self.compression = compression
+        self.keep_segments = keep_segments
+        self.lock = threading.RLock()
+        self._manifest: Dict[str, Any] = self._empty_manifest()
+        self._manifest_version: Optional[tuple] = None
+        self._compressing: List[threading.Thread] = []
+
+    @property
+    def rotating(self) -> bool:
+        """Whether this logger rotates the active log."""
+        return self.rotate_bytes is not None or self.rotate_interval is not None
+
+    def due(self, size: int) -> bool:
+        """
+        Check whether the active log should be rotated after an append.
+
+        Args:
+            size: Active log size after the append
+
+        Returns:
+            True if the active log reached its size or age limit
+        """
+        if self.rotate_bytes is not None and size >= self.rotate_bytes:
+            return True
+        if self.rotate_interval is not None:
+            with self.lock:
+                self._ensure_loaded()
+                if self._manifest["active_started"] is None:
+                    # First append to a fresh log starts its clock
+                    self._manifest["active_started"] = time.time()
+                    self._save()
+                return time.time() - self._manifest["active_started"] >= self.rotate_interval
+        return False
+
+    def rotate(self, counts: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Close the active log as the next segment.
+
+        The caller must hold the logger's append lock with the active log
+        closed. Compression runs in the background.
+
+        Args:
+            counts: Summary counters of the active log
+
+        Returns:
+            Manifest entry of the new segment, or None if the log is empty
+        """
+        with self.lock:
+            self._ensure_loaded()
+            if not self.log_path.exists() or not self.log_path.stat().st_size:
+                return None
+            number = self._manifest["next_segment"]
+            raw_path = self.log_path.with_name(
+                f"{self.log_path.stem}.{number:06d}{self.log_path.suffix}"
+            )
+            size = self.log_path.stat().st_size
+            os.replace(self.log_path, raw_path)
+
+            entry = {
+                "segment": number,
+                "file": raw_path.name,
+                "compression": None,
+                "bytes": size,
+                "stored_bytes": size,
+                "rotated_at": datetime.utcnow().isoformat(),
+                "counts": counts,
+            }
+            self._manifest["segments"].append(entry)
+            self._manifest["next_segment"] = number + 1
+            self._manifest["active_started"] = None
+            expired = self._expire()
+            self._save()
+
+            if self.compression is not None:
+                thread = threading.Thread(
+                    target=self._compress_segment, args=(number,),
+                    name=f"audit-compress:{raw_path.name}"
+                )
+                self._compressing = [t for t in self._compressing if t.is_alive()] + [thread]
+                thread.start()
+
+        for old in expired:
+            self._delete_files(old)
+        return entry
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Get the manifest entries of all segments, oldest first."""
+        with self.lock:
+            self._ensure_loaded()
+            return [dict(entry) for entry in self._manifest["segments"]]
+
+    def overlapping(
+        self,
+        start: Optional[str] = None,
+        end: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the segments holding events in a time range.
+
+        Args:
+            start: ISO timestamp, inclusive (None: unbounded)
+            end: ISO timestamp, exclusive (None: unbounded)
+
+        Returns:
+            Manifest entries, oldest first
+        """
+        return [entry for entry in self.entries() if self.overlaps(entry["counts"], start, end)]
+
+    @staticmethod
+    def overlaps(counts: Dict[str, Any], start: Optional[str], end: Optional[str]) -> bool:
+        """Whether counters' time range overlaps [start, end)."""
+        if start is None and end is None:
+            return True
+        if counts["first_timestamp"] is None:
+            return False
+        if start is not None and counts["last_timestamp"] < start:
+            return False
+        return end is None or counts["first_timestamp"] < end
+
+    def iter_events(self, entry: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """
+        Stream the events of one segment.
+
+        Args:
+            entry: Manifest entry from entries()/overlapping()
+
+        Yields:
+            Decoded events, in log order
+        """
+        with self._open(entry) as f:
+            yield from self.codec.iter_decode(f)
+
+    def counts(self) -> Dict[str, Any]:
+        """Get the merged summary counters of all segments."""
+        total = empty_counts()
+        for entry in self.entries():
+            merge_counts(total, entry["counts"])
+        return total
+
+    def stored_bytes(self) -> int:
+        """Get the on-disk size of all segments."""
+        return sum(entry["stored_bytes"] for entry in self.entries())
+
+    def recount(self) -> Dict[str, Any]:
+        """
+        Recompute every segment's counters from its events.
+
+        Returns:
+            Merged counters before recounting
+        """
+        with self.lock:
+            before = self.counts()
+            for entry in self._manifest["segments"]:
+                entry["counts"] = tally(self.iter_events(entry))
+            self._save()
+            return before
+
+    def wait(self):
+        """Block until background compression has finished."""
+        with self.lock:
+            threads, self._compressing = self._compressing, []
+        for thread in threads:
+            thread.join()
+
+    def clear(self):
+        """Delete every segment and the manifest."""
+        self.wait()
+        with self.lock:
+            self._ensure_loaded()
+            entries = self._manifest["segments"]
+            self._manifest = self._empty_manifest()
+            if self.path.exists():
+                self.path.unlink()
+            self._manifest_version = None
+        for entry in entries:
+            self._delete_files(entry)
+
+    @staticmethod
+    def _empty_manifest() -> Dict[str, Any]:
+        return {"next_segment": 1, "active_started": None, "segments": []}
+
+    def _ensure_loaded(self):
+        """(Re)load the manifest if it changed on disk."""
+        try:
+            stat = self.path.stat()
+            # Every save replaces the file, so the inode identifies a version
+            version = (stat.st_ino, stat.st_mtime_ns)
+        except FileNotFoundError:
+            version = None
+        if version == self._manifest_version:
+            return
+        self._manifest_version = version
+        if version is None:
+            self._manifest = self._empty_manifest()
+            return
+        with open(self.path) as f:
+            manifest = json.load(f)
+        if manifest.get("version") != self.VERSION:
+            raise ValueError(f"Unsupported audit manifest version in {self.path}")
+        self._manifest = {key: manifest[key] for key in self._empty_manifest()}
+
+    def _save(self):
+        """Write the manifest atomically."""
+        manifest = {"version": self.VERSION}
+        manifest.update(self._manifest)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, self.path)
+        stat = self.path.stat()
+        self._manifest_version = (stat.st_ino, stat.st_mtime_ns)
+
+    def _expire(self) -> List[Dict[str, Any]]:
+        """Drop the oldest entries beyond keep_segments (files deleted by the caller)."""
+        segments = self._manifest["segments"]
+        if self.keep_segments is None or len(segments) <= self.keep_segments:
+            return []
+        expired = segments[:len(segments) - self.keep_segments]
+        self._manifest["segments"] = segments[len(expired):]
+        return expired
+
+    def _entry(self, number: int) -> Optional[Dict[str, Any]]:
+        for entry in self._manifest["segments"]:
+            if entry["segment"] == number:
+                return entry
+        return None
+
+    def _open(self, entry: Dict[str, Any]) -> BinaryIO:
+        """Open a segment, following it if it was compressed meanwhile."""
+        path = self.log_path.with_name(entry["file"])
+        try:
+            return open_compressed(path, entry["compression"])
+        except FileNotFoundError:
+            with self.lock:
+                self._ensure_loaded()
+                current = self._entry(entry["segment"])
+            if current is None or current["file"] == entry["file"]:
+                raise
+            return open_compressed(self.log_path.with_name(current["file"]), current["compression"])
+
+    def _compress_segment(self, number: int):
+        """Compress one raw segment and point the manifest at the result."""
+        with self.lock:
+            entry = self._entry(number)
+        if entry is None:
+            return
+        raw_path = self.log_path.with_name(entry["file"])
+        compressed_path = raw_path.with_name(raw_path.name + COMPRESSIONS[self.compression])
+        tmp_path = compressed_path.with_name(compressed_path.name + ".tmp")
+        try:
+            _compress(raw_path, tmp_path, self.compression)
+            os.replace(tmp_path, compressed_path)
+        except OSError:
+            # Keep serving the raw segment
+            if tmp_path.exists():
+                tmp_path.unlink()
+            return
+
+        with self.lock:
+            self._ensure_loaded()
+            entry = self._entry(number)
+            if entry is not None:
+                entry["file"] = compressed_path.name
+                entry["compression"] = self.compression
+                entry["stored_bytes"] = compressed_path.stat().st_size
+                self._save()
+        if entry is None:
+            # Expired while compressing
+            compressed_path.unlink()
+        raw_path.unlink(missing_ok=True)
+
+    def _delete_files(self, entry: Dict[str, Any]):
+        """Delete a segment's file, raw or compressed."""
+        raw_name = entry["file"]
+        for suffix in COMPRESSIONS.values():
+            raw_name = raw_name[:-len(suffix)] if raw_name.endswith(suffix) else raw_name
+        raw_path = self.log_path.with_name(raw_name)
+        for path in [raw_path] + [
+            raw_path.with_name(raw_path.name + suffix) for suffix in COMPRESSIONS.values()
+        ]:
+            path.unlink(missing_ok=True)
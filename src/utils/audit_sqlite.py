@@ -0,0 +1,314 @@
+"""
+SQLite storage backend for the audit log.
+
+AuditLogger(database_url="sqlite:///audit_logs.db") stores events in one
+SQLite table instead of a log file:
+- WAL journal, so readers never block the writer (and vice versa)
+- Inserts are batched into one transaction per batch
+- Filter columns (event_type, campaign_id, timestamp, severity, decision)
+  are extracted next to the codec-encoded event, with indexes on
+  (campaign_id, timestamp) and (event_type, timestamp), so filtered
+  queries and summary counts run in SQL
+
+migrate_log() copies an existing JSONL/MessagePack log (including its
+rotated segments) into a database.
+"""
+
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.utils.audit_summary import GROUPS, LABELED_EVENTS
+from src.utils.codecs import Codec
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS audit_events (
+    id INTEGER PRIMARY KEY,
+    event_type TEXT,
+    campaign_id TEXT,
+    timestamp TEXT,
+    severity TEXT,
+    decision TEXT,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_audit_events_campaign_time
+    ON audit_events (campaign_id, timestamp);
+CREATE INDEX IF NOT EXISTS idx_audit_events_type_time
+    ON audit_events (event_type, timestamp);
+"""
+
+INSERT = (
+    "INSERT INTO audit_events (event_type, campaign_id, timestamp, severity, decision, payload) "
+    "VALUES (?, ?, ?, ?, ?, ?)"
+)
+
+# Rows read per fetch while streaming query results
+FETCH_SIZE = 1000
+
+
+def sqlite_path(database_url: str) -> str:
+    """
+    Get the database file of a sqlite:/// URL.
+
+    Args:
+        database_url: e.g. "sqlite:///audit_logs.db" (relative path),
+                      "sqlite:////var/lib/audit.db" (absolute path) or
+                      "sqlite:///:memory:"
+
+    Returns:
+        Path (or ":memory:") for sqlite3.connect
+
+    Raises:
+        ValueError: If the URL isn't a sqlite:/// URL
+    """
+    prefix = "sqlite:///"
+    if not database_url.startswith(prefix) or len(database_url) == len(prefix):
+        raise ValueError(
+            f"Unsupported DATABASE_URL '{database_url}'; expected sqlite:///<path>"
+        )
+    return database_url[len(prefix):]
+
+
+def _column(value: Any) -> Any:
+    """Value for a filter column (SQLite stores str/int/float/None natively)."""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class SqliteAuditStore:
+    """
+    Audit events in a SQLite database.
+
+    Thread-safe; one connection writes (under a lock), and every query
+    streams from its own connection so it never sees a half-written batch.
+    """
+
+    def __init__(self, path: str, codec: Codec, batch_size: int = 1):
+        """
+        Open (and create if needed) an audit database.
+
+        Args:
+            path: Database file, or ":memory:"
+            codec: Codec for the stored event payloads
+            batch_size: Events per insert transaction; pending events are
+                        committed by flush() (1 commits every event)
+        """
+        self.path = path
+        self.codec = codec
+        self.batch_size = max(1, batch_size)
+        self.lock = threading.RLock()
+        self._pending: List[Tuple] = []
+        self._conn = self._connect()
+        self._conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: transactions are explicit BEGIN/COMMIT
+        conn = sqlite3.connect(
+            self.path, isolation_level=None, check_same_thread=False, timeout=30.0
+        )
+        if self.path != ":memory:":
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Safe with WAL: commits survive a process crash, and the
+            # database stays consistent on power loss
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def append(self, event: Dict[str, Any], record: bytes):
+        """
+        Store one event, committing once a batch is full.
+
+        Args:
+            event: Event dict (filter columns are extracted from it)
+            record: The event encoded by the store's codec
+        """
+        row = (
+            _column(event.get("event_type")),
+            _column(event.get("campaign_id")),
+            _column(event.get("timestamp")),
+            _column(event.get("severity")),
+            _column(event.get("decision")),
+            record,
+        )
+        with self.lock:
+            self._pending.append(row)
+            if len(self._pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        """Commit pending events in one transaction."""
+        with self.lock:
+            if not self._pending:
+                return
+            rows, self._pending = self._pending, []
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(INSERT, rows)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def close(self):
+        """Commit pending events and close the connection."""
+        with self.lock:
+            if self._conn is None:
+                return
+            self.flush()
+            self._conn.close()
+            self._conn = None
+
+    def iter_events(
+        self,
+        event_type: Optional[str] = None,
+        campaign_id: Optional[str] = None,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Stream matching events in insertion order.
+
+        Args:
+            event_type: Filter by event type
+            campaign_id: Filter by campaign ID
+            start: Only events at or after this ISO timestamp
+            end: Only events before this ISO timestamp
+            limit: Maximum number of events
+            newest_first: Stream in reverse insertion order instead
+
+        Yields:
+            Event dictionaries
+        """
+        self.flush()
+        clauses, params = [], []
+        for column, value in (("event_type", event_type), ("campaign_id", campaign_id)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(end)
+        sql = "SELECT payload FROM audit_events"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY id DESC" if newest_first else " ORDER BY id"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        conn = self._read_connection()
+        try:
+            cursor = conn.execute(sql, params)
+            while True:
+                rows = cursor.fetchmany(FETCH_SIZE)
+                if not rows:
+                    break
+                for (payload,) in rows:
+                    try:
+                        yield self.codec.decode(payload)
+                    except ValueError:
+                        continue
+        finally:
+            if conn is not self._conn:
+                conn.close()
+
+    def counts(self) -> Dict[str, Any]:
+        """
+        Get summary counters, computed in SQL.
+
+        Returns:
+            Dict with total_events, event_types, alerts_by_severity and
+            decisions_by_type; keys ordered by first appearance like the
+            file backend's counters
+        """
+        self.flush()
+        conn = self._read_connection()
+        try:
+            counts: Dict[str, Any] = {
+                "total_events": conn.execute("SELECT COUNT(*) FROM audit_events").fetchone()[0]
+            }
+            counts["event_types"] = dict(conn.execute(
+                "SELECT COALESCE(event_type, 'unknown'), COUNT(*) FROM audit_events "
+                "GROUP BY event_type ORDER BY MIN(id)"
+            ).fetchall())
+            for event_type, (group, column) in LABELED_EVENTS.items():
+                counts[group] = dict(conn.execute(
+                    f"SELECT COALESCE({column}, 'unknown'), COUNT(*) FROM audit_events "
+                    f"WHERE event_type = ? GROUP BY {column} ORDER BY MIN(id)",
+                    (event_type,)
+                ).fetchall())
+            return {key: counts[key] for key in ("total_events",) + GROUPS}
+        finally:
+            if conn is not self._conn:
+                conn.close()
+
+    def clear(self):
+        """Delete every stored event."""
+        with self.lock:
+            self._pending = []
+            self._conn.execute("DELETE FROM audit_events")
+
+    def size_bytes(self) -> int:
+        """Get the on-disk size of the database (including its WAL)."""
+        if self.path == ":memory:":
+            return 0
+        return sum(
+            path.stat().st_size
+            for path in (Path(self.path), Path(self.path + "-wal"))
+            if path.exists()
+        )
+
+    def _read_connection(self) -> sqlite3.Connection:
+        """A connection for one query (the write connection for in-memory databases)."""
+        if self.path == ":memory:":
+            return self._conn
+        return self._connect()
+
+
+def migrate_log(
+    log_file: str,
+    database_url: str,
+    codec: Optional[str] = None,
+    batch_size: int = 10_000
+) -> int:
+    """
+    Copy an audit log (and its rotated segments) into a SQLite database.
+
+    Events are appended to whatever the database already holds.
+
+    Args:
+        log_file: JSONL or MessagePack audit log
+        database_url: Target sqlite:/// URL
+        codec: Log codec (default: from the file extension); payloads are
+               stored with the same codec
+        batch_size: Events per insert transaction
+
+    Returns:
+        Number of events copied
+    """
+    # Imported here: audit_logger imports this module
+    from src.utils.audit_logger import AuditLogger
+    from src.utils.codecs import codec_for_path, get_codec
+
+    source = AuditLogger(
+        log_file=log_file, codec=get_codec(codec) if codec else codec_for_path(log_file)
+    )
+    store = SqliteAuditStore(sqlite_path(database_url), source.codec, batch_size=batch_size)
+    count = 0
+    try:
+        for event in source.iter_events():
+            store.append(event, source.codec.encode(event))
+            count += 1
+    finally:
+        store.close()
+    return count
@@ -0,0 +1,336 @@
+"""
+Incremental summary counters for the audit log.
+
+AuditLogger.get_summary_stats used to decode the whole log to count events,
+so its cost grew with all history rather than with the run. AuditSummary
+counts events by type, alerts by severity and decisions by type as they
+are appended, and persists the counters in a small checkpoint file
+("<log>.summary.json") together with the number of log bytes they cover:
+- A new logger resumes from the checkpoint and counts only the log tail it
+  doesn't cover yet (appends by other writers, or after a crash)
+- A checkpoint that doesn't describe the log (the log was truncated or
+  replaced) is discarded and the counters are recomputed
+- rebuild() recomputes the counters from the log alone (reconciliation)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from src.utils.codecs import Codec
+
+
+# Counter groups, in get_summary_stats order
+GROUPS = ("event_types", "alerts_by_severity", "decisions_by_type")
+
+# Event type -> field counted per group for that type
+LABELED_EVENTS = {
+    "pacing_alert": ("alerts_by_severity", "severity"),
+    "agent_decision": ("decisions_by_type", "decision"),
+}
+
+
+def empty_counts() -> Dict[str, Any]:
+    """
+    Counters of an empty log.
+
+    Counters are plain dicts: total_events, one dict per group in GROUPS,
+    and the first/last event timestamps (ISO strings, None when empty).
+    """
+    counts: Dict[str, Any] = {"total_events": 0}
+    counts.update((group, {}) for group in GROUPS)
+    counts["first_timestamp"] = counts["last_timestamp"] = None
+    return counts
+
+
+def count_event(counts: Dict[str, Any], keys: Tuple[Any, Any, Optional[str]]):
+    """
+    Count one event into counters, in place.
+
+    Args:
+        counts: Counters from empty_counts()
+        keys: (event_type, label, timestamp) from AuditSummary.keys()
+    """
+    event_type, label, timestamp = keys
+    counts["total_events"] += 1
+    event_types = counts["event_types"]
+    event_types[event_type] = event_types.get(event_type, 0) + 1
+    if label is not None:
+        labels = counts[LABELED_EVENTS[event_type][0]]
+        labels[label] = labels.get(label, 0) + 1
+    if timestamp is not None:
+        if counts["first_timestamp"] is None or timestamp < counts["first_timestamp"]:
+            counts["first_timestamp"] = timestamp
+        if counts["last_timestamp"] is None or timestamp > counts["last_timestamp"]:
+            counts["last_timestamp"] = timestamp
+
+
+def merge_counts(total: Dict[str, Any], counts: Dict[str, Any]):
+    """Add counters (e.g. of another log segment) into total, in place."""
+    total["total_events"] += counts["total_events"]
+    for group in GROUPS:
+        merged = total[group]
+        for key, count in counts[group].items():
+            merged[key] = merged.get(key, 0) + count
+    if counts["first_timestamp"] is not None:
+        if total["first_timestamp"] is None or counts["first_timestamp"] < total["first_timestamp"]:
+            total["first_timestamp"] = counts["first_timestamp"]
+        if total["last_timestamp"] is None or counts["last_timestamp"] > total["last_timestamp"]:
+            total["last_timestamp"] = counts["last_timestamp"]
+
+
+def tally(events: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """Counters of a stream of decoded events."""
+    counts = empty_counts()
+    for event in events:
+        count_event(counts, AuditSummary.keys(event))
+    return counts
+
+
+def counts_drift(before: Dict[str, Any], after: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Differences between two sets of counters.
+
+    Args:
+        before: Counters believed correct (e.g. from the checkpoint)
+        after: Counters recomputed from the log
+
+    Returns:
+        after - before per non-zero difference, e.g.
+        {"total_events": 2, "event_types": {"error": 2}}; empty if equal
+    """
+    drift: Dict[str, Any] = {}
+    total = after["total_events"] - before["total_events"]
+    if total:
+        drift["total_events"] = total
+    for group in GROUPS:
+        changed = {
+            key: after[group].get(key, 0) - before[group].get(key, 0)
+            for key in {**before[group], **after[group]}
+        }
+        changed = {key: delta for key, delta in changed.items() if delta}
+        if changed:
+            drift[group] = changed
+    return drift
+
+
+class AuditSummary:
+    """
+    Event counters of an audit log, maintained as records are appended.
+
+    Thread-safe. Counters are loaded lazily on first use; counts() then
+    costs a stat of the log plus counting whatever was appended by others.
+    Besides the get_summary_stats counters, the first and last event
+    timestamps are tracked, giving the log's time range.
+    """
+
+    # Checkpoint file suffix, appended to the log file name
+    SUFFIX = ".summary.json"
+
+    # Checkpoint format version
+    VERSION = 2
+
+    # Appends between checkpoint writes on flush()
+    CHECKPOINT_EVERY = 10_000
+
+    # Leading log bytes fingerprinted to detect a replaced log
+    HEAD_BYTES = 4096
+
+    def __init__(self, log_path: Path, codec: Codec, checkpoint: bool = True):
+        """
+        Initialize counters (loaded lazily on first use).
+
+        Args:
+            log_path: Audit log file
+            codec: Codec the log is written with
+            checkpoint: Persist counters in "<log>.summary.json"
+        """
+        self.log_path = Path(log_path)
+        self.path = self.log_path.with_name(self.log_path.name + self.SUFFIX)
+        self.codec = codec
+        self.checkpoint_enabled = checkpoint
+        self.lock = threading.RLock()
+        self._loaded = False
+        self._reset()
+
+    def add(self, offset: int, length: int, keys: Tuple[Any, Any, Optional[str]]):
+        """
+        Count a record just appended to the log.
+
+        Args:
+            offset: Byte offset of the record's frame
+            length: Frame length in bytes
+            keys: (event_type, label, timestamp) from keys()
+        """
+        with self.lock:
+            if not self._loaded:
+                self._ensure_loaded()
+            if offset != self.counted_bytes:
+                if offset > self.counted_bytes:
+                    # Someone else appended since; count their records first
+                    self._scan_log(self.counted_bytes)
+                if offset < self.counted_bytes:
+                    # Already picked up by a catch-up scan
+                    return
+            count_event(self._counts, keys)
+            self.counted_bytes = offset + length
+            self._unsaved += 1
+
+    def counts(self) -> Dict[str, Any]:
+        """
+        Get the counters for the whole log.
+
+        Returns:
+            Counters (see empty_counts), copied
+        """
+        with self.lock:
+            self.sync()
+            return self._copy()
+
+    def sync(self):
+        """Count records appended by anyone since the last sync."""
+        with self.lock:
+            self._ensure_loaded()
+            log_size = self.log_path.stat().st_size if self.log_path.exists() else 0
+            if log_size < self.counted_bytes:
+                # Truncated or replaced under us
+                self._recount()
+            elif log_size > self.counted_bytes:
+                self._scan_log(self.counted_bytes)
+
+    def flush(self):
+        """Write the checkpoint if enough appends accumulated since the last one."""
+        with self.lock:
+            if self._unsaved >= self.CHECKPOINT_EVERY:
+                self.save()
+
+    def save(self):
+        """Write the checkpoint if the counters changed since the last one."""
+        with self.lock:
+            if not self.checkpoint_enabled or not self._loaded or not self._unsaved:
+                return
+            if not self.log_path.exists():
+                if self.path.exists():
+                    self.path.unlink()
+                self._unsaved = 0
+                return
+            checkpoint = {
+                "version": self.VERSION,
+                "log_bytes": self.counted_bytes,
+                "head_sha1": self._head_digest(self.counted_bytes),
+            }
+            checkpoint.update(self._counts)
+            # Replace atomically, so a crash never leaves a torn checkpoint;
+            # per-process temp files, as several processes may share the log
+            tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(checkpoint, f)
+            os.replace(tmp_path, self.path)
+            self._unsaved = 0
+
+    def rebuild(self) -> Dict[str, Any]:
+        """
+        Discard the checkpoint and recompute the counters from the log.
+
+        Returns:
+            Counters before the rebuild, to compare with counts()
+        """
+        with self.lock:
+            self._ensure_loaded()
+            before = self._copy()
+            if self.path.exists():
+                self.path.unlink()
+            self._recount()
+            return before
+
+    @staticmethod
+    def keys(event: Dict[str, Any]) -> Tuple[Any, Any, Optional[str]]:
+        """Counter keys (event_type, severity/decision or None, timestamp) of an event."""
+        event_type = event.get("event_type", "unknown")
+        labeled = LABELED_EVENTS.get(event_type)
+        timestamp = event.get("timestamp")
+        if timestamp is not None and not isinstance(timestamp, str):
+            timestamp = timestamp.isoformat() if hasattr(timestamp, "isoformat") else str(timestamp)
+        return event_type, event.get(labeled[1], "unknown") if labeled else None, timestamp
+
+    def _reset(self):
+        self._counts = empty_counts()
+        # End of the last counted record; log bytes past it are uncounted
+        self.counted_bytes = 0
+        # Appends counted since the checkpoint was last written
+        self._unsaved = 0
+        self._head: Optional[str] = None
+
+    def _copy(self) -> Dict[str, Any]:
+        counts = dict(self._counts)
+        counts.update((group, dict(self._counts[group])) for group in GROUPS)
+        return counts
+
+    def _ensure_loaded(self):
+        """Load the checkpoint and catch up with the log, once."""
+        if self._loaded:
+            return
+        self._loaded = True
+        self._reset()
+        if not self.log_path.exists():
+            return
+
+        checkpoint = self._read_checkpoint()
+        log_size = self.log_path.stat().st_size
+        if (
+            checkpoint is None
+            or checkpoint["log_bytes"] > log_size
+            or checkpoint["head_sha1"] != self._head_digest(checkpoint["log_bytes"])
+        ):
+            self._recount()
+            return
+
+        self._counts = {key: checkpoint[key] for key in empty_counts()}
+        self.counted_bytes = checkpoint["log_bytes"]
+        if log_size > self.counted_bytes:
+            self._scan_log(self.counted_bytes)
+
+    def _read_checkpoint(self) -> Optional[Dict[str, Any]]:
+        """The checkpoint, or None if missing, unreadable or from another version."""
+        if not self.checkpoint_enabled or not self.path.exists():
+            return None
+        try:
+            with open(self.path) as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(checkpoint, dict) or checkpoint.get("version") != self.VERSION:
+            return None
+        return checkpoint
+
+    def _recount(self):
+        """Recompute the counters from the whole log."""
+        self._reset()
+        if self.log_path.exists():
+            self._scan_log(0)
+        # Always rewrite the checkpoint after a recount
+        self._unsaved = max(self._unsaved, 1)
+
+    def _scan_log(self, start: int):
+        """Count complete records from a byte offset to the end of the log."""
+        with open(self.log_path, "rb") as f:
+            f.seek(start)
+            for offset, length, event in self.codec.iter_records(f):
+                count_event(self._counts, self.keys(event))
+                self.counted_bytes = offset + length
+                self._unsaved += 1
+
+    def _head_digest(self, log_bytes: int) -> str:
+        """Fingerprint of the first HEAD_BYTES of the log (up to log_bytes)."""
+        size = min(log_bytes, self.HEAD_BYTES)
+        if self._head is not None and size == self.HEAD_BYTES:
+            return self._head
+        with open(self.log_path, "rb") as f:
+            head = f.read(size)
+        digest = hashlib.sha1(head).hexdigest()
+        if len(head) == self.HEAD_BYTES:
+            self._head = digest
+        return digest
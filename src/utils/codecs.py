@@ -0,0 +1,432 @@
+"""
+Pluggable serialization codecs for audit events, run results and models.
+
+Every AuditLogger.log_* call and every saved run goes through a codec:
+- JsonCodec (default): newline-delimited JSON, byte-identical to the
+  original JSONL audit log and pretty-printed run files
+- MsgpackCodec: checksummed, length-prefixed MessagePack records, much
+  cheaper to encode and decode than JSON (needs ormsgpack or msgpack
+  installed)
+
+Codecs also serialize models directly: anything with a to_dict() method,
+datetimes, enums and NumPy scalars are converted the same way by every
+codec, so decode(encode(model)) == model.to_dict() round-trips for JSON
+and MessagePack alike.
+"""
+
+import json
+import struct
+import zlib
+from datetime import date, datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, BinaryIO, Dict, Generator, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    # ormsgpack (Rust) is preferred; msgpack is the pure/C fallback
+    import ormsgpack as _ormsgpack
+except ImportError:  # pragma: no cover - depends on installed extras
+    _ormsgpack = None
+
+try:
+    import msgpack as _msgpack
+except ImportError:  # pragma: no cover - depends on installed extras
+    _msgpack = None
+
+
+def _default(obj: Any) -> Any:
+    """Convert objects the serializers don't handle natively."""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not serializable")
+
+
+class Codec:
+    """
+    Serialization format for a stream of records and for whole documents.
+
+    Subclasses implement encode/iter_decode for append-only record streams
+    (the audit log) and dumps/loads for single documents (saved runs).
+    """
+
+    # Registry name, and file extensions for documents and record streams
+    name = ""
+    extension = ""
+    stream_extension = ""
+
+    def encode(self, record: Any) -> bytes:
+        """
+        Encode one record as a self-delimiting frame for an append-only stream.
+
+        Args:
+            record: Event dict or model with to_dict()
+
+        Returns:
+            Framed bytes, ready to append to a stream
+        """
+        raise NotImplementedError
+
+    def iter_decode(self, stream: BinaryIO) -> Iterator[Dict[str, Any]]:
+        """
+        Decode the records of a stream written with encode().
+
+        Corrupt records are skipped (see each codec for how far a corrupt
+        frame reaches); a truncated trailing record ends the stream.
+
+        Args:
+            stream: Binary file object positioned at a frame boundary
+
+        Yields:
+            Decoded records, in stream order
+        """
+        raise NotImplementedError
+
+    def iter_records(self, stream: BinaryIO) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        """
+        Decode records along with the byte span of their frames.
+
+        Like iter_decode, but only complete frames are yielded, so a record
+        still being appended is never reported.
+
+        Args:
+            stream: Binary file object positioned at a frame boundary
+
+        Yields:
+            (offset, length, record) per frame, offset relative to the file
+        """
+        raise NotImplementedError
+
+    def decode(self, frame: bytes) -> Dict[str, Any]:
+        """
+        Decode a single frame produced by encode().
+
+        Raises:
+            ValueError: If the frame is corrupt
+        """
+        raise NotImplementedError
+
+    def field_needle(self, key: str, value: Any) -> Optional[bytes]:
+        """
+        Bytes found in every frame of a record with record[key] == value.
+
+        Lets a scan skip frames without decoding them. The needle may also
+        occur in frames that don't match (e.g. in a nested dict), never
+        the other way round.
+
+        Args:
+            key: Top-level field name
+            value: Field value
+
+        Returns:
+            Needle bytes, or None if the codec can't prefilter
+        """
+        return None
+
+    def dumps(self, document: Any) -> bytes:
+        """Encode a whole document (e.g. a saved run)."""
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> Any:
+        """Decode a whole document written with dumps()."""
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}()"
+
+
+class JsonCodec(Codec):
+    """Newline-delimited JSON records and indented JSON documents."""
+
+    name = "json"
+    extension = ".json"
+    stream_extension = ".jsonl"
+
+    def __init__(self, indent: int = 2):
+        """
+        Initialize JSON codec.
+
+        Args:
+            indent: Indentation for whole documents (records are one line each)
+        """
+        self.indent = indent
+        self._encoder = json.JSONEncoder(default=_default)
+
+    def encode(self, record: Any) -> bytes:
+        return (self._encoder.encode(record) + "\n").encode("utf-8")
+
+    def iter_decode(self, stream: BinaryIO) -> Iterator[Dict[str, Any]]:
+        for line in stream:
+            try:
+                yield json.loads(line.strip())
+            except json.JSONDecodeError:
+                continue
+
+    def iter_records(self, stream: BinaryIO) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        offset = stream.tell()
+        for line in stream:
+            length = len(line)
+            if not line.endswith(b"\n"):
+                return
+            try:
+                yield offset, length, json.loads(line)
+            except json.JSONDecodeError:
+                pass
+            offset += length
+
+    def decode(self, frame: bytes) -> Dict[str, Any]:
+        return json.loads(frame)
+
+    def field_needle(self, key: str, value: Any) -> Optional[bytes]:
+        # The quoted value alone: lines written with other separators (e.g.
+        # compact '"key":value') must still match. Strings other writers
+        # may escape differently (non-ASCII, escapes, "/") aren't prefiltered.
+        if not isinstance(value, str):
+            return None
+        needle = self._encoder.encode(value)
+        if not value.isascii() or "\\" in needle or "/" in value:
+            return None
+        return needle.encode("utf-8")
+
+    def dumps(self, document: Any) -> bytes:
+        return json.dumps(document, indent=self.indent, default=_default).encode("utf-8")
+
+    def loads(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class MsgpackCodec(Codec):
+    """
+    Checksummed, length-prefixed MessagePack records and documents.
+
+    Each record is a 10-byte header (the MAGIC marker, then the payload
+    length and CRC-32 as little-endian uint32) followed by the MessagePack
+    payload. A frame whose marker, length or checksum doesn't hold is
+    skipped by scanning forward to the next MAGIC that starts a valid
+    frame, so a corrupt header costs the records it overlaps rather than
+    the rest of the stream. A frame cut off by the end of the data is a
+    truncated tail and ends the stream.
+    """
+
+    name = "msgpack"
+    extension = ".msgpack"
+    stream_extension = ".msgpack"
+
+    # Frame header: marker, payload length, payload CRC-32. 0xc1 is the
+    # one byte MessagePack never uses as a type byte.
+    MAGIC = b"\xc1\xa7"
+    HEADER = struct.Struct("<2sII")
+
+    # Longer length fields are treated as corrupt without reading that far
+    MAX_RECORD_BYTES = 64 * 2**20
+
+    # Stream read size (grown while a long frame is incomplete)
+    READ_SIZE = 2**20
+
+    def __init__(self):
+        """
+        Initialize MessagePack codec.
+
+        Raises:
+            ImportError: If neither ormsgpack nor msgpack is installed
+        """
+        if _ormsgpack is not None:
+            options = (
+                _ormsgpack.OPT_PASSTHROUGH_DATACLASS |
+                _ormsgpack.OPT_PASSTHROUGH_DATETIME |
+                _ormsgpack.OPT_PASSTHROUGH_ENUM
+            )
+            self._packb = lambda obj: _ormsgpack.packb(obj, default=_default, option=options)
+            self._unpackb = _ormsgpack.unpackb
+            self._unpack_error = _ormsgpack.MsgpackDecodeError
+        elif _msgpack is not None:
+            self._packb = lambda obj: _msgpack.packb(obj, default=_default, use_bin_type=True)
+            self._unpackb = lambda data: _msgpack.unpackb(data, raw=False)
+            self._unpack_error = (ValueError, _msgpack.UnpackException)
+        else:
+            raise ImportError(
+                "The msgpack codec needs ormsgpack or msgpack: pip install ormsgpack"
+            )
+
+    def encode(self, record: Any) -> bytes:
+        payload = self._packb(record)
+        return self.HEADER.pack(self.MAGIC, len(payload), zlib.crc32(payload)) + payload
+
+    def _scan(
+        self,
+        buffer: Any,
+        position: int,
+        eof: bool
+    ) -> Generator[Tuple[int, int, int], None, int]:
+        """
+        Walk the valid frames of a buffer, resynchronizing past corrupt ones.
+
+        Args:
+            buffer: bytes or mmap holding the data read so far
+            position: Offset to start at (need not be a frame boundary)
+            eof: Whether buffer holds the rest of the data
+
+        Yields:
+            (frame offset, payload offset, frame end) of every valid frame
+
+        Returns:
+            Offset to resume from once more data is appended (unless eof)
+        """
+        header = self.HEADER
+        size = len(buffer)
+        while position + header.size <= size:
+            magic, length, checksum = header.unpack_from(buffer, position)
+            if magic == self.MAGIC and length <= self.MAX_RECORD_BYTES:
+                payload = position + header.size
+                end = payload + length
+                if end > size and not eof:
+                    return position
+                if end <= size and zlib.crc32(buffer[payload:end]) == checksum:
+                    yield position, payload, end
+                    position = end
+                    continue
+            position = buffer.find(self.MAGIC, position + 1)
+            if position < 0:
+                # Keep a last byte that may start a marker
+                return size if eof else size - 1
+        return position
+
+    def frames(self, buffer: Any) -> Iterator[Tuple[int, int, int]]:
+        """
+        Locate the valid frames of a complete buffer without decoding them.
+
+        Args:
+            buffer: bytes or mmap of a whole log file
+
+        Yields:
+            (frame offset, payload offset, frame end), in order
+        """
+        yield from self._scan(buffer, 0, True)
+
+    def next_frame(self, buffer: Any, position: int) -> int:
+        """
+        Offset of the first valid frame at or after position.
+
+        Args:
+            buffer: bytes or mmap of a whole log file
+            position: Any offset into buffer
+
+        Returns:
+            Frame offset, or len(buffer) if no valid frame follows
+        """
+        for offset, _, _ in self._scan(buffer, position, True):
+            return offset
+        return len(buffer)
+
+    def _iter_frames(self, stream: BinaryIO) -> Iterator[Tuple[int, int, bytes]]:
+        """(offset, length, payload) of the valid frames of a stream."""
+        offset = stream.tell()
+        buffer = b""
+        read_size = self.READ_SIZE
+        while True:
+            chunk = stream.read(read_size)
+            eof = not chunk
+            buffer += chunk
+            frames = self._scan(buffer, 0, eof)
+            while True:
+                try:
+                    start, payload, end = next(frames)
+                except StopIteration as stop:
+                    position = stop.value
+                    break
+                yield offset + start, end - start, buffer[payload:end]
+            if eof:
+                return
+            buffer = buffer[position:]
+            offset += position
+            read_size = max(self.READ_SIZE, len(buffer))
+
+    def iter_decode(self, stream: BinaryIO) -> Iterator[Dict[str, Any]]:
+        for _, _, payload in self._iter_frames(stream):
+            try:
+                yield self._unpackb(payload)
+            except self._unpack_error:
+                continue
+
+    def iter_records(self, stream: BinaryIO) -> Iterator[Tuple[int, int, Dict[str, Any]]]:
+        for offset, length, payload in self._iter_frames(stream):
+            try:
+                yield offset, length, self._unpackb(payload)
+            except self._unpack_error:
+                continue
+
+    def decode(self, frame: bytes) -> Dict[str, Any]:
+        header = self.HEADER
+        payload = frame[header.size:]
+        if len(frame) < header.size:
+            raise ValueError("Corrupt msgpack record: truncated header")
+        magic, length, checksum = header.unpack_from(frame)
+        if magic != self.MAGIC or length != len(payload) or zlib.crc32(payload) != checksum:
+            raise ValueError("Corrupt msgpack record: bad marker, length or checksum")
+        try:
+            return self._unpackb(payload)
+        except self._unpack_error as e:
+            raise ValueError(f"Corrupt msgpack record: {e}") from e
+
+    def field_needle(self, key: str, value: Any) -> Optional[bytes]:
+        # Map entries are the packed key directly followed by the packed value
+        return self._packb(key) + self._packb(value)
+
+    def dumps(self, document: Any) -> bytes:
+        return self._packb(document)
+
+    def loads(self, data: bytes) -> Any:
+        return self._unpackb(data)
+
+
+# Codec classes by name
+CODECS = {
+    JsonCodec.name: JsonCodec,
+    MsgpackCodec.name: MsgpackCodec,
+}
+
+
+def get_codec(codec: Union[str, Codec, None] = None) -> Codec:
+    """
+    Resolve a codec by name (or pass an instance through).
+
+    Args:
+        codec: Codec name ("json", "msgpack"), Codec instance, or None for JSON
+
+    Returns:
+        Codec instance
+
+    Raises:
+        ValueError: If the name is unknown
+        ImportError: If the codec's optional dependency is missing
+    """
+    if isinstance(codec, Codec):
+        return codec
+    name = codec or JsonCodec.name
+    if name not in CODECS:
+        raise ValueError(f"Unknown codec '{name}'. Available: {', '.join(CODECS)}")
+    return CODECS[name]()
+
+
+def codec_for_path(path: Any) -> Codec:
+    """
+    Pick the codec matching a file's extension (JSON if unrecognized).
+
+    Args:
+        path: File path
+
+    Returns:
+        Codec instance
+    """
+    suffix = Path(path).suffix
+    for codec_class in CODECS.values():
+        if suffix in (codec_class.extension, codec_class.stream_extension):
+            return codec_class()
+    return JsonCodec()
@@ -0,0 +1,204 @@
+"""
+Streaming columnar (Parquet / Arrow IPC) exports.
+
+ColumnarWriter turns a stream of dicts into typed columns and writes them
+one row group per batch, so exporting a long audit log or many runs never
+holds more than one batch in memory. Downstream analysis then reads only
+the columns it needs, e.g. pandas.read_parquet(path, columns=[...]).
+
+- Columns are declared as (name, type) pairs with types "string",
+  "float", "bool" and "timestamp" (ISO strings or datetimes, stored as
+  timestamp[us], UTC for zone-aware values); non-string values of a
+  string column are stored as str(value), other mistyped values as nulls
+- Fields without a column are kept, JSON-encoded, in an "extra" column
+- The output format follows the file extension: Arrow IPC for ".arrow",
+  ".feather" and ".ipc", Parquet otherwise
+
+Needs pyarrow (pip install pyarrow).
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+try:
+    import pyarrow as _pa
+    import pyarrow.parquet as _pq
+except ImportError:  # pragma: no cover - depends on installed extras
+    _pa = _pq = None
+
+
+# Rows per row group (and per batch held in memory)
+ROW_GROUP_SIZE = 100_000
+
+# File extensions written as Arrow IPC files instead of Parquet
+ARROW_EXTENSIONS = (".arrow", ".feather", ".ipc")
+
+# Typed columns of exported audit events
+AUDIT_COLUMNS: Tuple[Tuple[str, str], ...] = (
+    ("timestamp", "timestamp"),
+    ("event_type", "string"),
+    ("campaign_id", "string"),
+    ("severity", "string"),
+    ("decision", "string"),
+    ("action_taken", "string"),
+    ("action_type", "string"),
+    ("variance_pct", "float"),
+    ("confidence_score", "float"),
+    ("target_spend", "float"),
+    ("actual_spend", "float"),
+    ("metadata_match_score", "float"),
+    ("name_similarity", "float"),
+    ("data_freshness_score", "float"),
+    ("requires_human", "bool"),
+    ("success", "bool"),
+    ("error_type", "string"),
+)
+
+
+def _string(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, str):
+        return value
+    if hasattr(value, "value") and isinstance(value.value, str):
+        return value.value  # Enum
+    return str(value)
+
+
+def _float(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return None
+
+
+def _bool(value: Any) -> Optional[bool]:
+    return value if isinstance(value, bool) else None
+
+
+def _timestamp(value: Any) -> Optional[datetime]:
+    """Parse an ISO timestamp (naive UTC for zone-aware values); None if invalid."""
+    if isinstance(value, str):
+        try:
+            value = datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    if not isinstance(value, datetime):
+        return None
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+_COERCE = {"string": _string, "float": _float, "bool": _bool, "timestamp": _timestamp}
+
+
+def _arrow_type(type_name: str):
+    return {
+        "string": _pa.string(),
+        "float": _pa.float64(),
+        "bool": _pa.bool_(),
+        "timestamp": _pa.timestamp("us"),
+    }[type_name]
+
+
+class ColumnarWriter:
+    """
+    Write dict rows to a Parquet or Arrow IPC file in row-group batches.
+
+    Use as a context manager, or call close() to write the last batch.
+    """
+
+    def __init__(
+        self,
+        output_file: str,
+        columns: Sequence[Tuple[str, str]],
+        batch_size: int = ROW_GROUP_SIZE,
+        extra_column: Optional[str] = "extra"
+    ):
+        """
+        Open the output file.
+
+        Args:
+            output_file: Output path; ".arrow"/".feather"/".ipc" write an
+                         Arrow IPC file, anything else Parquet
+            columns: (name, type) pairs, type one of "string", "float",
+                     "bool", "timestamp"
+            batch_size: Rows per row group
+            extra_column: Column holding the JSON of fields without a
+                          column of their own (None: drop them)
+
+        Raises:
+            ImportError: If pyarrow is not installed
+            ValueError: If a column type is unknown
+        """
+        if _pa is None:
+            raise ImportError("Columnar export needs pyarrow: pip install pyarrow")
+        for name, type_name in columns:
+            if type_name not in _COERCE:
+                raise ValueError(f"Unknown column type '{type_name}' for column '{name}'")
+        self.columns = tuple(columns)
+        self.names = frozenset(name for name, _ in self.columns)
+        self.batch_size = max(1, batch_size)
+        self.extra_column = extra_column
+        self.rows = 0
+
+        fields = [_pa.field(name, _arrow_type(type_name)) for name, type_name in self.columns]
+        if extra_column:
+            fields.append(_pa.field(extra_column, _pa.string()))
+        self.schema = _pa.schema(fields)
+        self._arrow = Path(output_file).suffix.lower() in ARROW_EXTENSIONS
+        if self._arrow:
+            self._writer = _pa.ipc.new_file(output_file, self.schema)
+        else:
+            self._writer = _pq.ParquetWriter(output_file, self.schema)
+        self._reset_batch()
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _reset_batch(self):
+        self._batch = [[] for _ in self.columns]
+        self._extra = []
+
+    def write(self, row: Dict[str, Any]):
+        """Add one row, writing a row group once the batch is full."""
+        for values, (name, _) in zip(self._batch, self.columns):
+            values.append(row.get(name))
+        if self.extra_column:
+            extra = {key: value for key, value in row.items() if key not in self.names}
+            self._extra.append(json.dumps(extra, default=str) if extra else None)
+        if len(self._batch[0]) >= self.batch_size:
+            self._write_batch()
+
+    def close(self) -> int:
+        """
+        Write the last batch and close the file.
+
+        Returns:
+            Number of rows written
+        """
+        if self._writer is not None:
+            self._write_batch()
+            self._writer.close()
+            self._writer = None
+        return self.rows
+
+    def _write_batch(self):
+        if not self._batch[0]:
+            return
+        arrays = [
+            _pa.array([_COERCE[type_name](value) for value in values], type=_arrow_type(type_name))
+            for values, (_, type_name) in zip(self._batch, self.columns)
+        ]
+        if self.extra_column:
+            arrays.append(_pa.array(self._extra, type=_pa.string()))
+        table = _pa.Table.from_arrays(arrays, schema=self.schema)
+        if self._arrow:
+            self._writer.write_table(table, max_chunksize=self.batch_size)
+        else:
+            self._writer.write_table(table, row_group_size=self.batch_size)
+        self.rows += table.num_rows
+        self._reset_batch()
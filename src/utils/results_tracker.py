@@ -6,14 +6,34 @@ This module allows you to:
 - Compare performance across different configurations
 - Track improvement metrics
 - Export results for analysis
+
+Run files are written with a pluggable codec (indented JSON by default, or
+MessagePack); runs in any supported format can be loaded and compared.
 """
 
-import json
 import os
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from pathlib import Path
 
+from src.utils.codecs import CODECS, Codec, codec_for_path, get_codec
+from src.utils.columnar import ROW_GROUP_SIZE, ColumnarWriter
+
+
+# Typed columns of exported campaign results (one row per campaign per run)
+RESULT_COLUMNS = (
+    ("run_id", "string"),
+    ("run_name", "string"),
+    ("run_timestamp", "timestamp"),
+    ("campaign_id", "string"),
+    ("severity", "string"),
+    ("variance_pct", "float"),
+    ("confidence_score", "float"),
+    ("action_taken", "string"),
+    ("requires_human", "bool"),
+    ("is_autonomous_action", "bool"),
+)
+
 
 class ResultsTracker:
     """
@@ -26,15 +46,17 @@ class ResultsTracker:
     - Performance metrics
     """
 
-    def __init__(self, results_dir: str = "results"):
+    def __init__(self, results_dir: str = "results", codec: Union[str, Codec, None] = None):
         """
         Initialize results tracker.
 
         Args:
             results_dir: Directory to store results files
+            codec: Codec name or instance for new run files (default: "json")
         """
         self.results_dir = Path(results_dir)
         self.results_dir.mkdir(exist_ok=True)
+        self.codec = get_codec(codec)
 
     def save_run(
         self,
@@ -115,11 +137,11 @@ class ResultsTracker:
         }
 
         # Save to file
-        filename = f"run_{run_id}.json"
+        filename = f"run_{run_id}{self.codec.extension}"
         filepath = self.results_dir / filename
 
-        with open(filepath, 'w') as f:
-            json.dump(results, f, indent=2)
+        with open(filepath, 'wb') as f:
+            f.write(self.codec.dumps(results))
 
         print(f"Results saved to: {filepath}")
         return str(filepath)
@@ -134,13 +156,10 @@ class ResultsTracker:
         Returns:
             Results dictionary
         """
-        if not run_id.endswith('.json'):
-            run_id = f"run_{run_id}.json"
-
-        filepath = self.results_dir / run_id
+        filepath = self._run_path(run_id)
 
-        with open(filepath, 'r') as f:
-            return json.load(f)
+        with open(filepath, 'rb') as f:
+            return codec_for_path(filepath).loads(f.read())
 
     def list_runs(self) -> List[Dict[str, str]]:
         """
@@ -150,9 +169,9 @@ class ResultsTracker:
             List of dictionaries with run metadata
         """
         runs = []
-        for filepath in sorted(self.results_dir.glob("run_*.json")):
-            with open(filepath, 'r') as f:
-                data = json.load(f)
+        for filepath in sorted(self._run_files()):
+            with open(filepath, 'rb') as f:
+                data = codec_for_path(filepath).loads(f.read())
                 runs.append({
                     "run_id": data["run_metadata"]["run_id"],
                     "run_name": data["run_metadata"]["run_name"],
@@ -214,6 +233,31 @@ class ResultsTracker:
 
         return comparison
 
+    def _run_files(self) -> List[Path]:
+        """Saved run files in every supported format."""
+        extensions = {codec_class.extension for codec_class in CODECS.values()}
+        return [p for p in self.results_dir.glob("run_*") if p.suffix in extensions]
+
+    def _run_path(self, run_id: str) -> Path:
+        """
+        Resolve a run ID or filename to its file.
+
+        A bare run ID prefers this tracker's codec, then any other format.
+        """
+        filepath = self.results_dir / run_id
+        if filepath.suffix in {codec_class.extension for codec_class in CODECS.values()}:
+            return filepath
+        if not run_id.startswith("run_"):
+            run_id = f"run_{run_id}"
+        extensions = [self.codec.extension] + [
+            codec_class.extension for codec_class in CODECS.values()
+        ]
+        for extension in extensions:
+            filepath = self.results_dir / f"{run_id}{extension}"
+            if filepath.exists():
+                return filepath
+        return self.results_dir / f"{run_id}{self.codec.extension}"
+
     def _compare_configs(self, config1: Dict, config2: Dict) -> Dict[str, Any]:
         """Compare two configurations and show changes."""
         changes = {}
@@ -307,6 +351,40 @@ class ResultsTracker:
 
         print(f"Comparison exported to: {output_file}")
 
+    def export_results_parquet(
+        self,
+        run_ids: List[str],
+        output_file: str,
+        batch_size: int = ROW_GROUP_SIZE
+    ):
+        """
+        Export the campaign results of several runs to one columnar file.
+
+        One row per campaign per run (see RESULT_COLUMNS; campaign
+        metadata goes to a JSON "extra" column), written in row groups of
+        batch_size rows while loading one run at a time. Needs pyarrow.
+
+        Args:
+            run_ids: List of run IDs to export
+            output_file: Output Parquet path (".arrow"/".feather" for Arrow IPC)
+            batch_size: Rows per row group
+
+        Raises:
+            ImportError: If pyarrow is not installed
+        """
+        with ColumnarWriter(output_file, RESULT_COLUMNS, batch_size) as writer:
+            for run_id in run_ids:
+                run = self.load_run(run_id)
+                run_metadata = {
+                    "run_id": run["run_metadata"]["run_id"],
+                    "run_name": run["run_metadata"]["run_name"],
+                    "run_timestamp": run["run_metadata"]["timestamp"],
+                }
+                for result in run["campaign_results"]:
+                    writer.write({**run_metadata, **result})
+
+        print(f"Results exported to: {output_file}")
+
     def get_latest_run(self) -> Optional[Dict[str, Any]]:
         """Get the most recent run."""
         runs = self.list_runs()
@@ -316,10 +394,8 @@ class ResultsTracker:
 
     def delete_run(self, run_id: str):
         """Delete a saved run."""
-        if not run_id.endswith('.json'):
-            run_id = f"run_{run_id}.json"
-
-        filepath = self.results_dir / run_id
+        filepath = self._run_path(run_id)
+        run_id = filepath.name
         if filepath.exists():
             filepath.unlink()
             print(f"Deleted run: {run_id}")
@@ -0,0 +1,181 @@
+"""
+Unit tests for parallel audit log analytics.
+
+Tests splitting the log at record boundaries, AuditLogger.aggregate
+(serial and in a process pool) and the aggregate CLI command.
+"""
+
+import json
+import pytest
+from src.utils import audit_cli
+from src.utils.audit_analytics import split_log
+from src.utils.audit_logger import AuditLogger
+from src.utils.codecs import MsgpackCodec
+
+
+def codec_names():
+    """Codec names usable in this environment (msgpack needs an extra)."""
+    try:
+        MsgpackCodec()
+        return ["json", "msgpack"]
+    except ImportError:
+        return ["json"]
+
+
+def log_runs(logger: AuditLogger, count: int = 90):
+    """Helper to log reconciliations, decisions and alerts across platforms and days."""
+    for i in range(count):
+        campaign_id = f"{['google', 'meta', 'tiktok'][i % 3]}_{i % 5:03d}"
+        timestamp = f"2026-01-{10 + i % 4:02d}T{i % 24:02d}:00:00"
+        kind = i % 4
+        if kind == 0:
+            logger.log_event({
+                "event_type": "reconciliation", "campaign_id": campaign_id,
+                "variance_pct": i % 60, "confidence_score": (i % 10) / 10,
+                "timestamp": timestamp,
+            })
+        elif kind == 1:
+            logger.log_event({
+                "event_type": "agent_decision", "campaign_id": campaign_id,
+                "decision": ["escalate_to_human", "autonomous_halt", "send_alert"][i % 3],
+                "timestamp": timestamp,
+            })
+        elif kind == 2:
+            logger.log_event({
+                "event_type": "pacing_alert", "campaign_id": campaign_id,
+                "severity": "critical" if i % 3 else "warning", "timestamp": timestamp,
+            })
+        else:
+            logger.log_event({"event_type": "error", "campaign_id": None, "timestamp": timestamp})
+
+
+class TestSplitLog:
+    """Test splitting a log into parts."""
+
+    @pytest.mark.parametrize("codec", codec_names())
+    def test_parts_start_at_record_boundaries(self, tmp_path, codec):
+        """Test that parts cover the file and every part holds whole records."""
+        logger = AuditLogger(log_dir=str(tmp_path), codec=codec)
+        log_runs(logger)
+        with open(logger.log_path, "rb") as f:
+            boundaries = {offset for offset, _, _ in logger.codec.iter_records(f)}
+
+        for parts in (1, 3, 7, 1000):
+            ranges = split_log(logger.log_path, logger.codec, parts)
+            assert ranges[0][0] == 0 and ranges[-1][1] == logger.log_path.stat().st_size
+            assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+            assert all(start in boundaries for start, _ in ranges)
+            assert len(ranges) <= parts
+
+    def test_empty_log(self, tmp_path):
+        """Test that a missing or empty log has no parts."""
+        logger = AuditLogger(log_dir=str(tmp_path))
+        assert split_log(logger.log_path, logger.codec, 4) == []
+        logger.log_path.touch()
+        assert split_log(logger.log_path, logger.codec, 4) == []
+
+
+class TestAggregate:
+    """Test AuditLogger.aggregate."""
+
+    @pytest.mark.parametrize("codec", codec_names())
+    def test_counts_and_groups(self, tmp_path, codec):
+        """Test the aggregate of a log against counts of its events."""
+        logger = AuditLogger(log_dir=str(tmp_path), codec=codec)
+        log_runs(logger)
+
+        result = logger.aggregate(workers=1)
+        stats = logger.get_summary_stats()
+
+        for key in ("total_events", "event_types", "alerts_by_severity", "decisions_by_type"):
+            assert result[key] == stats[key]
+        assert result["group_by"] == "platform"
+        assert set(result["groups"]) == {"google", "meta", "tiktok", "unknown"}
+        decisions = logger.get_events(event_type="agent_decision")
+        for platform, group in result["groups"].items():
+            mine = [e for e in decisions if str(e["campaign_id"]).startswith(platform)]
+            escalations = sum(e["decision"] == "escalate_to_human" for e in mine)
+            assert group["decisions"] == len(mine)
+            assert group["escalations"] == escalations
+            assert group["escalation_rate"] == (escalations / len(mine) if mine else 0.0)
+        histogram = result["histograms"]["variance_pct"]
+        assert len(histogram["counts"]) == len(histogram["edges"]) + 1
+        assert sum(histogram["counts"]) == stats["event_types"]["reconciliation"]
+
+    def test_healthy_runs_count_as_decisions(self, tmp_path):
+        """Test that escalation rates count healthy runs, which log healthy_pacing events."""
+        logger = AuditLogger(log_dir=str(tmp_path))
+        for i in range(8):
+            campaign_id = f"google_{i:03d}"
+            timestamp = f"2026-01-15T{i:02d}:00:00"
+            logger.log_event({
+                "event_type": "reconciliation", "campaign_id": campaign_id, "timestamp": timestamp
+            })
+            if i < 6:
+                logger.log_event({
+                    "type": "healthy_pacing", "campaign_id": campaign_id, "timestamp": timestamp
+                })
+            else:
+                logger.log_event({
+                    "event_type": "agent_decision", "campaign_id": campaign_id,
+                    "decision": "escalate_to_human", "timestamp": timestamp,
+                })
+
+        by_platform = logger.aggregate(workers=1)["groups"]
+        by_type = logger.aggregate(group_by="event_type", workers=1)["groups"]
+
+        assert by_platform["google"]["decisions"] == 8
+        assert by_platform["google"]["escalation_rate"] == 0.25
+        assert by_type["healthy_pacing"]["decisions"] == 6
+        assert "unknown" not in by_type
+
+    @pytest.mark.parametrize("codec", codec_names())
+    def test_parallel_matches_serial(self, tmp_path, codec):
+        """Test that a process pool over many parts gives the serial result."""
+        logger = AuditLogger(log_dir=str(tmp_path), codec=codec)
+        log_runs(logger, 400)
+
+        for group_by in ("platform", "day", None):
+            serial = logger.aggregate(group_by=group_by, workers=1)
+            parallel = logger.aggregate(group_by=group_by, workers=3)
+            # Same counts, in the same first-seen order
+            assert json.dumps(parallel) == json.dumps(serial)
+
+    def test_time_range_and_segments(self, tmp_path):
+        """Test aggregating rotated segments and the log within a time range."""
+        with AuditLogger(log_dir=str(tmp_path), rotate_bytes=3000) as logger:
+            log_runs(logger, 200)
+        assert logger.segments.entries()
+
+        result = logger.aggregate(
+            group_by="day", start_time="2026-01-11", end_time="2026-01-13", workers=2
+        )
+        events = logger.get_events(start_time="2026-01-11", end_time="2026-01-13")
+        assert result["total_events"] == len(events)
+        assert {day: group["events"] for day, group in result["groups"].items()} == {
+            "2026-01-11": 50, "2026-01-12": 50
+        }
+
+    def test_sqlite_backend(self, tmp_path):
+        """Test that SQLite loggers aggregate the same events."""
+        plain = AuditLogger(log_dir=str(tmp_path))
+        log_runs(plain)
+        logger = AuditLogger(database_url=f"sqlite:///{tmp_path / 'audit.db'}")
+        log_runs(logger)
+
+        assert logger.aggregate(group_by="event_type") == plain.aggregate(group_by="event_type", workers=1)
+
+    def test_unknown_group_by(self, tmp_path):
+        """Test that an unknown group key is rejected."""
+        with pytest.raises(ValueError, match="Unknown group_by"):
+            AuditLogger(log_dir=str(tmp_path)).aggregate(group_by="market")
+
+    def test_cli(self, tmp_path, capsys):
+        """Test the aggregate command."""
+        logger = AuditLogger(log_dir=str(tmp_path))
+        log_runs(logger, 40)
+
+        assert audit_cli.main(["aggregate", str(logger.log_path), "--group-by", "none", "--workers", "1"]) == 0
+        result = json.loads(capsys.readouterr().out)
+        assert result["total_events"] == 40
+        assert result["groups"] == {}
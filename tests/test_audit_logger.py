@@ -0,0 +1,535 @@
+"""
+Unit tests for AuditLogger.
+
+Tests direct and buffered (background writer) event logging, the sidecar
+index, the summary counters, log rotation and appends from several
+processes.
+"""
+
+import json
+import multiprocessing
+import pytest
+import threading
+from datetime import datetime
+from src.utils import audit_cli, audit_logger, audit_segments
+from src.utils.audit_index import ENTRY
+from src.utils.audit_logger import AuditLogger
+from src.utils.audit_summary import AuditSummary
+
+
+def log_decisions(logger: AuditLogger, start: int, count: int):
+    """Helper to log a run of agent decisions."""
+    for i in range(start, start + count):
+        logger.log_event({
+            "event_type": "agent_decision",
+            "campaign_id": f"google_{i:05d}",
+            "decision": "log_only",
+            "timestamp": "2026-01-15T12:00:00",
+        })
+
+
+def append_worker(log_dir: str, worker: int, count: int, buffered: bool):
+    """Helper process logging a numbered run of events to a shared log."""
+    logger = AuditLogger(log_dir=log_dir, buffered=buffered, flush_every=50, multiprocess=True)
+    for seq in range(count):
+        logger.log_event({
+            "event_type": "agent_action",
+            "campaign_id": f"worker_{worker}",
+            "seq": seq,
+            # Mostly small records, with some beyond a pipe buffer/page
+            "padding": "x" * (9000 if seq % 997 == 0 else seq % 300),
+            "timestamp": "2026-01-15T12:00:00",
+        })
+    logger.close()
+
+
+class TestBufferedAuditLogger:
+    """Test AuditLogger buffered writer mode."""
+
+    def test_same_bytes_as_direct_writes(self, tmp_path):
+        """Test that buffered mode writes exactly what direct mode writes."""
+        direct = AuditLogger(log_file="direct.jsonl", log_dir=str(tmp_path))
+        log_decisions(direct, 0, 500)
+
+        with AuditLogger(log_file="buffered.jsonl", log_dir=str(tmp_path), buffered=True) as buffered:
+            log_decisions(buffered, 0, 500)
+
+        assert buffered.log_path.read_bytes() == direct.log_path.read_bytes()
+
+    def test_reads_see_pending_events(self, tmp_path):
+        """Test that queries flush queued events first."""
+        logger = AuditLogger(log_dir=str(tmp_path), buffered=True, flush_every=1000)
+        log_decisions(logger, 0, 10)
+
+        assert len(logger.get_events()) == 10
+        assert logger.get_summary_stats()["decisions_by_type"] == {"log_only": 10}
+        logger.close()
+
+    def test_bounded_queue_with_concurrent_producers(self, tmp_path):
+        """Test that a tiny queue applies back-pressure without losing events."""
+        logger = AuditLogger(
+            log_dir=str(tmp_path), buffered=True, queue_size=2, flush_every=7, fsync_interval=0.01
+        )
+        threads = [
+            threading.Thread(target=log_decisions, args=(logger, n * 1000, 250))
+            for n in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        logger.close()
+
+        campaign_ids = [e["campaign_id"] for e in logger.get_events()]
+        assert len(campaign_ids) == 1000
+        assert len(set(campaign_ids)) == 1000
+        # Each producer's events stay in order
+        producer = [c for c in campaign_ids if c.startswith("google_02")]
+        assert producer == sorted(producer)
+
+    def test_close_is_idempotent_and_falls_back_to_direct(self, tmp_path):
+        """Test that events logged after close() are still written."""
+        logger = AuditLogger(log_dir=str(tmp_path), buffered=True)
+        log_decisions(logger, 0, 3)
+        logger.close()
+        logger.close()
+        log_decisions(logger, 3, 2)
+
+        assert len(logger.get_events()) == 5
+
+    def test_clear_log_restarts_writer(self, tmp_path):
+        """Test that clearing the log keeps buffered logging working."""
+        logger = AuditLogger(log_dir=str(tmp_path), buffered=True)
+        log_decisions(logger, 0, 3)
+        logger.clear_log()
+        log_decisions(logger, 3, 2)
+
+        assert [e["campaign_id"] for e in logger.get_events()] == ["google_00003", "google_00004"]
+        logger.close()
+
+    def test_writer_errors_surface_on_flush(self, tmp_path, monkeypatch):
+        """Test that a background I/O error is raised to the caller."""
+        logger = AuditLogger(log_dir=str(tmp_path), buffered=True)
+
+        def full_disk(fd, data, file_lock=False):
+            raise OSError(28, "No space left on device")
+
+        monkeypatch.setattr(audit_logger, "_append", full_disk)
+        log_decisions(logger, 0, 1)
+
+        with pytest.raises(OSError, match="No space left"):
+            logger.flush()
+        logger.close()
+
+
+class TestAuditLogIndex:
+    """Test the sidecar index behind filtered get_events."""
+
+    def log_mixed(self, logger: AuditLogger, count: int = 60):
+        """Helper to log interleaved event types across a few campaigns."""
+        for i in range(count):
+            campaign_id = f"google_{i % 7:03d}"
+            if i % 3 == 0:
+                logger.log_decision(campaign_id, 5.0, 0.9, "healthy", "log_only", f"run {i}")
+            elif i % 3 == 1:
+                logger.log_action(campaign_id, "send_alert", True, {"run": i})
+            else:
+                logger.log_error("api_error", f"run {i}", campaign_id=None, context={"run": i})
+
+    def assert_matches_full_scan(self, indexed: AuditLogger, plain: AuditLogger):
+        """Helper to compare indexed queries with full scans of the same log."""
+        queries = [
+            {"campaign_id": "google_003"},
+            {"event_type": "error"},
+            {"event_type": "agent_action", "campaign_id": "google_001"},
+            {"event_type": "agent_decision", "campaign_id": "google_002", "limit": 2},
+            {"campaign_id": "missing"},
+        ]
+        for query in queries:
+            assert indexed.get_events(**query) == plain.get_events(**query), query
+
+    @pytest.mark.parametrize("codec", ["json", "msgpack"])
+    @pytest.mark.parametrize("buffered", [False, True])
+    def test_filtered_queries_match_full_scan(self, tmp_path, codec, buffered):
+        """Test that indexed queries return exactly what a full scan returns."""
+        if codec == "msgpack":
+            pytest.importorskip("ormsgpack")
+        logger = AuditLogger(log_dir=str(tmp_path), codec=codec, buffered=buffered, indexed=True)
+        self.log_mixed(logger)
+
+        self.assert_matches_full_scan(logger, AuditLogger(log_dir=str(tmp_path), codec=codec))
+        assert logger.index.stats()["indexed_records"] == 60
+        logger.close()
+
+    def test_sidecar_reloads_and_catches_up(self, tmp_path):
+        """Test that a new logger reuses the sidecar and indexes foreign appends."""
+        log_file = str(tmp_path / "audit.jsonl")
+        first = AuditLogger(log_file=log_file, indexed=True)
+        self.log_mixed(first, 30)
+        first.close()
+
+        # Appended by a logger that doesn't maintain the index
+        self.log_mixed(AuditLogger(log_file=log_file), 30)
+
+        second = AuditLogger(log_file=log_file, indexed=True)
+        self.assert_matches_full_scan(second, AuditLogger(log_file=log_file))
+        assert second.index.stats()["indexed_records"] == 60
+
+    def test_damaged_sidecar_is_repaired(self, tmp_path):
+        """Test that a truncated or garbage sidecar never yields wrong events."""
+        log_file = str(tmp_path / "audit.jsonl")
+        logger = AuditLogger(log_file=log_file, indexed=True)
+        self.log_mixed(logger)
+        logger.close()
+
+        # Keep 25 entries, then an entry past the end of the log, then a
+        # gap of 5 missing entries
+        sidecar = logger.index.path
+        entries = sidecar.read_bytes()
+        size = ENTRY.size
+        sidecar.write_bytes(
+            entries[:25 * size] + ENTRY.pack(10**9, 10, 0, 0) + entries[30 * size:]
+        )
+
+        reopened = AuditLogger(log_file=log_file, indexed=True)
+        self.assert_matches_full_scan(reopened, AuditLogger(log_file=log_file))
+        assert reopened.index.stats()["indexed_records"] == 60
+
+    def test_replaced_log_is_reindexed(self, tmp_path):
+        """Test that a sidecar describing a deleted or replaced log is discarded."""
+        log_file = str(tmp_path / "audit.jsonl")
+        first = AuditLogger(log_file=log_file, indexed=True)
+        for i in range(20):
+            first.log_event({"event_type": "a", "campaign_id": f"google_{i:03d}"})
+        first.close()
+        assert first.index.head_path.exists()
+
+        # Deleted outside clear_log, then regrown past the old size
+        first.log_path.unlink()
+        plain = AuditLogger(log_file=log_file)
+        for i in range(30):
+            plain.log_event({"event_type": "b", "campaign_id": f"google_{i:03d}"})
+
+        reopened = AuditLogger(log_file=log_file, indexed=True)
+        assert len(reopened.get_events(event_type="b")) == 30
+        assert reopened.get_events(event_type="a") == []
+        assert reopened.index.stats()["indexed_records"] == 30
+        reopened.close()
+
+        # Same size, different head
+        data = reopened.log_path.read_bytes()
+        reopened.log_path.write_bytes(data.replace(b'"b"', b'"c"', 5))
+        replaced = AuditLogger(log_file=log_file, indexed=True)
+        assert len(replaced.get_events(event_type="c")) == 5
+        assert len(replaced.get_events(event_type="b")) == 25
+
+    def test_rebuild_and_clear(self, tmp_path):
+        """Test rebuilding from the log alone and resetting on clear_log."""
+        logger = AuditLogger(log_dir=str(tmp_path), indexed=True)
+        self.log_mixed(logger)
+        logger.close()
+        logger.index.path.unlink()
+
+        stats = logger.rebuild_index()
+        assert stats["indexed_records"] == 60
+        assert stats["campaigns"] == 7
+        assert logger.index.path.exists()
+
+        logger.clear_log()
+        logger.log_event({"event_type": "note", "campaign_id": "line\nid\\x"})
+        assert logger.get_events(campaign_id="google_001") == []
+        assert len(logger.get_events(campaign_id="line\nid\\x")) == 1
+        logger.close()
+
+        reopened = AuditLogger(log_dir=str(tmp_path), indexed=True)
+        assert len(reopened.get_events(campaign_id="line\nid\\x")) == 1
+        assert reopened.index.stats()["indexed_records"] == 1
+
+    def test_rebuild_requires_index(self, tmp_path):
+        """Test that rebuild_index is rejected without indexed=True."""
+        with pytest.raises(ValueError, match="indexed=True"):
+            AuditLogger(log_dir=str(tmp_path)).rebuild_index()
+
+
+class TestSummaryCounters:
+    """Test the incremental counters behind get_summary_stats."""
+
+    def recount(self, logger: AuditLogger) -> dict:
+        """Helper to count events the way a full scan of the log does."""
+        stats = {"total_events": 0, "event_types": {}, "alerts_by_severity": {}, "decisions_by_type": {}}
+        for event in logger.get_events():
+            event_type = event["event_type"]
+            stats["total_events"] += 1
+            stats["event_types"][event_type] = stats["event_types"].get(event_type, 0) + 1
+            if event_type == "pacing_alert":
+                group, key = stats["alerts_by_severity"], event["severity"]
+            elif event_type == "agent_decision":
+                group, key = stats["decisions_by_type"], event["decision"]
+            else:
+                continue
+            group[key] = group.get(key, 0) + 1
+        return stats
+
+    def log_mixed(self, logger: AuditLogger, count: int = 40):
+        """Helper to log decisions, alerts and errors."""
+        for i in range(count):
+            if i % 4 == 0:
+                decision = "alert" if i % 8 else "log_only"
+                logger.log_decision(f"google_{i:03d}", 5.0, 0.9, "healthy", decision, "ok")
+            elif i % 4 == 1:
+                severity = "critical" if i % 3 == 0 else "warning"
+                logger.log_event({"event_type": "pacing_alert", "severity": severity})
+            else:
+                logger.log_error("api_error", f"run {i}")
+
+    def assert_counts(self, logger: AuditLogger):
+        """Helper to compare get_summary_stats with a recount."""
+        stats = logger.get_summary_stats()
+        expected = self.recount(logger)
+        assert {key: stats[key] for key in expected} == expected
+        assert stats["log_size_bytes"] == logger.log_path.stat().st_size
+
+    @pytest.mark.parametrize("codec", ["json", "msgpack"])
+    @pytest.mark.parametrize("buffered", [False, True])
+    def test_counters_match_full_scan(self, tmp_path, codec, buffered):
+        """Test that incremental counters equal a recount of the log."""
+        if codec == "msgpack":
+            pytest.importorskip("ormsgpack")
+        with AuditLogger(log_dir=str(tmp_path), codec=codec, buffered=buffered, indexed=True) as logger:
+            self.log_mixed(logger)
+            self.assert_counts(logger)
+            self.log_mixed(logger, 9)
+            self.assert_counts(logger)
+
+    def test_checkpoint_resumes_and_catches_up(self, tmp_path, monkeypatch):
+        """Test that a new logger resumes from the checkpoint plus the log tail."""
+        log_file = str(tmp_path / "audit.jsonl")
+        with AuditLogger(log_file=log_file) as first:
+            self.log_mixed(first)
+        assert first.summary.path.exists()
+
+        # Appended by a logger that doesn't write the checkpoint
+        self.log_mixed(AuditLogger(log_file=log_file, summary_checkpoint=False), 10)
+
+        def full_recount(self):
+            raise AssertionError("summary recounted the whole log")
+
+        monkeypatch.setattr(AuditSummary, "_recount", full_recount)
+        second = AuditLogger(log_file=log_file)
+        self.assert_counts(second)
+        assert second.get_summary_stats()["total_events"] == 50
+
+    def test_replaced_log_is_recounted(self, tmp_path):
+        """Test that a checkpoint describing another log is discarded."""
+        log_file = str(tmp_path / "audit.jsonl")
+        with AuditLogger(log_file=log_file) as first:
+            self.log_mixed(first)
+
+        # Same size, different contents
+        data = first.log_path.read_bytes()
+        first.log_path.write_bytes(data.replace(b"api_error", b"api_fault"))
+        self.assert_counts(AuditLogger(log_file=log_file))
+
+        # Truncated behind the checkpoint
+        first.log_path.write_bytes(data[:len(data) // 2])
+        self.assert_counts(AuditLogger(log_file=log_file))
+
+    def test_reconcile_reports_drift(self, tmp_path, capsys):
+        """Test that reconciliation recounts the log and fixes a bad checkpoint."""
+        logger = AuditLogger(log_dir=str(tmp_path))
+        self.log_mixed(logger)
+        logger.close()
+        assert logger.reconcile_summary_stats()["drift"] == {}
+
+        checkpoint = json.loads(logger.summary.path.read_text())
+        checkpoint["total_events"] += 3
+        checkpoint["event_types"]["error"] -= 1
+        logger.summary.path.write_text(json.dumps(checkpoint))
+
+        assert audit_cli.main(["reconcile", str(logger.log_path)]) == 0
+        assert "drift corrected" in capsys.readouterr().out
+        reopened = AuditLogger(log_dir=str(tmp_path))
+        stats = reopened.reconcile_summary_stats()
+        assert stats["drift"] == {}
+        assert stats["total_events"] == 40
+
+    def test_clear_log_resets_counters(self, tmp_path):
+        """Test that clearing the log resets counters and the checkpoint."""
+        logger = AuditLogger(log_dir=str(tmp_path), buffered=True)
+        self.log_mixed(logger)
+        logger.clear_log()
+        logger.log_decision("google_001", 1.0, 0.9, "healthy", "log_only", "ok")
+
+        stats = logger.get_summary_stats()
+        assert stats["total_events"] == 1
+        assert stats["decisions_by_type"] == {"log_only": 1}
+        logger.close()
+        assert AuditLogger(log_dir=str(tmp_path)).get_summary_stats()["total_events"] == 1
+
+
+class TestLogRotation:
+    """Test rotating the log into compressed segments."""
+
+    def log_hours(self, logger: AuditLogger, hours: int, per_hour: int = 20):
+        """Helper to log decisions spread over consecutive hours."""
+        for hour in range(hours):
+            for i in range(per_hour):
+                logger.log_event({
+                    "event_type": "agent_decision" if i % 2 else "error",
+                    "campaign_id": f"google_{i % 5:03d}",
+                    "decision": "alert",
+                    "timestamp": f"2026-01-15T{hour:02d}:{i:02d}:00",
+                })
+
+    @pytest.mark.parametrize("buffered", [False, True])
+    def test_rotates_and_reads_across_segments(self, tmp_path, buffered):
+        """Test that rotated, compressed segments read back like one log."""
+        plain = AuditLogger(log_file="plain.jsonl", log_dir=str(tmp_path))
+        self.log_hours(plain, 6)
+        with AuditLogger(
+            log_dir=str(tmp_path), buffered=buffered, indexed=True, rotate_bytes=4096
+        ) as logger:
+            self.log_hours(logger, 6)
+
+        segments = logger.segments.entries()
+        assert len(segments) > 1
+        assert all(entry["compression"] == "gzip" for entry in segments)
+        assert all((tmp_path / entry["file"]).exists() for entry in segments)
+        assert list(tmp_path.glob("audit_log.*.jsonl")) == []
+
+        assert logger.get_events() == plain.get_events()
+        assert logger.get_events(campaign_id="google_003", limit=7) == plain.get_events(
+            campaign_id="google_003", limit=7
+        )
+        stats = logger.get_summary_stats()
+        assert stats["total_events"] == 120
+        assert stats["event_types"] == {"error": 60, "agent_decision": 60}
+        assert stats["segments"] == len(segments)
+
+    def test_time_range_reads_overlapping_segments_only(self, tmp_path, monkeypatch):
+        """Test that a time-range query skips segments outside the range."""
+        logger = AuditLogger(log_dir=str(tmp_path), rotate_bytes=2500, compression=None)
+        self.log_hours(logger, 6)
+        read = []
+        iter_events = logger.segments.iter_events
+        monkeypatch.setattr(
+            logger.segments, "iter_events", lambda entry: read.append(entry["segment"]) or iter_events(entry)
+        )
+
+        events = logger.get_events(start_time="2026-01-15T02:00:00", end_time=datetime(2026, 1, 15, 3))
+
+        assert [e["timestamp"][11:13] for e in events] == ["02"] * 20
+        assert 0 < len(read) < len(logger.segments.entries())
+
+    def test_rotation_by_age(self, tmp_path, monkeypatch):
+        """Test that the active log rotates once it is older than the interval."""
+        clock = [1000.0]
+        monkeypatch.setattr(audit_segments.time, "time", lambda: clock[0])
+        logger = AuditLogger(log_dir=str(tmp_path), rotate_interval=3600)
+        self.log_hours(logger, 1)
+        clock[0] += 3600
+        self.log_hours(logger, 1)
+        logger.close()
+
+        assert [entry["counts"]["total_events"] for entry in logger.segments.entries()] == [21]
+        assert logger.get_summary_stats()["total_events"] == 40
+
+    def test_retention_and_clear(self, tmp_path):
+        """Test that old segments expire and clear_log removes all of them."""
+        logger = AuditLogger(log_dir=str(tmp_path), rotate_bytes=2000, keep_segments=2)
+        self.log_hours(logger, 6)
+        logger.close()
+
+        segments = logger.segments.entries()
+        assert len(segments) == 2
+        assert segments[0]["segment"] > 1
+        assert len(list(tmp_path.glob("audit_log.0*"))) == 2
+        stats = logger.reconcile_summary_stats()
+        assert stats["drift"] == {}
+        assert stats["total_events"] == len(logger.get_events())
+
+        logger.clear_log()
+        assert list(tmp_path.glob("audit_log.0*")) == []
+        assert logger.get_summary_stats()["total_events"] == 0
+
+    def test_export_streams_all_segments(self, tmp_path):
+        """Test that export_to_json writes what json.dump of all events writes."""
+        logger = AuditLogger(log_dir=str(tmp_path), rotate_bytes=3000)
+        self.log_hours(logger, 3)
+        logger.close()
+        output = tmp_path / "export.json"
+
+        logger.export_to_json(str(output))
+
+        assert output.read_text() == json.dumps(logger.get_events(), indent=2)
+        AuditLogger(log_file=str(tmp_path / "empty.jsonl")).export_to_json(str(output))
+        assert output.read_text() == "[]"
+
+    def test_zstd_segments(self, tmp_path):
+        """Test zstd-compressed segments when zstandard is installed."""
+        pytest.importorskip("zstandard")
+        with AuditLogger(log_dir=str(tmp_path), rotate_bytes=2000, compression="zstd") as logger:
+            self.log_hours(logger, 2)
+
+        assert logger.segments.entries()[0]["file"].endswith(".zst")
+        assert len(logger.get_events()) == 40
+
+
+class TestMultiProcessAppends:
+    """Test several processes appending to one log."""
+
+    def run_workers(self, tmp_path, workers: int, count: int, buffered: bool):
+        """Helper to run append_worker processes and check the shared log."""
+        context = multiprocessing.get_context("fork")
+        processes = [
+            context.Process(target=append_worker, args=(str(tmp_path), worker, count, buffered))
+            for worker in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            assert process.exitcode == 0
+
+        # Every line decodes (no torn records), none is lost or duplicated
+        seen = {f"worker_{worker}": [] for worker in range(workers)}
+        with open(tmp_path / "audit_log.jsonl", "rb") as f:
+            for line in f:
+                event = json.loads(line)
+                seen[event["campaign_id"]].append(event["seq"])
+        for seqs in seen.values():
+            # Each worker's events stay in its own order
+            assert seqs == list(range(count))
+
+        stats = AuditLogger(log_dir=str(tmp_path)).get_summary_stats()
+        assert stats["total_events"] == workers * count
+        assert stats["event_types"] == {"agent_action": workers * count}
+
+    @pytest.mark.parametrize("buffered", [False, True])
+    def test_no_lost_or_torn_records(self, tmp_path, buffered):
+        """Test concurrent appends from several processes."""
+        self.run_workers(tmp_path, workers=4, count=3000, buffered=buffered)
+
+    @pytest.mark.slow
+    @pytest.mark.parametrize("buffered", [False, True])
+    def test_stress_100k_events_per_process(self, tmp_path, buffered):
+        """Stress test: 4 processes x 100k events each."""
+        self.run_workers(tmp_path, workers=4, count=100_000, buffered=buffered)
+
+    def test_rejects_single_writer_options(self, tmp_path):
+        """Test that sidecar index and rotation need a single writer process."""
+        with pytest.raises(ValueError, match="single writer"):
+            AuditLogger(log_dir=str(tmp_path), multiprocess=True, indexed=True)
+        with pytest.raises(ValueError, match="single writer"):
+            AuditLogger(log_dir=str(tmp_path), multiprocess=True, rotate_bytes=1024)
+
+    def test_index_picks_up_other_writers(self, tmp_path):
+        """Test that an indexed logger indexes records appended by other writers."""
+        indexed = AuditLogger(log_dir=str(tmp_path), indexed=True)
+        other = AuditLogger(log_dir=str(tmp_path))
+        log_decisions(indexed, 0, 3)
+        log_decisions(other, 3, 3)
+        log_decisions(indexed, 6, 3)
+
+        assert len(indexed.get_events(event_type="agent_decision")) == 9
+        assert indexed.get_events(campaign_id="google_00004")[0]["campaign_id"] == "google_00004"
@@ -0,0 +1,163 @@
+"""
+Unit tests for memory-mapped audit log scans.
+
+Tests the prefiltered scanner behind filtered get_events calls and the
+reverse tail reader behind AuditLogger.tail_events.
+"""
+
+import json
+
+import pytest
+from src.utils.audit_logger import AuditLogger
+from src.utils.audit_scan import scan_events, scan_events_reverse
+from src.utils.codecs import MsgpackCodec, get_codec
+
+
+def codec_names():
+    """Codec names usable in this environment (msgpack needs an extra)."""
+    try:
+        MsgpackCodec()
+        return ["json", "msgpack"]
+    except ImportError:
+        return ["json"]
+
+
+def log_mixed(logger: AuditLogger, count: int = 60, start: int = 0):
+    """Helper to log interleaved event types across a few campaigns."""
+    for i in range(start, start + count):
+        event = {
+            "event_type": ["agent_decision", "pacing_alert", "error"][i % 3],
+            "campaign_id": f"google_{i % 7:03d}",
+            "details": {"run": i},
+            "timestamp": f"2026-01-15T12:{i % 60:02d}:00",
+        }
+        if i % 5 == 0:
+            # Decoy: the filter value nested inside another field
+            event["details"]["campaign_id"] = "google_003"
+        logger.log_event(event)
+
+
+def full_scan(logger: AuditLogger, event_type=None, campaign_id=None):
+    """Helper to filter every decoded record, like get_events used to."""
+    with open(logger.log_path, "rb") as f:
+        return [
+            event for event in logger.codec.iter_decode(f)
+            if (not event_type or event.get("event_type") == event_type)
+            and (not campaign_id or event.get("campaign_id") == campaign_id)
+        ]
+
+
+QUERIES = [
+    {"campaign_id": "google_003"},
+    {"event_type": "error"},
+    {"event_type": "pacing_alert", "campaign_id": "google_001"},
+    {"campaign_id": "missing"},
+    {},
+]
+
+
+class TestPrefilteredScan:
+    """Test scan_events and filtered get_events."""
+
+    @pytest.mark.parametrize("codec", codec_names())
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_matches_full_scan(self, tmp_path, codec, query):
+        """Test that prefiltered queries return what a full decode returns."""
+        logger = AuditLogger(log_dir=str(tmp_path), codec=codec)
+        log_mixed(logger)
+
+        assert logger.get_events(**query) == full_scan(logger, **query)
+
+    def test_only_candidates_are_decoded(self, tmp_path, monkeypatch):
+        """Test that records without the filter value are never decoded."""
+        logger = AuditLogger(log_dir=str(tmp_path))
+        log_mixed(logger, 70)
+        decoded = []
+        decode = logger.codec.decode
+        monkeypatch.setattr(logger.codec, "decode", lambda frame: decoded.append(frame) or decode(frame))
+
+        events = logger.get_events(event_type="error", campaign_id="google_002")
+
+        assert len(events) == len(decoded) == 4
+
+    def test_corrupt_lines_and_partial_tail(self, tmp_path):
+        """Test that corrupt lines are skipped and a last line without newline is read."""
+        codec = get_codec("json")
+        path = tmp_path / "audit_log.jsonl"
+        path.write_bytes(
+            codec.encode({"campaign_id": "a", "n": 1})
+            + b'{"campaign_id": "a", broken\n'
+            + codec.encode({"campaign_id": "b", "n": 2})
+            + codec.encode({"campaign_id": "a", "n": 3}).rstrip(b"\n")
+        )
+
+        assert [e["n"] for e in scan_events(path, codec, campaign_id="a")] == [1, 3]
+        assert [e["n"] for e in scan_events_reverse(path, codec, campaign_id="a")] == [3, 1]
+        assert [e["n"] for e in scan_events_reverse(path, codec)] == [3, 2, 1]
+
+    def test_compact_json_log(self, tmp_path):
+        """Test that lines written with compact separators still match the filters."""
+        logger = AuditLogger(log_dir=str(tmp_path))
+        with open(logger.log_path, "w") as f:
+            for i in range(6):
+                event = {"event_type": ["a", "b"][i % 2], "campaign_id": f"google_{i % 3:03d}", "n": i}
+                f.write(json.dumps(event, separators=(",", ":")) + "\n")
+
+        assert [e["n"] for e in logger.get_events(campaign_id="google_001")] == [1, 4]
+        assert [e["n"] for e in logger.get_events(event_type="b", campaign_id="google_001")] == [1]
+        assert [e["n"] for e in logger.tail_events(10, campaign_id="google_001")] == [1, 4]
+
+    def test_missing_and_empty_logs(self, tmp_path):
+        """Test scanning a log that doesn't exist or is empty."""
+        codec = get_codec("json")
+        path = tmp_path / "audit_log.jsonl"
+
+        assert list(scan_events(path, codec, campaign_id="a")) == []
+        path.touch()
+        assert list(scan_events(path, codec, campaign_id="a")) == []
+        assert list(scan_events_reverse(path, codec)) == []
+
+
+class TestTailEvents:
+    """Test reading the latest events."""
+
+    @pytest.mark.parametrize("codec", codec_names())
+    @pytest.mark.parametrize("query", QUERIES)
+    def test_matches_end_of_full_scan(self, tmp_path, codec, query):
+        """Test that tail_events returns the last events of a full scan."""
+        logger = AuditLogger(log_dir=str(tmp_path), codec=codec)
+        log_mixed(logger)
+
+        for limit in (1, 4, 100):
+            assert logger.tail_events(limit, **query) == full_scan(logger, **query)[-limit:]
+        assert logger.tail_events(0) == []
+
+    def test_reads_only_the_tail(self, tmp_path, monkeypatch):
+        """Test that the latest events are found without decoding older ones."""
+        logger = AuditLogger(log_dir=str(tmp_path))
+        log_mixed(logger, 700)
+        decoded = []
+        decode = logger.codec.decode
+        monkeypatch.setattr(logger.codec, "decode", lambda frame: decoded.append(frame) or decode(frame))
+
+        events = logger.tail_events(2, campaign_id="google_004")
+
+        assert [e["details"]["run"] for e in events] == [690, 697]
+        assert len(decoded) == 2
+
+    def test_spans_rotated_segments(self, tmp_path):
+        """Test that the tail continues into older segments."""
+        with AuditLogger(log_dir=str(tmp_path), rotate_bytes=2000) as logger:
+            log_mixed(logger, 80)
+        assert logger.segments.entries()
+
+        everything = logger.get_events(campaign_id="google_005")
+        assert logger.tail_events(8, campaign_id="google_005") == everything[-8:]
+        assert logger.tail_events(1000) == logger.get_events()
+
+    def test_sqlite_backend(self, tmp_path):
+        """Test tail_events against a SQLite database."""
+        logger = AuditLogger(database_url=f"sqlite:///{tmp_path / 'audit.db'}")
+        log_mixed(logger, 30)
+
+        assert logger.tail_events(3, event_type="error") == logger.get_events(event_type="error")[-3:]
@@ -0,0 +1,150 @@
+"""
+Unit tests for the SQLite audit backend.
+
+Tests that AuditLogger(database_url=...) behaves like the log file
+backend, and migrating log files into a database.
+"""
+
+import sqlite3
+import pytest
+from datetime import datetime
+from src.utils import audit_cli
+from src.utils.audit_logger import AuditLogger
+from src.utils.audit_sqlite import migrate_log, sqlite_path
+
+
+def log_mixed(logger: AuditLogger, count: int = 60):
+    """Helper to log decisions, alerts, actions and errors over a few hours."""
+    for i in range(count):
+        event = {
+            "event_type": ["agent_decision", "pacing_alert", "agent_action", "error"][i % 4],
+            "campaign_id": f"google_{i % 7:03d}" if i % 4 != 3 else None,
+            "details": {"run": i},
+            "timestamp": f"2026-01-15T{i % 6:02d}:{i % 60:02d}:00",
+        }
+        if i % 4 == 0:
+            event["decision"] = "alert" if i % 8 else "log_only"
+        elif i % 4 == 1:
+            event["severity"] = "critical" if i % 3 == 0 else "warning"
+        logger.log_event(event)
+
+
+def database_url(tmp_path) -> str:
+    """Helper to build a database URL in a test directory."""
+    return f"sqlite:///{tmp_path / 'audit_logs.db'}"
+
+
+class TestSqliteAuditLogger:
+    """Test AuditLogger with a SQLite database."""
+
+    @pytest.mark.parametrize("codec", ["json", "msgpack"])
+    @pytest.mark.parametrize("buffered", [False, True])
+    def test_matches_log_file_backend(self, tmp_path, codec, buffered):
+        """Test that queries and stats match the log file backend."""
+        if codec == "msgpack":
+            pytest.importorskip("ormsgpack")
+        plain = AuditLogger(log_dir=str(tmp_path), codec=codec)
+        log_mixed(plain)
+        logger = AuditLogger(
+            database_url=database_url(tmp_path), codec=codec, buffered=buffered, flush_every=16
+        )
+        log_mixed(logger)
+
+        queries = [
+            {},
+            {"campaign_id": "google_003"},
+            {"event_type": "error", "limit": 4},
+            {"event_type": "pacing_alert", "campaign_id": "google_001"},
+            {"start_time": "2026-01-15T02:00:00", "end_time": datetime(2026, 1, 15, 4)},
+            {"campaign_id": "missing"},
+        ]
+        for query in queries:
+            assert logger.get_events(**query) == plain.get_events(**query), query
+
+        stats = logger.get_summary_stats()
+        expected = plain.get_summary_stats()
+        assert stats["total_events"] == expected["total_events"]
+        for key in ("event_types", "alerts_by_severity", "decisions_by_type"):
+            # Same counts, in the same first-seen order
+            assert list(stats[key].items()) == list(expected[key].items())
+        assert stats["log_file"] == sqlite_path(database_url(tmp_path))
+        logger.close()
+
+    def test_wal_mode_and_indexed_queries(self, tmp_path):
+        """Test the journal mode and that filtered queries use the indexes."""
+        logger = AuditLogger(database_url=database_url(tmp_path))
+        log_mixed(logger, 8)
+
+        conn = sqlite3.connect(logger.store.path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        for column, index in (("campaign_id", "campaign_time"), ("event_type", "type_time")):
+            plan = conn.execute(
+                f"EXPLAIN QUERY PLAN SELECT payload FROM audit_events "
+                f"WHERE {column} = ? AND timestamp >= ? ORDER BY id", ("x", "2026")
+            ).fetchall()
+            assert f"idx_audit_events_{index}" in str(plan)
+        conn.close()
+
+    def test_batched_inserts_commit_on_flush(self, tmp_path):
+        """Test that buffered loggers commit per batch, and on flush/read."""
+        logger = AuditLogger(database_url=database_url(tmp_path), buffered=True, flush_every=10)
+        reader = sqlite3.connect(logger.store.path)
+
+        def committed():
+            return reader.execute("SELECT COUNT(*) FROM audit_events").fetchone()[0]
+
+        log_mixed(logger, 25)
+        assert committed() == 20
+        assert len(logger.get_events()) == 25
+        assert committed() == 25
+        log_mixed(logger, 3)
+        logger.close()
+        assert committed() == 28
+        reader.close()
+
+    def test_clear_log(self, tmp_path):
+        """Test that clearing deletes every stored event."""
+        logger = AuditLogger(database_url=database_url(tmp_path))
+        log_mixed(logger, 10)
+        logger.clear_log()
+        log_mixed(logger, 2)
+
+        assert logger.get_summary_stats()["total_events"] == 2
+        assert logger.reconcile_summary_stats()["drift"] == {}
+
+    def test_rejects_file_only_options(self, tmp_path):
+        """Test that bad URLs and log-file-only options are rejected."""
+        with pytest.raises(ValueError, match="sqlite:///"):
+            AuditLogger(database_url="postgresql://localhost/audit")
+        with pytest.raises(ValueError, match="indexed"):
+            AuditLogger(database_url=database_url(tmp_path), indexed=True)
+        with pytest.raises(ValueError, match="rotation"):
+            AuditLogger(database_url=database_url(tmp_path), rotate_bytes=1024)
+
+
+class TestMigration:
+    """Test copying log files into a database."""
+
+    def test_migrates_log_and_segments(self, tmp_path):
+        """Test that a rotated log migrates with every event in order."""
+        with AuditLogger(log_dir=str(tmp_path), rotate_bytes=2000) as source:
+            log_mixed(source)
+        assert source.segments.entries()
+
+        count = migrate_log(str(source.log_path), database_url(tmp_path), batch_size=7)
+        target = AuditLogger(database_url=database_url(tmp_path))
+
+        assert count == 60
+        assert target.get_events() == source.get_events()
+        assert target.get_summary_stats()["event_types"] == source.get_summary_stats()["event_types"]
+
+    def test_cli_migrate_uses_audit_database_url(self, tmp_path, monkeypatch, capsys):
+        """Test the migrate command, defaulting to $AUDIT_DATABASE_URL."""
+        source = AuditLogger(log_dir=str(tmp_path))
+        log_mixed(source, 12)
+        monkeypatch.setenv("DATABASE_URL", "sqlite:///" + str(tmp_path / "other.db"))
+        monkeypatch.setenv("AUDIT_DATABASE_URL", database_url(tmp_path))
+
+        assert audit_cli.main(["migrate", str(source.log_path)]) == 0
+        assert "Migrated 12 events" in capsys.readouterr().out
+        assert len(AuditLogger(database_url=database_url(tmp_path)).get_events()) == 12
@@ -0,0 +1,113 @@
+"""
+Unit tests for CampaignMatcher.
+
+Tests blocked n-gram candidate matching of tracker rows to platform campaigns.
+"""
+
+import pytest
+from dataclasses import replace
+from datetime import datetime, timedelta
+from src.agents.campaign_matcher import CampaignMatcher
+from src.agents.confidence_scorer import ConfidenceScorer
+from src.api.internal_tracker import MockInternalTracker
+from src.api.mock_platform_api import MockPlatformAPI
+from src.models.spend import Platform, DataSource, SpendRecord
+
+
+AS_OF = datetime(2026, 1, 15, 12, 0)
+
+
+@pytest.fixture
+def catalog():
+    """Synced platform and tracker records sharing campaign IDs."""
+    platform_api = MockPlatformAPI(Platform.GOOGLE, num_campaigns=500, seed=42, as_of=AS_OF)
+    tracker = MockInternalTracker()
+    tracker.sync_from_platform(platform_api, dirty_ratio=0.1, seed=42)
+    campaign_ids = platform_api.list_campaign_ids()
+    return (
+        platform_api.get_campaign_spend_batch(campaign_ids),
+        tracker.get_target_spend_batch(campaign_ids),
+    )
+
+
+def create_record(campaign_id: str, name: str, market: str = "EU", product: str = "LEGO_City"):
+    """Helper to create a tracker SpendRecord."""
+    return SpendRecord(
+        campaign_id=campaign_id,
+        campaign_name=name,
+        platform=Platform.GOOGLE,
+        source=DataSource.INTERNAL_TRACKER,
+        amount_usd=1000.0,
+        timestamp=AS_OF - timedelta(hours=1),
+        refresh_cycle_hours=24,
+        metadata={"market": market, "product": product}
+    )
+
+
+class TestCampaignMatcher:
+    """Test CampaignMatcher."""
+
+    def test_recovers_campaigns_without_shared_ids(self, catalog):
+        """Test that clean tracker rows match their campaign under drifted IDs."""
+        actual, target = catalog
+        matcher = CampaignMatcher(actual)
+        clean = [
+            (replace(t, campaign_id=f"tracker_{i}"), t.campaign_id)
+            for i, t in enumerate(target)
+            if not t.campaign_name.startswith(("Unknown", "Legacy", "Unmatched"))
+        ]
+
+        results = matcher.match_all([record for record, _ in clean], k=3, as_of=AS_OF)
+
+        for (record, original_id), matches in zip(clean, results):
+            assert matches[0].campaign_id == original_id
+            assert matches[0].tracker_campaign_id == record.campaign_id
+
+    def test_matches_brute_force_best(self, catalog):
+        """Test that the top candidate scores as well as exhaustive search in its block."""
+        actual, target = catalog
+        scorer = ConfidenceScorer()
+        matcher = CampaignMatcher(actual, confidence_scorer=scorer)
+
+        for record in target[:50]:
+            matches = matcher.match(record, k=1, as_of=AS_OF)
+            block = [
+                a for a in actual
+                if a.metadata["market"] == record.metadata["market"]
+                and a.metadata["product"] == record.metadata["product"]
+            ]
+            if not block:
+                assert matches == []
+                continue
+            best = max(
+                scorer.calculate_confidence(
+                    record.campaign_name, a.campaign_name, record.metadata, a.metadata,
+                    a.timestamp, as_of=AS_OF
+                )["confidence_score"]
+                for a in block
+            )
+            assert matches[0].confidence_score == best
+
+    def test_top_k_sorted_by_confidence(self, catalog):
+        """Test that candidates are returned best first and capped at k."""
+        actual, target = catalog
+        matches = CampaignMatcher(actual).match(target[0], k=4, as_of=AS_OF)
+
+        assert len(matches) == 4
+        scores = [m.confidence_score for m in matches]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_blocking_by_market_and_product(self):
+        """Test that only campaigns sharing market and product are candidates."""
+        campaigns = [
+            create_record("google_001", "LEGO_EU_City_001", "EU", "LEGO_City"),
+            create_record("google_002", "LEGO_EU_City_001", "NA", "LEGO_City"),
+            create_record("google_003", "LEGO_EU_City_002", "eu", "lego_city"),
+        ]
+        matcher = CampaignMatcher(campaigns)
+
+        matches = matcher.match(create_record("t1", "LEGO EU City 001"), k=5, as_of=AS_OF)
+        assert [m.campaign_id for m in matches] == ["google_001", "google_003"]
+
+        unknown_block = create_record("t2", "LEGO_EU_City_001", "LATAM", "LEGO_City")
+        assert matcher.match(unknown_block, as_of=AS_OF) == []
@@ -0,0 +1,212 @@
+"""
+Unit tests for serialization codecs.
+
+Tests JSON and MessagePack codecs, and their use by AuditLogger and
+ResultsTracker.
+"""
+
+import io
+import json
+import pytest
+from datetime import datetime
+from src.models.spend import Platform, PacingAlert, ReconciledSpend
+from src.utils.audit_logger import AuditLogger
+from src.utils.codecs import JsonCodec, MsgpackCodec, codec_for_path, get_codec
+from src.utils.results_tracker import ResultsTracker
+
+
+def available_codecs():
+    """Codec names usable in this environment (msgpack needs an extra)."""
+    names = ["json"]
+    try:
+        MsgpackCodec()
+        names.append("msgpack")
+    except ImportError:
+        pass
+    return names
+
+
+CODEC_NAMES = available_codecs()
+
+TIMESTAMP = datetime(2026, 1, 15, 12, 0, 0, 123456)
+
+
+def create_reconciled() -> ReconciledSpend:
+    """Helper to create a ReconciledSpend."""
+    return ReconciledSpend(
+        campaign_id="google_001",
+        campaign_name="LEGO_EU_City_Q1_2026_Search_001",
+        platform=Platform.GOOGLE,
+        target_spend=10000.0,
+        actual_spend=12000.0,
+        target_timestamp=TIMESTAMP,
+        actual_timestamp=TIMESTAMP,
+        metadata_match_score=1.0,
+        name_similarity=0.8,
+        data_freshness_score=0.6
+    )
+
+
+def create_alert(campaign_id: str = "google_001", severity: str = "critical") -> PacingAlert:
+    """Helper to create a PacingAlert."""
+    return PacingAlert(
+        alert_id=f"alert_{campaign_id}",
+        campaign_id=campaign_id,
+        severity=severity,
+        variance_pct=45.0,
+        confidence_score=0.92,
+        action_taken="autonomous_halt",
+        recommendation="Pause campaign",
+        requires_human=False,
+        timestamp=TIMESTAMP,
+        metadata={"market": "EU", "target_spend": 10000.0}
+    )
+
+
+class TestCodecs:
+    """Test record and document encoding."""
+
+    def test_json_records_match_original_jsonl(self):
+        """Test that JSON records are byte-identical to json.dumps lines."""
+        event = {"event_type": "reconciliation", "campaign_id": "google_001", "variance_pct": 20.0}
+
+        assert JsonCodec().encode(event) == (json.dumps(event) + "\n").encode("utf-8")
+
+    @pytest.mark.parametrize("name", CODEC_NAMES)
+    def test_record_stream_round_trip(self, name):
+        """Test that a stream of encoded records decodes back in order."""
+        codec = get_codec(name)
+        events = [
+            {"event_type": "agent_decision", "campaign_id": f"google_{i:03d}",
+             "confidence_score": i / 10, "requires_human": i % 2 == 0,
+             "details": {"nested": [1, 2.5, None, "x"]}}
+            for i in range(10)
+        ]
+        stream = io.BytesIO(b"".join(codec.encode(e) for e in events))
+
+        assert list(codec.iter_decode(stream)) == events
+
+    @pytest.mark.parametrize("name", CODEC_NAMES)
+    def test_models_encode_as_to_dict(self, name):
+        """Test that models, datetimes and enums serialize via to_dict()."""
+        codec = get_codec(name)
+        reconciled = create_reconciled()
+        alert = create_alert()
+
+        assert codec.loads(codec.dumps(reconciled)) == reconciled.to_dict()
+        assert codec.loads(codec.dumps(alert)) == alert.to_dict()
+        assert codec.loads(codec.dumps({"platform": Platform.META, "at": TIMESTAMP})) == {
+            "platform": "meta", "at": TIMESTAMP.isoformat()
+        }
+
+    def test_corrupt_json_lines_are_skipped(self):
+        """Test that unparseable JSON lines are skipped like before."""
+        codec = JsonCodec()
+        stream = io.BytesIO(codec.encode({"a": 1}) + b"{not json\n\n" + codec.encode({"b": 2}))
+
+        assert list(codec.iter_decode(stream)) == [{"a": 1}, {"b": 2}]
+
+    @pytest.mark.skipif("msgpack" not in CODEC_NAMES, reason="ormsgpack/msgpack not installed")
+    def test_msgpack_truncated_tail_ends_stream(self):
+        """Test that a partially written last record is ignored."""
+        codec = MsgpackCodec()
+        data = codec.encode({"a": 1}) + codec.encode({"b": 2})
+
+        assert list(codec.iter_decode(io.BytesIO(data[:-3]))) == [{"a": 1}]
+
+    @pytest.mark.skipif("msgpack" not in CODEC_NAMES, reason="ormsgpack/msgpack not installed")
+    def test_msgpack_resyncs_after_corrupt_header(self):
+        """Test that a corrupt length header costs only its own record."""
+        codec = MsgpackCodec()
+        frames = [codec.encode({"n": n, "pad": "x" * n}) for n in range(6)]
+        data = bytearray(b"".join(frames))
+        second = len(frames[0])
+        data[second + 2:second + 6] = b"\xff\xff\x00\x00"  # length now runs past later frames
+        fourth = second + len(frames[1]) + len(frames[2])
+        data[fourth + 12] ^= 0xff  # payload no longer matches its checksum
+
+        codec.READ_SIZE = 7  # resync across read boundaries too
+        records = list(codec.iter_records(io.BytesIO(bytes(data))))
+
+        assert [record["n"] for _, _, record in records] == [0, 2, 4, 5]
+        assert [offset for offset, _, _ in records] == [
+            0, second + len(frames[1]), fourth + len(frames[3]), len(data) - len(frames[5])
+        ]
+        assert [start for start, _, _ in codec.frames(bytes(data))] == [
+            offset for offset, _, _ in records
+        ]
+        assert codec.next_frame(bytes(data), 1) == second + len(frames[1])
+        with pytest.raises(ValueError):
+            codec.decode(bytes(data[second:second + len(frames[1])]))
+
+    @pytest.mark.parametrize("name", CODEC_NAMES)
+    def test_field_needle_found_in_matching_records(self, name):
+        """Test that field needles occur in matching records only."""
+        codec = get_codec(name)
+        needle = codec.field_needle("campaign_id", "google_007")
+
+        assert needle in codec.encode({"event_type": "error", "campaign_id": "google_007", "x": 1})
+        assert needle not in codec.encode({"event_type": "error", "campaign_id": "google_0071"})
+        assert needle not in codec.encode({"event_type": "error", "campaign_id": "google_00"})
+
+    def test_codec_lookup(self):
+        """Test resolving codecs by name and by file extension."""
+        codec = JsonCodec()
+
+        assert get_codec(None).name == "json"
+        assert get_codec(codec) is codec
+        assert codec_for_path("audit_log.jsonl").name == "json"
+        with pytest.raises(ValueError, match="Unknown codec"):
+            get_codec("xml")
+
+
+class TestAuditLoggerCodecs:
+    """Test AuditLogger with each codec."""
+
+    @pytest.mark.parametrize("name", CODEC_NAMES)
+    def test_events_round_trip(self, tmp_path, name):
+        """Test that logged events are read back with filters and stats."""
+        logger = AuditLogger(log_dir=str(tmp_path), codec=name)
+        reconciled = create_reconciled()
+
+        logger.log_reconciliation(
+            campaign_id=reconciled.campaign_id,
+            target_spend=reconciled.target_spend,
+            actual_spend=reconciled.actual_spend,
+            confidence_score=reconciled.confidence_score,
+            metadata_match_score=reconciled.metadata_match_score,
+            name_similarity=reconciled.name_similarity,
+            data_freshness_score=reconciled.data_freshness_score,
+            as_of=TIMESTAMP
+        )
+        logger.log_alert(create_alert())
+        logger.log_alert(create_alert("google_002", "healthy"))
+        logger.log_decision("google_002", 2.0, 0.95, "healthy", "log_only", "On target")
+
+        assert logger.log_path.name == f"audit_log{logger.codec.stream_extension}"
+        assert len(logger.get_events()) == 4
+        assert logger.get_events(event_type="reconciliation")[0]["as_of"] == TIMESTAMP.isoformat()
+        assert [e["event_type"] for e in logger.get_events(campaign_id="google_002")] == [
+            "pacing_alert", "agent_decision"
+        ]
+        assert logger.get_summary_stats()["alerts_by_severity"] == {"critical": 1, "healthy": 1}
+
+
+class TestResultsTrackerCodecs:
+    """Test ResultsTracker with each codec."""
+
+    @pytest.mark.parametrize("name", CODEC_NAMES)
+    def test_save_and_load_run(self, tmp_path, name):
+        """Test that saved runs load back and list in any format."""
+        tracker = ResultsTracker(results_dir=str(tmp_path), codec=name)
+        alerts = [create_alert(), create_alert("google_002", "healthy")]
+
+        filepath = tracker.save_run(alerts, {"confidence_threshold": 0.7}, run_name="codec run")
+        run_id = tracker.list_runs()[0]["run_id"]
+        results = tracker.load_run(run_id)
+
+        assert filepath.endswith(tracker.codec.extension)
+        assert results["run_metadata"]["run_name"] == "codec run"
+        assert results["summary_statistics"]["critical"] == 1
+        assert results["campaign_results"][1]["metadata"] == {"market": "EU", "target_spend": 10000.0}
+        assert tracker.get_latest_run() == results
@@ -0,0 +1,139 @@
+"""
+Unit tests for columnar exports.
+
+Tests ColumnarWriter, AuditLogger.export_to_parquet and
+ResultsTracker.export_results_parquet (all need pyarrow).
+"""
+
+import json
+import pytest
+from datetime import datetime
+from pathlib import Path
+from src.utils.audit_logger import AuditLogger
+from src.utils.columnar import AUDIT_COLUMNS, ColumnarWriter
+from src.utils.results_tracker import ResultsTracker
+from tests.test_codecs import create_alert
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+def log_mixed(logger: AuditLogger, count: int = 50):
+    """Helper to log reconciliations, decisions and errors."""
+    for i in range(count):
+        if i % 3 == 0:
+            logger.log_event({
+                "event_type": "reconciliation", "campaign_id": f"google_{i:03d}",
+                "target_spend": 1000, "actual_spend": 900.5 + i, "variance_pct": 9.95,
+                "confidence_score": 0.9, "as_of": "2026-01-15T11:00:00",
+                "timestamp": f"2026-01-15T12:{i:02d}:00",
+            })
+        elif i % 3 == 1:
+            logger.log_event({
+                "event_type": "agent_decision", "campaign_id": f"google_{i:03d}",
+                "decision": "send_alert", "severity": "warning", "reasoning": "r",
+                "timestamp": f"2026-01-15T12:{i:02d}:00.250000",
+            })
+        else:
+            logger.log_event({
+                "event_type": "error", "error_type": "api_error", "campaign_id": None,
+                "context": {"attempt": i}, "timestamp": f"2026-01-15T12:{i:02d}:00",
+            })
+
+
+class TestColumnarWriter:
+    """Test writing typed columns in row-group batches."""
+
+    def test_row_groups_and_types(self, tmp_path):
+        """Test batching, type coercion and the extra column."""
+        output = tmp_path / "rows.parquet"
+        with ColumnarWriter(str(output), [("name", "string"), ("x", "float"), ("ok", "bool"),
+                                          ("at", "timestamp")], batch_size=4) as writer:
+            for i in range(10):
+                writer.write({"name": i, "x": "bad" if i == 3 else i, "ok": i % 2 == 0,
+                              "at": f"2026-01-15T12:00:0{i}+01:00", "note": {"i": i}})
+
+        parquet = pq.ParquetFile(output)
+        assert parquet.metadata.num_rows == writer.rows == 10
+        assert parquet.metadata.num_row_groups == 3
+        table = parquet.read()
+        assert table.schema.field("x").type == pa.float64()
+        assert table.column("name").to_pylist()[:2] == ["0", "1"]
+        assert table.column("x").to_pylist()[3] is None
+        assert table.column("at").to_pylist()[0] == datetime(2026, 1, 15, 11, 0, 0)
+        assert json.loads(table.column("extra").to_pylist()[9]) == {"note": {"i": 9}}
+
+    def test_arrow_ipc_and_empty_output(self, tmp_path):
+        """Test Arrow IPC output, and a readable file with no rows."""
+        output = tmp_path / "rows.arrow"
+        with ColumnarWriter(str(output), [("name", "string")], extra_column=None) as writer:
+            writer.write({"name": "a", "dropped": 1})
+        assert pa.ipc.open_file(output).read_all().to_pylist() == [{"name": "a"}]
+
+        empty = tmp_path / "empty.parquet"
+        ColumnarWriter(str(empty), [("name", "string")]).close()
+        assert pq.read_table(empty).num_rows == 0
+
+    def test_unknown_column_type(self, tmp_path):
+        """Test that an unknown column type is rejected."""
+        with pytest.raises(ValueError, match="Unknown column type"):
+            ColumnarWriter(str(tmp_path / "x.parquet"), [("name", "decimal")])
+
+
+class TestAuditParquetExport:
+    """Test AuditLogger.export_to_parquet."""
+
+    @pytest.mark.parametrize("rotate_bytes", [None, 2000])
+    def test_matches_events(self, tmp_path, rotate_bytes):
+        """Test that every event is exported into its typed columns."""
+        with AuditLogger(log_dir=str(tmp_path), rotate_bytes=rotate_bytes) as logger:
+            log_mixed(logger)
+        output = tmp_path / "audit.parquet"
+
+        logger.export_to_parquet(str(output), batch_size=16)
+
+        events = logger.get_events()
+        parquet = pq.ParquetFile(output)
+        assert parquet.metadata.num_row_groups == 4
+        table = parquet.read()
+        assert table.num_rows == len(events) == 50
+        assert table.schema.names == [name for name, _ in AUDIT_COLUMNS] + ["extra"]
+        assert table.column("event_type").to_pylist() == [e["event_type"] for e in events]
+        assert table.column("actual_spend").to_pylist() == [e.get("actual_spend") for e in events]
+        assert table.column("timestamp").to_pylist()[1] == datetime(2026, 1, 15, 12, 1, 0, 250000)
+        assert json.loads(table.column("extra").to_pylist()[2]) == {"context": {"attempt": 2}}
+
+    def test_reads_only_requested_columns(self, tmp_path):
+        """Test a time-range export read back by column."""
+        logger = AuditLogger(log_dir=str(tmp_path))
+        log_mixed(logger)
+        output = tmp_path / "audit.parquet"
+
+        logger.export_to_parquet(str(output), start_time="2026-01-15T12:30:00")
+
+        table = pq.read_table(output, columns=["campaign_id", "variance_pct"])
+        assert table.schema.names == ["campaign_id", "variance_pct"]
+        assert table.num_rows == 20
+
+
+class TestResultsParquetExport:
+    """Test ResultsTracker.export_results_parquet."""
+
+    def test_one_row_per_campaign_per_run(self, tmp_path):
+        """Test exporting the campaign results of two runs."""
+        tracker = ResultsTracker(results_dir=str(tmp_path))
+        alerts = [create_alert(f"google_{i:03d}", "critical" if i % 2 else "healthy") for i in range(3)]
+        first = Path(tracker.save_run(alerts, {"confidence_threshold": 0.7}, run_name="first"))
+        # Runs saved within the same second share a run ID; keep both files
+        first.rename(tmp_path / "run_20260101_000000.json")
+        tracker.save_run(alerts[:2], {"confidence_threshold": 0.8}, run_name="second")
+        run_ids = [Path(run["filepath"]).name for run in tracker.list_runs()]
+        output = tmp_path / "results.parquet"
+
+        tracker.export_results_parquet(run_ids, str(output))
+
+        rows = pq.read_table(output).to_pylist()
+        assert len(rows) == 5
+        assert [row["run_name"] for row in rows] == ["first"] * 3 + ["second"] * 2
+        assert rows[1]["severity"] == "critical" and rows[1]["variance_pct"] == 45.0
+        assert json.loads(rows[0]["extra"])["metadata"]["market"] == "EU"
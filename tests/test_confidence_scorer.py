@@ -4,9 +4,11 @@ Unit tests for ConfidenceScorer.
 Tests metadata matching, name similarity, freshness scoring, and overall confidence.
 """
 
+import numpy as np
 import pytest
 from datetime import datetime, timedelta
-from src.agents.confidence_scorer import ConfidenceScorer
+from src.agents.confidence_scorer import ConfidenceResult, ConfidenceScorer, NameDistanceCache
+from src.models.metadata import MetadataVocabulary
 
 
 @pytest.fixture
@@ -214,6 +216,34 @@ class TestFreshnessScoring:
         assert score == 0.2
 
 
+class TestReferenceClock:
+    """Test scoring against a fixed as_of reference time."""
+
+    def test_freshness_uses_as_of(self, scorer):
+        """Test that freshness is measured from as_of, not the wall clock."""
+        timestamp = datetime(2026, 1, 15, 8, 0)
+
+        assert scorer.calculate_freshness(timestamp, as_of=datetime(2026, 1, 15, 10, 0)) == 1.0
+        assert scorer.calculate_freshness(timestamp, as_of=datetime(2026, 1, 15, 20, 0)) == 0.5
+
+    def test_replay_at_as_of_reproduces_scores(self, scorer):
+        """Test that scoring the same inputs at the same as_of is exact."""
+        as_of = datetime(2026, 1, 15, 12, 0)
+        args = (
+            "LEGO_EU_City", "LEGO EU City",
+            {"market": "EU"}, {"market": "EU"},
+            as_of - timedelta(hours=3, minutes=59, seconds=59)
+        )
+
+        original = scorer.calculate_confidence(*args, as_of=as_of)
+        replayed = scorer.calculate_confidence(*args, as_of=as_of)
+        explained = scorer.explain_confidence(*args, scores=original, as_of=as_of)
+
+        assert replayed == original
+        assert original["data_freshness_score"] == 1.0
+        assert explained["data_freshness"]["tier_label"] == "Fresh"
+
+
 class TestOverallConfidence:
     """Test overall confidence calculation."""
 
@@ -296,6 +326,282 @@ class TestOverallConfidence:
         assert result["data_freshness_score"] == 0.2
 
 
+class TestBatchConfidence:
+    """Test vectorized batch confidence scoring."""
+
+    def create_pairs(self):
+        """Helper to build aligned tracker/API rows covering edge cases."""
+        base = {
+            "market": "EU",
+            "product": "LEGO_City",
+            "start_date": "2026-01-01",
+            "end_date": "2026-01-31"
+        }
+        now = datetime.utcnow()
+        return [
+            ("LEGO_EU_City", "LEGO_EU_City", base, dict(base), now - timedelta(hours=1)),
+            ("LEGO_EU_City", "lego eu city ", base, {**base, "market": "eu"}, now - timedelta(hours=6)),
+            ("Unknown_Campaign_001", "LEGO_NA_Friends", base, {"market": "NA"}, now - timedelta(hours=15)),
+            ("", "LEGO_EU_City", {}, {}, now - timedelta(days=3)),
+            (None, "X", {"market": None}, {"market": None}, now - timedelta(hours=2)),
+            ("   ", "  ", base, {**base, "end_date": "2026-02-28"}, now - timedelta(hours=30)),
+            # Equal-but-different-type values: True == 1 == 1.0, "true" != "1"
+            ("LEGO_EU_City", "LEGO_EU_City", {**base, "market": True, "product": 1},
+             {**base, "market": "true", "product": "1"}, now - timedelta(hours=1)),
+            ("LEGO_EU_City", "LEGO_EU_City", {**base, "market": 1, "product": True},
+             {**base, "market": "1", "product": 1.0}, now - timedelta(hours=1)),
+        ]
+
+    def test_batch_matches_scalar(self, scorer):
+        """Test that every batch score matches calculate_confidence exactly."""
+        pairs = self.create_pairs()
+        tracker_names, api_names, tracker_meta, api_meta, timestamps = zip(*pairs)
+
+        result = scorer.calculate_confidence_batch(
+            tracker_names,
+            api_names,
+            scorer.metadata_columns(tracker_meta),
+            scorer.metadata_columns(api_meta),
+            timestamps
+        )
+
+        for i, pair in enumerate(pairs):
+            expected = scorer.calculate_confidence(*pair)
+            for key, value in expected.items():
+                assert result[key][i] == value, (i, key)
+
+    def test_freshness_batch_datetime64(self, scorer):
+        """Test freshness tiers from a datetime64 array and fixed reference time."""
+        as_of = datetime(2026, 1, 15, 12, 0)
+        timestamps = np.array(
+            [as_of - timedelta(hours=h) for h in (0, 3.99, 4, 11.9, 12, 23.9, 24, 72)],
+            dtype="datetime64[us]"
+        )
+
+        scores = scorer.calculate_freshness_batch(timestamps, as_of=as_of)
+
+        assert scores.tolist() == [1.0, 1.0, 0.8, 0.8, 0.5, 0.5, 0.2, 0.2]
+
+
+class TestEncodedMetadataMatching:
+    """Test metadata matching on integer-coded metadata."""
+
+    def test_codes_match_string_comparison(self, scorer):
+        """Test that coded scalar and batch scores equal plain-dict scores."""
+        vocabulary = MetadataVocabulary(scorer.required_fields)
+        pairs = [(t, a) for _, _, t, a, _ in TestBatchConfidence().create_pairs()]
+        tracker = [vocabulary.encode(t) for t, _ in pairs]
+        api = [vocabulary.encode(a) for _, a in pairs]
+
+        expected = [scorer.calculate_metadata_match(t, a) for t, a in pairs]
+
+        assert [scorer.calculate_metadata_match(t, a) for t, a in zip(tracker, api)] == expected
+        batch = scorer.calculate_metadata_match_batch(
+            scorer.metadata_codes(tracker), scorer.metadata_codes(api)
+        )
+        assert batch.tolist() == expected
+
+    def test_mixed_vocabularies_fall_back(self, scorer):
+        """Test that codes from different vocabularies are not compared."""
+        first = MetadataVocabulary(scorer.required_fields)
+        second = MetadataVocabulary(scorer.required_fields)
+
+        # Different values that happen to get the same code in each vocabulary
+        tracker = first.encode({"market": "NA"})
+        api = second.encode({"market": "EU"})
+
+        assert tracker.codes[0] == api.codes[0]
+        assert scorer.calculate_metadata_match(tracker, api) == 0.0
+        assert scorer.metadata_codes([{"market": "EU"}]) is None
+
+
+class TestScoreWithExplanation:
+    """Test single-pass scoring with a lazy explanation."""
+
+    def test_matches_separate_calls(self, scorer):
+        """Test that scores and explanation match the two-call API."""
+        as_of = datetime(2026, 1, 15, 12, 0)
+        for pair in TestBatchConfidence().create_pairs():
+            result = scorer.score_with_explanation(*pair, as_of=as_of)
+            expected = scorer.calculate_confidence(*pair, as_of=as_of)
+
+            assert isinstance(result, ConfidenceResult)
+            assert result.scores == expected
+            assert result["confidence_score"] == expected["confidence_score"]
+            assert result.explanation == scorer.explain_confidence(
+                *pair, scores=expected, as_of=as_of
+            )
+
+    def test_explanation_is_lazy(self, scorer):
+        """Test that the distance is computed once and the explanation built on demand."""
+        calls = []
+        original = scorer._build_explanation
+        scorer._build_explanation = lambda *args: calls.append(args) or original(*args)
+
+        result = scorer.score_with_explanation(
+            "LEGO_EU_City", "LEGO EU City", {}, {}, datetime.utcnow()
+        )
+        assert calls == []
+
+        assert result.explanation is result.explanation
+        assert len(calls) == 1
+        assert scorer.name_cache.stats()["misses"] == 1
+        assert scorer.name_cache.stats()["hits"] == 0
+
+
+class TestThresholdGating:
+    """Test bound-based short-circuit scoring for threshold decisions."""
+
+    def test_decisions_match_full_scoring(self, scorer):
+        """Test that gated scores land on the same side of every threshold."""
+        as_of = datetime(2026, 1, 15, 12, 0)
+        pairs = TestBatchConfidence().create_pairs() + [
+            ("LEGO_EU_City_Q1", "LEGO_EU_City_Q2", {}, {}, as_of - timedelta(hours=30)),
+            ("LEGO_NA_Friends", "LEGO_NA_Friend", {"market": "NA"}, {"market": "NA"}, as_of),
+        ]
+
+        for threshold in (0.3, 0.5, 0.7, 0.9):
+            for pair in pairs:
+                full = scorer.calculate_confidence(*pair, as_of=as_of)
+                gated = scorer.score_for_threshold(*pair, threshold=threshold, as_of=as_of)
+
+                assert (gated["confidence_score"] >= threshold) == (
+                    full["confidence_score"] >= threshold
+                ), (threshold, pair[:2])
+                assert gated["metadata_match_score"] == full["metadata_match_score"]
+                assert gated["data_freshness_score"] == full["data_freshness_score"]
+                if not gated.short_circuited:
+                    assert gated.scores == full
+                else:
+                    # The skipped name score is unknown, bounded on both sides
+                    assert gated["name_similarity"] is None
+                    assert gated["confidence_score"] <= full["confidence_score"]
+                    assert full["confidence_score"] <= gated.confidence_score_max
+                    assert full["name_similarity"] <= gated.name_similarity_max
+
+    def test_settled_pairs_skip_distance(self):
+        """Test that pairs decided by metadata and freshness skip the distance."""
+        scorer = ConfidenceScorer(name_cache_size=0)
+        metadata = {
+            "market": "EU",
+            "product": "LEGO_City",
+            "start_date": "2026-01-01",
+            "end_date": "2026-01-31"
+        }
+        as_of = datetime(2026, 1, 15, 12, 0)
+
+        # 0.5 + 0.2 = 0.7 passes whatever the name score
+        passing = scorer.score_for_threshold(
+            "LEGO_EU_City", "Totally Different", metadata, dict(metadata), as_of, threshold=0.7,
+            as_of=as_of
+        )
+        # No metadata matches and stale data: at most 0.3 + 0.04 < 0.7
+        failing = scorer.score_for_threshold(
+            "LEGO_EU_City", "LEGO_EU_Citx", {}, {}, as_of - timedelta(days=2), threshold=0.7,
+            as_of=as_of
+        )
+        # 0.5 + 0.3 * name + 0.04 depends on the name score
+        undecided = scorer.score_for_threshold(
+            "LEGO_EU_City", "LEGO_EU_Citx", metadata, dict(metadata),
+            as_of - timedelta(days=2), threshold=0.7, as_of=as_of
+        )
+
+        assert passing.short_circuited and passing["name_similarity"] is None
+        assert passing["confidence_score"] == pytest.approx(0.7)
+        assert failing.short_circuited and failing["name_similarity"] is None
+        assert failing["confidence_score"] == pytest.approx(0.04)
+        assert failing.confidence_score_max == pytest.approx(0.04 + 0.3 * 11 / 12)
+        assert not undecided.short_circuited
+        assert scorer.gating_stats() == {
+            "gated": 3,
+            "short_circuited": 2,
+            "short_circuit_rate": 2 / 3,
+        }
+
+    def test_explanation_uses_real_distance(self, scorer):
+        """Test that a short-circuited explanation still reports the edit distance."""
+        as_of = datetime(2026, 1, 15, 12, 0)
+        result = scorer.score_for_threshold(
+            "LEGO_EU_City", "LEGO_EU_Citx", {}, {}, as_of - timedelta(days=2),
+            threshold=0.7, as_of=as_of
+        )
+
+        assert result.short_circuited
+        assert scorer.name_cache.stats()["misses"] == 0
+        assert result.explanation["name_similarity"]["edit_distance"] == 1
+        assert result.explanation["name_similarity"]["score"] is None
+        assert "not scored" in result.explanation["name_similarity"]["summary"]
+
+    def test_diagnosis_of_skipped_name_score(self, scorer):
+        """Test that a low-confidence diagnosis doesn't report a skipped name score."""
+        as_of = datetime(2026, 1, 15, 12, 0)
+        result = scorer.score_for_threshold(
+            "LEGO_EU_City", "LEGO_EU_Citx", {}, {}, as_of - timedelta(days=2),
+            threshold=0.7, as_of=as_of
+        )
+
+        diagnosis = scorer.diagnose_low_confidence(result.scores, 0.7)
+
+        assert "Name similarity not scored" in diagnosis
+        assert "Low name similarity" not in diagnosis
+
+
+class TestNameDistanceCache:
+    """Test memoized name-similarity distances."""
+
+    def test_repeated_pairs_hit_cache(self, scorer):
+        """Test that scoring then explaining a pair computes the distance once."""
+        timestamp = datetime.utcnow()
+        args = ("LEGO_EU_City", "LEGO EU City", {}, {}, timestamp)
+
+        scores = scorer.calculate_confidence(*args)
+        scorer.explain_confidence(*args, scores=scores)
+        scorer.calculate_confidence(*args)
+
+        stats = scorer.name_cache.stats()
+        assert stats["misses"] == 1
+        assert stats["hits"] == 2
+
+    def test_cached_scores_match_uncached(self, scorer):
+        """Test that caching doesn't change similarity scores."""
+        uncached = ConfidenceScorer(name_cache_size=0)
+        pairs = [("LEGO_EU_City", "LEGO_EU_Friends"), ("ABC", "abd"), ("LEGO", "LEGO_City")]
+
+        for _ in range(2):
+            for tracker_name, api_name in pairs:
+                assert scorer.calculate_name_similarity(tracker_name, api_name) == (
+                    uncached.calculate_name_similarity(tracker_name, api_name)
+                )
+        assert uncached.name_cache is None
+
+    def test_lru_eviction(self):
+        """Test that the least recently used pair is evicted first."""
+        cache = NameDistanceCache(max_size=2)
+        cache.distance("a", "b")
+        cache.distance("c", "d")
+        cache.distance("a", "b")  # refresh a/b
+        cache.distance("e", "f")  # evicts c/d
+
+        assert len(cache) == 2
+        cache.distance("a", "b")
+        assert cache.hits == 2
+        cache.distance("c", "d")
+        assert cache.misses == 4
+
+    def test_persistence_round_trip(self, tmp_path):
+        """Test that a saved cache loads warm in a new scorer."""
+        path = str(tmp_path / "name_cache.json")
+        first = ConfidenceScorer(name_cache_path=path)
+        first.calculate_name_similarity("LEGO_EU_City", "LEGO_NA_City")
+        first.name_cache.save()
+
+        second = ConfidenceScorer(name_cache_path=path)
+        second.calculate_name_similarity("LEGO_EU_City", "LEGO_NA_City")
+
+        assert second.name_cache.stats()["hits"] == 1
+        assert second.name_cache.stats()["misses"] == 0
+
+
 class TestConfidenceThreshold:
     """Test confidence threshold evaluation."""
 
@@ -0,0 +1,279 @@
+"""
+Unit tests for replaying logged pacing decisions.
+
+Tests pairing reconciliations with their logged decisions, that a replay
+under the logged thresholds reproduces PacingBrain's routing, and
+replays under other thresholds and confidence weights, including logs
+whose name scores were short-circuited.
+"""
+
+import json
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from src.analyzers.decision_replay import DECISIONS, NOT_LOGGED, UNDECIDABLE, DecisionReplay
+from src.analyzers.pacing_analyzer import PacingAnalyzer
+from src.api.internal_tracker import MockInternalTracker
+from src.api.mock_platform_api import MockPlatformAPI
+from src.models.spend import Platform
+from src.utils import audit_cli
+from src.utils.audit_logger import AuditLogger
+
+
+def reconciliation(campaign_id: str, target: float, actual: float, confidence: float = 0.9,
+                   timestamp: str = "2026-01-15T12:00:00"):
+    """Helper to build a logged reconciliation event."""
+    return {
+        "event_type": "reconciliation", "campaign_id": campaign_id,
+        "target_spend": target, "actual_spend": actual, "confidence_score": confidence,
+        "metadata_match_score": 1.0, "name_similarity": 0.5, "data_freshness_score": 0.5,
+        "timestamp": timestamp,
+    }
+
+
+def decision(campaign_id: str, label: str, timestamp: str = "2026-01-15T12:00:01"):
+    """Helper to build a logged agent decision event."""
+    return {
+        "event_type": "agent_decision", "campaign_id": campaign_id, "decision": label,
+        "timestamp": timestamp,
+    }
+
+
+def run_brain(tmp_path, num_campaigns: int = 60, seed: int = 7,
+              short_circuit_gating: bool = False) -> AuditLogger:
+    """Helper to run PacingBrain over dirty mock data and return its audit logger."""
+    from src.agents.pacing_brain import PacingBrain
+
+    as_of = datetime(2026, 1, 15, 12, 0)
+    platform_api = MockPlatformAPI(
+        Platform.GOOGLE, num_campaigns=num_campaigns, seed=seed, as_of=as_of
+    )
+    tracker = MockInternalTracker(as_of=as_of)
+    tracker.sync_from_platform(platform_api, dirty_ratio=0.3, seed=seed)
+    logger = AuditLogger(log_file=str(tmp_path / f"audit_{short_circuit_gating}.jsonl"))
+    brain = PacingBrain(
+        platform_api=platform_api, internal_tracker=tracker, audit_logger=logger, as_of=as_of,
+        short_circuit_gating=short_circuit_gating
+    )
+    brain.run_batch(platform_api.list_campaign_ids())
+    return logger
+
+
+class TestFromEvents:
+    """Test rebuilding reconciliations and their logged decisions."""
+
+    def test_pairs_each_reconciliation_with_next_decision(self):
+        """Test pairing by campaign, with interleaved runs and missing decisions."""
+        replay = DecisionReplay.from_events([
+            reconciliation("google_001", 100, 95),
+            reconciliation("meta_002", 100, 150),
+            {"type": "healthy_pacing", "campaign_id": "google_001"},
+            reconciliation("google_003", 100, 80),
+            decision("meta_002", "autonomous_halt"),
+            reconciliation("google_003", 100, 0),
+            decision("google_003", "escalate_to_human"),
+            reconciliation("tiktok_004", 100, 100),
+            decision("tiktok_004", "alert"),
+            {"event_type": "reconciliation", "campaign_id": "google_005", "target_spend": 100},
+            decision("google_005", "send_alert"),
+        ])
+
+        assert list(replay.frame.campaign_id) == [
+            "google_001", "meta_002", "google_003", "google_003", "tiktok_004"
+        ]
+        assert list(DECISIONS[replay.logged_decision]) == [
+            "log_healthy", "autonomous_halt", "not_logged", "escalate_to_human", "not_logged"
+        ]
+        assert list(replay.frame.platform) == [
+            Platform.GOOGLE, Platform.META, Platform.GOOGLE, Platform.GOOGLE, Platform.TIKTOK
+        ]
+        assert replay.frame.target_spend.tolist() == [100.0] * 5
+        assert replay.frame.actual_spend.tolist() == [95.0, 150.0, 80.0, 0.0, 100.0]
+
+    def test_empty_log(self, tmp_path):
+        """Test replaying a log without reconciliations."""
+        replay = DecisionReplay.from_audit_log(AuditLogger(log_dir=str(tmp_path)))
+        result = replay.compare()
+
+        assert len(replay) == 0
+        assert result["reconciliations"] == 0
+        assert result["changed"] == 0 and result["diffs"] == []
+
+
+class TestReplay:
+    """Test re-routing logged reconciliations."""
+
+    def test_logged_thresholds_reproduce_brain_decisions(self, tmp_path):
+        """Test that replaying a PacingBrain log under its own thresholds changes nothing."""
+        logger = run_brain(tmp_path)
+        replay = DecisionReplay.from_audit_log(logger)
+        result = replay.compare()
+
+        assert result["reconciliations"] == 60
+        assert result["not_logged"] == 0
+        assert result["changed"] == 0
+        assert result["replayed"] == result["logged"]
+        assert len(result["logged"]) > 1
+
+    def test_matches_scalar_routing(self, tmp_path):
+        """Test that the vectorized routing matches the scalar analyzer row by row."""
+        replay = DecisionReplay.from_audit_log(run_brain(tmp_path))
+        thresholds = dict(healthy_threshold=5.0, warning_threshold=40.0, confidence_threshold=0.5)
+        decisions = replay.replay(**thresholds)["decision"]
+
+        analyzer = PacingAnalyzer(5.0, 40.0)
+        for index in range(len(replay)):
+            severity = analyzer.calculate_variance(replay.frame.row(index))["severity"]
+            expected = "escalate_to_human" if replay.confidence_score[index] < 0.5 else {
+                "healthy": "log_healthy", "warning": "send_alert", "critical": "autonomous_halt"
+            }[severity]
+            assert DECISIONS[decisions[index]] == expected
+
+    def test_reports_decision_diffs(self):
+        """Test the diff counts, transitions and listed rows under a lower bar."""
+        replay = DecisionReplay.from_events([
+            reconciliation("google_001", 100, 95, confidence=0.6),
+            decision("google_001", "escalate_to_human"),
+            reconciliation("google_002", 100, 120, confidence=0.65),
+            decision("google_002", "escalate_to_human"),
+            reconciliation("google_003", 100, 150, confidence=0.9),
+            decision("google_003", "autonomous_halt"),
+            reconciliation("google_004", 100, 101, confidence=0.2),
+        ])
+
+        result = replay.compare(confidence_threshold=0.5, max_diffs=1)
+
+        assert result["logged"] == {"autonomous_halt": 1, "escalate_to_human": 2, "not_logged": 1}
+        assert result["replayed"] == {
+            "log_healthy": 1, "send_alert": 1, "autonomous_halt": 1, "escalate_to_human": 1
+        }
+        assert result["changed"] == 2
+        assert result["not_logged"] == 1
+        assert result["transitions"] == {
+            "escalate_to_human -> log_healthy": 1, "escalate_to_human -> send_alert": 1
+        }
+        assert result["diffs"] == [{
+            "campaign_id": "google_001", "timestamp": "2026-01-15T12:00:00",
+            "variance_pct": 5.0, "confidence_score": 0.6, "severity": "healthy",
+            "logged": "escalate_to_human", "replayed": "log_healthy",
+        }]
+
+    def test_recomputes_confidence_with_weights(self):
+        """Test confidence weights, falling back to the logged confidence."""
+        events = [reconciliation("google_001", 100, 100, confidence=0.9)]
+        events.append({
+            "event_type": "reconciliation", "campaign_id": "google_002",
+            "target_spend": 100, "actual_spend": 100, "confidence_score": 0.9,
+        })
+        replay = DecisionReplay.from_events(events)
+
+        logged = replay.replay()
+        reweighted = replay.replay(confidence_weights=(0.0, 0.5, 0.5))
+
+        assert logged["confidence"].tolist() == [0.9, 0.9]
+        assert reweighted["confidence"].tolist() == [0.5, 0.9]
+        assert list(DECISIONS[reweighted["decision"]]) == ["escalate_to_human", "log_healthy"]
+
+    def test_missing_confidence_escalates(self):
+        """Test that rows without any confidence are escalated."""
+        replay = DecisionReplay.from_events([{
+            "event_type": "reconciliation", "campaign_id": "google_001",
+            "target_spend": 100, "actual_spend": 100,
+        }])
+
+        assert replay.replay(confidence_threshold=0.0)["decision"].tolist() == [3]
+
+    def test_short_circuited_rows_replay_within_bounds(self):
+        """Test that skipped name scores are routed from their bounds, or undecidable."""
+        skipped = {
+            **reconciliation("google_001", 100, 95, confidence=0.75),
+            "name_similarity": None, "short_circuited": True,
+            "name_similarity_max": 0.5, "confidence_score_max": 0.9,
+        }
+        replay = DecisionReplay.from_events([
+            skipped, {"type": "healthy_pacing", "campaign_id": "google_001"},
+            {**skipped, "campaign_id": "google_002", "name_similarity_max": None,
+             "confidence_score_max": None},
+        ])
+
+        decisions = {
+            threshold: list(DECISIONS[replay.replay(confidence_threshold=threshold)["decision"]])
+            for threshold in (0.7, 0.8, 0.95)
+        }
+        reweighted = replay.replay(confidence_threshold=0.8, confidence_weights=(0.5, 0.4, 0.1))
+
+        assert np.isnan(replay.frame.name_similarity).all()
+        assert decisions[0.7] == ["log_healthy", "log_healthy"]
+        assert decisions[0.8] == ["undecidable", "undecidable"]
+        assert decisions[0.95] == ["escalate_to_human", "undecidable"]
+        assert reweighted["confidence"].tolist() == [0.55, 0.55]
+        assert reweighted["confidence_max"].tolist() == [0.75, np.inf]
+        assert reweighted["decision"].tolist() == [3, UNDECIDABLE]
+        assert replay.compare(confidence_threshold=0.8)["changed"] == 0
+
+    def test_gated_log_replays_like_ungated_log(self, tmp_path):
+        """Test that a short-circuited log replays like the full log wherever it can decide."""
+        full = DecisionReplay.from_audit_log(run_brain(tmp_path, num_campaigns=300, seed=42))
+        gated = DecisionReplay.from_audit_log(
+            run_brain(tmp_path, num_campaigns=300, seed=42, short_circuit_gating=True)
+        )
+        assert gated.short_circuited.any()
+        assert gated.compare()["changed"] == 0 and gated.compare()["undecidable"] == 0
+
+        for thresholds in (
+            dict(confidence_threshold=0.9),
+            dict(confidence_threshold=0.5, warning_threshold=40.0),
+            dict(confidence_threshold=0.8, confidence_weights=(0.4, 0.4, 0.2)),
+        ):
+            expected = full.replay(**thresholds)["decision"]
+            replayed = gated.replay(**thresholds)["decision"]
+            decided = replayed != UNDECIDABLE
+
+            assert (replayed[decided] == expected[decided]).all()
+            assert gated.short_circuited[~decided].all()
+        assert (~decided).any()
+
+    def test_has_no_side_effects(self, tmp_path):
+        """Test that replaying leaves the audit log untouched."""
+        logger = run_brain(tmp_path)
+        size = logger.log_path.stat().st_size
+        stats = logger.get_summary_stats()["event_types"]
+
+        DecisionReplay.from_audit_log(logger).compare(confidence_threshold=0.0)
+
+        assert logger.log_path.stat().st_size == size
+        assert logger.get_summary_stats()["event_types"] == stats
+        assert np.all(DecisionReplay.from_audit_log(logger).logged_decision != NOT_LOGGED)
+
+
+class TestReplayCli:
+    """Test the replay CLI command."""
+
+    def test_cli_prints_diff(self, tmp_path, capsys):
+        """Test that the replay command prints the comparison as JSON."""
+        logger = AuditLogger(log_dir=str(tmp_path))
+        logger.log_event(reconciliation("google_001", 100, 130, timestamp="2026-01-14T12:00:00"))
+        logger.log_event(decision("google_001", "autonomous_halt", timestamp="2026-01-14T12:00:01"))
+        logger.log_event(reconciliation("google_001", 100, 130, timestamp="2026-01-15T12:00:00"))
+        logger.log_event(decision("google_001", "autonomous_halt"))
+        logger.close()
+
+        code = audit_cli.main([
+            "replay", str(logger.log_path), "--warning-threshold", "35",
+            "--start", "2026-01-15", "--max-diffs", "0",
+        ])
+        captured = capsys.readouterr()
+        result = json.loads(captured.out)
+
+        assert code == 0
+        assert result["reconciliations"] == 1
+        assert result["transitions"] == {"autonomous_halt -> send_alert": 1}
+        assert result["diffs"] == []
+        assert "1 decisions changed" in captured.err
+
+    def test_cli_rejects_partial_weights(self, tmp_path):
+        """Test that --weights needs all three weights."""
+        with pytest.raises(SystemExit):
+            audit_cli.main(["replay", str(tmp_path / "audit.jsonl"), "--weights", "0.5", "0.5"])
@@ -4,7 +4,12 @@ Unit tests for Mock APIs.
 Tests MockPlatformAPI and MockInternalTracker.
 """
 
+import pickle
+import time
+import numpy as np
 import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from src.api.mock_platform_api import MockPlatformAPI
 from src.api.internal_tracker import MockInternalTracker
 from src.models.spend import Platform, DataSource
@@ -129,6 +134,17 @@ class TestMockPlatformAPI:
         assert all(id.startswith("google_") for id in google_ids)
         assert all(id.startswith("meta_") for id in meta_ids)
 
+    def test_campaign_index_shares_store(self, google_api):
+        """Test that the ID index and campaign list stay consistent."""
+        campaign_id = google_api.list_campaign_ids()[2]
+
+        google_api.pause_campaign(campaign_id)
+
+        listed = next(c for c in google_api.campaigns if c["campaign_id"] == campaign_id)
+        assert listed["status"] == "paused"
+        assert google_api.get_campaign_status(campaign_id) == "paused"
+        assert google_api.get_campaign_status("nonexistent") is None
+
     def test_seed_reproducibility(self):
         """Test that same seed produces same results."""
         api1 = MockPlatformAPI(Platform.GOOGLE, num_campaigns=3, seed=100)
@@ -145,6 +161,91 @@ class TestMockPlatformAPI:
             spend2 = api2.get_campaign_spend(id).amount_usd
             assert spend1 == spend2
 
+    def test_generate_campaign_columns_reproducible(self, google_api):
+        """Test that vectorized generation is reproducible for a seed."""
+        now = datetime(2026, 1, 15, 12, 0)
+        cols1 = google_api.generate_campaign_columns(1000, np.random.default_rng(7), now)
+        cols2 = google_api.generate_campaign_columns(1000, np.random.default_rng(7), now)
+
+        for key in cols1:
+            assert np.array_equal(cols1[key], cols2[key])
+
+    def test_generate_campaign_columns_distribution(self, google_api):
+        """Test that scenario draws follow SCENARIO_DISTRIBUTION."""
+        n = 50_000
+        cols = google_api.generate_campaign_columns(n, np.random.default_rng(0))
+        dist = MockPlatformAPI.SCENARIO_DISTRIBUTION
+
+        for scenario in MockPlatformAPI.VARIANCE_SCENARIOS:
+            expected = dist.count(scenario) / len(dist)
+            observed = np.mean(cols["scenario"] == scenario)
+            assert abs(observed - expected) < 0.01
+
+        # Variance factors come from the drawn scenario's factor list
+        factors = cols["spend"] / cols["target"]
+        for scenario, options in MockPlatformAPI.VARIANCE_SCENARIOS.items():
+            mask = cols["scenario"] == scenario
+            assert np.all(np.isin(np.round(factors[mask], 6), np.round(options, 6)))
+
+        assert np.all((cols["target"] >= 1000) & (cols["target"] <= 15000))
+        assert np.all((cols["status"] == "paused") == (cols["spend"] == 0))
+
+    def test_get_campaign_spend_batch(self):
+        """Test batch fetch returns aligned records in few requests."""
+        api = MockPlatformAPI(Platform.GOOGLE, num_campaigns=25, seed=42, max_batch_size=10)
+        campaign_ids = api.list_campaign_ids() + ["nonexistent"]
+
+        records = api.get_campaign_spend_batch(campaign_ids)
+
+        assert len(records) == len(campaign_ids)
+        assert records[-1] is None
+        for campaign_id, record in zip(campaign_ids[:-1], records):
+            assert record.campaign_id == campaign_id
+            assert record.amount_usd == api.get_campaign_spend(campaign_id).amount_usd
+        # 26 IDs at 10 per page = 3 batch requests, plus 25 single lookups above
+        assert api.request_count == 3 + 25
+
+    def test_platforms_with_same_seed_are_independent(self):
+        """Test that each platform draws from its own seed stream."""
+        as_of = datetime(2026, 1, 15, 12, 0)
+        google_api = MockPlatformAPI(Platform.GOOGLE, num_campaigns=50, seed=42, as_of=as_of)
+        meta_api = MockPlatformAPI(Platform.META, num_campaigns=50, seed=42, as_of=as_of)
+
+        google_spend = [c["spend"] for c in google_api.campaigns]
+        meta_spend = [c["spend"] for c in meta_api.campaigns]
+        assert google_spend != meta_spend
+
+    def test_concurrent_builds_match_serial(self):
+        """Test that building platforms concurrently doesn't disturb output."""
+        as_of = datetime(2026, 1, 15, 12, 0)
+        platforms = list(Platform)
+
+        serial = [
+            MockPlatformAPI(p, num_campaigns=200, seed=7, as_of=as_of).campaigns
+            for p in platforms
+        ]
+        with ThreadPoolExecutor(max_workers=len(platforms)) as executor:
+            threaded = list(executor.map(
+                lambda p: MockPlatformAPI(p, num_campaigns=200, seed=7, as_of=as_of).campaigns,
+                platforms
+            ))
+
+        assert pickle.dumps(serial) == pickle.dumps(threaded)
+
+    def test_shards_generate_independently(self, monkeypatch):
+        """Test that any shard can be generated alone and matches the full catalog."""
+        monkeypatch.setattr(MockPlatformAPI, "SHARD_SIZE", 40)
+        api = MockPlatformAPI(Platform.GOOGLE, num_campaigns=100, seed=3)
+
+        full = api.generate_shard_columns(100)
+        middle = api.generate_shard_columns(100, shards=[1])
+        last = api.generate_shard_columns(100, shards=[2])
+
+        assert len(full["campaign_id"]) == 100
+        assert np.array_equal(full["spend"][40:80], middle["spend"])
+        assert np.array_equal(full["campaign_name"][80:], last["campaign_name"])
+        assert last["campaign_id"][0] == "google_080"
+
 
 class TestMockInternalTracker:
     """Test MockInternalTracker."""
@@ -235,6 +336,17 @@ class TestMockInternalTracker:
         assert summary["average_target_spend"] == 4000.0
         assert len(summary["campaign_ids"]) == 2
 
+    def test_get_target_spend_batch(self, tracker):
+        """Test batch target fetch returns aligned records."""
+        tracker.set_target("google_001", 5000.0)
+
+        records = tracker.get_target_spend_batch(["google_001", "meta_002", "unknown"])
+
+        assert records[0].amount_usd == 5000.0
+        assert records[1].platform == Platform.META
+        assert records[2] is None
+        assert tracker.request_count == 1
+
     def test_platform_inference_from_id(self, tracker):
         """Test platform inference from campaign ID."""
         google_record = tracker.get_target_spend("google_999")
@@ -243,6 +355,20 @@ class TestMockInternalTracker:
         meta_record = tracker.get_target_spend("meta_999")
         assert meta_record.platform == Platform.META
 
+    def test_pinned_as_of_stamps_records(self):
+        """Test that a pinned as_of drives record timestamps and generated dates."""
+        as_of = datetime(2026, 1, 15, 12, 0)
+        tracker = MockInternalTracker(as_of=as_of)
+        tracker.set_target("google_001", 5000.0)
+
+        explicit = tracker.get_target_spend("google_001")
+        generated = tracker.get_target_spend("google_002")
+
+        assert explicit.timestamp == datetime(2026, 1, 15, 0, 0)
+        assert generated.timestamp == datetime(2026, 1, 15, 0, 0)
+        assert generated.metadata["start_date"] == "2026-01-01"
+        assert tracker.get_target_spend_batch(["google_001"])[0] == explicit
+
 
 class TestAPIIntegration:
     """Test integration between platform API and tracker."""
@@ -263,6 +389,230 @@ class TestAPIIntegration:
         actual_record = platform_api.get_campaign_spend(campaign_id)
         assert actual_record.campaign_id == campaign_id
 
+    def test_brain_prefetch_uses_batch_requests(self, tmp_path):
+        """Test that PacingBrain.run_batch fetches through the batch endpoints."""
+        from src.agents.pacing_brain import PacingBrain
+        from src.utils.audit_logger import AuditLogger
+
+        platform_api = MockPlatformAPI(Platform.GOOGLE, num_campaigns=20, seed=42)
+        tracker = MockInternalTracker()
+        tracker.sync_from_platform(platform_api, seed=42)
+        brain = PacingBrain(
+            platform_api=platform_api,
+            internal_tracker=tracker,
+            audit_logger=AuditLogger(log_file=str(tmp_path / "audit.jsonl")),
+        )
+
+        brain.run_batch(platform_api.list_campaign_ids())
+
+        assert platform_api.request_count == 1
+        assert tracker.request_count == 1
+        assert brain._prefetched == {}
+
+    def test_brain_short_circuit_gating_keeps_routing(self, tmp_path):
+        """Test that short-circuit gating makes the same decisions with fewer distances."""
+        from src.agents.confidence_scorer import ConfidenceScorer
+        from src.agents.pacing_brain import PacingBrain
+        from src.utils.audit_logger import AuditLogger
+
+        as_of = datetime(2026, 1, 15, 12, 0)
+        outcomes = {}
+        scorers = {}
+        for gating in (False, True):
+            platform_api = MockPlatformAPI(Platform.GOOGLE, num_campaigns=200, seed=7, as_of=as_of)
+            tracker = MockInternalTracker()
+            tracker.sync_from_platform(platform_api, dirty_ratio=0.3, seed=7)
+            scorers[gating] = ConfidenceScorer(name_cache_size=0)
+            brain = PacingBrain(
+                platform_api=platform_api,
+                internal_tracker=tracker,
+                audit_logger=AuditLogger(log_file=str(tmp_path / f"audit_{gating}.jsonl")),
+                as_of=as_of,
+                confidence_scorer=scorers[gating],
+                short_circuit_gating=gating,
+            )
+            outcomes[gating] = [
+                brain.graph.invoke(dict(
+                    campaign_id=campaign_id, reconciled_spend=None, variance_result=None,
+                    confidence_score=0.0, action_taken="", recommendation="",
+                    requires_human=False, root_cause_analysis=None, mitigation_plan=None,
+                    alert=None, as_of=as_of, confidence_result=None,
+                ))["action_taken"]
+                for campaign_id in platform_api.list_campaign_ids()
+            ]
+
+        assert outcomes[True] == outcomes[False]
+        assert scorers[False].gating_stats()["gated"] == 0
+        assert scorers[True].gating_stats()["short_circuited"] > 0
+
+    def test_brain_logs_skipped_name_scores_as_unknown(self, tmp_path):
+        """Test that gated runs log skipped name scores as unknown, with bounds."""
+        from src.agents.pacing_brain import PacingBrain
+        from src.utils.audit_logger import AuditLogger
+
+        as_of = datetime(2026, 1, 15, 12, 0)
+        events = {}
+        for gating in (False, True):
+            platform_api = MockPlatformAPI(Platform.GOOGLE, num_campaigns=300, seed=42, as_of=as_of)
+            tracker = MockInternalTracker(as_of=as_of)
+            tracker.sync_from_platform(platform_api, seed=42)
+            logger = AuditLogger(log_file=str(tmp_path / f"audit_{gating}.jsonl"))
+            brain = PacingBrain(
+                platform_api=platform_api, internal_tracker=tracker, audit_logger=logger,
+                as_of=as_of, short_circuit_gating=gating,
+            )
+            brain.run_batch(platform_api.list_campaign_ids())
+            events[gating] = logger.get_events(event_type="reconciliation")
+
+        skipped = 0
+        for full, gated in zip(events[False], events[True]):
+            if not gated.get("short_circuited"):
+                assert gated["name_similarity"] == full["name_similarity"]
+                assert gated["confidence_score"] == full["confidence_score"]
+                continue
+            skipped += 1
+            assert gated["name_similarity"] is None
+            assert full["name_similarity"] <= gated["name_similarity_max"]
+            assert gated["confidence_score"] <= full["confidence_score"]
+            assert full["confidence_score"] <= gated["confidence_score_max"]
+        assert skipped > 0
+
+    def test_brain_reconciles_with_scorer_weights(self, tmp_path):
+        """Test that the reconciled confidence is the scorer's own confidence."""
+        from src.agents.confidence_scorer import ConfidenceScorer
+        from src.agents.pacing_brain import PacingBrain
+        from src.utils.audit_logger import AuditLogger
+
+        as_of = datetime(2026, 1, 15, 12, 0)
+        platform_api = MockPlatformAPI(Platform.GOOGLE, num_campaigns=20, seed=7, as_of=as_of)
+        tracker = MockInternalTracker()
+        tracker.sync_from_platform(platform_api, dirty_ratio=0.3, seed=7)
+        scorer = ConfidenceScorer(
+            metadata_weight=0.2, name_similarity_weight=0.2, freshness_weight=0.6
+        )
+        brain = PacingBrain(
+            platform_api=platform_api,
+            internal_tracker=tracker,
+            audit_logger=AuditLogger(log_file=str(tmp_path / "audit.jsonl")),
+            as_of=as_of,
+            confidence_scorer=scorer,
+        )
+
+        for campaign_id in platform_api.list_campaign_ids():
+            state = brain.graph.invoke(dict(
+                campaign_id=campaign_id, reconciled_spend=None, variance_result=None,
+                confidence_score=0.0, action_taken="", recommendation="",
+                requires_human=False, root_cause_analysis=None, mitigation_plan=None,
+                alert=None, as_of=as_of, confidence_result=None,
+            ))
+            reconciled = state["reconciled_spend"]
+            assert reconciled.confidence_weights == (0.2, 0.2, 0.6)
+            assert reconciled.confidence_score == state["confidence_result"]["confidence_score"]
+            assert state["confidence_score"] == reconciled.confidence_score
+
+    def test_shared_vocabulary_encodes_at_ingestion(self):
+        """Test that platform and tracker records share metadata codes."""
+        from src.models.metadata import EncodedMetadata, MetadataVocabulary
+
+        vocabulary = MetadataVocabulary()
+        platform_api = MockPlatformAPI(
+            Platform.GOOGLE, num_campaigns=50, seed=42, vocabulary=vocabulary
+        )
+        tracker = MockInternalTracker(vocabulary=vocabulary)
+        tracker.sync_from_platform(platform_api, dirty_ratio=0.0, seed=42)
+
+        campaign_id = platform_api.list_campaign_ids()[0]
+        actual = platform_api.get_campaign_spend(campaign_id).metadata
+        target = tracker.get_target_spend(campaign_id).metadata
+
+        assert isinstance(actual, EncodedMetadata)
+        assert actual.codes == target.codes
+        assert actual is target  # identical metadata is interned
+        assert isinstance(tracker.get_target_spend("meta_999").metadata, EncodedMetadata)
+
+    def test_tracker_sync_is_split_per_platform(self):
+        """Test that syncing a second platform doesn't change the first's targets."""
+        google_api = MockPlatformAPI(Platform.GOOGLE, num_campaigns=50, seed=42)
+        meta_api = MockPlatformAPI(Platform.META, num_campaigns=50, seed=42)
+
+        alone = MockInternalTracker()
+        alone.sync_from_platform(google_api, seed=42)
+
+        combined = MockInternalTracker()
+        combined.sync_from_platform(meta_api, seed=42)
+        combined.sync_from_platform(google_api, seed=42)
+
+        for campaign_id, data in alone.target_data.items():
+            assert combined.target_data[campaign_id] == data
+
+    def test_parallel_orchestrator_build_matches_serial(self, tmp_path):
+        """Test that parallel catalog builds are byte-identical to serial ones."""
+        from src.orchestrator import PacingOrchestrator
+
+        as_of = datetime(2026, 1, 15, 12, 0)
+        kwargs = dict(
+            platforms=list(Platform),
+            audit_log_file=str(tmp_path / "audit.jsonl"),
+            num_campaigns=500,
+            seed=42,
+            as_of=as_of,
+        )
+        serial = PacingOrchestrator(**kwargs)
+        parallel = PacingOrchestrator(max_workers=len(Platform), **kwargs)
+
+        for platform in Platform:
+            serial_campaigns = serial.platform_apis[platform].campaigns
+            parallel_campaigns = parallel.platform_apis[platform].campaigns
+            # Metadata is encoded with each orchestrator's own vocabulary, so
+            # compare it as plain dicts plus codes
+            assert pickle.dumps(
+                [{**c, "metadata": dict(c["metadata"])} for c in serial_campaigns]
+            ) == pickle.dumps(
+                [{**c, "metadata": dict(c["metadata"])} for c in parallel_campaigns]
+            )
+            assert [c["metadata"].codes for c in serial_campaigns] == [
+                c["metadata"].codes for c in parallel_campaigns
+            ]
+
+    def test_orchestrator_takes_fresh_as_of_per_run(self, tmp_path, monkeypatch):
+        """Test that an orchestrator without as_of pins a new time for every run."""
+        from src.orchestrator import PacingOrchestrator
+
+        orchestrator = PacingOrchestrator(
+            platforms=[Platform.GOOGLE], audit_log_file=str(tmp_path / "audit.jsonl"),
+            num_campaigns=3,
+        )
+        agent = orchestrator.get_agent(Platform.GOOGLE)
+        seen = []
+        monkeypatch.setattr(agent, "run", lambda campaign_id, as_of=None: seen.append(as_of))
+
+        orchestrator.run_platform(Platform.GOOGLE)
+        time.sleep(0.01)
+        orchestrator.run_platform(Platform.GOOGLE)
+
+        assert orchestrator.as_of is None
+        assert seen[0] == seen[1] == seen[2]
+        assert seen[3] == seen[4] == seen[5]
+        assert seen[3] > seen[0]
+
+    def test_orchestrator_pins_explicit_as_of(self, tmp_path, monkeypatch):
+        """Test that an explicit as_of is used for every run and by the tracker."""
+        from src.orchestrator import PacingOrchestrator
+
+        as_of = datetime(2026, 1, 15, 12, 0)
+        orchestrator = PacingOrchestrator(
+            platforms=[Platform.GOOGLE], audit_log_file=str(tmp_path / "audit.jsonl"),
+            num_campaigns=2, as_of=as_of,
+        )
+        agent = orchestrator.get_agent(Platform.GOOGLE)
+        seen = []
+        monkeypatch.setattr(agent, "run", lambda campaign_id, as_of=None: seen.append(as_of))
+
+        orchestrator.run_platform(Platform.GOOGLE)
+
+        assert seen == [as_of, as_of]
+        assert orchestrator.internal_tracker.as_of == as_of
+
     def test_reconciliation_scenario(self):
         """Test realistic reconciliation scenario."""
         platform_api = MockPlatformAPI(Platform.GOOGLE, num_campaigns=1, seed=42)
@@ -4,6 +4,10 @@ Unit tests for data models.
 Tests SpendRecord, ReconciledSpend, and PacingAlert data models.
 """
 
+import copy
+import dataclasses
+import pickle
+import numpy as np
 import pytest
 from datetime import datetime, timedelta
 from src.models.spend import (
@@ -11,8 +15,10 @@ from src.models.spend import (
     DataSource,
     SpendRecord,
     ReconciledSpend,
+    ReconciledSpendFrame,
     PacingAlert
 )
+from src.models.metadata import EncodedMetadata, MetadataVocabulary
 
 
 class TestSpendRecord:
@@ -79,6 +85,41 @@ class TestSpendRecord:
         )
         assert stale_record.is_stale is True
 
+    def test_age_at_reference_time(self):
+        """Test age and staleness measured against a fixed as_of."""
+        record = SpendRecord(
+            campaign_id="test_001",
+            campaign_name="Test",
+            platform=Platform.GOOGLE,
+            source=DataSource.PLATFORM_API,
+            amount_usd=1000.0,
+            timestamp=datetime(2026, 1, 15, 6, 0),
+            refresh_cycle_hours=4,
+            metadata={}
+        )
+
+        assert record.hours_since_update_at(datetime(2026, 1, 15, 9, 30)) == 3.5
+        assert record.is_stale_at(datetime(2026, 1, 15, 9, 30)) is False
+        assert record.is_stale_at(datetime(2026, 1, 15, 12, 0)) is True
+
+    def test_slotted_and_frozen(self):
+        """Test that records have no per-instance __dict__ and are immutable."""
+        record = SpendRecord(
+            campaign_id="test_001",
+            campaign_name="Test",
+            platform=Platform.GOOGLE,
+            source=DataSource.PLATFORM_API,
+            amount_usd=1000.0,
+            timestamp=datetime(2026, 1, 15, 6, 0),
+            refresh_cycle_hours=4
+        )
+
+        assert not hasattr(record, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            record.amount_usd = 0.0
+        assert dataclasses.replace(record, amount_usd=0.0).amount_usd == 0.0
+        assert pickle.loads(pickle.dumps(record)) == record
+
 
 class TestReconciledSpend:
     """Test ReconciledSpend data model."""
@@ -188,6 +229,177 @@ class TestReconciledSpend:
         assert data["is_zero_delivery"] is False
         assert "timestamp" in data["target_timestamp"]
 
+    def test_slotted_and_frozen(self):
+        """Test that reconciliations have no __dict__ and are immutable."""
+        reconciled = self.create_reconciled(target=10000, actual=12000)
+
+        assert not hasattr(reconciled, "__dict__")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            reconciled.actual_spend = 0.0
+
+    def test_derived_values_use_scorer_weights(self):
+        """Test that cached derived values use the given scorer weights."""
+        reconciled = dataclasses.replace(
+            self.create_reconciled(target=10000, actual=12000, metadata_match=1.0,
+                                   name_similarity=0.5, freshness=0.0),
+            confidence_weights=(0.2, 0.2, 0.6)
+        )
+
+        assert reconciled.confidence_score == pytest.approx(0.3)
+        data = reconciled.to_dict()
+        assert data["confidence_score"] == reconciled.confidence_score
+        assert data["variance_pct"] == reconciled.pacing_variance == 20.0
+        assert data["spend_direction"] == reconciled.spend_direction == "overspending"
+        assert pickle.loads(pickle.dumps(reconciled)).confidence_score == reconciled.confidence_score
+
+    def test_skipped_name_similarity(self):
+        """Test that a gated (None) name similarity is left out of the confidence."""
+        reconciled = self.create_reconciled(
+            target=10000, actual=10000, metadata_match=1.0, name_similarity=None, freshness=0.5
+        )
+
+        assert reconciled.confidence_score == pytest.approx(0.6)
+        assert reconciled.to_dict()["confidence_score"] == reconciled.confidence_score
+
+
+class TestReconciledSpendFrame:
+    """Test ReconciledSpendFrame columnar model."""
+
+    def create_records(self):
+        """Helper to create a mix of reconciliations."""
+        timestamp = datetime(2026, 1, 15, 12, 0)
+        return [
+            ReconciledSpend(
+                campaign_id=f"google_{i:03d}",
+                campaign_name=f"Campaign {i}",
+                platform=Platform.GOOGLE,
+                target_spend=target,
+                actual_spend=actual,
+                target_timestamp=timestamp,
+                actual_timestamp=timestamp - timedelta(hours=i),
+                metadata_match_score=1.0,
+                name_similarity=0.8,
+                data_freshness_score=0.6
+            )
+            for i, (target, actual) in enumerate(
+                [(10000, 12000), (10000, 8000), (10000, 0), (0, 0), (0, 100), (5000, 5000)]
+            )
+        ]
+
+    def test_properties_match_scalar(self):
+        """Test that vectorized properties match ReconciledSpend."""
+        records = self.create_records()
+        frame = ReconciledSpendFrame.from_records(records)
+
+        assert len(frame) == len(records)
+        assert frame.pacing_variance.tolist() == [r.pacing_variance for r in records]
+        assert frame.variance_amount.tolist() == [r.variance_amount for r in records]
+        assert frame.confidence_score.tolist() == [r.confidence_score for r in records]
+        assert frame.is_zero_delivery.tolist() == [r.is_zero_delivery for r in records]
+        assert frame.spend_direction.tolist() == [r.spend_direction for r in records]
+
+    def test_row_round_trip(self):
+        """Test that a row materializes back into the original record."""
+        records = self.create_records()
+        frame = ReconciledSpendFrame.from_records(records)
+
+        assert frame.row(1) == records[1]
+        assert isinstance(frame.row(1).actual_timestamp, datetime)
+
+    def test_skipped_name_similarity_round_trip(self):
+        """Test that gated (None) name similarities become NaN and back."""
+        records = [dataclasses.replace(r, name_similarity=None) for r in self.create_records()[:2]]
+        frame = ReconciledSpendFrame.from_records(records + self.create_records()[2:])
+
+        assert np.isnan(frame.name_similarity[:2]).all()
+        assert frame.confidence_score.tolist() == [
+            r.confidence_score for r in records + self.create_records()[2:]
+        ]
+        assert frame.row(0) == records[0]
+
+    def test_confidence_weights_carry_through(self):
+        """Test that the frame uses and round-trips the records' weights."""
+        weights = (0.2, 0.2, 0.6)
+        records = [dataclasses.replace(r, confidence_weights=weights) for r in self.create_records()]
+        frame = ReconciledSpendFrame.from_records(records)
+
+        assert frame.confidence_score.tolist() == [r.confidence_score for r in records]
+        assert frame.row(0).confidence_weights == weights
+
+        with pytest.raises(ValueError):
+            ReconciledSpendFrame.from_records(records + self.create_records()[:1])
+
+
+class TestMetadataVocabulary:
+    """Test MetadataVocabulary dictionary encoding."""
+
+    def test_codes_follow_normalized_values(self):
+        """Test that values matching case-insensitively share a code."""
+        vocabulary = MetadataVocabulary(["market", "product"])
+
+        assert vocabulary.code("market", "EU") == vocabulary.code("market", "eu")
+        assert vocabulary.code("market", "NA") != vocabulary.code("market", "EU")
+        assert vocabulary.code("market", None) == MetadataVocabulary.MISSING
+        assert vocabulary.decode("market", vocabulary.code("market", "NA")) == "na"
+        assert vocabulary.stats() == {"market": 2, "product": 0}
+
+    def test_encode_keeps_dict_contents(self):
+        """Test that encoded metadata behaves like the original dict."""
+        vocabulary = MetadataVocabulary(["market", "product"])
+        metadata = {"market": "EU", "platform": "google"}
+
+        encoded = vocabulary.encode(metadata)
+
+        assert isinstance(encoded, EncodedMetadata)
+        assert encoded == metadata
+        assert encoded.codes == (0, MetadataVocabulary.MISSING)
+        assert vocabulary.encode(encoded) is encoded
+
+    def test_pickle_round_trip(self):
+        """Test that encoded metadata keeps codes and vocabulary across pickling."""
+        vocabulary = MetadataVocabulary(["market"])
+        rows = [vocabulary.encode({"market": m}) for m in ("EU", "NA", "eu")]
+
+        restored = pickle.loads(pickle.dumps(rows))
+
+        assert restored == rows
+        assert [r.codes for r in restored] == [(0,), (1,), (0,)]
+        assert restored[0].vocabulary is restored[2].vocabulary
+        assert restored[0].vocabulary.codes_of(restored).tolist() == [[0], [1], [0]]
+
+    def test_intern_shares_read_only_instances(self):
+        """Test that identical metadata is interned into one read-only object."""
+        vocabulary = MetadataVocabulary(["market"])
+
+        first = vocabulary.intern({"market": "EU", "platform": "google"})
+        second = vocabulary.intern({"market": "EU", "platform": "google"})
+        other = vocabulary.intern({"market": "EU", "platform": "meta"})
+
+        assert first is second
+        assert first is not other and first.codes == other.codes
+        assert vocabulary.interned_count() == 2
+        assert copy.deepcopy(first) is first
+        with pytest.raises(TypeError):
+            first["market"] = "NA"
+        with pytest.raises(TypeError):
+            first.update(market="NA")
+        assert dict(first) == {"market": "EU", "platform": "google"}
+
+    def test_equal_values_of_different_types_stay_distinct(self):
+        """Test that True, 1 and 1.0 get codes and instances of their own."""
+        vocabulary = MetadataVocabulary(["market"])
+
+        codes = [vocabulary.code("market", value) for value in (1, True, 1.0, "1", "TRUE")]
+        interned = [vocabulary.intern({"market": value}) for value in (1, 1.0, True, (1,), (True,))]
+
+        assert codes == [0, 1, 2, 0, 1]
+        assert [dict(metadata) for metadata in interned] == [
+            {"market": 1}, {"market": 1.0}, {"market": True}, {"market": (1,)}, {"market": (True,)}
+        ]
+        assert [type(metadata["market"]) for metadata in interned[:3]] == [int, float, bool]
+        assert vocabulary.interned_count() == 5
+        assert vocabulary.intern({"market": 1.0}) is interned[1]
+
 
 class TestPacingAlert:
     """Test PacingAlert data model."""
@@ -253,6 +465,14 @@ class TestPacingAlert:
         assert data["is_critical"] is False
         assert data["is_autonomous_action"] is False
 
+    def test_slotted(self):
+        """Test that alerts have no per-instance __dict__."""
+        alert = self.create_alert()
+
+        assert not hasattr(alert, "__dict__")
+        with pytest.raises(AttributeError):
+            alert.extra = "not a field"
+
     def test_str_representation(self):
         """Test string representation."""
         alert = self.create_alert()
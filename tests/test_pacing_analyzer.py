@@ -4,10 +4,11 @@ Unit tests for PacingAnalyzer.
 Tests variance calculation, severity classification, and recommendation generation.
 """
 
+import numpy as np
 import pytest
 from datetime import datetime
 from src.analyzers.pacing_analyzer import PacingAnalyzer
-from src.models.spend import ReconciledSpend, Platform
+from src.models.spend import ReconciledSpend, ReconciledSpendFrame, Platform
 
 
 @pytest.fixture
@@ -130,6 +131,39 @@ class TestCustomThresholds:
         assert result["variance_pct"] == 20.0
 
 
+class TestVarianceBatch:
+    """Test vectorized variance calculation over a ReconciledSpendFrame."""
+
+    @pytest.mark.parametrize("thresholds", [(10.0, 25.0), (5.0, 15.0)])
+    def test_batch_matches_scalar(self, thresholds):
+        """Test that every batch column matches calculate_variance exactly."""
+        analyzer = PacingAnalyzer(*thresholds)
+        rng = np.random.default_rng(0)
+
+        pairs = [
+            (10000, 10700), (10000, 12000), (10000, 0), (0, 0), (0, 500),
+            (10000, 10000), (10000, 9000), (10000, 12500), (10000, 11000),
+        ]
+        targets = rng.uniform(0, 15000, 500).round(2)
+        factors = rng.choice([0.0, 0.5, 0.9, 1.0, 1.1, 1.25, 1.8], 500)
+        pairs += list(zip(targets, targets * factors))
+
+        records = [
+            create_reconciled_spend(target, actual, confidence=c)
+            for (target, actual), c in zip(pairs, rng.uniform(0, 1, len(pairs)))
+        ]
+        result = analyzer.calculate_variance_batch(ReconciledSpendFrame.from_records(records))
+
+        for i, reconciled in enumerate(records):
+            expected = analyzer.calculate_variance(reconciled)
+            assert result["variance_pct"][i] == expected["variance_pct"]
+            assert result["variance_amount"][i] == expected["variance_amount"]
+            assert result["severity"][i] == expected["severity"]
+            assert result["is_zero_delivery"][i] == expected["is_zero_delivery"]
+            assert result["confidence"][i] == expected["confidence"]
+            assert result["spend_direction"][i] == expected["spend_direction"]
+
+
 class TestRecommendationGeneration:
     """Test recommendation generation."""
 